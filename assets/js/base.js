@@ -0,0 +1,27 @@
+setTimeout(function() {
+    const alerts = document.querySelectorAll('.alert');
+    alerts.forEach(function(alert) {
+        const bsAlert = new bootstrap.Alert(alert);
+        bsAlert.close();
+    });
+}, 5000);
+
+var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));
+var tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {
+    return new bootstrap.Tooltip(tooltipTriggerEl);
+});
+
+function adaptTablesForMobile() {
+    if (window.innerWidth < 576) {
+        document.querySelectorAll('.table th.mobile-hidden, .table td.mobile-hidden').forEach(function(el) {
+            el.style.display = 'none';
+        });
+    } else {
+        document.querySelectorAll('.table th.mobile-hidden, .table td.mobile-hidden').forEach(function(el) {
+            el.style.display = '';
+        });
+    }
+}
+
+document.addEventListener('DOMContentLoaded', adaptTablesForMobile);
+window.addEventListener('resize', adaptTablesForMobile);
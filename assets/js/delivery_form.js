@@ -0,0 +1,571 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Элементы DOM
+    const selectedCityId = document.getElementById('selectedCityId');
+    const cityInfo = document.getElementById('city-info');
+    const cityNameElement = document.getElementById('selected-city-name');
+    const cityContent = document.getElementById('city-info-content');
+    const warehouseHidden = document.getElementById('id_warehouse_hidden');
+    const cityHidden = document.getElementById('id_city_hidden');
+    const warehouseSelection = document.getElementById('warehouse-selection');
+    const citySelectionDisplay = document.getElementById('city-selection-display');
+    const form = document.getElementById('orderForm');
+    const submitButton = document.getElementById('submitButton');
+    const dateAvailabilityIndicator = document.getElementById('date-availability-indicator');
+    const dateAvailabilityMessage = document.getElementById('date-availability-message');
+    const dateInput = document.querySelector('#id_date');
+
+    // Данные из контекста Django
+    const citiesData = pageConfig.citiesData;
+
+    // Текущий выбранный город и склад
+    let currentCity = null;
+    let selectedWarehouseId = null;
+    let selectedWarehouseName = null;
+    let selectedCityIdValue = null;
+    let selectedCityName = null;
+
+    // Функция для переключения полей в зависимости от типа клиента в форме доставки
+    function toggleDeliveryClientFieldsByType() {
+        const clientTypeSelect = document.getElementById('id_client_type');
+        if (!clientTypeSelect) return;
+
+        const clientType = clientTypeSelect.value;
+        const companyGroup = document.getElementById('delivery-client-company-group');
+        const companyLabel = document.getElementById('delivery-client-company-label');
+        const companyHelp = document.getElementById('delivery-client-company-help');
+
+        // Скрываем все группы полей
+        document.querySelectorAll('.delivery-client-legal-fields, .delivery-client-entrepreneur-fields, .delivery-client-individual-fields').forEach(el => {
+            el.classList.remove('visible');
+        });
+
+        // Управление полем ИНН
+        const innField = document.querySelector('.delivery-client-legal-fields.delivery-client-entrepreneur-fields');
+        if (innField) {
+            // Для физ.лиц и самозанятых скрываем ИНН, для юр.лиц и ИП показываем
+            if (clientType === 'individual' || clientType === 'self_employed') {
+                innField.style.display = 'none';
+            } else {
+                innField.style.display = 'block';
+            }
+        }
+
+        // Настраиваем лейбл для поля компании/ФИО и показываем нужные поля
+        if (companyLabel && companyHelp) {
+            switch(clientType) {
+                case 'legal':
+                    companyLabel.textContent = 'Наименование компании *';
+                    companyHelp.textContent = 'Полное наименование юридического лица (ООО, АО и т.д.)';
+                    document.querySelectorAll('.delivery-client-legal-fields').forEach(el => el.classList.add('visible'));
+                    break;
+                case 'entrepreneur':
+                    companyLabel.textContent = 'Наименование ИП *';
+                    companyHelp.textContent = 'Наименование индивидуального предпринимателя';
+                    document.querySelectorAll('.delivery-client-entrepreneur-fields').forEach(el => el.classList.add('visible'));
+                    document.querySelectorAll('.delivery-client-individual-fields').forEach(el => el.classList.add('visible'));
+                    break;
+                case 'individual':
+                case 'self_employed':
+                    companyLabel.textContent = 'ФИО *';
+                    companyHelp.textContent = 'Фамилия, имя, отчество физического лица';
+                    document.querySelectorAll('.delivery-client-individual-fields').forEach(el => el.classList.add('visible'));
+                    break;
+            }
+        }
+    }
+
+    // Инициализация полей клиента для доставки
+    function initDeliveryClientFields() {
+        const typeSelect = document.getElementById('id_client_type');
+        if (typeSelect) {
+            typeSelect.addEventListener('change', toggleDeliveryClientFieldsByType);
+            // Инициализируем при загрузке
+            toggleDeliveryClientFieldsByType();
+        }
+    }
+
+    // Функция для отображения информации о городе
+    function displayCityInfo(cityId) {
+        const city = citiesData.find(c => c.id == cityId);
+        if (!city) {
+            cityContent.innerHTML = `
+                <div class="alert alert-danger">
+                    <i class="bi bi-exclamation-triangle"></i>
+                    Город не найден
+                </div>
+            `;
+            return;
+        }
+
+        currentCity = city;
+        cityNameElement.textContent = city.name;
+        selectedCityIdValue = city.id;
+        selectedCityName = city.name;
+
+        cityHidden.value = city.id;
+
+        updateCitySelectionDisplay(city.name);
+
+        let html = '';
+
+        if (city.warehouses && city.warehouses.length > 0) {
+            city.warehouses.forEach((warehouse, index) => {
+                const isOpen = warehouse.is_open_now;
+                const schedules = warehouse.schedules || [];
+
+                html += `
+                    <div class="warehouse-info mb-4 p-3">
+                        <div class="d-flex justify-content-between align-items-start mb-3">
+                            <div>
+                                <h6 class="mb-1">
+                                    <i class="bi bi-house-door me-2"></i>
+                                    <strong>${warehouse.name}</strong>
+                                    <span class="badge ${isOpen ? 'bg-success' : 'bg-danger'} ms-2">
+                                        <i class="bi ${isOpen ? 'bi-check-circle' : 'bi-x-circle'}"></i>
+                                        ${isOpen ? 'Открыт' : 'Закрыт'}
+                                    </span>
+                                </h6>
+                                <p class="text-muted mb-0"><small>Код: ${warehouse.code}</small></p>
+                            </div>
+                            <div>
+                                <button type="button" class="btn btn-sm ${selectedWarehouseId == warehouse.id ? 'btn-primary' : 'btn-outline-primary'} select-warehouse-btn" 
+                                        data-warehouse-id="${warehouse.id}" 
+                                        data-warehouse-name="${warehouse.name}"
+                                        data-warehouse-city="${city.name}">
+                                    <i class="bi bi-check-circle me-1"></i> 
+                                    ${selectedWarehouseId == warehouse.id ? 'Выбран' : 'Выбрать'}
+                                </button>
+                            </div>
+                        </div>
+
+                        <div class="row mb-3">
+                            <div class="col-md-6">
+                                <p class="mb-1">
+                                    <i class="bi bi-geo-alt text-primary"></i> 
+                                    <strong>Адрес:</strong> ${warehouse.address}
+                                </p>
+                                <p class="mb-1">
+                                    <i class="bi bi-telephone text-primary"></i> 
+                                    <strong>Телефон:</strong> ${warehouse.phone}
+                                </p>
+                                ${warehouse.email ? `
+                                    <p class="mb-1">
+                                        <i class="bi bi-envelope text-primary"></i> 
+                                        <strong>Email:</strong> ${warehouse.email}
+                                    </p>
+                                ` : ''}
+                                ${warehouse.manager ? `
+                                    <p class="mb-1">
+                                        <i class="bi bi-person text-primary"></i> 
+                                        <strong>Менеджер:</strong> ${warehouse.manager}
+                                    </p>
+                                ` : ''}
+                            </div>
+                            <div class="col-md-6">
+                                <p class="mb-1">
+                                    <i class="bi bi-clock text-primary"></i> 
+                                    <strong>График работы:</strong> ${warehouse.working_hours}
+                                </p>
+                                <p class="mb-1">
+                                    <i class="bi bi-rulers text-primary"></i> 
+                                    <strong>Площадь:</strong> ${warehouse.available_area} м² / ${warehouse.total_area} м²
+                                </p>
+                            </div>
+                        </div>
+
+                        ${schedules.length > 0 ? `
+                            <div class="mt-3">
+                                <h6 class="mb-2"><i class="bi bi-calendar-event"></i> График приема заявок:</h6>
+                                <div class="table-responsive">
+                                    <table class="table table-sm table-bordered">
+                                        <thead>
+                                            <tr>
+                                                <th>День недели</th>
+                                                <th>Время работы</th>
+                                                <th>Крайний срок забора</th>
+                                                <th>Крайний срок доставки</th>
+                                            </tr>
+                                        </thead>
+                                        <tbody>
+                                            ${schedules.map(schedule => `
+                                                <tr>
+                                                    <td>${schedule.day_of_week}</td>
+                                                    <td>${schedule.opening_time} - ${schedule.closing_time}</td>
+                                                    <td>${schedule.pickup_cutoff_time}</td>
+                                                    <td>${schedule.delivery_cutoff_time}</td>
+                                                </tr>
+                                            `).join('')}
+                                        </tbody>
+                                    </table>
+                                </div>
+                            </div>
+                        ` : '<p class="text-warning"><i class="bi bi-exclamation-triangle"></i> График приема заявок не указан</p>'}
+                    </div>
+                `;
+            });
+        } else {
+            html = `
+                <div class="alert alert-warning">
+                    <i class="bi bi-exclamation-triangle"></i>
+                    В городе ${city.name} нет доступных складов отправки.
+                </div>
+            `;
+        }
+
+        cityContent.innerHTML = html;
+        cityInfo.classList.remove('hidden');
+        cityInfo.classList.add('fade-in');
+
+        document.querySelectorAll('.select-warehouse-btn').forEach(btn => {
+            btn.addEventListener('click', function() {
+                selectWarehouse(
+                    this.getAttribute('data-warehouse-id'),
+                    this.getAttribute('data-warehouse-name'),
+                    this.getAttribute('data-warehouse-city')
+                );
+            });
+        });
+
+        if (selectedWarehouseId) {
+            document.querySelectorAll('.warehouse-info').forEach(div => {
+                if (div.getAttribute('data-warehouse-id') == selectedWarehouseId) {
+                    div.classList.add('selected-warehouse');
+                }
+            });
+        }
+    }
+
+
+    // Функция для обновления отображения выбранного города
+    function updateCitySelectionDisplay(cityName) {
+        citySelectionDisplay.innerHTML = `
+            <div class="alert alert-success">
+                <i class="bi bi-check-circle"></i>
+                Выбран город назначения: <strong>${cityName}</strong>
+            </div>
+        `;
+    }
+
+    // Функция для выбора склада
+    function selectWarehouse(warehouseId, warehouseName, warehouseCity) {
+        selectedWarehouseId = warehouseId;
+        selectedWarehouseName = warehouseName;
+
+        // Устанавливаем значение скрытого поля
+        warehouseHidden.value = warehouseId;
+
+        // Обновляем кнопки и стили
+        document.querySelectorAll('.select-warehouse-btn').forEach(btn => {
+            const btnWarehouseId = btn.getAttribute('data-warehouse-id');
+            if (btnWarehouseId == warehouseId) {
+                btn.classList.remove('btn-outline-primary');
+                btn.classList.add('btn-primary');
+                btn.innerHTML = '<i class="bi bi-check-circle me-1"></i> Выбран';
+            } else {
+                btn.classList.remove('btn-primary');
+                btn.classList.add('btn-outline-primary');
+                btn.innerHTML = '<i class="bi bi-check-circle me-1"></i> Выбрать';
+            }
+        });
+
+        // Обновляем стили складов
+        document.querySelectorAll('.warehouse-info').forEach(div => {
+            div.classList.remove('selected-warehouse');
+            if (div.getAttribute('data-warehouse-id') == warehouseId) {
+                div.classList.add('selected-warehouse');
+            }
+        });
+
+        // Показываем сообщение
+        showAlertMessage(`Выбран склад отправки: ${warehouseName} (${warehouseCity})`, 'success');
+
+        // Обновляем отображение
+        if (warehouseSelection) {
+            warehouseSelection.innerHTML = `
+                <div class="alert alert-success">
+                    <i class="bi bi-check-circle"></i>
+                    Выбран склад отправки: <strong>${warehouseName}</strong> (${warehouseCity})
+                </div>
+            `;
+        }
+
+        // Проверяем доступность текущей выбранной даты
+        if (dateInput && dateInput.value) {
+            checkDateAvailability();
+        }
+    }
+
+    // Функция для получения CSRF токена
+    function getCSRFToken() {
+        const name = 'csrftoken';
+        let cookieValue = null;
+        if (document.cookie && document.cookie !== '') {
+            const cookies = document.cookie.split(';');
+            for (let i = 0; i < cookies.length; i++) {
+                const cookie = cookies[i].trim();
+                if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                    cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                    break;
+                }
+            }
+        }
+        return cookieValue;
+    }
+
+    // Функция для проверки доступности даты через API
+    async function checkDateAvailability() {
+        if (!selectedWarehouseId || !dateInput || !dateInput.value) {
+            return;
+        }
+
+        // Показываем индикатор проверки
+        dateAvailabilityIndicator.classList.remove('hidden');
+        dateAvailabilityIndicator.classList.remove('date-available');
+        dateAvailabilityIndicator.classList.remove('date-unavailable');
+        dateAvailabilityIndicator.classList.add('date-checking');
+        dateAvailabilityIndicator.innerHTML = '<i class="bi bi-clock"></i><span>Проверка доступности...</span>';
+
+        try {
+            // AJAX запрос к API проверки даты
+            const response = await fetch(`/warehouses/api/warehouses/${selectedWarehouseId}/check_date/`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCSRFToken()
+                },
+                body: JSON.stringify({ date: dateInput.value })
+            });
+
+            if (!response.ok) {
+                throw new Error('Ошибка сети');
+            }
+
+            const data = await response.json();
+
+            if (data.is_available) {
+                dateAvailabilityIndicator.classList.remove('date-checking');
+                dateAvailabilityIndicator.classList.add('date-available');
+                dateAvailabilityIndicator.innerHTML = '<i class="bi bi-check-circle"></i><span>День доступен</span>';
+                dateAvailabilityMessage.innerHTML = data.message || 'Дата доступна для бронирования';
+                dateAvailabilityMessage.style.color = '#198754';
+            } else {
+                dateAvailabilityIndicator.classList.remove('date-checking');
+                dateAvailabilityIndicator.classList.add('date-unavailable');
+                dateAvailabilityIndicator.innerHTML = '<i class="bi bi-x-circle"></i><span>День не доступен</span>';
+                dateAvailabilityMessage.innerHTML = data.message || 'Склад не работает в этот день';
+                dateAvailabilityMessage.style.color = '#dc3545';
+            }
+
+        } catch (error) {
+            console.error('Ошибка проверки даты:', error);
+            dateAvailabilityIndicator.classList.remove('date-checking');
+            dateAvailabilityIndicator.classList.add('date-unavailable');
+            dateAvailabilityIndicator.innerHTML = '<i class="bi bi-exclamation-triangle"></i><span>Ошибка проверки</span>';
+            dateAvailabilityMessage.innerHTML = 'Не удалось проверить доступность даты';
+            dateAvailabilityMessage.style.color = '#dc3545';
+        }
+    }
+
+    // Обработчики для кнопок выбора города
+    document.querySelectorAll('.city-btn').forEach(btn => {
+        btn.addEventListener('click', function() {
+            const cityId = this.getAttribute('data-city-id');
+
+            // Сбрасываем активные кнопки
+            document.querySelectorAll('.city-btn').forEach(b => {
+                b.classList.remove('active');
+            });
+
+            // Активируем текущую кнопку
+            this.classList.add('active');
+
+            // Сохраняем ID города
+            selectedCityId.value = cityId;
+
+            // Отображаем информацию о городе
+            displayCityInfo(cityId);
+
+            // Прокручиваем к информации
+            setTimeout(() => {
+                document.getElementById('city-info').scrollIntoView({ 
+                    behavior: 'smooth', 
+                    block: 'start' 
+                });
+            }, 300);
+        });
+    });
+
+    // Добавляем обработчик для проверки даты при изменении
+    if (dateInput) {
+        dateInput.addEventListener('change', function() {
+            if (selectedWarehouseId) {
+                checkDateAvailability();
+            } else {
+                showAlertMessage('Сначала выберите склад для проверки доступности даты', 'warning');
+            }
+        });
+    }
+
+    // Автоматически выбираем первый город при загрузке
+    const firstCityBtn = document.querySelector('.city-btn');
+    if (firstCityBtn && citiesData.length > 0) {
+        setTimeout(() => {
+            firstCityBtn.click();
+        }, 500);
+    }
+
+    // Валидация формы
+    if (form) {
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+
+            // Проверяем, выбран ли город назначения
+            if (!selectedCityIdValue) {
+                showAlertMessage('Пожалуйста, выберите город назначения', 'warning');
+                document.querySelector('.city-selection-card').scrollIntoView({ 
+                    behavior: 'smooth', 
+                    block: 'center' 
+                });
+                return false;
+            }
+
+            // Проверяем, выбран ли склад отправки
+            if (!selectedWarehouseId) {
+                showAlertMessage('Пожалуйста, выберите склад отправки', 'warning');
+                document.getElementById('city-info').scrollIntoView({ 
+                    behavior: 'smooth', 
+                    block: 'center' 
+                });
+                return false;
+            }
+
+            // Проверяем доступность даты перед отправкой
+            if (dateInput && dateInput.value) {
+                const selectedDate = new Date(dateInput.value);
+                const today = new Date();
+                today.setHours(0, 0, 0, 0);
+
+                if (selectedDate < today) {
+                    showAlertMessage('Нельзя выбрать дату в прошлом', 'warning');
+                    dateInput.focus();
+                    return false;
+                }
+
+                // Проверяем доступность даты через API перед отправкой
+                if (dateAvailabilityIndicator.classList.contains('date-unavailable')) {
+                    showAlertMessage('Выбранная дата недоступна для этого склада. Пожалуйста, выберите другую дату.', 'warning');
+                    dateInput.focus();
+                    return false;
+                }
+            }
+
+            // Проверяем обязательные поля формы Django
+            let isValid = true;
+            const requiredFields = form.querySelectorAll('[required]');
+
+            requiredFields.forEach(function(field) {
+                field.classList.remove('is-invalid');
+
+                const isCheckbox = field.type === 'checkbox';
+                const isEmpty = isCheckbox ? !field.checked : !field.value.trim();
+
+                if (isEmpty) {
+                    isValid = false;
+                    field.classList.add('is-invalid');
+
+                    // Добавляем анимацию
+                    const parentDiv = field.closest('.col-md-6, .col-md-4, .col-12');
+                    if (parentDiv) {
+                        parentDiv.style.animation = 'pulse 0.5s';
+                        setTimeout(() => {
+                            parentDiv.style.animation = '';
+                        }, 500);
+                    }
+                }
+            });
+
+            if (!isValid) {
+                showAlertMessage('Пожалуйста, заполните все обязательные поля', 'warning');
+                const firstError = form.querySelector('.is-invalid');
+                if (firstError) {
+                    firstError.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                    firstError.focus();
+                }
+                return false;
+            }
+
+            // Если все проверки пройдены, отправляем форму
+            if (submitButton) {
+                submitButton.disabled = true;
+                submitButton.innerHTML = '<i class="bi bi-hourglass-split me-2"></i> Отправка...';
+            }
+
+            // Отправляем форму
+            this.submit();
+        });
+    }
+
+    // Функция для показа сообщений
+    function showAlertMessage(message, type) {
+        // Создаем уникальный ID для уведомления
+        const notificationId = 'notification-' + Date.now();
+
+        const alertDiv = document.createElement('div');
+        alertDiv.id = notificationId;
+        alertDiv.className = `alert alert-${type} alert-dismissible fade show notification-alert`;
+        alertDiv.style.cssText = `
+            position: fixed;
+            top: 100px;
+            right: 20px;
+            z-index: 9999;
+            min-width: 300px;
+            max-width: 400px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+        `;
+        alertDiv.innerHTML = `
+            <div class="d-flex align-items-center">
+                ${type === 'success' ? 
+                    '<i class="bi bi-check-circle-fill me-2 fs-5"></i>' : 
+                    type === 'warning' ? 
+                    '<i class="bi bi-exclamation-triangle-fill me-2 fs-5"></i>' :
+                    type === 'info' ?
+                    '<i class="bi bi-info-circle-fill me-2 fs-5"></i>' :
+                    '<i class="bi bi-exclamation-circle-fill me-2 fs-5"></i>'
+                }
+                <div>${message}</div>
+            </div>
+            <button type="button" class="btn-close" onclick="document.getElementById('${notificationId}').remove()"></button>
+        `;
+
+        document.body.appendChild(alertDiv);
+
+        // Автоматическое удаление через 5 секунд
+        setTimeout(() => {
+            const element = document.getElementById(notificationId);
+            if (element) {
+                element.remove();
+            }
+        }, 5000);
+    }
+
+
+    // Автоматическое закрытие сообщений
+    setTimeout(function() {
+        const alerts = document.querySelectorAll('.alert');
+        alerts.forEach(function(alert) {
+            const bsAlert = new bootstrap.Alert(alert);
+            bsAlert.close();
+        });
+    }, 5000);
+
+    // Восстанавливаем кнопку отправки при возврате на страницу
+    window.addEventListener('pageshow', function(event) {
+        if (submitButton) {
+            submitButton.disabled = false;
+            submitButton.innerHTML = '<i class="bi bi-send-check me-2"></i> Отправить заявку';
+        }
+    });
+
+    // Инициализируем поля клиента для доставки
+    initDeliveryClientFields();
+});
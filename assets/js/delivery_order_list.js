@@ -0,0 +1,1296 @@
+// Глобальные переменные для хранения состояния
+let editingCell = null;
+let logisticsList = [];
+let currentAddressCell = null;
+let currentAddressField = null; // 'pickup_address' или 'delivery_address'
+let bulkEditModal = null;
+
+// Загружаем список логистов при загрузке страницы
+document.addEventListener('DOMContentLoaded', function() {
+    // Проверяем, является ли пользователь оператором
+    const isOperator = pageConfig.isOperator;
+    
+    if (!isOperator) {
+        // Только для не-операторов (логистов и админов) инициализируем редактирование
+        initInlineEditing();
+        initAddressModal();
+        loadLogisticsList();
+    }
+    
+    // Инициализация массового выбора
+    initBulkActions();
+});
+
+// ==================== ИНИЦИАЛИЗАЦИЯ МОДАЛЬНОГО ОКНА АДРЕСА ====================
+
+function initAddressModal() {
+    const modal = document.getElementById('addressModal');
+    
+    // Очистка при закрытии
+    modal.addEventListener('hidden.bs.modal', function() {
+        document.getElementById('citySelect').value = '';
+        document.getElementById('warehouseSelect').value = '';
+        document.getElementById('warehouseSelect').disabled = true;
+        document.getElementById('warehouseList').style.display = 'none';
+        document.getElementById('warehouseDetails').style.display = 'none';
+        document.getElementById('addressInput').value = '';
+        document.getElementById('warehouseItemsContainer').innerHTML = '';
+        currentAddressCell = null;
+        currentAddressField = null;
+    });
+    
+    // Загрузка данных при открытии
+    modal.addEventListener('show.bs.modal', function() {
+        loadCities();
+    });
+    
+    // Обработчик выбора города
+    document.getElementById('citySelect').addEventListener('change', function() {
+        const cityId = this.value;
+        if (cityId) {
+            loadWarehousesByCity(cityId);
+            document.getElementById('warehouseDetails').style.display = 'none';
+        } else {
+            document.getElementById('warehouseSelect').value = '';
+            document.getElementById('warehouseSelect').disabled = true;
+            document.getElementById('warehouseList').style.display = 'none';
+            document.getElementById('warehouseDetails').style.display = 'none';
+        }
+    });
+    
+    // Обработчик выбора склада
+    document.getElementById('warehouseSelect').addEventListener('change', function() {
+        const warehouseId = this.value;
+        if (warehouseId) {
+            loadWarehouseDetails(warehouseId);
+        } else {
+            document.getElementById('warehouseDetails').style.display = 'none';
+        }
+    });
+    
+    // Кнопка сохранения адреса
+    document.getElementById('saveAddressBtn').addEventListener('click', function() {
+        saveAddressFromModal();
+    });
+    
+    // Сохранение по Ctrl+Enter
+    document.getElementById('addressInput').addEventListener('keydown', function(e) {
+        if (e.key === 'Enter' && (e.ctrlKey || e.metaKey)) {
+            e.preventDefault();
+            saveAddressFromModal();
+        }
+    });
+}
+
+// Открытие модального окна при клике на ячейку адреса
+function openAddressModal(cell, field) {
+    currentAddressCell = cell;
+    currentAddressField = field;
+    
+    // Получаем текущий адрес из data-атрибута
+    const currentAddress = cell.getAttribute('data-original') || '';
+    
+    // Заполняем поле адреса
+    document.getElementById('addressInput').value = currentAddress;
+    
+    // Открываем модальное окно
+    const modal = new bootstrap.Modal(document.getElementById('addressModal'));
+    modal.show();
+}
+
+// Сохранение адреса из модального окна
+function saveAddressFromModal() {
+    if (!currentAddressCell || !currentAddressField) return;
+    
+    const newAddress = document.getElementById('addressInput').value.trim();
+    const warehouseSelect = document.getElementById('warehouseSelect');
+    const selectedWarehouseId = warehouseSelect.value;
+    const selectedWarehouseText = warehouseSelect.options[warehouseSelect.selectedIndex].text;
+    
+    if (!newAddress) {
+        showNotification('Пожалуйста, введите адрес', 'error');
+        return;
+    }
+    
+    const orderId = currentAddressCell.closest('tr').getAttribute('data-order-id');
+    
+    // Если выбран склад, обновляем оба поля
+    if (selectedWarehouseId) {
+        updateOrderWarehouseAndAddress(currentAddressCell, selectedWarehouseId, newAddress, selectedWarehouseText);
+    } else {
+        // Иначе обновляем только адрес
+        updateOrderAddressOnly(currentAddressCell, newAddress, orderId, currentAddressField);
+    }
+}
+
+// Обновление только адреса (без склада)
+function updateOrderAddressOnly(cell, address, orderId, field) {
+    const csrfToken = getCookie('csrftoken');
+    const url = pageConfig.urls.delivery_order_update_field.replace('0', orderId);
+    
+    fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({
+            field: field,
+            value: address
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            // Обновляем отображение в ячейке
+            updateCellDisplay(cell, field, address, data.display_value || address, 'text');
+            
+            // Закрываем модальное окно
+            const modal = bootstrap.Modal.getInstance(document.getElementById('addressModal'));
+            modal.hide();
+            
+            showNotification('Адрес успешно обновлен', 'success');
+        } else {
+            throw new Error(data.error || 'Ошибка обновления адреса');
+        }
+    })
+    .catch(error => {
+        console.error('Ошибка обновления адреса:', error);
+        showNotification('Ошибка обновления адреса: ' + error.message, 'error');
+    });
+}
+
+// Обновление склада и адреса
+function updateOrderWarehouseAndAddress(cell, warehouseId, address, warehouseText) {
+    const orderId = cell.closest('tr').getAttribute('data-order-id');
+    const field = currentAddressField;
+    
+    // Определяем поле для склада в зависимости от типа адреса
+    let warehouseField;
+    if (field === 'pickup_address') {
+        warehouseField = 'pickup_warehouse';
+    } else if (field === 'delivery_address') {
+        warehouseField = 'delivery_warehouse';
+    } else {
+        showNotification('Неизвестный тип адреса', 'error');
+        return;
+    }
+    
+    // Склад и адрес сохраняются одним запросом в одной транзакции
+    updateFields([
+        {id: orderId, field: warehouseField, value: warehouseId},
+        {id: orderId, field: field, value: address}
+    ])
+        .then((data) => {
+            if (data.success) {
+                const result = data.results.find(item => item.field === field);
+                // Обновляем отображение в ячейке
+                updateCellDisplay(cell, field, address, (result && result.display_value) || address, 'text');
+                
+                // Закрываем модальное окно
+                const modal = bootstrap.Modal.getInstance(document.getElementById('addressModal'));
+                modal.hide();
+                
+                showNotification('Адрес и склад успешно обновлены', 'success');
+            } else {
+                const error = data.errors && data.errors.length ? data.errors[0].error : data.error;
+                throw new Error(error || 'Ошибка обновления адреса');
+            }
+        })
+        .catch(error => {
+            console.error('Ошибка обновления склада и адреса:', error);
+            showNotification('Ошибка: ' + error.message, 'error');
+        });
+}
+
+// Универсальная функция обновления поля
+function updateField(orderId, field, value, url) {
+    const csrfToken = getCookie('csrftoken');
+    
+    return fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({
+            field: field,
+            value: value
+        })
+    })
+    .then(response => response.json());
+}
+
+// Пакетное обновление полей: edits = [{id, field, value}, ...]
+function updateFields(edits) {
+    const csrfToken = getCookie('csrftoken');
+    
+    return fetch(pageConfig.urls.delivery_orders_update_fields, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({edits: edits})
+    })
+    .then(response => response.json());
+}
+
+// Загрузка городов
+function loadCities() {
+    const citySelect = document.getElementById('citySelect');
+    
+    referenceFetch('cities')
+        .then(response => response.json())
+        .then(data => {
+            citySelect.innerHTML = '<option value="">Выберите город</option>';
+            data.forEach(city => {
+                const option = document.createElement('option');
+                option.value = city.id;
+                option.textContent = city.name;
+                citySelect.appendChild(option);
+            });
+        })
+        .catch(error => {
+            console.error('Ошибка загрузки городов:', error);
+            showNotification('Ошибка загрузки списка городов', 'error');
+        });
+}
+
+// Загрузка складов по городу
+function loadWarehousesByCity(cityId) {
+    const warehouseSelect = document.getElementById('warehouseSelect');
+    const warehouseItemsContainer = document.getElementById('warehouseItemsContainer');
+    
+    referenceFetch('warehouses_by_city', cityId)
+        .then(response => response.json())
+        .then(data => {
+            // Обновляем выпадающий список
+            warehouseSelect.innerHTML = '<option value="">Выберите склад</option>';
+            data.forEach(warehouse => {
+                const option = document.createElement('option');
+                option.value = warehouse.id;
+                option.textContent = warehouse.name;
+                warehouseSelect.appendChild(option);
+            });
+            warehouseSelect.disabled = false;
+            
+            // Обновляем список складов
+            warehouseItemsContainer.innerHTML = '';
+            data.forEach(warehouse => {
+                const warehouseItem = document.createElement('div');
+                warehouseItem.className = 'warehouse-item';
+                warehouseItem.setAttribute('data-warehouse-id', warehouse.id);
+                warehouseItem.innerHTML = `
+                    <div class="warehouse-name">${warehouse.name}</div>
+                    <div class="warehouse-address">${warehouse.address || 'Адрес не указан'}</div>
+                `;
+                
+                warehouseItem.addEventListener('click', function() {
+                    // Снимаем выделение со всех элементов
+                    document.querySelectorAll('.warehouse-item').forEach(item => {
+                        item.classList.remove('selected');
+                    });
+                    
+                    // Выделяем текущий элемент
+                    this.classList.add('selected');
+                    
+                    // Устанавливаем значение в выпадающем списке
+                    warehouseSelect.value = warehouse.id;
+                    
+                    // Загружаем детали склада
+                    loadWarehouseDetails(warehouse.id);
+                });
+                
+                warehouseItemsContainer.appendChild(warehouseItem);
+            });
+            
+            document.getElementById('warehouseList').style.display = 'block';
+        })
+        .catch(error => {
+            console.error('Ошибка загрузки складов:', error);
+            showNotification('Ошибка загрузки списка складов', 'error');
+        });
+}
+
+// Загрузка деталей склада
+function loadWarehouseDetails(warehouseId) {
+    referenceFetch('warehouse_details', warehouseId)
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                console.error('Ошибка загрузки деталей склада:', data.error);
+                return;
+            }
+            
+            document.getElementById('warehouseName').textContent = data.name;
+            document.getElementById('warehouseAddress').textContent = data.address;
+            document.getElementById('warehousePhone').textContent = data.phone;
+            document.getElementById('warehouseEmail').textContent = data.email || 'Не указан';
+            document.getElementById('warehouseHours').textContent = data.working_hours;
+            document.getElementById('warehouseArea').textContent = data.available_area;
+            
+            document.getElementById('warehouseDetails').style.display = 'block';
+            
+            // АВТОМАТИЧЕСКОЕ ЗАПОЛНЕНИЕ АДРЕСА
+            if (data.address && data.address !== '-') {
+                document.getElementById('addressInput').value = data.address;
+            }
+        })
+        .catch(error => {
+            console.error('Ошибка загрузки деталей склада:', error);
+        });
+}
+
+// ==================== ИНИЦИАЛИЗАЦИЯ ИНЛАЙН-РЕДАКТИРОВАНИЯ ====================
+
+function initInlineEditing(root = document) {
+    const editableCells = root.querySelectorAll('.editable-cell');
+    
+    editableCells.forEach(cell => {
+        cell.addEventListener('click', function(e) {
+            // Если уже в режиме редактирования, выходим
+            if (this.classList.contains('editing')) return;
+            
+            // Если кликнули на кнопку сохранения или отмены
+            if (e.target.classList.contains('save-btn') || e.target.classList.contains('cancel-btn')) return;
+            
+            // Если это статус и кликнули на badge
+            if (e.target.classList.contains('status-badge-editable')) {
+                startEditing(this);
+                return;
+            }
+            
+            // Если это ячейка адреса - открываем модальное окно
+            const field = this.getAttribute('data-field');
+            if (field === 'pickup_address' || field === 'delivery_address') {
+                openAddressModal(this, field);
+                return;
+            }
+            
+            // Для остальных ячеек - двойной клик
+            if (e.detail === 2) {
+                startEditing(this);
+            }
+        });
+    });
+}
+
+// Загрузка списка логистов
+function loadLogisticsList() {
+    referenceFetch('logistics')
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return response.json();
+    })
+    .then(data => {
+        logisticsList = data;
+        console.log('Логисты загружены:', logisticsList.length);
+    })
+    .catch(error => {
+        console.error('Ошибка загрузки логистов:', error);
+        // Запасной вариант: статический список
+        logisticsList = [
+            {id: '', name: 'Не назначен'}
+        ];
+    });
+}
+
+function startEditing(cell) {
+    // Если уже редактируем другую ячейку, сохраняем ее
+    if (editingCell && editingCell !== cell) {
+        saveCell(editingCell.querySelector('.save-btn'));
+    }
+    
+    const field = cell.getAttribute('data-field');
+    const originalValue = cell.getAttribute('data-original') || '';
+    const type = cell.getAttribute('data-type') || 'text';
+    const isStatusCell = field === 'status';
+    
+    // Сохраняем оригинальное содержимое
+    cell.setAttribute('data-original-content', cell.innerHTML);
+    cell.classList.add('editing');
+    editingCell = cell;
+    
+    let inputElement;
+    
+    if (type === 'select' || isStatusCell) {
+        inputElement = document.createElement('select');
+        inputElement.className = 'editable-select';
+        
+        // Опции для статусов
+        let options = [];
+        if (field === 'status') {
+            options = [
+                {value: 'submitted', text: 'Подана'},
+                {value: 'driver_assigned', text: 'Водитель назначен'},
+                {value: 'on_the_way', text: 'В пути'},
+                {value: 'shipped', text: 'Отправлено'}
+            ];
+        } else {
+            options = [{value: originalValue, text: originalValue}];
+        }
+        
+        options.forEach(opt => {
+            const option = document.createElement('option');
+            option.value = opt.value;
+            option.textContent = opt.text;
+            if (opt.value.toString() === originalValue.toString()) {
+                option.selected = true;
+            }
+            inputElement.appendChild(option);
+        });
+    } else if (type === 'date') {
+        inputElement = document.createElement('input');
+        inputElement.type = 'date';
+        inputElement.className = 'editable-date';
+        inputElement.value = originalValue;
+    } else if (type === 'time') {
+        inputElement = document.createElement('input');
+        inputElement.type = 'time';
+        inputElement.className = 'editable-input';
+        inputElement.value = originalValue;
+    } else if (type === 'number') {
+        inputElement = document.createElement('input');
+        inputElement.type = 'number';
+        inputElement.className = 'editable-input';
+        inputElement.value = originalValue;
+        inputElement.min = field === 'quantity' ? '1' : '0';
+        inputElement.step = field === 'weight' || field === 'volume' ? '0.01' : '1';
+    } else {
+        inputElement = document.createElement('input');
+        inputElement.type = 'text';
+        inputElement.className = 'editable-input';
+        inputElement.value = originalValue;
+    }
+    
+    // Создаем контейнер для input
+    const inputContainer = document.createElement('div');
+    inputContainer.className = 'inline-input-container';
+    inputContainer.appendChild(inputElement);
+    
+    // Очищаем ячейку и добавляем input
+    cell.innerHTML = '';
+    cell.appendChild(inputContainer);
+    
+    // Фокус на поле ввода
+    inputElement.focus();
+    
+    // Обработка нажатия Enter и Escape
+    inputElement.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter' && !e.shiftKey) {
+            saveCell(cell);
+        } else if (e.key === 'Escape') {
+            cancelEditing(cell);
+        }
+    });
+    
+    // Сохранение при потере фокуса
+    inputElement.addEventListener('blur', function() {
+        setTimeout(() => {
+            if (!cell.contains(document.activeElement)) {
+                saveCell(cell);
+            }
+        }, 100);
+    });
+}
+
+function startEditStatus(statusBadge) {
+    const cell = statusBadge.closest('.editable-cell');
+    startEditing(cell);
+}
+
+function saveCell(cell) {
+    // Если cell - это кнопка, находим родительскую ячейку
+    if (cell.tagName === 'BUTTON') {
+        cell = cell.parentElement;
+    }
+    
+    const inputElement = cell.querySelector('input, select, textarea');
+    if (!inputElement) return;
+    
+    const newValue = inputElement.value;
+    const field = cell.getAttribute('data-field');
+    const orderId = cell.closest('tr').getAttribute('data-order-id');
+    const type = cell.getAttribute('data-type') || 'text';
+    
+    // Валидация
+    if (field === 'quantity' && (!newValue || parseInt(newValue) < 1)) {
+        showNotification('Количество мест должно быть не менее 1', 'error');
+        return;
+    }
+    
+    if ((field === 'weight' || field === 'volume') && parseFloat(newValue) < 0) {
+        showNotification('Значение должно быть положительным', 'error');
+        return;
+    }
+    
+    // Для адресов: проверка на пустоту
+    if ((field === 'pickup_address' || field === 'delivery_address') && newValue.trim() === '') {
+        showNotification('Адрес не может быть пустым', 'error');
+        return;
+    }
+    
+    // Отправка на сервер
+    saveToServer(orderId, field, newValue, cell, type);
+}
+
+function saveToServer(orderId, field, value, cell, type) {
+    const url = pageConfig.urls.delivery_order_update_field.replace('0', orderId);
+    const csrfToken = getCookie('csrftoken');
+    
+    // Показываем индикатор загрузки
+    cell.classList.add('loading');
+    
+    fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({
+            field: field,
+            value: value
+        })
+    })
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return response.json();
+    })
+    .then(data => {
+        cell.classList.remove('loading');
+        
+        if (data.success) {
+            updateCellDisplay(cell, field, value, data.display_value, type);
+            showNotification('Изменения сохранены', 'success');
+            editingCell = null;
+        } else {
+            showNotification('Ошибка: ' + data.error, 'error');
+            cancelEditing(cell);
+        }
+    })
+    .catch(error => {
+        cell.classList.remove('loading');
+        console.error('Error:', error);
+        showNotification('Ошибка сети при сохранении: ' + error.message, 'error');
+        cancelEditing(cell);
+    });
+}
+
+function updateCellDisplay(cell, field, value, displayValue, type) {
+    cell.classList.remove('editing');
+    
+    if (field === 'status') {
+        // Обновляем badge статуса
+        const statusClass = `status-${value}`;
+        
+        cell.innerHTML = `
+            <span class="status-badge-editable ${statusClass}" onclick="startEditStatus(this)">
+                ${displayValue || value}
+            </span>
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    } else if (field === 'delivery_date') {
+        // Форматируем дату для отображения
+        let displayText = '-';
+        if (value) {
+            const date = new Date(value);
+            if (!isNaN(date)) {
+                const day = date.getDate().toString().padStart(2, '0');
+                const month = (date.getMonth() + 1).toString().padStart(2, '0');
+                const year = date.getFullYear();
+                displayText = `${day}.${month}.${year}`;
+            }
+        }
+        cell.innerHTML = `
+            ${displayText}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    } else if (field === 'pickup_address' || field === 'delivery_address') {
+        // Для адресов используем специальную структуру с подсказкой
+        let addressText = value || '';
+        let displayText = addressText;
+        let titleText = addressText;
+        
+        if (!addressText || addressText.trim() === '') {
+            displayText = "Не указан";
+            titleText = "Не указан";
+        } else if (addressText.length > 30) {
+            displayText = addressText.substring(0, 30) + '...';
+            titleText = addressText;
+        }
+        
+        cell.innerHTML = `
+            <div class="address-text" title="${titleText}">${displayText}</div>
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', addressText);
+    } else if (field === 'driver_name') {
+        // Для имени водителя
+        if (!value || value.trim() === '') {
+            cell.innerHTML = `
+                <span class="text-muted">Не назначен</span>
+                <button class="save-btn" onclick="saveCell(this)">✓</button>
+                <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+            `;
+        } else {
+            cell.innerHTML = `
+                ${value}
+                <button class="save-btn" onclick="saveCell(this)">✓</button>
+                <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+            `;
+        }
+        cell.setAttribute('data-original', value);
+    } else if (field === 'driver_phone') {
+        // Для телефона водителя
+        cell.innerHTML = `
+            ${value}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    } else if (field === 'weight' || field === 'volume') {
+        // Для веса и объема
+        cell.innerHTML = `
+            ${value}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    } else if (field === 'quantity') {
+        // Для количества мест
+        cell.innerHTML = `
+            ${value}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    } else {
+        // Для всех остальных полей
+        cell.innerHTML = `
+            ${value}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    }
+}
+
+function cancelEditing(cell) {
+    const originalContent = cell.getAttribute('data-original-content');
+    if (originalContent) {
+        cell.innerHTML = originalContent;
+    }
+    cell.classList.remove('editing');
+    editingCell = null;
+}
+
+function showNotification(message, type) {
+    // Удаляем старые уведомления
+    const oldNotifications = document.querySelectorAll('.notification-alert');
+    oldNotifications.forEach(alert => {
+        const bsAlert = new bootstrap.Alert(alert);
+        bsAlert.close();
+    });
+    
+    // Создаем новое уведомление
+    const alert = document.createElement('div');
+    alert.className = `alert alert-${type === 'success' ? 'success' : 'danger'} alert-dismissible fade show notification-alert`;
+    alert.style.cssText = `
+        position: fixed;
+        top: 100px;
+        right: 20px;
+        z-index: 9999;
+        min-width: 300px;
+        max-width: 400px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+    `;
+    alert.innerHTML = `
+        <div class="d-flex align-items-center">
+            ${type === 'success' ? 
+                '<i class="bi bi-check-circle-fill me-2 fs-5"></i>' : 
+                '<i class="bi bi-exclamation-circle-fill me-2 fs-5"></i>'
+            }
+            <div>${message}</div>
+        </div>
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+    
+    // Вставляем в body
+    document.body.appendChild(alert);
+    
+    // Автоматически скрываем через 3 секунды
+    setTimeout(() => {
+        if (alert.parentNode) {
+            const bsAlert = new bootstrap.Alert(alert);
+            bsAlert.close();
+        }
+    }, 3000);
+}
+
+// Функция для получения CSRF токена
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// ==================== ИНИЦИАЛИЗАЦИЯ МАССОВЫХ ДЕЙСТВИЙ ====================
+
+function initBulkActions() {
+    const selectAllCheckbox = document.getElementById('selectAllCheckbox');
+    const selectAllBtn = document.getElementById('selectAllBtn');
+    const deselectAllBtn = document.getElementById('deselectAllBtn');
+    const exportPdfBtn = document.getElementById('exportPdfBtn');
+    const exportListPdfBtn = document.getElementById('exportListPdfBtn');
+    const selectedCount = document.getElementById('selectedCount');
+    // Строки таблицы перерисовываются, поэтому чекбоксы ищутся при каждом действии
+    const orderCheckboxes = () => document.querySelectorAll('.order-checkbox');
+    const bulkActionsForm = document.getElementById('bulkActionsForm');
+    const listPdfForm = document.getElementById('listPdfForm');
+    const exportLabelsBtn = document.getElementById('exportLabelsBtn');
+    const labelsForm = document.getElementById('labelsForm');
+    
+    if (!selectAllCheckbox) return;
+    
+    function updateSelectedCount() {
+        const selected = document.querySelectorAll('.order-checkbox:checked');
+        if (selectedCount) {
+            selectedCount.textContent = `Выбрано: ${selected.length}`;
+        }
+        if (exportPdfBtn) {
+            exportPdfBtn.disabled = selected.length === 0;
+        }
+        if (exportListPdfBtn) {
+            exportListPdfBtn.disabled = selected.length === 0;
+        }
+        if (exportLabelsBtn) {
+            exportLabelsBtn.disabled = selected.length === 0;
+        }
+        updateBulkEditButton();
+    }
+    
+    if (selectAllCheckbox) {
+        selectAllCheckbox.addEventListener('change', function() {
+            orderCheckboxes().forEach(checkbox => {
+                checkbox.checked = this.checked;
+            });
+            updateSelectedCount();
+        });
+    }
+    
+    if (selectAllBtn) {
+        selectAllBtn.addEventListener('click', function() {
+            orderCheckboxes().forEach(checkbox => {
+                checkbox.checked = true;
+            });
+            if (selectAllCheckbox) selectAllCheckbox.checked = true;
+            updateSelectedCount();
+        });
+    }
+    
+    if (deselectAllBtn) {
+        deselectAllBtn.addEventListener('click', function() {
+            orderCheckboxes().forEach(checkbox => {
+                checkbox.checked = false;
+            });
+            if (selectAllCheckbox) selectAllCheckbox.checked = false;
+            updateSelectedCount();
+        });
+    }
+    
+    document.addEventListener('change', function(e) {
+        if (e.target.classList.contains('order-checkbox')) {
+            updateSelectedCount();
+        }
+    });
+    
+    // Новая страница таблицы - выбор сбрасывается
+    document.addEventListener('grid:rendered', function() {
+        if (selectAllCheckbox) selectAllCheckbox.checked = false;
+        updateSelectedCount();
+    });
+    
+    if (bulkActionsForm) {
+        bulkActionsForm.addEventListener('submit', function(e) {
+            const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+            if (selectedCheckboxes.length === 0) {
+                e.preventDefault();
+                alert('Пожалуйста, выберите хотя бы одну заявку');
+                return;
+            }
+            
+            const oldInputs = this.querySelectorAll('input[name="order_ids"]');
+            oldInputs.forEach(input => input.remove());
+            
+            selectedCheckboxes.forEach(checkbox => {
+                const hiddenInput = document.createElement('input');
+                hiddenInput.type = 'hidden';
+                hiddenInput.name = 'order_ids';
+                hiddenInput.value = checkbox.value;
+                this.appendChild(hiddenInput);
+            });
+        });
+    }
+    
+    // Обработчик для кнопки "Список в PDF"
+    if (exportListPdfBtn && listPdfForm) {
+        exportListPdfBtn.addEventListener('click', function() {
+            const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+            if (selectedCheckboxes.length === 0) {
+                alert('Пожалуйста, выберите хотя бы одну заявку');
+                return;
+            }
+            
+            // Очищаем старые поля
+            const oldInputs = listPdfForm.querySelectorAll('input[name="order_ids"]');
+            oldInputs.forEach(input => input.remove());
+            
+            // Добавляем новые поля с выбранными заявками
+            selectedCheckboxes.forEach(checkbox => {
+                const hiddenInput = document.createElement('input');
+                hiddenInput.type = 'hidden';
+                hiddenInput.name = 'order_ids';
+                hiddenInput.value = checkbox.value;
+                listPdfForm.appendChild(hiddenInput);
+            });
+            
+            // Отправляем форму
+            listPdfForm.submit();
+        });
+    }
+    
+    // Обработчик для кнопки "QR-этикетки"
+    if (exportLabelsBtn && labelsForm) {
+        exportLabelsBtn.addEventListener('click', function() {
+            const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+            if (selectedCheckboxes.length === 0) {
+                alert('Пожалуйста, выберите хотя бы одну заявку');
+                return;
+            }
+            
+            const oldInputs = labelsForm.querySelectorAll('input[name="order_ids"]');
+            oldInputs.forEach(input => input.remove());
+            
+            selectedCheckboxes.forEach(checkbox => {
+                const hiddenInput = document.createElement('input');
+                hiddenInput.type = 'hidden';
+                hiddenInput.name = 'order_ids';
+                hiddenInput.value = checkbox.value;
+                labelsForm.appendChild(hiddenInput);
+            });
+            
+            labelsForm.submit();
+        });
+    }
+    
+    updateSelectedCount();
+    initBulkEditing();
+}
+
+// ==================== МАССОВОЕ РЕДАКТИРОВАНИЕ ====================
+
+function updateBulkEditButton() {
+    const bulkEditBtn = document.getElementById('bulkEditBtn');
+    if (!bulkEditBtn) return;
+    
+    const selected = document.querySelectorAll('.order-checkbox:checked');
+    bulkEditBtn.disabled = selected.length === 0;
+}
+
+function initBulkEditing() {
+    const bulkEditBtn = document.getElementById('bulkEditBtn');
+    if (!bulkEditBtn) return;
+    
+    bulkEditBtn.addEventListener('click', function() {
+        const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+        if (selectedCheckboxes.length === 0) {
+            alert('Пожалуйста, выберите заявки для редактирования');
+            return;
+        }
+        
+        // Обновляем счетчик выбранных заявок (с проверкой на существование элемента)
+        const selectedOrdersCountEl = document.getElementById('selectedOrdersCount');
+        if (selectedOrdersCountEl) {
+            selectedOrdersCountEl.textContent = selectedCheckboxes.length;
+        }
+        
+        // Сбрасываем форму
+        const bulkEditField = document.getElementById('bulkEditField');
+        const bulkEditValueContainer = document.getElementById('bulkEditValueContainer');
+        
+        if (bulkEditField) bulkEditField.value = '';
+        if (bulkEditValueContainer) bulkEditValueContainer.innerHTML = '';
+        
+        // Показываем модальное окно
+        const bulkEditModalEl = document.getElementById('bulkEditModal');
+        if (bulkEditModalEl) {
+            bulkEditModal = new bootstrap.Modal(bulkEditModalEl);
+            bulkEditModal.show();
+        } else {
+            console.error('Модальное окно массового редактирования не найдено');
+        }
+    });
+    
+    // Обработчик изменения поля
+    const bulkEditFieldEl = document.getElementById('bulkEditField');
+    if (bulkEditFieldEl) {
+        bulkEditFieldEl.addEventListener('change', function() {
+            const field = this.value;
+            const container = document.getElementById('bulkEditValueContainer');
+            if (!container) return;
+            
+            container.innerHTML = '';
+            
+            if (!field) return;
+            
+            let inputHtml = '';
+            
+            switch(field) {
+                case 'status':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Новый статус</label>
+                        <select class="form-select" id="bulkEditValue">
+                            <option value="">Выберите статус</option>
+                            <option value="submitted">Подана</option>
+                            <option value="driver_assigned">Водитель назначен</option>
+                            <option value="on_the_way">В пути</option>
+                            <option value="shipped">Отправлено</option>
+                        </select>
+                    `;
+                    break;
+
+                    
+                case 'driver_name':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Имя водителя</label>
+                        <input type="text" class="form-control" id="bulkEditValue" placeholder="Введите ФИО водителя">
+                    `;
+                    break;
+                    
+                case 'driver_phone':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Телефон водителя</label>
+                        <input type="text" class="form-control" id="bulkEditValue" placeholder="+7 (XXX) XXX-XX-XX">
+                    `;
+                    break;
+                    
+                case 'vehicle':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Транспортное средство</label>
+                        <input type="text" class="form-control" id="bulkEditValue" placeholder="Марка и номер ТС">
+                    `;
+                    break;
+                    
+                case 'delivery_date':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Дата доставки</label>
+                        <input type="date" class="form-control" id="bulkEditValue">
+                    `;
+                    break;
+                    
+                case 'logistic':
+                    // Загружаем логистов для выбора
+                    loadLogisticsForBulk();
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Логист</label>
+                        <select class="form-select" id="bulkEditValue">
+                            <option value="">Загрузка логистов...</option>
+                        </select>
+                    `;
+                    break;
+                    
+                case 'quantity':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Количество мест</label>
+                        <input type="number" class="form-control" id="bulkEditValue" min="1" placeholder="Введите число">
+                    `;
+                    break;
+                    
+                case 'weight':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Вес (кг)</label>
+                        <input type="number" class="form-control" id="bulkEditValue" min="0" step="0.01" placeholder="Введите вес">
+                    `;
+                    break;
+                    
+                case 'volume':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Объем (м³)</label>
+                        <input type="number" class="form-control" id="bulkEditValue" min="0" step="0.01" placeholder="Введите объем">
+                    `;
+                    break;
+            }
+            
+            container.innerHTML = inputHtml;
+        });
+    }
+    
+    // Кнопка сохранения изменений
+    const bulkEditSaveBtn = document.getElementById('bulkEditSaveBtn');
+    if (bulkEditSaveBtn) {
+        bulkEditSaveBtn.addEventListener('click', saveBulkChanges);
+    }
+}
+
+// Загрузка логистов для выпадающего списка
+function loadLogisticsForBulk() {
+    referenceFetch('logistics')
+    .then(response => response.json())
+    .then(data => {
+        const select = document.getElementById('bulkEditValue');
+        if (select) {
+            select.innerHTML = '<option value="">Выберите логиста</option>';
+            data.forEach(logistic => {
+                const option = document.createElement('option');
+                option.value = logistic.id;
+                option.textContent = logistic.full_name || logistic.username;
+                select.appendChild(option);
+            });
+        }
+    })
+    .catch(error => {
+        console.error('Ошибка загрузки логистов:', error);
+        const select = document.getElementById('bulkEditValue');
+        if (select) {
+            select.innerHTML = '<option value="">Ошибка загрузки</option>';
+        }
+    });
+}
+
+// Сохранение массовых изменений
+function saveBulkChanges() {
+    const field = document.getElementById('bulkEditField');
+    const valueInput = document.getElementById('bulkEditValue');
+    
+    if (!field || !valueInput) {
+        showNotification('Ошибка: элементы формы не найдены', 'error');
+        return;
+    }
+    
+    const fieldValue = field.value;
+    const value = valueInput.value;
+    
+    if (!fieldValue) {
+        showNotification('Выберите поле для редактирования', 'error');
+        return;
+    }
+    
+    if (value === '') {
+        showNotification('Введите значение для поля', 'error');
+        return;
+    }
+    
+    // Собираем ID выбранных заявок
+    const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+    const orderIds = Array.from(selectedCheckboxes).map(cb => cb.value);
+    
+    if (orderIds.length === 0) {
+        showNotification('Не выбраны заявки для редактирования', 'error');
+        return;
+    }
+    
+    // Показываем индикатор загрузки
+    const saveBtn = document.getElementById('bulkEditSaveBtn');
+    const originalText = saveBtn.innerHTML;
+    saveBtn.innerHTML = '<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Сохранение...';
+    saveBtn.disabled = true;
+    
+    // Отправка запроса на сервер
+    const csrfToken = getCookie('csrftoken');
+    const url = pageConfig.urls.delivery_orders_bulk_update;
+    
+    fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({
+            order_ids: orderIds,
+            field: fieldValue,
+            value: value
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        saveBtn.innerHTML = originalText;
+        saveBtn.disabled = false;
+        
+        if (data.success) {
+            showNotification(`Успешно обновлено ${data.updated_count} из ${data.total_count} заявок`, 'success');
+            
+            // Закрываем модальное окно
+            if (bulkEditModal) {
+                bulkEditModal.hide();
+            }
+            
+            // Обновляем страницу через 1.5 секунды, чтобы увидеть изменения
+            setTimeout(() => {
+                location.reload();
+            }, 1500);
+            
+        } else {
+            showNotification('Ошибка: ' + data.error, 'error');
+        }
+    })
+    .catch(error => {
+        saveBtn.innerHTML = originalText;
+        saveBtn.disabled = false;
+        console.error('Ошибка при массовом обновлении:', error);
+        showNotification('Ошибка сети: ' + error.message, 'error');
+    });
+}
+
+// ==================== ТАБЛИЦА ЗАЯВОК ====================
+
+// Операторам ячейки показываются без редактирования
+function disableEditing(root = document) {
+    const editableCells = root.querySelectorAll('.editable-cell');
+    editableCells.forEach(cell => {
+        cell.style.cursor = 'default';
+        cell.style.transition = 'none';
+        
+        cell.onclick = null;
+        cell.ondblclick = null;
+        cell.onmouseenter = null;
+        cell.onmouseleave = null;
+        
+        cell.classList.remove('editable-cell');
+        
+        const saveBtn = cell.querySelector('.save-btn');
+        const cancelBtn = cell.querySelector('.cancel-btn');
+        if (saveBtn) saveBtn.style.display = 'none';
+        if (cancelBtn) cancelBtn.style.display = 'none';
+    });
+    
+    const statusBadges = root.querySelectorAll('.status-badge-editable');
+    statusBadges.forEach(badge => {
+        badge.style.cursor = 'default';
+        badge.onclick = null;
+        badge.style.pointerEvents = 'none';
+    });
+}
+
+const CELL_BUTTONS = `
+                    <button class="save-btn" onclick="saveCell(this)">✓</button>
+                    <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>`;
+
+function renderAddressCell(field, address) {
+    const esc = OrderGrid.escape;
+    return `
+                <td class="editable-cell address-cell" data-field="${field}" data-original="${esc(address)}">
+                    <div class="address-text" title="${esc(address || 'Не указан')}">
+                        ${esc(OrderGrid.truncate(address || 'Не указан', 30))}
+                    </div>${CELL_BUTTONS}
+                </td>`;
+}
+
+// Строка таблицы из данных api/orders/ - та же разметка, что в шаблоне
+function renderDeliveryRow(order) {
+    const esc = OrderGrid.escape;
+    const urls = pageConfig.urls;
+    const driverName = order.driver_name
+        ? esc(order.driver_name)
+        : '<span class="text-muted">Не назначен</span>';
+    const driverPhone = order.driver_phone ? `
+                        <small class="editable-cell" data-field="driver_phone" data-original="${esc(order.driver_phone)}" style="color: #666; font-size: 15px;">
+                            ${esc(order.driver_phone)}${CELL_BUTTONS}
+                        </small>` : '';
+    
+    return `
+            <tr data-order-id="${order.id}">
+                <td>
+                    <input type="checkbox" name="order_ids" value="${order.id}" 
+                           class="form-check-input order-checkbox">
+                </td>
+                <td class="editable-cell" data-field="delivery_date" data-original="${esc(order.delivery_date)}" data-type="date">
+                    ${OrderGrid.formatDate(order.delivery_date)}${CELL_BUTTONS}
+                </td>${renderAddressCell('pickup_address', order.pickup_address)}${renderAddressCell('delivery_address', order.delivery_address)}
+                <td class="editable-cell" data-field="quantity" data-original="${order.quantity}" data-type="number">
+                    ${order.quantity}${CELL_BUTTONS}
+                </td>
+                <td>
+                    <div class="d-flex align-items-center gap-2 weight-volume-cell">
+                        <span class="editable-cell" data-field="weight" data-original="${OrderGrid.number(order.weight)}" data-type="number" style="flex: 1;">
+                            ${OrderGrid.number(order.weight)}${CELL_BUTTONS}
+                        </span>
+                        <span>кг /</span>
+                        <span class="editable-cell" data-field="volume" data-original="${OrderGrid.number(order.volume)}" data-type="number" style="flex: 1;">
+                            ${OrderGrid.number(order.volume)}${CELL_BUTTONS}
+                        </span>
+                        <span>м³</span>
+                    </div>
+                </td>
+                <td class="editable-cell" data-field="status" data-original="${esc(order.status)}" data-type="select">
+                    <span class="status-badge-editable status-${esc(order.status)}" onclick="startEditStatus(this)">
+                        ${esc(order.status_display)}
+                    </span>${CELL_BUTTONS}
+                </td>
+                <td>
+                    <div class="driver-info-container">
+                        <span class="editable-cell" data-field="driver_name" data-original="${esc(order.driver_name)}">
+                            ${driverName}${CELL_BUTTONS}
+                        </span>${driverPhone}
+                    </div>
+                </td>
+                <td>
+                    <div class="btn-group btn-group-sm">
+                        <a href="${OrderGrid.url(urls.delivery_order_detail, order.id)}" class="btn">Просмотр</a>
+                        <a href="${OrderGrid.url(urls.delivery_order_update, order.id)}" class="btn">Назначить</a>
+                        <a href="${OrderGrid.url(urls.delivery_order_pdf, order.id)}" class="btn">
+                            <i class="bi bi-file-pdf"></i>
+                        </a>
+                    </div>
+                </td>
+            </tr>`;
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    new OrderGrid({
+        url: pageConfig.urls.delivery_orders_data,
+        table: document.getElementById('ordersTable'),
+        pagination: document.getElementById('gridPagination'),
+        filterForm: document.getElementById('filterForm'),
+        renderRow: renderDeliveryRow,
+        state: pageConfig.grid,
+    });
+    
+    if (pageConfig.isOperator) {
+        disableEditing();
+    }
+});
+
+// Новые строки таблицы получают те же обработчики, что и строки шаблона
+document.addEventListener('grid:rendered', function(e) {
+    editingCell = null;
+    if (pageConfig.isOperator) {
+        disableEditing(e.detail);
+    } else {
+        initInlineEditing(e.detail);
+    }
+});
+
+// Глобальные функции для использования в onclick
+window.saveCell = saveCell;
+window.cancelEditing = cancelEditing;
+window.startEditStatus = startEditStatus;
+window.openAddressModal = openAddressModal;
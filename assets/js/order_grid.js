@@ -0,0 +1,203 @@
+// Таблица списка заявок без перезагрузки страницы.
+// Первая страница приходит готовой из шаблона, дальше фильтры, сортировка и
+// листание запрашивают api/orders/: ответ - имена колонок и строки массивами
+// значений, строки заменяются в <tbody> на месте. Листание идет курсором:
+// сервер отдает курсор следующей страницы, курсоры пройденных страниц
+// хранятся для кнопки "Назад".
+// После отрисовки на document отправляется событие 'grid:rendered' с <tbody>
+// в detail - по нему страница заново подключает редактирование ячеек.
+
+class OrderGrid {
+    constructor(options) {
+        this.url = options.url;
+        this.table = options.table;
+        this.tbody = options.table.querySelector('tbody');
+        this.pagination = options.pagination;
+        this.filterForm = options.filterForm;
+        this.renderRow = options.renderRow;
+        this.emptyText = options.emptyText || 'Нет заявок по заданным фильтрам';
+
+        const state = options.state || {};
+        this.sort = state.sort;
+        this.order = state.order || 'desc';
+        this.page = state.page || 1;
+        this.nextCursor = state.nextCursor || null;
+        // Курсор текущей страницы: null - первая, undefined - страница из шаблона
+        this.cursor = this.page === 1 ? null : undefined;
+        this.previous = [];
+        this.loading = false;
+
+        this.filters = new URLSearchParams(window.location.search);
+        ['page', 'sort', 'order', 'cursor'].forEach(name => this.filters.delete(name));
+
+        this.bind();
+    }
+
+    bind() {
+        this.table.querySelectorAll('.sortable-header').forEach(header => {
+            header.addEventListener('click', () => this.sortBy(header.getAttribute('data-sort')));
+        });
+
+        if (this.filterForm) {
+            this.filterForm.addEventListener('submit', e => {
+                e.preventDefault();
+                this.filters = new URLSearchParams();
+                new FormData(this.filterForm).forEach((value, name) => {
+                    if (value !== '') this.filters.append(name, value);
+                });
+                this.reload();
+            });
+        }
+
+        if (this.pagination) {
+            this.pagination.addEventListener('click', e => {
+                const link = e.target.closest('[data-grid-nav]');
+                if (!link) return;
+                const direction = link.getAttribute('data-grid-nav');
+                if (direction === 'next' && this.nextCursor) {
+                    e.preventDefault();
+                    this.previous.push(this.cursor);
+                    this.page += 1;
+                    this.load(this.nextCursor);
+                } else if (direction === 'prev' && this.previous.length) {
+                    e.preventDefault();
+                    const cursor = this.previous.pop();
+                    if (cursor === undefined) {
+                        // Курсора страницы из шаблона нет - берем ее с сервера заново
+                        window.location.reload();
+                        return;
+                    }
+                    this.page -= 1;
+                    this.load(cursor);
+                }
+                // Иначе - обычный переход по ссылке шаблона на предыдущую страницу
+            });
+        }
+    }
+
+    sortBy(field) {
+        if (this.sort === field) {
+            this.order = this.order === 'asc' ? 'desc' : 'asc';
+        } else {
+            this.sort = field;
+            this.order = 'asc';
+        }
+        this.table.querySelectorAll('.sortable-header').forEach(header => {
+            header.classList.remove('sorted-asc', 'sorted-desc');
+            if (header.getAttribute('data-sort') === this.sort) {
+                header.classList.add(`sorted-${this.order}`);
+            }
+        });
+        this.reload();
+    }
+
+    // Первая страница с текущими фильтрами и сортировкой
+    reload() {
+        this.previous = [];
+        this.page = 1;
+        const params = new URLSearchParams(this.filters);
+        params.set('sort', this.sort);
+        params.set('order', this.order);
+        // Адрес страницы повторяет состояние таблицы - обновление и ссылка откроют то же
+        window.history.replaceState(null, '', `${window.location.pathname}?${params}`);
+        this.load(null);
+    }
+
+    load(cursor) {
+        if (this.loading) return;
+        this.loading = true;
+        this.table.classList.add('grid-loading');
+
+        const params = new URLSearchParams(this.filters);
+        params.set('sort', this.sort);
+        params.set('order', this.order);
+        if (cursor) params.set('cursor', cursor);
+
+        fetch(`${this.url}?${params}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                this.cursor = cursor;
+                this.nextCursor = data.next_cursor;
+                this.render(data.fields, data.rows);
+            })
+            .catch(error => {
+                console.error('Ошибка загрузки заявок:', error);
+                if (typeof showNotification === 'function') {
+                    showNotification('Ошибка загрузки списка заявок', 'error');
+                }
+            })
+            .finally(() => {
+                this.loading = false;
+                this.table.classList.remove('grid-loading');
+            });
+    }
+
+    render(fields, rows) {
+        if (rows.length) {
+            this.tbody.innerHTML = rows.map(values => {
+                const row = {};
+                fields.forEach((field, i) => { row[field] = values[i]; });
+                return this.renderRow(row);
+            }).join('');
+        } else {
+            const columns = this.table.querySelectorAll('thead th').length;
+            this.tbody.innerHTML = `<tr><td colspan="${columns}" class="text-center py-4" style="font-size: 15px;">${this.emptyText}</td></tr>`;
+        }
+        this.renderPagination();
+        document.dispatchEvent(new CustomEvent('grid:rendered', {detail: this.tbody}));
+    }
+
+    renderPagination() {
+        if (!this.pagination) return;
+        const hasPrevious = this.previous.length > 0;
+        if (!hasPrevious && !this.nextCursor) {
+            this.pagination.innerHTML = '';
+            return;
+        }
+        let html = '<ul class="pagination justify-content-center">';
+        if (hasPrevious) {
+            html += '<li class="page-item"><a class="page-link" href="#" data-grid-nav="prev">Назад</a></li>';
+        }
+        html += `<li class="page-item disabled"><span class="page-link">Страница ${this.page}</span></li>`;
+        if (this.nextCursor) {
+            html += '<li class="page-item"><a class="page-link" href="#" data-grid-nav="next">Вперед</a></li>';
+        }
+        html += '</ul>';
+        this.pagination.innerHTML = html;
+    }
+
+    // ---- Помощники для renderRow ----
+
+    static escape(value) {
+        return String(value ?? '').replace(/[&<>"']/g, ch => ({
+            '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;',
+        })[ch]);
+    }
+
+    // 'YYYY-MM-DD' -> 'DD.MM.YYYY'
+    static formatDate(value) {
+        if (!value) return '';
+        const [year, month, day] = value.split('-');
+        return `${day}.${month}.${year}`;
+    }
+
+    // Как фильтр truncatechars в шаблонах
+    static truncate(value, length) {
+        const text = String(value ?? '');
+        return text.length > length ? text.slice(0, length - 1) + '…' : text;
+    }
+
+    // Число в записи шаблонов (десятичная запятая)
+    static number(value) {
+        return String(value ?? '').replace('.', ',');
+    }
+
+    static url(template, id) {
+        return template.replace('0', id);
+    }
+}
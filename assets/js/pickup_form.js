@@ -0,0 +1,742 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const selectedCityId = document.getElementById('selectedCityId');
+    const cityInfo = document.getElementById('city-info');
+    const cityNameElement = document.getElementById('selected-city-name');
+    const cityContent = document.getElementById('city-info-content');
+    const receivingWarehouseHidden = document.getElementById('id_receiving_warehouse_hidden');
+    const deliveryCityHidden = document.getElementById('id_delivery_city_hidden');
+    const warehouseSelection = document.getElementById('warehouse-selection');
+    const citySelectionDisplay = document.getElementById('city-selection-display');
+    const form = document.getElementById('orderForm');
+    const submitButton = document.getElementById('submitButton');
+    const dateAvailabilityIndicator = document.getElementById('date-availability-indicator');
+    const dateAvailabilityMessage = document.getElementById('date-availability-message');
+    const dateInput = document.querySelector('#id_desired_delivery_date');
+
+    const citiesData = pageConfig.citiesData;
+
+    let currentCity = null;
+    let selectedWarehouseId = null;
+    let selectedWarehouseName = null;
+
+    // Функция для переключения полей в зависимости от типа клиента
+    function toggleClientFieldsByType() {
+        const clientTypeSelect = document.getElementById('id_client_type');
+        if (!clientTypeSelect) return;
+
+        const clientType = clientTypeSelect.value;
+        const companyGroup = document.getElementById('client-company-group');
+        const companyLabel = document.getElementById('client-company-label');
+        const companyHelp = document.getElementById('client-company-help');
+
+        // Скрываем все группы полей
+        document.querySelectorAll('.client-legal-fields, .client-entrepreneur-fields, .client-individual-fields').forEach(el => {
+            el.classList.remove('visible');
+        });
+
+        // Управление полем ИНН
+        const innField = document.querySelector('.client-legal-fields.client-entrepreneur-fields');
+        if (innField) {
+            // Для физ.лиц и самозанятых скрываем ИНН, для юр.лиц и ИП показываем
+            if (clientType === 'individual' || clientType === 'self_employed') {
+                innField.style.display = 'none';
+            } else {
+                innField.style.display = 'block';
+            }
+        }
+
+        // Настраиваем лейбл для поля компании/ФИО и показываем нужные поля
+        if (companyLabel && companyHelp) {
+            switch(clientType) {
+                case 'legal':
+                    companyLabel.textContent = 'Наименование компании *';
+                    companyHelp.textContent = 'Полное наименование юридического лица (ООО, АО и т.д.)';
+                    document.querySelectorAll('.client-legal-fields').forEach(el => el.classList.add('visible'));
+                    break;
+                case 'entrepreneur':
+                    companyLabel.textContent = 'Наименование ИП *';
+                    companyHelp.textContent = 'Наименование индивидуального предпринимателя';
+                    document.querySelectorAll('.client-entrepreneur-fields').forEach(el => el.classList.add('visible'));
+                    document.querySelectorAll('.client-individual-fields').forEach(el => el.classList.add('visible'));
+                    break;
+                case 'individual':
+                case 'self_employed':
+                    companyLabel.textContent = 'ФИО *';
+                    companyHelp.textContent = 'Фамилия, имя, отчество физического лица';
+                    document.querySelectorAll('.client-individual-fields').forEach(el => el.classList.add('visible'));
+                    break;
+            }
+        }
+    }
+
+    // Инициализация полей клиента
+    function initClientFields() {
+        // Навешиваем обработчик на изменение типа клиента
+        const typeSelect = document.getElementById('id_client_type');
+        if (typeSelect) {
+            typeSelect.addEventListener('change', toggleClientFieldsByType);
+            // Инициализируем при загрузке
+            toggleClientFieldsByType();
+        }
+
+        // Остальной код инициализации полей клиента...
+        const searchInput = document.getElementById('client_search');
+        if (searchInput) {
+            searchInput.addEventListener('input', function() {
+                clearTimeout(window.searchTimeout);
+                window.searchTimeout = setTimeout(() => {
+                    if (this.value.trim().length >= 2) {
+                        searchClient('client');
+                    }
+                }, 500);
+            });
+        }
+    }
+
+    // Функция для поиска клиента
+    async function searchClient(clientType) {
+        const searchInput = document.getElementById(`${clientType}_search`);
+        const searchTerm = searchInput.value.trim();
+        const resultsContainer = document.getElementById(`${clientType}_search_results`);
+
+        if (searchTerm.length < 2) {
+            showAlertMessage('Введите хотя бы 2 символа для поиска', 'warning');
+            return;
+        }
+
+        // Показываем индикатор загрузки
+        resultsContainer.innerHTML = `
+            <div class="text-center p-3">
+                <div class="spinner-border spinner-border-sm text-primary" role="status">
+                    <span class="visually-hidden">Загрузка...</span>
+                </div>
+                <span class="ms-2">Поиск клиентов...</span>
+            </div>
+        `;
+        resultsContainer.style.display = 'block';
+
+        try {
+            // AJAX запрос к API
+            const response = await fetch(`/counterparties/api/public/search/?search=${encodeURIComponent(searchTerm)}`);
+            const clients = await response.json();
+
+            if (clients.length === 0) {
+                resultsContainer.innerHTML = `
+                    <div class="list-group-item text-muted text-center">
+                        <i class="bi bi-exclamation-circle me-2"></i>
+                        Клиенты не найдены
+                    </div>
+                `;
+                return;
+            }
+
+            // Отображаем результаты
+            let html = '';
+            clients.forEach(client => {
+                html += `
+                    <a href="#" class="list-group-item list-group-item-action" 
+                       onclick="selectClient('${clientType}', ${client.id}); return false;">
+                        <div class="counterparty-info">
+                            <strong>${client.name}</strong>
+                            <div class="counterparty-type">
+                                ${client.type === 'legal' ? 'Юридическое лицо' : 
+                                  client.type === 'entrepreneur' ? 'ИП' : 
+                                  client.type === 'individual' ? 'Физическое лицо' : 'Самозанятый'}
+                            </div>
+                            ${client.inn ? `<div><small>ИНН: ${client.inn}</small></div>` : ''}
+                            ${client.phone ? `<div><small>Телефон: ${client.phone}</small></div>` : ''}
+                            ${client.address ? `<div><small>Адрес: ${client.address.substring(0, 50)}${client.address.length > 50 ? '...' : ''}</small></div>` : ''}
+                        </div>
+                    </a>
+                `;
+            });
+
+            resultsContainer.innerHTML = html;
+
+        } catch (error) {
+            console.error('Ошибка при поиске клиентов:', error);
+            resultsContainer.innerHTML = `
+                <div class="list-group-item text-danger text-center">
+                    <i class="bi bi-x-circle me-2"></i>
+                    Ошибка при поиске. Попробуйте еще раз
+                </div>
+            `;
+        }
+    }
+
+    window.selectClient = async function(clientType, counterpartyId) {
+        try {
+            // Получаем детальную информацию о клиенте
+            const response = await fetch(`/counterparties/api/public/${counterpartyId}/`);
+            const client = await response.json();
+
+            if (client.error) {
+                showAlertMessage('Клиент не найден', 'danger');
+                return;
+            }
+
+            // Заполняем форму данными клиента
+            document.getElementById('client_counterparty_id').value = client.id;
+            document.getElementById('id_client_type').value = client.type;
+            document.getElementById('id_client_company').value = client.name;
+            document.getElementById('id_client_inn').value = client.inn;
+            document.getElementById('id_client_kpp').value = client.kpp;
+            document.getElementById('id_client_ogrn').value = client.ogrn;
+            document.getElementById('id_client_address').value = client.address;
+            document.getElementById('id_client_phone').value = client.phone;
+            document.getElementById('id_client_email').value = client.email;
+            document.getElementById('id_client_contact_person').value = client.contact_person;
+            document.getElementById('id_client_director_name').value = client.director_name;
+            document.getElementById('id_client_passport_series').value = client.passport_series;
+            document.getElementById('id_client_passport_number').value = client.passport_number;
+            document.getElementById('id_client_passport_issued_by').value = client.passport_issued_by;
+            document.getElementById('id_client_passport_issued_date').value = client.passport_issued_date;
+            document.getElementById('id_client_bank_name').value = client.bank_name;
+            document.getElementById('id_client_bank_account').value = client.bank_account;
+
+            // Обновляем видимость полей в зависимости от типа
+            toggleClientFieldsByType();
+
+            // Показываем сообщение об успешной загрузке
+            showAlertMessage(`Данные клиента "${client.name}" загружены`, 'success');
+
+            // Скрываем результаты поиска
+            document.getElementById(`${clientType}_search_results`).style.display = 'none';
+
+        } catch (error) {
+            console.error('Ошибка при загрузке данных клиента:', error);
+            showAlertMessage('Ошибка при загрузке данных клиента', 'danger');
+        }
+    }
+
+    // Функция для очистки поиска и подготовки к вводу нового клиента
+    window.clearClientSearch = function(clientType) {
+        document.getElementById(`${clientType}_search`).value = '';
+        document.getElementById('client_counterparty_id').value = '';
+        document.getElementById(`${clientType}_search_results`).style.display = 'none';
+
+        // Сбрасываем значения полей
+        document.getElementById('id_client_type').value = 'legal';
+        document.getElementById('id_client_company').value = '';
+        document.getElementById('id_client_inn').value = '';
+        document.getElementById('id_client_kpp').value = '';
+        document.getElementById('id_client_ogrn').value = '';
+        document.getElementById('id_client_address').value = '';
+        document.getElementById('id_client_phone').value = '';
+        document.getElementById('id_client_email').value = '';
+        document.getElementById('id_client_contact_person').value = '';
+        document.getElementById('id_client_director_name').value = '';
+        document.getElementById('id_client_passport_series').value = '';
+        document.getElementById('id_client_passport_number').value = '';
+        document.getElementById('id_client_passport_issued_by').value = '';
+        document.getElementById('id_client_passport_issued_date').value = '';
+        document.getElementById('id_client_bank_name').value = '';
+        document.getElementById('id_client_bank_account').value = '';
+
+        // Обновляем видимость полей
+        toggleClientFieldsByType();
+
+        showAlertMessage('Готово к вводу данных нового клиента', 'info');
+    }
+
+    function displayCityInfo(cityId) {
+        const city = citiesData.find(c => c.id == cityId);
+        if (!city) {
+            cityContent.innerHTML = `
+                <div class="alert alert-danger">
+                    <i class="bi bi-exclamation-triangle"></i>
+                    Город не найден
+                </div>
+            `;
+            return;
+        }
+
+        currentCity = city;
+        cityNameElement.textContent = city.name;
+
+        let html = '';
+
+        if (city.warehouses && city.warehouses.length > 0) {
+            city.warehouses.forEach((warehouse, index) => {
+                const isOpen = warehouse.is_open_now;
+                const schedules = warehouse.schedules || [];
+
+                html += `
+                    <div class="warehouse-info mb-4 p-3">
+                        <div class="d-flex justify-content-between align-items-start mb-3">
+                            <div>
+                                <h6 class="mb-1">
+                                    <i class="bi bi-house-door me-2"></i>
+                                    <strong>${warehouse.name}</strong>
+                                    <span class="badge ${isOpen ? 'bg-success' : 'bg-danger'} ms-2">
+                                        <i class="bi ${isOpen ? 'bi-check-circle' : 'bi-x-circle'}"></i>
+                                        ${isOpen ? 'Открыт' : 'Закрыт'}
+                                    </span>
+                                </h6>
+                                <p class="text-muted mb-0"><small>Код: ${warehouse.code}</small></p>
+                            </div>
+                            <div>
+                                <button type="button" class="btn btn-sm ${selectedWarehouseId == warehouse.id ? 'btn-primary' : 'btn-outline-primary'} select-warehouse-btn" 
+                                        data-warehouse-id="${warehouse.id}" 
+                                        data-warehouse-name="${warehouse.name}">
+                                    <i class="bi bi-check-circle me-1"></i> 
+                                    ${selectedWarehouseId == warehouse.id ? 'Выбран' : 'Выбрать'}
+                                </button>
+                            </div>
+                        </div>
+
+                        <div class="row mb-3">
+                            <div class="col-md-6">
+                                <p class="mb-1">
+                                    <i class="bi bi-geo-alt text-primary"></i> 
+                                    <strong>Адрес:</strong> ${warehouse.address}
+                                </p>
+                                <p class="mb-1">
+                                    <i class="bi bi-telephone text-primary"></i> 
+                                    <strong>Телефон:</strong> ${warehouse.phone}
+                                </p>
+                                ${warehouse.email ? `
+                                    <p class="mb-1">
+                                        <i class="bi bi-envelope text-primary"></i> 
+                                        <strong>Email:</strong> ${warehouse.email}
+                                    </p>
+                                ` : ''}
+                                ${warehouse.manager ? `
+                                    <p class="mb-1">
+                                        <i class="bi bi-person text-primary"></i> 
+                                        <strong>Менеджер:</strong> ${warehouse.manager}
+                                    </p>
+                                ` : ''}
+                            </div>
+                            <div class="col-md-6">
+                                <p class="mb-1">
+                                    <i class="bi bi-clock text-primary"></i> 
+                                    <strong>График работы:</strong> ${warehouse.working_hours}
+                                </p>
+                                <p class="mb-1">
+                                    <i class="bi bi-rulers text-primary"></i> 
+                                    <strong>Площадь:</strong> ${warehouse.available_area} м² / ${warehouse.total_area} м²
+                                </p>
+                            </div>
+                        </div>
+
+                        ${schedules.length > 0 ? `
+                            <div class="mt-3">
+                                <h6 class="mb-2"><i class="bi bi-calendar-event"></i> График работы по дням:</h6>
+                                <div class="table-responsive">
+                                    <table class="table table-sm table-bordered">
+                                        <thead>
+                                            <tr>
+                                                <th>День недели</th>
+                                                <th>Время работы</th>
+                                            </tr>
+                                        </thead>
+                                        <tbody>
+                                            ${schedules.map(schedule => `
+                                                <tr>
+                                                    <td>${schedule.day_of_week}</td>
+                                                    <td>${schedule.opening_time} ${schedule.closing_time ? ' - ' + schedule.closing_time : ''}</td>
+                                                </tr>
+                                            `).join('')}
+                                        </tbody>
+                                    </table>
+                                </div>
+                            </div>
+                        ` : '<p class="text-warning"><i class="bi bi-exclamation-triangle"></i> График работы по дням не указан</p>'}
+                    </div>
+                `;
+            });
+        } else {
+            html = `
+                <div class="alert alert-warning">
+                    <i class="bi bi-exclamation-triangle"></i>
+                    В городе ${city.name} нет доступных складов.
+                </div>
+            `;
+        }
+
+        cityContent.innerHTML = html;
+        cityInfo.classList.remove('hidden');
+        cityInfo.classList.add('fade-in');
+
+        document.querySelectorAll('.select-warehouse-btn').forEach(btn => {
+            btn.addEventListener('click', function() {
+                selectWarehouse(
+                    this.getAttribute('data-warehouse-id'),
+                    this.getAttribute('data-warehouse-name')
+                );
+            });
+        });
+
+        // Убираем вызов loadDeliveryCities, теперь город доставки определяется при выборе склада
+    }
+
+    function selectWarehouse(warehouseId, warehouseName) {
+        selectedWarehouseId = warehouseId;
+        selectedWarehouseName = warehouseName;
+
+        receivingWarehouseHidden.value = warehouseId;
+
+        // Устанавливаем город доставки (из currentCity, который соответствует выбранному складу)
+        if (currentCity) {
+            deliveryCityHidden.value = currentCity.id;
+            // Отображаем город доставки
+            citySelectionDisplay.innerHTML = `
+                <div class="alert alert-success">
+                    <i class="bi bi-check-circle"></i>
+                    Город доставки: <strong>${currentCity.name}</strong>
+                </div>
+            `;
+        } else {
+            // На всякий случай, если currentCity почему-то нет
+            citySelectionDisplay.innerHTML = `
+                <div class="alert alert-warning">
+                    <i class="bi bi-exclamation-triangle"></i>
+                    Не удалось определить город доставки
+                </div>
+            `;
+        }
+
+        document.querySelectorAll('.select-warehouse-btn').forEach(btn => {
+            const btnWarehouseId = btn.getAttribute('data-warehouse-id');
+            if (btnWarehouseId == warehouseId) {
+                btn.classList.remove('btn-outline-primary');
+                btn.classList.add('btn-primary');
+                btn.innerHTML = '<i class="bi bi-check-circle me-1"></i> Выбран';
+                btn.parentElement.parentElement.classList.add('pulse');
+            } else {
+                btn.classList.remove('btn-primary');
+                btn.classList.add('btn-outline-primary');
+                btn.innerHTML = '<i class="bi bi-check-circle me-1"></i> Выбрать';
+                btn.parentElement.parentElement.classList.remove('pulse');
+            }
+        });
+
+        showAlertMessage(`Выбран склад: ${warehouseName}`, 'success');
+
+        if (warehouseSelection) {
+            warehouseSelection.innerHTML = `
+                <div class="alert alert-success">
+                    <i class="bi bi-check-circle"></i>
+                    Выбран склад: <strong>${warehouseName}</strong>
+                </div>
+            `;
+        }
+
+        // Проверяем доступность текущей выбранной даты
+        if (dateInput && dateInput.value) {
+            checkDateAvailability();
+        }
+    }
+
+    // Функция для получения CSRF токена
+    function getCSRFToken() {
+        const name = 'csrftoken';
+        let cookieValue = null;
+        if (document.cookie && document.cookie !== '') {
+            const cookies = document.cookie.split(';');
+            for (let i = 0; i < cookies.length; i++) {
+                const cookie = cookies[i].trim();
+                if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                    cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                    break;
+                }
+            }
+        }
+        return cookieValue;
+    }
+
+    // Функция для проверки доступности даты через API
+    async function checkDateAvailability() {
+        if (!selectedWarehouseId || !dateInput || !dateInput.value) {
+            return;
+        }
+
+        // Показываем индикатор проверки
+        dateAvailabilityIndicator.classList.remove('hidden');
+        dateAvailabilityIndicator.classList.remove('date-available');
+        dateAvailabilityIndicator.classList.remove('date-unavailable');
+        dateAvailabilityIndicator.classList.add('date-checking');
+        dateAvailabilityIndicator.innerHTML = '<i class="bi bi-clock"></i><span>Проверка доступности...</span>';
+
+        try {
+            // AJAX запрос к API проверки даты
+            const response = await fetch(`/warehouses/api/warehouses/${selectedWarehouseId}/check_date/`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCSRFToken()
+                },
+                body: JSON.stringify({ date: dateInput.value })
+            });
+
+            if (!response.ok) {
+                throw new Error('Ошибка сети');
+            }
+
+            const data = await response.json();
+
+            if (data.is_available) {
+                dateAvailabilityIndicator.classList.remove('date-checking');
+                dateAvailabilityIndicator.classList.add('date-available');
+                dateAvailabilityIndicator.innerHTML = '<i class="bi bi-check-circle"></i><span>День доступен</span>';
+                dateAvailabilityMessage.innerHTML = data.message || 'Дата доступна для бронирования';
+                dateAvailabilityMessage.style.color = '#198754';
+            } else {
+                dateAvailabilityIndicator.classList.remove('date-checking');
+                dateAvailabilityIndicator.classList.add('date-unavailable');
+                dateAvailabilityIndicator.innerHTML = '<i class="bi bi-x-circle"></i><span>День не доступен</span>';
+                dateAvailabilityMessage.innerHTML = data.message || 'Склад не работает в этот день';
+                dateAvailabilityMessage.style.color = '#dc3545';
+            }
+
+        } catch (error) {
+            console.error('Ошибка проверки даты:', error);
+            dateAvailabilityIndicator.classList.remove('date-checking');
+            dateAvailabilityIndicator.classList.add('date-unavailable');
+            dateAvailabilityIndicator.innerHTML = '<i class="bi bi-exclamation-triangle"></i><span>Ошибка проверки</span>';
+            dateAvailabilityMessage.innerHTML = 'Не удалось проверить доступность даты';
+            dateAvailabilityMessage.style.color = '#dc3545';
+        }
+    }
+
+    document.querySelectorAll('.city-btn').forEach(btn => {
+        btn.addEventListener('click', function() {
+            const cityId = this.getAttribute('data-city-id');
+
+            document.querySelectorAll('.city-btn').forEach(b => {
+                b.classList.remove('active');
+            });
+
+            this.classList.add('active');
+
+            selectedCityId.value = cityId;
+
+            displayCityInfo(cityId);
+
+            setTimeout(() => {
+                document.getElementById('city-info').scrollIntoView({ 
+                    behavior: 'smooth', 
+                    block: 'start' 
+                });
+            }, 300);
+        });
+    });
+
+    const firstCityBtn = document.querySelector('.city-btn');
+    if (firstCityBtn && citiesData.length > 0) {
+        firstCityBtn.click();
+    }
+
+    const quantityField = document.getElementById('id_quantity');
+    const volumeField = document.getElementById('id_volume');
+
+    if (quantityField && volumeField) {
+        const boxTypeContainer = document.createElement('div');
+        boxTypeContainer.className = 'mt-3';
+        boxTypeContainer.innerHTML = `
+            <label class="form-label">Быстрый расчет объема</label>
+            <select id="box-type-select" class="form-select">
+                <option value="">Выберите тип коробки для расчета...</option>
+                ${pageConfig.boxSizes.map(box => `<option value="${box.volume}">${box.name} (${box.volume} м³)</option>`).join('')}
+            </select>
+            <div class="form-text">Выберите тип коробки для автоматического расчета объема</div>
+        `;
+
+        volumeField.parentNode.appendChild(boxTypeContainer);
+        const boxTypeSelect = document.getElementById('box-type-select');
+
+        boxTypeSelect.addEventListener('change', function() {
+            const boxVolume = parseFloat(this.value);
+            const quantity = parseInt(quantityField.value) || 1;
+
+            if (boxVolume && quantity) {
+                const totalVolume = boxVolume * quantity;
+                volumeField.value = totalVolume.toFixed(3);
+
+                volumeField.title = `Рассчитано: ${quantity} × ${boxVolume} м³ = ${totalVolume.toFixed(3)} м³`;
+
+                volumeField.style.backgroundColor = '#e8f4f8';
+                volumeField.style.borderColor = '#0d6efd';
+                setTimeout(() => {
+                    volumeField.style.backgroundColor = '';
+                    volumeField.style.borderColor = '';
+                }, 1500);
+            }
+        });
+
+        quantityField.addEventListener('change', function() {
+            if (boxTypeSelect.value) {
+                boxTypeSelect.dispatchEvent(new Event('change'));
+            }
+        });
+
+        volumeField.addEventListener('input', function() {
+            boxTypeSelect.value = '';
+        });
+    }
+
+    // Добавляем обработчик для проверки даты при изменении
+    if (dateInput) {
+        dateInput.addEventListener('change', function() {
+            if (selectedWarehouseId) {
+                checkDateAvailability();
+            } else {
+                showAlertMessage('Сначала выберите склад для проверки доступности даты', 'warning');
+            }
+        });
+    }
+
+    if (form) {
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+
+            if (!selectedCityId.value) {
+                showAlertMessage('Пожалуйста, выберите город получения груза', 'warning');
+                document.querySelector('.city-selection-card').scrollIntoView({ 
+                    behavior: 'smooth', 
+                    block: 'center' 
+                });
+                return false;
+            }
+
+            if (!selectedWarehouseId) {
+                showAlertMessage('Пожалуйста, выберите склад приемки', 'warning');
+                document.getElementById('city-info').scrollIntoView({ 
+                    behavior: 'smooth', 
+                    block: 'center' 
+                });
+                return false;
+            }
+
+            if (!deliveryCityHidden.value) {
+                showAlertMessage('Пожалуйста, выберите склад для определения города доставки', 'warning');
+                const citySection = document.querySelector('#city-selection-display');
+                if (citySection) {
+                    citySection.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                }
+                return false;
+            }
+
+            // Проверяем доступность даты перед отправкой
+            if (dateInput && dateInput.value) {
+                const selectedDate = new Date(dateInput.value);
+                const today = new Date();
+                today.setHours(0, 0, 0, 0);
+
+                if (selectedDate < today) {
+                    showAlertMessage('Нельзя выбрать дату в прошлом', 'warning');
+                    dateInput.focus();
+                    return false;
+                }
+
+                // Проверяем доступность даты через API перед отправкой
+                if (dateAvailabilityIndicator.classList.contains('date-unavailable')) {
+                    showAlertMessage('Выбранная дата недоступна для этого склада. Пожалуйста, выберите другую дату.', 'warning');
+                    dateInput.focus();
+                    return false;
+                }
+            }
+
+            let isValid = true;
+            const requiredFields = form.querySelectorAll('[required]');
+
+            requiredFields.forEach(function(field) {
+                field.classList.remove('is-invalid');
+
+                const isCheckbox = field.type === 'checkbox';
+                const isEmpty = isCheckbox ? !field.checked : !field.value.trim();
+
+                if (isEmpty) {
+                    isValid = false;
+                    field.classList.add('is-invalid');
+
+                    const parentDiv = field.closest('.col-md-6, .col-md-4, .col-12');
+                    if (parentDiv) {
+                        parentDiv.style.animation = 'pulse 0.5s';
+                        setTimeout(() => {
+                            parentDiv.style.animation = '';
+                        }, 500);
+                    }
+                }
+            });
+
+            if (!isValid) {
+                showAlertMessage('Пожалуйста, заполните все обязательные поля', 'warning');
+                const firstError = form.querySelector('.is-invalid');
+                if (firstError) {
+                    firstError.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                    firstError.focus();
+                }
+                return false;
+            }
+
+            if (submitButton) {
+                submitButton.disabled = true;
+                submitButton.innerHTML = '<i class="bi bi-hourglass-split me-2"></i> Отправка...';
+            }
+
+            this.submit();
+        });
+    }
+
+    // Инициализируем поля клиента при загрузке
+    initClientFields();
+});
+
+function showAlertMessage(message, type) {
+    // Создаем уникальный ID для уведомления
+    const notificationId = 'notification-' + Date.now();
+
+    const alertDiv = document.createElement('div');
+    alertDiv.id = notificationId;
+    alertDiv.className = `alert alert-${type} alert-dismissible fade show notification-alert`;
+    alertDiv.style.cssText = `
+        position: fixed;
+        top: 100px;
+        right: 20px;
+        z-index: 9999;
+        min-width: 300px;
+        max-width: 400px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+    `;
+    alertDiv.innerHTML = `
+        <div class="d-flex align-items-center">
+            ${type === 'success' ? 
+                '<i class="bi bi-check-circle-fill me-2 fs-5"></i>' : 
+                type === 'warning' ? 
+                '<i class="bi bi-exclamation-triangle-fill me-2 fs-5"></i>' :
+                type === 'info' ?
+                '<i class="bi bi-info-circle-fill me-2 fs-5"></i>' :
+                '<i class="bi bi-exclamation-circle-fill me-2 fs-5"></i>'
+            }
+            <div>${message}</div>
+        </div>
+        <button type="button" class="btn-close" onclick="document.getElementById('${notificationId}').remove()"></button>
+    `;
+
+    document.body.appendChild(alertDiv);
+
+    // Автоматическое удаление через 5 секунд
+    setTimeout(() => {
+        const element = document.getElementById(notificationId);
+        if (element) {
+            element.remove();
+        }
+    }, 5000);
+}
+
+setTimeout(function() {
+    const alerts = document.querySelectorAll('.alert');
+    alerts.forEach(function(alert) {
+        const bsAlert = new bootstrap.Alert(alert);
+        bsAlert.close();
+    });
+}, 5000);
+
+window.addEventListener('pageshow', function(event) {
+    if (submitButton) {
+        submitButton.disabled = false;
+        submitButton.innerHTML = '<i class="bi bi-send-check me-2"></i> Отправить заявку';
+    }
+});
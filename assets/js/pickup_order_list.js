@@ -0,0 +1,1521 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const selectAllCheckbox = document.getElementById('selectAllCheckbox');
+    const selectAllBtn = document.getElementById('selectAllBtn');
+    const deselectAllBtn = document.getElementById('deselectAllBtn');
+    const exportPdfBtn = document.getElementById('exportPdfBtn');
+    const exportListPdfBtn = document.getElementById('exportListPdfBtn');
+    const selectedCount = document.getElementById('selectedCount');
+    // Строки таблицы перерисовываются, поэтому чекбоксы ищутся при каждом действии
+    const orderCheckboxes = () => document.querySelectorAll('.order-checkbox');
+    const bulkActionsForm = document.getElementById('bulkActionsForm');
+    const listPdfForm = document.getElementById('listPdfForm');
+    
+    function updateSelectedCount() {
+        const selected = document.querySelectorAll('.order-checkbox:checked');
+        selectedCount.textContent = `Выбрано: ${selected.length}`;
+        exportPdfBtn.disabled = selected.length === 0;
+        exportListPdfBtn.disabled = selected.length === 0;
+        
+        // Обновляем кнопку массового редактирования
+        const bulkEditBtn = document.getElementById('openBulkEditBtn');
+        if (bulkEditBtn) {
+            bulkEditBtn.disabled = selected.length === 0;
+        }
+        const bulkConvertBtn = document.getElementById('bulkConvertBtn');
+        if (bulkConvertBtn) {
+            bulkConvertBtn.disabled = selected.length === 0;
+        }
+    }
+    
+    selectAllCheckbox.addEventListener('change', function() {
+        orderCheckboxes().forEach(checkbox => {
+            checkbox.checked = this.checked;
+        });
+        updateSelectedCount();
+    });
+    
+    selectAllBtn.addEventListener('click', function() {
+        orderCheckboxes().forEach(checkbox => {
+            checkbox.checked = true;
+        });
+        selectAllCheckbox.checked = true;
+        updateSelectedCount();
+    });
+    
+    deselectAllBtn.addEventListener('click', function() {
+        orderCheckboxes().forEach(checkbox => {
+            checkbox.checked = false;
+        });
+        selectAllCheckbox.checked = false;
+        updateSelectedCount();
+    });
+    
+    document.addEventListener('change', function(e) {
+        if (e.target.classList.contains('order-checkbox')) {
+            updateSelectedCount();
+        }
+    });
+    
+    // Новая страница таблицы - выбор сбрасывается
+    document.addEventListener('grid:rendered', function() {
+        selectAllCheckbox.checked = false;
+        updateSelectedCount();
+    });
+    
+    bulkActionsForm.addEventListener('submit', function(e) {
+        const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+        if (selectedCheckboxes.length === 0) {
+            e.preventDefault();
+            alert('Пожалуйста, выберите хотя бы одну заявку');
+            return;
+        }
+        
+        const oldInputs = this.querySelectorAll('input[name="order_ids"]');
+        oldInputs.forEach(input => input.remove());
+        
+        selectedCheckboxes.forEach(checkbox => {
+            const hiddenInput = document.createElement('input');
+            hiddenInput.type = 'hidden';
+            hiddenInput.name = 'order_ids';
+            hiddenInput.value = checkbox.value;
+            this.appendChild(hiddenInput);
+        });
+    });
+    
+    // Обработчик для кнопки "Список в PDF"
+    if (exportListPdfBtn && listPdfForm) {
+        exportListPdfBtn.addEventListener('click', function() {
+            const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+            if (selectedCheckboxes.length === 0) {
+                alert('Пожалуйста, выберите хотя бы одну заявку');
+                return;
+            }
+            
+            // Очищаем старые поля
+            const oldInputs = listPdfForm.querySelectorAll('input[name="order_ids"]');
+            oldInputs.forEach(input => input.remove());
+            
+            // Добавляем новые поля с выбранными заявками
+            selectedCheckboxes.forEach(checkbox => {
+                const hiddenInput = document.createElement('input');
+                hiddenInput.type = 'hidden';
+                hiddenInput.name = 'order_ids';
+                hiddenInput.value = checkbox.value;
+                listPdfForm.appendChild(hiddenInput);
+            });
+            
+            // Отправляем форму
+            listPdfForm.submit();
+        });
+    }
+    
+    updateSelectedCount();
+});
+
+// ==================== ТАБЛИЦА ЗАЯВОК ====================
+
+// Операторам ячейки показываются без редактирования
+function disableEditing(root = document) {
+    const editableCells = root.querySelectorAll('.editable-cell');
+    editableCells.forEach(cell => {
+        // Убираем курсор-указатель
+        cell.style.cursor = 'default';
+        // Убираем эффект при наведении
+        cell.style.transition = 'none';
+        
+        // Удаляем обработчики событий
+        cell.onclick = null;
+        cell.ondblclick = null;
+        cell.onmouseenter = null;
+        cell.onmouseleave = null;
+        
+        // Убираем класс editable-cell
+        cell.classList.remove('editable-cell');
+        
+        // Скрываем кнопки сохранения/отмены если они есть
+        const saveBtn = cell.querySelector('.save-btn');
+        const cancelBtn = cell.querySelector('.cancel-btn');
+        if (saveBtn) saveBtn.style.display = 'none';
+        if (cancelBtn) cancelBtn.style.display = 'none';
+    });
+    
+    // Отключаем редактирование статусов
+    const statusBadges = root.querySelectorAll('.status-badge-editable');
+    statusBadges.forEach(badge => {
+        badge.style.cursor = 'default';
+        badge.onclick = null;
+        badge.style.pointerEvents = 'none';
+    });
+}
+
+const CELL_BUTTONS = `
+                    <button class="save-btn" onclick="saveCell(this)">✓</button>
+                    <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>`;
+
+const EMPTY_VALUE = '<span class="text-muted">-</span>';
+
+function renderUserCell(field, userId, userName) {
+    const esc = OrderGrid.escape;
+    const content = userId
+        ? `<span class="operator-name">${esc(OrderGrid.truncate(userName, 20))}</span>`
+        : EMPTY_VALUE;
+    return `
+                <td class="editable-cell" data-field="${field}" data-original="${userId || ''}" data-type="select">
+                    ${content}${CELL_BUTTONS}
+                </td>`;
+}
+
+// Строка таблицы из данных api/orders/ - та же разметка, что в шаблоне
+function renderPickupRow(order) {
+    const esc = OrderGrid.escape;
+    const urls = pageConfig.urls;
+    const warehouseBadge = order.receiving_warehouse_id
+        ? `
+                    <span class="badge bg-info ms-2" title="Склад: ${esc(order.receiving_warehouse_name)} (${esc(order.receiving_warehouse_city)})">📦</span>`
+        : '';
+    const clientInn = order.client_inn
+        ? `
+                    <br><small class="text-muted">ИНН: ${esc(order.client_inn)}</small>`
+        : '';
+    const editLink = pageConfig.isOperator ? '' : `
+                        <a href="${OrderGrid.url(urls.pickup_order_update, order.id)}" class="btn" title="Редактировать">
+                            <i class="bi bi-pencil"></i>
+                        </a>`;
+    const convertLink = order.convertible ? `
+                        <a href="${OrderGrid.url(urls.convert_to_delivery, order.id)}" class="btn" title="Создать доставку">
+                            <i class="bi bi-truck"></i>
+                        </a>` : '';
+    
+    return `
+            <tr data-order-id="${order.id}" data-order-type="pickup">
+                <td>
+                    <input type="checkbox" name="order_ids" value="${order.id}" 
+                           class="form-check-input order-checkbox">
+                </td>
+                <td class="editable-cell" data-field="invoice_number" data-original="${esc(order.invoice_number)}">
+                    ${order.invoice_number ? `<span class="invoice-number">${esc(order.invoice_number)}</span>` : EMPTY_VALUE}${CELL_BUTTONS}
+                </td>
+                <td class="editable-cell" data-field="pickup_date" data-original="${esc(order.pickup_date)}" data-type="date">
+                    ${order.pickup_date ? OrderGrid.formatDate(order.pickup_date) : EMPTY_VALUE}${CELL_BUTTONS}
+                </td>
+                <td class="editable-cell" data-field="quantity" data-original="${order.quantity}" data-type="number">
+                    ${order.quantity}${CELL_BUTTONS}
+                </td>
+                <td class="editable-cell" data-field="pickup_address" data-original="${esc(order.pickup_address)}" data-full-address="${esc(order.pickup_address)}">
+                    ${esc(OrderGrid.truncate(order.pickup_address, 30))}${warehouseBadge}${CELL_BUTTONS}
+                </td>
+                <td class="editable-cell" data-field="desired_delivery_date" data-original="${esc(order.desired_delivery_date)}" data-type="date">
+                    ${order.desired_delivery_date ? OrderGrid.formatDate(order.desired_delivery_date) : EMPTY_VALUE}${CELL_BUTTONS}
+                </td>
+                <td class="editable-cell" data-field="status" data-original="${esc(order.status)}" data-type="select">
+                    <span class="status-badge-editable status-${esc(order.status)}" onclick="startEditStatus(this)">
+                        ${esc(order.status_display)}
+                    </span>${CELL_BUTTONS}
+                </td>
+                <td class="editable-cell" data-field="client_name" data-original="${esc(order.client_name)}">
+                    ${esc(OrderGrid.truncate(order.client_name, 20))}${clientInn}${CELL_BUTTONS}
+                </td>${renderUserCell('operator', order.operator_id, order.operator_name)}${renderUserCell('receiving_operator', order.receiving_operator_id, order.receiving_operator_name)}
+                <td class="editable-cell" data-field="receiving_warehouse" data-original="${order.receiving_warehouse_id || ''}" data-type="select">
+                    ${order.receiving_warehouse_id ? `<span class="warehouse-name">${esc(OrderGrid.truncate(order.receiving_warehouse_name, 20))}</span>` : EMPTY_VALUE}${CELL_BUTTONS}
+                </td>
+                <td>
+                    <div class="btn-group btn-group-sm">
+                        <a href="${OrderGrid.url(urls.pickup_order_detail, order.id)}" class="btn" title="Просмотр">
+                            <i class="bi bi-eye"></i>
+                        </a>${editLink}
+                        <a href="${OrderGrid.url(urls.pickup_order_pdf, order.id)}" class="btn" title="Скачать PDF">
+                            <i class="bi bi-file-pdf"></i>
+                        </a>${convertLink}
+                    </div>
+                </td>
+            </tr>`;
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    new OrderGrid({
+        url: pageConfig.urls.pickup_orders_data,
+        table: document.getElementById('ordersTable'),
+        pagination: document.getElementById('gridPagination'),
+        filterForm: document.getElementById('filterForm'),
+        renderRow: renderPickupRow,
+        state: pageConfig.grid,
+    });
+    
+    if (pageConfig.isOperator) {
+        disableEditing();
+    }
+});
+
+// Новые строки таблицы получают те же обработчики, что и строки шаблона
+document.addEventListener('grid:rendered', function(e) {
+    editingCell = null;
+    if (pageConfig.isOperator) {
+        disableEditing(e.detail);
+    } else {
+        initInlineEditing(e.detail);
+    }
+});
+
+// Глобальные переменные для хранения состояния
+let editingCell = null;
+let operatorsList = [];
+let warehousesList = [];
+let currentAddressCell = null;
+let currentAddressField = null;
+let bulkEditModal = null;
+
+// ==================== МАССОВОЕ РЕДАКТИРОВАНИЕ ====================
+
+// Загрузка данных для массового редактирования
+function loadBulkEditData() {
+    // Загружаем операторы
+    referenceFetch('operators')
+        .then(response => response.json())
+        .then(data => {
+            operatorsList = data;
+            console.log('Операторы загружены для массового редактирования:', operatorsList.length);
+        })
+        .catch(error => console.error('Ошибка загрузки операторов:', error));
+    
+    // Загружаем склады
+    referenceFetch('warehouses')
+        .then(response => {
+            if (response.ok) return response.json();
+            return [];
+        })
+        .then(data => {
+            warehousesList = data;
+            console.log('Склады загружены для массового редактирования:', warehousesList.length);
+        })
+        .catch(error => console.error('Ошибка загрузки складов:', error));
+}
+
+// Обновление кнопки массового редактирования
+function updateBulkEditButton() {
+    const bulkEditBtn = document.getElementById('openBulkEditBtn');
+    if (!bulkEditBtn) return;
+    
+    const selected = document.querySelectorAll('.order-checkbox:checked');
+    bulkEditBtn.disabled = selected.length === 0;
+}
+
+// Инициализация массового редактирования
+function initBulkEditing() {
+    const bulkEditBtn = document.getElementById('openBulkEditBtn');
+    if (!bulkEditBtn) return;
+    
+    bulkEditBtn.addEventListener('click', function() {
+        const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+        if (selectedCheckboxes.length === 0) {
+            alert('Пожалуйста, выберите заявки для редактирования');
+            return;
+        }
+        
+        // Обновляем счетчик выбранных заявок - с проверкой существования элемента
+        const selectedOrdersCountEl = document.getElementById('selectedOrdersCount');
+        if (selectedOrdersCountEl) {
+            selectedOrdersCountEl.textContent = selectedCheckboxes.length;
+        }
+        
+        // Сбрасываем форму
+        const bulkEditFieldEl = document.getElementById('bulkEditField');
+        const bulkEditValueContainerEl = document.getElementById('bulkEditValueContainer');
+        
+        if (bulkEditFieldEl) bulkEditFieldEl.value = '';
+        if (bulkEditValueContainerEl) bulkEditValueContainerEl.innerHTML = '';
+        
+        // Показываем модальное окно
+        const bulkEditModalEl = document.getElementById('bulkEditModal');
+        if (bulkEditModalEl) {
+            bulkEditModal = new bootstrap.Modal(bulkEditModalEl);
+            bulkEditModal.show();
+        }
+    });
+    
+    // Обработчик изменения поля
+    const bulkEditFieldEl = document.getElementById('bulkEditField');
+    if (bulkEditFieldEl) {
+        bulkEditFieldEl.addEventListener('change', function() {
+            const field = this.value;
+            const container = document.getElementById('bulkEditValueContainer');
+            if (!container) return;
+            
+            container.innerHTML = '';
+            
+            if (!field) return;
+            
+            let inputHtml = '';
+            
+            switch(field) {
+                case 'status':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Новый статус</label>
+                        <select class="form-select" id="bulkEditValue">
+                            <option value="">Выберите статус</option>
+                            <option value="ready">Готова к выдаче</option>
+                            <option value="payment">На оплате</option>
+                            <option value="in_transit">В пути</option> 
+                            <option value="accepted">Принята</option> 
+                        </select>
+                    `;
+                    break;
+                    
+                case 'operator':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Новый оператор</label>
+                        <select class="form-select" id="bulkEditValue">
+                            <option value="">Не назначен</option>
+                            ${operatorsList.map(op => 
+                                `<option value="${op.id}">${op.full_name || op.username}</option>`
+                            ).join('')}
+                        </select>
+                    `;
+                    break;
+                    
+                case 'receiving_warehouse':
+                    if (warehousesList.length > 0) {
+                        inputHtml = `
+                            <label for="bulkEditValue" class="form-label">Новый склад приемки</label>
+                            <select class="form-select" id="bulkEditValue">
+                                <option value="">Не выбран</option>
+                                ${warehousesList.map(wh => 
+                                    `<option value="${wh.id}">${wh.name}</option>`
+                                ).join('')}
+                        </select>
+                        `;
+                    } else {
+                        inputHtml = `
+                            <label for="bulkEditValue" class="form-label">Новый склад приемки</label>
+                            <input type="text" class="form-control" id="bulkEditValue" placeholder="ID склада">
+                            <small class="form-text text-muted">Введите ID склада или установите пустое значение</small>
+                        `;
+                    }
+                    break;
+                    
+                case 'receiving_operator':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Новый оператор приемки</label>
+                        <select class="form-select" id="bulkEditValue">
+                            <option value="">Не назначен</option>
+                            ${operatorsList.map(op => 
+                                `<option value="${op.id}">${op.full_name || op.username}</option>`
+                            ).join('')}
+                        </select>
+                    `;
+                    break;
+                    
+                case 'pickup_date':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Новая дата забора</label>
+                        <input type="date" class="form-control" id="bulkEditValue">
+                        <small class="form-text text-muted">Оставьте пустым, чтобы сбросить дату</small>
+                    `;
+                    break;
+                    
+                case 'desired_delivery_date':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Новая желаемая дата доставки</label>
+                        <input type="date" class="form-control" id="bulkEditValue">
+                        <small class="form-text text-muted">Оставьте пустым, чтобы сбросить дату</small>
+                    `;
+                    break;
+                    
+                case 'quantity':
+                    inputHtml = `
+                        <label for="bulkEditValue" class="form-label">Новое количество мест</label>
+                        <input type="number" class="form-control" id="bulkEditValue" min="1" placeholder="Введите число">
+                    `;
+                    break;
+            }
+            
+            container.innerHTML = inputHtml;
+        });
+    }
+    
+    // Кнопка сохранения изменений
+    const bulkEditSaveBtn = document.getElementById('bulkEditSaveBtn');
+    if (bulkEditSaveBtn) {
+        bulkEditSaveBtn.addEventListener('click', saveBulkChanges);
+    }
+}
+
+// Сохранение массовых изменений
+function saveBulkChanges() {
+    const bulkEditFieldEl = document.getElementById('bulkEditField');
+    const valueInput = document.getElementById('bulkEditValue');
+    
+    if (!bulkEditFieldEl) {
+        showNotification('Форма массового редактирования не найдена', 'error');
+        return;
+    }
+    
+    const field = bulkEditFieldEl.value;
+    let value = valueInput ? valueInput.value : '';
+    
+    if (!field) {
+        showNotification('Выберите поле для редактирования', 'error');
+        return;
+    }
+    
+    if (value === '') {
+        if (!confirm('Вы хотите установить пустое значение? Нажмите OK для продолжения или Отмена для ввода значения.')) {
+            return;
+        }
+        value = null;
+    }
+    
+    // Для числовых полей проверяем валидность
+    if (field === 'quantity' && value !== null) {
+        if (parseInt(value) < 1) {
+            showNotification('Количество мест должно быть не менее 1', 'error');
+            return;
+        }
+    }
+    
+    // Собираем ID выбранных заявок
+    const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+    const orderIds = Array.from(selectedCheckboxes).map(cb => cb.value);
+    
+    if (orderIds.length === 0) {
+        showNotification('Не выбраны заявки для редактирования', 'error');
+        return;
+    }
+    
+    // Показываем индикатор загрузки
+    const saveBtn = document.getElementById('bulkEditSaveBtn');
+    const originalText = saveBtn ? saveBtn.innerHTML : 'Сохранить';
+    if (saveBtn) {
+        saveBtn.innerHTML = '<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Сохранение...';
+        saveBtn.disabled = true;
+    }
+    
+    // Отправка запроса на сервер
+    const csrfToken = getCookie('csrftoken');
+    const url = pageConfig.urls.pickup_orders_bulk_update;
+    
+    fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({
+            order_ids: orderIds,
+            field: field,
+            value: value
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (saveBtn) {
+            saveBtn.innerHTML = originalText;
+            saveBtn.disabled = false;
+        }
+        
+        if (data.success) {
+            showNotification(`Успешно обновлено ${data.updated_count} из ${orderIds.length} заявок`, 'success');
+            
+            // Закрываем модальное окно
+            if (bulkEditModal) {
+                bulkEditModal.hide();
+            }
+            
+            // Обновляем страницу через 1.5 секунды, чтобы увидеть изменения
+            setTimeout(() => {
+                location.reload();
+            }, 1500);
+            
+        } else {
+            showNotification('Ошибка: ' + (data.error || 'Неизвестная ошибка'), 'error');
+        }
+    })
+    .catch(error => {
+        if (saveBtn) {
+            saveBtn.innerHTML = originalText;
+            saveBtn.disabled = false;
+        }
+        console.error('Ошибка при массовом обновлении:', error);
+        showNotification('Ошибка сети: ' + error.message, 'error');
+    });
+}
+
+// Создание заявок на доставку по выбранным заборам (только со статусом «Готов»)
+function initBulkConvert() {
+    const convertBtn = document.getElementById('bulkConvertBtn');
+    if (!convertBtn) return;
+
+    convertBtn.addEventListener('click', function() {
+        const selectedCheckboxes = document.querySelectorAll('.order-checkbox:checked');
+        const orderIds = Array.from(selectedCheckboxes).map(cb => cb.value);
+
+        if (orderIds.length === 0) {
+            showNotification('Не выбраны заявки для преобразования', 'error');
+            return;
+        }
+        if (!confirm(`Создать заявки на доставку для выбранных заявок (${orderIds.length})? Будут обработаны только заявки со статусом «Готов» без доставки.`)) {
+            return;
+        }
+
+        const originalText = convertBtn.innerHTML;
+        convertBtn.innerHTML = '<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Создание...';
+        convertBtn.disabled = true;
+
+        fetch(pageConfig.urls.pickup_orders_bulk_convert, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            body: JSON.stringify({ order_ids: orderIds })
+        })
+        .then(response => response.json())
+        .then(data => {
+            convertBtn.innerHTML = originalText;
+            convertBtn.disabled = false;
+
+            if (data.success) {
+                showNotification(`Создано доставок: ${data.converted_count}, пропущено заявок: ${data.skipped_count}`, 'success');
+                if (data.converted_count > 0) {
+                    setTimeout(() => {
+                        location.reload();
+                    }, 1500);
+                }
+            } else {
+                showNotification('Ошибка: ' + (data.error || 'Неизвестная ошибка'), 'error');
+            }
+        })
+        .catch(error => {
+            convertBtn.innerHTML = originalText;
+            convertBtn.disabled = false;
+            console.error('Ошибка при создании доставок:', error);
+            showNotification('Ошибка сети: ' + error.message, 'error');
+        });
+    });
+}
+
+// ==================== ИНИЦИАЛИЗАЦИЯ МОДАЛЬНОГО ОКНА АДРЕСА ====================
+
+function initAddressModal() {
+    const modal = document.getElementById('addressModal');
+    if (!modal) return;
+    
+    // Очистка при закрытии
+    modal.addEventListener('hidden.bs.modal', function() {
+        const citySelect = document.getElementById('citySelect');
+        const warehouseSelect = document.getElementById('warehouseSelect');
+        const warehouseList = document.getElementById('warehouseList');
+        const warehouseDetails = document.getElementById('warehouseDetails');
+        const addressInput = document.getElementById('addressInput');
+        const warehouseItemsContainer = document.getElementById('warehouseItemsContainer');
+        
+        if (citySelect) citySelect.value = '';
+        if (warehouseSelect) {
+            warehouseSelect.value = '';
+            warehouseSelect.disabled = true;
+        }
+        if (warehouseList) warehouseList.style.display = 'none';
+        if (warehouseDetails) warehouseDetails.style.display = 'none';
+        if (addressInput) addressInput.value = '';
+        if (warehouseItemsContainer) warehouseItemsContainer.innerHTML = '';
+        
+        currentAddressCell = null;
+        currentAddressField = null;
+    });
+    
+    // Загрузка данных при открытии
+    modal.addEventListener('show.bs.modal', function() {
+        loadCities();
+    });
+    
+    // Обработчик выбора города
+    const citySelect = document.getElementById('citySelect');
+    if (citySelect) {
+        citySelect.addEventListener('change', function() {
+            const cityId = this.value;
+            if (cityId) {
+                loadWarehousesByCity(cityId);
+                const warehouseDetails = document.getElementById('warehouseDetails');
+                if (warehouseDetails) warehouseDetails.style.display = 'none';
+            } else {
+                const warehouseSelect = document.getElementById('warehouseSelect');
+                const warehouseList = document.getElementById('warehouseList');
+                const warehouseDetails = document.getElementById('warehouseDetails');
+                
+                if (warehouseSelect) {
+                    warehouseSelect.value = '';
+                    warehouseSelect.disabled = true;
+                }
+                if (warehouseList) warehouseList.style.display = 'none';
+                if (warehouseDetails) warehouseDetails.style.display = 'none';
+            }
+        });
+    }
+    
+    // Обработчик выбора склада
+    const warehouseSelect = document.getElementById('warehouseSelect');
+    if (warehouseSelect) {
+        warehouseSelect.addEventListener('change', function() {
+            const warehouseId = this.value;
+            if (warehouseId) {
+                loadWarehouseDetails(warehouseId);
+            } else {
+                const warehouseDetails = document.getElementById('warehouseDetails');
+                if (warehouseDetails) warehouseDetails.style.display = 'none';
+            }
+        });
+    }
+    
+    // Кнопка сохранения адреса
+    const saveAddressBtn = document.getElementById('saveAddressBtn');
+    if (saveAddressBtn) {
+        saveAddressBtn.addEventListener('click', function() {
+            saveAddressFromModal();
+        });
+    }
+    
+    // Сохранение по Ctrl+Enter
+    const addressInput = document.getElementById('addressInput');
+    if (addressInput) {
+        addressInput.addEventListener('keydown', function(e) {
+            if (e.key === 'Enter' && (e.ctrlKey || e.metaKey)) {
+                e.preventDefault();
+                saveAddressFromModal();
+            }
+        });
+    }
+}
+
+// Открытие модального окна при клике на ячейку адреса
+function openAddressModal(cell, field) {
+    currentAddressCell = cell;
+    currentAddressField = field;
+    
+    // Получаем текущий адрес из data-атрибута
+    const currentAddress = cell.getAttribute('data-original') || '';
+    
+    // Заполняем поле адреса
+    const addressInput = document.getElementById('addressInput');
+    if (addressInput) {
+        addressInput.value = currentAddress;
+    }
+    
+    // Открываем модальное окно
+    const modal = document.getElementById('addressModal');
+    if (modal) {
+        const modalInstance = new bootstrap.Modal(modal);
+        modalInstance.show();
+    }
+}
+
+// Сохранение адреса из модального окна
+function saveAddressFromModal() {
+    if (!currentAddressCell || !currentAddressField) return;
+    
+    const addressInput = document.getElementById('addressInput');
+    const warehouseSelect = document.getElementById('warehouseSelect');
+    
+    if (!addressInput) return;
+    
+    const newAddress = addressInput.value.trim();
+    const selectedWarehouseId = warehouseSelect ? warehouseSelect.value : '';
+    const selectedWarehouseText = warehouseSelect ? warehouseSelect.options[warehouseSelect.selectedIndex].text : '';
+    
+    if (!newAddress) {
+        showNotification('Пожалуйста, введите адрес', 'error');
+        return;
+    }
+    
+    const orderId = currentAddressCell.closest('tr').getAttribute('data-order-id');
+    
+    // Если выбран склад, обновляем оба поля
+    if (selectedWarehouseId) {
+        updateOrderWarehouseAndAddress(currentAddressCell, selectedWarehouseId, newAddress, selectedWarehouseText);
+    } else {
+        // Иначе обновляем только адрес
+        updateOrderAddressOnly(currentAddressCell, newAddress, orderId, currentAddressField);
+    }
+}
+
+// Обновление только адреса (без склада)
+function updateOrderAddressOnly(cell, address, orderId, field) {
+    const csrfToken = getCookie('csrftoken');
+    const url = pageConfig.urls.pickup_order_update_field.replace('0', orderId);
+    
+    fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({
+            field: field,
+            value: address
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            // Обновляем отображение в ячейке
+            updateCellDisplay(cell, field, address, data.display_value || address, 'text');
+            
+            // Закрываем модальное окно
+            const modal = bootstrap.Modal.getInstance(document.getElementById('addressModal'));
+            if (modal) {
+                modal.hide();
+            }
+            
+            showNotification('Адрес успешно обновлен', 'success');
+        } else {
+            throw new Error(data.error || 'Ошибка обновления адреса');
+        }
+    })
+    .catch(error => {
+        console.error('Ошибка обновления адреса:', error);
+        showNotification('Ошибка обновления адреса: ' + error.message, 'error');
+    });
+}
+
+// Обновление склада и адреса
+function updateOrderWarehouseAndAddress(cell, warehouseId, address, warehouseText) {
+    const orderId = cell.closest('tr').getAttribute('data-order-id');
+    const field = currentAddressField;
+    
+    // Склад и адрес сохраняются одним запросом в одной транзакции
+    updateFields([
+        {id: orderId, field: 'receiving_warehouse', value: warehouseId},
+        {id: orderId, field: field, value: address}
+    ])
+        .then((data) => {
+            if (data.success) {
+                const result = data.results.find(item => item.field === field);
+                // Обновляем отображение в ячейке
+                updateCellDisplay(cell, field, address, (result && result.display_value) || address, 'text');
+                
+                // Добавляем иконку склада
+                const existingBadge = cell.querySelector('.badge.bg-info');
+                if (!existingBadge) {
+                    const badge = document.createElement('span');
+                    badge.className = 'badge bg-info ms-2';
+                    badge.title = `Склад: ${warehouseText}`;
+                    badge.innerHTML = '📦';
+                    const addressText = cell.querySelector('.address-text');
+                    if (addressText) {
+                        addressText.after(badge);
+                    }
+                }
+                
+                // Закрываем модальное окно
+                const modal = bootstrap.Modal.getInstance(document.getElementById('addressModal'));
+                if (modal) {
+                    modal.hide();
+                }
+                
+                showNotification('Адрес и склад успешно обновлены', 'success');
+            } else {
+                const error = data.errors && data.errors.length ? data.errors[0].error : data.error;
+                throw new Error(error || 'Ошибка обновления адреса');
+            }
+        })
+        .catch(error => {
+            console.error('Ошибка обновления склада и адреса:', error);
+            showNotification('Ошибка: ' + error.message, 'error');
+        });
+}
+
+// Универсальная функция обновления поля
+function updateField(orderId, field, value, url) {
+    const csrfToken = getCookie('csrftoken');
+    
+    return fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({
+            field: field,
+            value: value
+        })
+    })
+    .then(response => response.json());
+}
+
+// Пакетное обновление полей: edits = [{id, field, value}, ...]
+function updateFields(edits) {
+    const csrfToken = getCookie('csrftoken');
+    
+    return fetch(pageConfig.urls.pickup_orders_update_fields, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({edits: edits})
+    })
+    .then(response => response.json());
+}
+
+// Загрузка городов
+function loadCities() {
+    const citySelect = document.getElementById('citySelect');
+    if (!citySelect) return;
+    
+    referenceFetch('cities')
+        .then(response => response.json())
+        .then(data => {
+            citySelect.innerHTML = '<option value="">Выберите город</option>';
+            data.forEach(city => {
+                const option = document.createElement('option');
+                option.value = city.id;
+                option.textContent = city.name;
+                citySelect.appendChild(option);
+            });
+        })
+        .catch(error => {
+            console.error('Ошибка загрузки городов:', error);
+            showNotification('Ошибка загрузки списка городов', 'error');
+        });
+}
+
+// Загрузка складов по городу
+function loadWarehousesByCity(cityId) {
+    const warehouseSelect = document.getElementById('warehouseSelect');
+    const warehouseItemsContainer = document.getElementById('warehouseItemsContainer');
+    
+    referenceFetch('warehouses_by_city', cityId)
+        .then(response => response.json())
+        .then(data => {
+            // Обновляем выпадающий список
+            if (warehouseSelect) {
+                warehouseSelect.innerHTML = '<option value="">Выберите склад</option>';
+                data.forEach(warehouse => {
+                    const option = document.createElement('option');
+                    option.value = warehouse.id;
+                    option.textContent = warehouse.name;
+                    warehouseSelect.appendChild(option);
+                });
+                warehouseSelect.disabled = false;
+            }
+            
+            // Обновляем список складов
+            if (warehouseItemsContainer) {
+                warehouseItemsContainer.innerHTML = '';
+                data.forEach(warehouse => {
+                    const warehouseItem = document.createElement('div');
+                    warehouseItem.className = 'warehouse-item';
+                    warehouseItem.setAttribute('data-warehouse-id', warehouse.id);
+                    warehouseItem.innerHTML = `
+                        <div class="warehouse-name">${warehouse.name}</div>
+                        <div class="warehouse-address">${warehouse.address || 'Адрес не указан'}</div>
+                    `;
+                    
+                    warehouseItem.addEventListener('click', function() {
+                        // Снимаем выделение со всех элементов
+                        document.querySelectorAll('.warehouse-item').forEach(item => {
+                            item.classList.remove('selected');
+                        });
+                        
+                        // Выделяем текущий элемент
+                        this.classList.add('selected');
+                        
+                        // Устанавливаем значение в выпадающем списке
+                        if (warehouseSelect) {
+                            warehouseSelect.value = warehouse.id;
+                        }
+                        
+                        // Загружаем детали склада
+                        loadWarehouseDetails(warehouse.id);
+                    });
+                    
+                    warehouseItemsContainer.appendChild(warehouseItem);
+                });
+            }
+            
+            const warehouseList = document.getElementById('warehouseList');
+            if (warehouseList) {
+                warehouseList.style.display = 'block';
+            }
+        })
+        .catch(error => {
+            console.error('Ошибка загрузки складов:', error);
+            showNotification('Ошибка загрузки списка складов', 'error');
+        });
+}
+
+// Загрузка деталей склада
+function loadWarehouseDetails(warehouseId) {
+    referenceFetch('warehouse_details', warehouseId)
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                console.error('Ошибка загрузки деталей склада:', data.error);
+                return;
+            }
+            
+            const warehouseName = document.getElementById('warehouseName');
+            const warehouseAddress = document.getElementById('warehouseAddress');
+            const warehousePhone = document.getElementById('warehousePhone');
+            const warehouseEmail = document.getElementById('warehouseEmail');
+            const warehouseHours = document.getElementById('warehouseHours');
+            const warehouseArea = document.getElementById('warehouseArea');
+            const addressInput = document.getElementById('addressInput');
+            const warehouseDetails = document.getElementById('warehouseDetails');
+            
+            if (warehouseName) warehouseName.textContent = data.name;
+            if (warehouseAddress) warehouseAddress.textContent = data.address;
+            if (warehousePhone) warehousePhone.textContent = data.phone;
+            if (warehouseEmail) warehouseEmail.textContent = data.email || 'Не указан';
+            if (warehouseHours) warehouseHours.textContent = data.working_hours;
+            if (warehouseArea) warehouseArea.textContent = data.available_area;
+            
+            if (warehouseDetails) {
+                warehouseDetails.style.display = 'block';
+            }
+            
+            // АВТОМАТИЧЕСКОЕ ЗАПОЛНЕНИЕ АДРЕСА
+            if (addressInput && data.address && data.address !== '-') {
+                addressInput.value = data.address;
+            }
+        })
+        .catch(error => {
+            console.error('Ошибка загрузки деталей склада:', error);
+        });
+}
+
+// ==================== ИНИЦИАЛИЗАЦИЯ ИНЛАЙН-РЕДАКТИРОВАНИЯ ====================
+
+function initInlineEditing(root = document) {
+    const editableCells = root.querySelectorAll('.editable-cell');
+    
+    editableCells.forEach(cell => {
+        cell.addEventListener('click', function(e) {
+            // Если уже в режиме редактирования, выходим
+            if (this.classList.contains('editing')) return;
+            
+            // Если кликнули на кнопку сохранения или отмены
+            if (e.target.classList.contains('save-btn') || e.target.classList.contains('cancel-btn')) return;
+            
+            // Если это статус и кликнули на badge
+            if (e.target.classList.contains('status-badge-editable')) {
+                startEditing(this);
+                return;
+            }
+            
+            // Если это ячейка адреса забора - открываем модальное окно
+            const field = this.getAttribute('data-field');
+            if (field === 'pickup_address') {
+                openAddressModal(this, field);
+                return;
+            }
+            
+            // Для остальных ячеек - двойной клик
+            if (e.detail === 2) {
+                startEditing(this);
+            }
+        });
+    });
+}
+
+// Загрузка списка операторов
+function loadOperatorsList() {
+    referenceFetch('operators')
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return response.json();
+    })
+    .then(data => {
+        operatorsList = data;
+        console.log('Операторы загружены:', operatorsList.length);
+    })
+    .catch(error => {
+        console.error('Ошибка загрузки операторов:', error);
+        // Запасной вариант: статический список
+        operatorsList = [
+            {id: '', name: 'Не назначен'}
+        ];
+    });
+}
+
+// Загрузка списка складов
+function loadWarehousesList() {
+    referenceFetch('warehouses')
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return response.json();
+    })
+    .then(data => {
+        warehousesList = data;
+        console.log('Склады загружены:', warehousesList.length);
+    })
+    .catch(error => {
+        console.error('Ошибка загрузки складов:', error);
+        warehousesList = [];
+    });
+}
+
+// ==================== ФУНКЦИИ ДЛЯ ОБЫЧНОГО РЕДАКТИРОВАНИЯ ====================
+
+function startEditing(cell) {
+    // Если уже редактируем другую ячейку, сохраняем ее
+    if (editingCell && editingCell !== cell) {
+        saveCell(editingCell.querySelector('.save-btn'));
+    }
+    
+    const field = cell.getAttribute('data-field');
+    const originalValue = cell.getAttribute('data-original') || '';
+    const type = cell.getAttribute('data-type') || 'text';
+    const isStatusCell = field === 'status';
+    const isOperatorCell = field === 'operator' || field === 'receiving_operator';
+    const isWarehouseCell = field === 'receiving_warehouse';
+    
+    // Сохраняем оригинальное содержимое
+    cell.setAttribute('data-original-content', cell.innerHTML);
+    cell.classList.add('editing');
+    editingCell = cell;
+    
+    let inputElement;
+    
+    if (type === 'select' || isStatusCell || isOperatorCell || isWarehouseCell) {
+        inputElement = document.createElement('select');
+        inputElement.className = 'editable-select';
+        
+        // Опции для статусов
+        let options = [];
+        if (field === 'status') {
+            options = [
+                {value: 'ready', text: 'Готова к выдаче'},
+                {value: 'payment', text: 'На оплате'},
+                {value: 'in_transit', text: 'В пути'},  
+                {value: 'accepted', text: 'Принята'},
+            ];
+        } else if (field === 'operator' || field === 'receiving_operator') {
+            // Опции для оператора
+            options = [
+                {value: '', text: 'Не назначен'}
+            ];
+            // Добавляем операторов из списка
+            operatorsList.forEach(operator => {
+                options.push({
+                    value: operator.id,
+                    text: operator.full_name || operator.username
+                });
+            });
+        } else if (field === 'receiving_warehouse') {
+            // Опции для склада
+            options = [
+                {value: '', text: 'Не выбран'}
+            ];
+            // Добавляем склады из списка
+            warehousesList.forEach(warehouse => {
+                options.push({
+                    value: warehouse.id,
+                    text: warehouse.name
+                });
+            });
+        } else {
+            // Для других селектов
+            options = [{value: originalValue, text: originalValue}];
+        }
+        
+        options.forEach(opt => {
+            const option = document.createElement('option');
+            option.value = opt.value;
+            option.textContent = opt.text;
+            if (opt.value.toString() === originalValue.toString()) {
+                option.selected = true;
+            }
+            inputElement.appendChild(option);
+        });
+    } else if (type === 'date') {
+        inputElement = document.createElement('input');
+        inputElement.type = 'date';
+        inputElement.className = 'editable-date';
+        inputElement.value = originalValue;
+    } else if (type === 'number') {
+        inputElement = document.createElement('input');
+        inputElement.type = 'number';
+        inputElement.className = 'editable-input';
+        inputElement.value = originalValue;
+        inputElement.min = field === 'quantity' ? '1' : '0';
+        inputElement.step = '1';
+    } else {
+        inputElement = document.createElement('input');
+        inputElement.type = 'text';
+        inputElement.className = 'editable-input';
+        inputElement.value = originalValue;
+    }
+    
+    // Создаем контейнер для input
+    const inputContainer = document.createElement('div');
+    inputContainer.className = 'inline-input-container';
+    inputContainer.appendChild(inputElement);
+    
+    // Очищаем ячейку и добавляем input
+    cell.innerHTML = '';
+    cell.appendChild(inputContainer);
+    
+    // Фокус на поле ввода
+    inputElement.focus();
+    
+    // Обработка нажатия Enter и Escape
+    inputElement.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter') {
+            saveCell(cell);
+        } else if (e.key === 'Escape') {
+            cancelEditing(cell);
+        }
+    });
+    
+    // Сохранение при потере фокуса
+    inputElement.addEventListener('blur', function() {
+        setTimeout(() => {
+            if (!cell.contains(document.activeElement)) {
+                saveCell(cell);
+            }
+        }, 100);
+    });
+}
+
+function startEditStatus(statusBadge) {
+    const cell = statusBadge.closest('.editable-cell');
+    startEditing(cell);
+}
+
+function saveCell(cell) {
+    // Если cell - это кнопка, находим родительскую ячейку
+    if (cell.tagName === 'BUTTON') {
+        cell = cell.parentElement;
+    }
+    
+    const inputElement = cell.querySelector('input, select');
+    if (!inputElement) return;
+    
+    const newValue = inputElement.value;
+    const field = cell.getAttribute('data-field');
+    const orderId = cell.closest('tr').getAttribute('data-order-id');
+    const type = cell.getAttribute('data-type') || 'text';
+    
+    // Валидация
+    if (field === 'quantity' && (!newValue || parseInt(newValue) < 1)) {
+        showNotification('Количество мест должно быть не менее 1', 'error');
+        return;
+    }
+    
+    // Для оператора и склада: если пустое значение, отправляем null
+    let valueToSend = newValue;
+    if ((field === 'operator' || field === 'receiving_operator' || field === 'receiving_warehouse') && newValue === '') {
+        valueToSend = null;
+    }
+    
+    // Отправка на сервер
+    saveToServer(orderId, field, valueToSend, cell, type);
+}
+
+function saveToServer(orderId, field, value, cell, type) {
+    const url = pageConfig.urls.pickup_order_update_field.replace('0', orderId);
+    const csrfToken = getCookie('csrftoken');
+    
+    // Показываем индикатор загрузки
+    cell.classList.add('loading');
+    
+    fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        body: JSON.stringify({
+            field: field,
+            value: value
+        })
+    })
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return response.json();
+    })
+    .then(data => {
+        cell.classList.remove('loading');
+        
+        if (data.success) {
+            let displayValue = data.display_value;
+            
+            // Для оператора получаем имя из списка
+            if (field === 'operator' || field === 'receiving_operator') {
+                const operator = operatorsList.find(op => op.id.toString() === value);
+                displayValue = operator ? operator.full_name || operator.username : '';
+            }
+            
+            // Для склада получаем имя из списка
+            if (field === 'receiving_warehouse') {
+                const warehouse = warehousesList.find(wh => wh.id.toString() === value);
+                displayValue = warehouse ? warehouse.name : '';
+            }
+            
+            updateCellDisplay(cell, field, value, displayValue, type);
+            showNotification('Изменения сохранены', 'success');
+            editingCell = null;
+        } else {
+            showNotification('Ошибка: ' + data.error, 'error');
+            cancelEditing(cell);
+        }
+    })
+    .catch(error => {
+        cell.classList.remove('loading');
+        console.error('Error:', error);
+        showNotification('Ошибка сети при сохранении: ' + error.message, 'error');
+        cancelEditing(cell);
+    });
+}
+
+function updateCellDisplay(cell, field, value, displayValue, type) {
+    cell.classList.remove('editing');
+    
+    if (field === 'status') {
+        // Обновляем badge статуса
+        const statusClass = `status-${value}`;
+        
+        cell.innerHTML = `
+            <span class="status-badge-editable ${statusClass}" onclick="startEditStatus(this)">
+                ${displayValue || value}
+            </span>
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    } else if (field === 'operator' || field === 'receiving_operator') {
+        // Обновляем отображение оператора
+        let operatorName = '-';
+        if (value && displayValue) {
+            operatorName = displayValue;
+        } else if (value) {
+            // Пытаемся найти имя оператора по ID
+            const operator = operatorsList.find(op => op.id.toString() === value.toString());
+            operatorName = operator ? (operator.full_name || operator.username) : `Оператор #${value}`;
+        }
+        
+        cell.innerHTML = `
+            <span class="operator-name">${operatorName}</span>
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value || '');
+    } else if (field === 'receiving_warehouse') {
+        // Обновляем отображение склада
+        let warehouseName = '-';
+        if (value && displayValue) {
+            warehouseName = displayValue;
+        } else if (value) {
+            // Пытаемся найти имя склада по ID
+            const warehouse = warehousesList.find(wh => wh.id.toString() === value.toString());
+            warehouseName = warehouse ? warehouse.name : `Склад #${value}`;
+        }
+        
+        cell.innerHTML = `
+            <span class="warehouse-name">${warehouseName}</span>
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value || '');
+    } else if (field === 'pickup_date' || field === 'desired_delivery_date') { 
+        // Форматируем дату для отображения
+        let displayText = '-';
+        if (value) {
+            const date = new Date(value);
+            if (!isNaN(date)) {
+                displayText = date.toLocaleDateString('ru-RU');
+            }
+        }
+        cell.innerHTML = `
+            ${displayText}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    } else if (field === 'invoice_number') {
+        if (!value || value.trim() === '') {
+            cell.innerHTML = `
+                <span class="text-muted">-</span>
+                <button class="save-btn" onclick="saveCell(this)">✓</button>
+                <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+            `;
+        } else {
+            cell.innerHTML = `
+                <span class="invoice-number">${value}</span>
+                <button class="save-btn" onclick="saveCell(this)">✓</button>
+                <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+            `;
+        }
+        cell.setAttribute('data-original', value);
+    } else if (field === 'pickup_address') {
+        const addressText = value || '';
+        const displayText = addressText.length > 30 ? addressText.substring(0, 30) + '...' : addressText;
+        
+        let badgeHtml = '';
+        const existingBadge = cell.querySelector('.badge.bg-info');
+        if (existingBadge) {
+            badgeHtml = existingBadge.outerHTML;
+        }
+        
+        cell.innerHTML = `
+            ${displayText}
+            ${badgeHtml}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+        cell.setAttribute('data-full-address', value);
+    } else if (field === 'client_name') {
+        cell.innerHTML = `
+            ${value.length > 20 ? value.substring(0, 20) + '...' : value}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    } else if (field === 'quantity') {
+        cell.innerHTML = `
+            ${value}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    } else {
+        cell.innerHTML = `
+            ${value}
+            <button class="save-btn" onclick="saveCell(this)">✓</button>
+            <button class="cancel-btn" onclick="cancelEditing(this.parentElement)">✗</button>
+        `;
+        cell.setAttribute('data-original', value);
+    }
+}
+
+function cancelEditing(cell) {
+    const originalContent = cell.getAttribute('data-original-content');
+    if (originalContent) {
+        cell.innerHTML = originalContent;
+    }
+    cell.classList.remove('editing');
+    editingCell = null;
+}
+
+// ==================== ОБЩИЕ ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ ====================
+
+function showNotification(message, type) {
+    // Удаляем старые уведомления
+    const oldNotifications = document.querySelectorAll('.notification-alert');
+    oldNotifications.forEach(alert => {
+        const bsAlert = new bootstrap.Alert(alert);
+        bsAlert.close();
+    });
+    
+    // Создаем новое уведомление
+    const alert = document.createElement('div');
+    alert.className = `alert alert-${type === 'success' ? 'success' : 'danger'} alert-dismissible fade show notification-alert`;
+    alert.style.cssText = `
+        position: fixed;
+        top: 100px;
+        right: 20px;
+        z-index: 9999;
+        min-width: 300px;
+        max-width: 400px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+    `;
+    alert.innerHTML = `
+        <div class="d-flex align-items-center">
+            ${type === 'success' ? 
+                '<i class="bi bi-check-circle-fill me-2 fs-5"></i>' : 
+                '<i class="bi bi-exclamation-circle-fill me-2 fs-5"></i>'
+            }
+            <div>${message}</div>
+        </div>
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+    
+    // Вставляем в body
+    document.body.appendChild(alert);
+    
+    // Автоматически скрываем через 3 секунды
+    setTimeout(() => {
+        if (alert.parentNode) {
+            const bsAlert = new bootstrap.Alert(alert);
+            bsAlert.close();
+        }
+    }, 3000);
+}
+
+// Функция для получения CSRF токена
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// Глобальные функции для использования в onclick
+window.saveCell = saveCell;
+window.cancelEditing = cancelEditing;
+window.startEditStatus = startEditStatus;
+window.openAddressModal = openAddressModal;
+
+// Обработка нажатия Enter для сохранения при редактировании
+document.addEventListener('keydown', function(e) {
+    // Если нажат Enter и фокус в поле ввода
+    if (e.key === 'Enter' && 
+        (e.target.type === 'time' || 
+         e.target.classList.contains('editable-time') ||
+         e.target.classList.contains('editable-date') ||
+         e.target.classList.contains('editable-select') ||
+         e.target.classList.contains('editable-input'))) {
+        
+        // Проверяем, находимся ли мы в режиме редактирования
+        const editingCell = e.target.closest('.editable-cell.editing');
+        if (editingCell) {
+            e.preventDefault();
+            e.stopPropagation();
+            saveCell(editingCell);
+        }
+    }
+});
+
+// Инициализация при загрузке страницы
+document.addEventListener('DOMContentLoaded', function() {
+    // Проверяем, является ли пользователь оператором
+    const isOperator = pageConfig.isOperator;
+    
+    if (!isOperator) {
+        initInlineEditing();
+        initAddressModal();
+        loadOperatorsList();
+        loadWarehousesList();
+    }
+    
+    // Инициализация массового редактирования (для всех, кроме операторов)
+    if (!isOperator) {
+        loadBulkEditData();
+        initBulkEditing();
+        initBulkConvert();
+    }
+    
+    // Обновляем кнопку массового редактирования при изменении выбора
+    document.addEventListener('change', function(e) {
+        if (e.target.classList.contains('order-checkbox')) {
+            updateBulkEditButton();
+        }
+    });
+    
+    // Инициализация состояния кнопки массового редактирования
+    updateBulkEditButton();
+});
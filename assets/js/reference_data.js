@@ -0,0 +1,49 @@
+// Справочники страницы (города, склады, логисты, операторы) одним запросом.
+// Ответ загружается один раз на страницу, дальше выборки делаются на клиенте;
+// повторная загрузка страницы перепроверяет его по ETag (304 без тела).
+
+let referenceDataPromise = null;
+
+function loadReferenceData() {
+    if (!referenceDataPromise) {
+        referenceDataPromise = fetch(pageConfig.urls.reference_data_json)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .catch(error => {
+                // Следующий вызов попробует загрузить заново
+                referenceDataPromise = null;
+                throw error;
+            });
+    }
+    return referenceDataPromise;
+}
+
+function warehouseWithCity(warehouse) {
+    return {...warehouse, name: `${warehouse.name} (${warehouse.city})`};
+}
+
+// Выборки в формате прежних эндпоинтов (cities_json, warehouses_json и т.д.)
+const referenceSelectors = {
+    cities: data => data.cities,
+    warehouses: data => data.warehouses.map(warehouseWithCity),
+    warehouses_by_city: (data, cityId) => data.warehouses
+        .filter(warehouse => warehouse.city_id === Number(cityId))
+        .map(warehouseWithCity),
+    warehouse_details: (data, warehouseId) =>
+        data.warehouses.find(warehouse => warehouse.id === Number(warehouseId))
+        || {error: 'Склад не найден'},
+    logistics: data => data.logistics,
+    operators: data => data.operators.map(user => ({...user, full_name: user.short_name})),
+};
+
+// Результат в виде ответа fetch: вызовы .then(response => response.json()) не меняются
+function referenceFetch(name, arg) {
+    return loadReferenceData().then(data => {
+        const result = referenceSelectors[name](data, arg);
+        return {ok: true, status: 200, json: () => Promise.resolve(result)};
+    });
+}
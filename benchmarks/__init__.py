@@ -0,0 +1,11 @@
+"""
+Бенчмарки горячих путей CRM.
+
+Запуск (из корня проекта):
+    python -m benchmarks
+    python -m benchmarks --sizes 1000,10000,100000 --repeat 7
+    python -m benchmarks --save-baseline
+
+Данные генерируются командой generate_load_data в отдельной тестовой БД,
+отчеты пишутся в benchmarks/results/ и сравниваются с benchmarks/baseline.json.
+"""
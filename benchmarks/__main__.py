@@ -0,0 +1,210 @@
+import argparse
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "crm_logistic.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.runner import DiscoverRunner  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from benchmarks import report as report_module  # noqa: E402
+from benchmarks.cases import CASES, Context, SkipCase  # noqa: E402
+from monitoring.metrics import QueryTimer, percentile  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Бенчмарки горячих путей CRM"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="Размеры набора данных (число доставок и заборов), через запятую",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Замеров на сценарий")
+    parser.add_argument(
+        "--cases", default="", help="Только указанные сценарии, через запятую"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Рост медианы, считающийся регрессией (0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Сохранить результаты как новую базовую линию",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Завершиться с кодом 1 при регрессиях",
+    )
+    return parser.parse_args()
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=PROJECT_ROOT,
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def create_user():
+    from django.contrib.auth.models import User
+
+    user = User.objects.create_superuser("bench_admin", password="bench123")
+    user.profile.role = "admin"
+    user.profile.save()
+    return user
+
+
+def run_case(func, ctx, repeat):
+    """Один прогон с подсчетом SQL-запросов (он же прогрев) и repeat замеров"""
+    # Счетчик через execute_wrapper: CaptureQueriesContext сбрасывается
+    # сигналом request_started при запросах тестового клиента
+    sample = {"query_count": 0, "query_ms": 0.0}
+    try:
+        with connection.execute_wrapper(QueryTimer(sample)):
+            func(ctx)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(ctx)
+            timings.append((time.perf_counter() - start) * 1000)
+    except SkipCase as e:
+        return {"skipped": str(e)}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {str(e)[:100]}"}
+
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+        "min_ms": round(timings[0], 2),
+        "queries": sample["query_count"],
+    }
+
+
+def run_size(size, cases, args):
+    print(f"\n📊 Набор данных: {size} доставок / {size} заборов")
+    call_command(
+        "generate_load_data",
+        deliveries=size,
+        pickups=size,
+        counterparties=max(50, size // 20),
+        warehouses=50,
+        seed=args.seed,
+        clear=True,
+        verbosity=0,
+    )
+
+    from django.contrib.auth.models import User
+
+    User.objects.filter(username="bench_admin").delete()
+    client = Client()
+    user = create_user()
+    client.force_login(user)
+    ctx = Context(client, user)
+
+    results = {}
+    for name in cases:
+        result = run_case(CASES[name], ctx, args.repeat)
+        results[name] = result
+        if "median_ms" in result:
+            print(
+                f"  ✅ {name}: {result['median_ms']:.1f} мс "
+                f"(p95 {result['p95_ms']:.1f}), SQL {result['queries']}"
+            )
+        else:
+            print(f"  ⚠️ {name}: {result.get('error') or result.get('skipped')}")
+    return results
+
+
+def main():
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    cases = [name for name in args.cases.split(",") if name] or list(CASES)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        sys.exit(f"❌ Неизвестные сценарии: {', '.join(sorted(unknown))}")
+
+    started_at = datetime.now()
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "git_revision": git_revision(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+
+    # Отдельная тестовая БД и временный MEDIA_ROOT: рабочие данные не трогаем
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    old_config = runner.setup_databases()
+    media_root = tempfile.mkdtemp(prefix="crm_bench_media_")
+    try:
+        with override_settings(MEDIA_ROOT=media_root, REQUEST_METRICS_SAMPLE_RATE=0):
+            for size in sizes:
+                report["results"][str(size)] = run_size(size, cases, args)
+    finally:
+        runner.teardown_databases(old_config)
+        shutil.rmtree(media_root, ignore_errors=True)
+
+    baseline = report_module.load_baseline()
+    regressions = report_module.compare(report, baseline, args.threshold)
+
+    stamp = started_at.strftime("%Y%m%d_%H%M%S")
+    json_path = report_module.RESULTS_DIR / f"{stamp}.json"
+    md_path = report_module.RESULTS_DIR / f"{stamp}.md"
+    report_module.save_json(report, json_path)
+    md_path.write_text(
+        report_module.to_markdown(report, args.threshold), encoding="utf-8"
+    )
+    print(f"\n📄 Отчет: {md_path.relative_to(PROJECT_ROOT)}")
+
+    if args.save_baseline:
+        report_module.save_json(report, report_module.BASELINE_PATH)
+        print(f"💾 Базовая линия: {report_module.BASELINE_PATH.relative_to(PROJECT_ROOT)}")
+    elif baseline is None:
+        print("ℹ️ Базовой линии нет, сохраните ее флагом --save-baseline")
+
+    for size, name, delta in regressions:
+        print(f"⚠️ Регрессия: {name} на {size}: {delta:+.0%}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
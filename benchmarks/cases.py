@@ -0,0 +1,148 @@
+from datetime import date, timedelta
+
+from django.urls import reverse
+
+# Сценарии в порядке запуска: имя -> функция(ctx)
+CASES = {}
+
+
+class SkipCase(Exception):
+    """Сценарий нельзя выполнить в текущем окружении"""
+
+
+def case(name):
+    def decorator(func):
+        CASES[name] = func
+        return func
+
+    return decorator
+
+
+def require_weasyprint():
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        # WeasyPrint без системных библиотек (pango) не загружается
+        raise SkipCase("WeasyPrint недоступен")
+
+
+def check_response(response):
+    if response.status_code != 200:
+        raise AssertionError(f"HTTP {response.status_code}")
+    return response
+
+
+@case("order_create")
+def order_create(ctx):
+    """DeliveryOrder.save(): сквозной номер и QR-код"""
+    from logistic.models import DeliveryOrder
+
+    DeliveryOrder(
+        shipped_at=ctx.today,
+        delivery_date=ctx.today + timedelta(days=2),
+        sender_id=ctx.counterparty_id,
+        pickup_address="Москва, ул. Тверская, д. 10",
+        delivery_address="Казань, ул. Баумана, д. 45",
+        quantity=3,
+        weight=120.5,
+        volume=1.2,
+        operator=ctx.user,
+    ).save()
+
+
+@case("delivery_list")
+def delivery_list(ctx):
+    check_response(
+        ctx.client.get(
+            reverse("delivery_order_list"),
+            {"status": "shipped", "sort": "delivery_date", "order": "desc"},
+        )
+    )
+
+
+@case("pickup_list")
+def pickup_list(ctx):
+    check_response(
+        ctx.client.get(
+            reverse("pickup_order_list"),
+            {"status": "accepted", "sort": "pickup_date", "order": "desc"},
+        )
+    )
+
+
+@case("dashboard")
+def dashboard(ctx):
+    check_response(ctx.client.get(reverse("dashboard")))
+
+
+@case("statistics_report")
+def statistics_report(ctx):
+    check_response(
+        ctx.client.get(
+            reverse("statistics_report"),
+            {
+                "start_date": (ctx.today - timedelta(days=30)).isoformat(),
+                "end_date": ctx.today.isoformat(),
+                "report_type": "delivery",
+            },
+        )
+    )
+
+
+@case("excel_report")
+def excel_report(ctx):
+    from logistic.views import generate_excel_report
+
+    generate_excel_report(ctx.today, "delivery", {})
+
+
+@case("pdf_single")
+def pdf_single(ctx):
+    require_weasyprint()
+    from logistic.models import DeliveryOrder
+    from logistic.pdf_utils import create_delivery_order_pdf
+
+    if not create_delivery_order_pdf(DeliveryOrder.objects.get(pk=ctx.delivery_ids[0])):
+        raise AssertionError("PDF не создан")
+
+
+@case("pdf_bulk")
+def pdf_bulk(ctx):
+    require_weasyprint()
+    check_response(
+        ctx.client.get(
+            reverse("delivery_orders_bulk_pdf"), {"order_ids": ctx.delivery_ids}
+        )
+    )
+
+
+@case("counterparty_search")
+def counterparty_search(ctx):
+    check_response(
+        ctx.client.get(reverse("counterparties_public_search"), {"search": "ООО"})
+    )
+
+
+@case("cities_with_warehouses")
+def cities_with_warehouses(ctx):
+    from order_form.views import get_cities_with_warehouses_data
+
+    get_cities_with_warehouses_data()
+
+
+class Context:
+    """Общие объекты сценариев для одного размера набора данных"""
+
+    BULK_PDF_COUNT = 20
+
+    def __init__(self, client, user):
+        from counterparties.models import Counterparty
+        from logistic.models import DeliveryOrder
+
+        self.client = client
+        self.user = user
+        self.today = date.today()
+        self.counterparty_id = Counterparty.objects.values_list("pk", flat=True).first()
+        self.delivery_ids = list(
+            DeliveryOrder.objects.values_list("pk", flat=True)[: self.BULK_PDF_COUNT]
+        )
@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_json(data, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def compare(report, baseline, threshold):
+    """
+    Добавляет к каждому результату медиану из базовой линии и изменение в %.
+    Возвращает список регрессий (медиана выросла больше чем на threshold).
+    """
+    regressions = []
+    baseline_results = (baseline or {}).get("results", {})
+
+    for size, cases in report["results"].items():
+        for name, result in cases.items():
+            base = baseline_results.get(size, {}).get(name, {})
+            if "median_ms" not in result or "median_ms" not in base:
+                continue
+
+            result["baseline_ms"] = base["median_ms"]
+            if base["median_ms"]:
+                delta = (result["median_ms"] - base["median_ms"]) / base["median_ms"]
+                result["delta"] = round(delta, 3)
+                if delta > threshold:
+                    regressions.append((size, name, delta))
+
+    return regressions
+
+
+def to_markdown(report, threshold):
+    meta = report["meta"]
+    lines = [
+        f"# Бенчмарки CRM ({meta['started_at']})",
+        "",
+        f"Python {meta['python']}, Django {meta['django']}, БД {meta['database']}, "
+        f"коммит {meta['git_revision'] or '-'}, повторов {meta['repeat']}",
+        "",
+        "| Размер | Сценарий | Медиана, мс | p95, мс | SQL | База, мс | Изменение |",
+        "|---:|---|---:|---:|---:|---:|---:|",
+    ]
+
+    for size, cases in report["results"].items():
+        for name, result in cases.items():
+            if "error" in result:
+                lines.append(f"| {size} | {name} | ❌ {result['error']} | | | | |")
+                continue
+            if "skipped" in result:
+                lines.append(f"| {size} | {name} | ⏭️ {result['skipped']} | | | | |")
+                continue
+
+            delta = result.get("delta")
+            if delta is None:
+                delta_text = ""
+            else:
+                mark = " ⚠️" if delta > threshold else ""
+                delta_text = f"{delta:+.0%}{mark}"
+
+            lines.append(
+                f"| {size} | {name} | {result['median_ms']:.1f} | {result['p95_ms']:.1f} "
+                f"| {result['queries']} | {result.get('baseline_ms', '')} | {delta_text} |"
+            )
+
+    lines.append("")
+    return "\n".join(lines)
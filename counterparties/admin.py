@@ -1,9 +1,12 @@
 from django.contrib import admin
+
+from utils.changelist import SearchTextAdminMixin
+
 from .models import Counterparty
 
 
 @admin.register(Counterparty)
-class CounterpartyAdmin(admin.ModelAdmin):
+class CounterpartyAdmin(SearchTextAdminMixin, admin.ModelAdmin):
     list_display = [
         "name",
         "type",
@@ -21,16 +24,9 @@ class CounterpartyAdmin(admin.ModelAdmin):
         "is_carrier",
         "created_at",
     ]
-    search_fields = [
-        "name",
-        "full_name",
-        "inn",
-        "kpp",
-        "ogrn",
-        "phone",
-        "email",
-        "address",
-    ]
+    # Ищется по search_text (SEARCH_FIELDS модели), список нужен для поля поиска
+    # и autocomplete_fields заявок
+    search_fields = ["search_text"]
     readonly_fields = ["created_at", "updated_at"]
 
     fieldsets = (
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:59
+
+from django.db import migrations, models
+
+from utils.search_text import fill_search_text
+
+SEARCH_FIELDS = ('name', 'full_name', 'inn', 'kpp', 'ogrn', 'phone', 'email', 'address')
+
+
+def fill(apps, schema_editor):
+    # Текст для поиска у уже существующих записей
+    Counterparty = apps.get_model("counterparties", "Counterparty")
+    fill_search_text(Counterparty.objects.all(), SEARCH_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('counterparties', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='counterparty',
+            name='search_text',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=500, verbose_name='Текст для поиска'),
+        ),
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
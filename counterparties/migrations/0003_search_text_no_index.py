@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('counterparties', '0002_search_text'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='counterparty',
+            name='search_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=500, verbose_name='Текст для поиска'),
+        ),
+    ]
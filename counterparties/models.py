@@ -3,8 +3,10 @@ from django.conf import settings
 from django.utils import timezone
 from django.core.validators import RegexValidator
 
+from utils.search_text import SEARCH_TEXT_MAX_LENGTH, SearchTextMixin, SearchTextQuerySet
 
-class Counterparty(models.Model):
+
+class Counterparty(SearchTextMixin, models.Model):
     """Контрагент (Отправитель/Получатель)"""
     
     TYPE_CHOICES = [
@@ -186,6 +188,18 @@ class Counterparty(models.Model):
         auto_now=True,
         verbose_name='Дата обновления'
     )
+    search_text = models.CharField(
+        max_length=SEARCH_TEXT_MAX_LENGTH,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='Текст для поиска'
+    )
+    
+    # Поля, из которых собирается search_text (поиск в админке и Select2)
+    SEARCH_FIELDS = ('name', 'full_name', 'inn', 'kpp', 'ogrn', 'phone', 'email', 'address')
+    
+    objects = SearchTextQuerySet.as_manager()
     
     class Meta:
         verbose_name = 'Контрагент'
@@ -1,4 +1,5 @@
 import json
+from django.conf import settings
 from django.http import JsonResponse
 from django.db.models import Q
 from django.views.decorators.http import require_GET, require_POST
@@ -8,6 +9,15 @@ from .models import Counterparty
 from counterparties import models
 
 
+def _search_limit(request, default):
+    """Число результатов поиска из параметра limit, не больше COUNTERPARTY_SEARCH_LIMIT"""
+    try:
+        limit = int(request.GET.get("limit", default))
+    except ValueError:
+        limit = default
+    return max(1, min(limit, settings.COUNTERPARTY_SEARCH_LIMIT))
+
+
 @require_GET
 @login_required
 def get_counterparties_json(request):
@@ -28,8 +38,11 @@ def get_counterparties_json(request):
     if counterparty_type:
         queryset = queryset.filter(type=counterparty_type)
 
+    # Список выводится виджетом поиска, поэтому возвращаем только первые совпадения
+    limit = _search_limit(request, settings.COUNTERPARTY_SEARCH_LIMIT)
+
     data = []
-    for counterparty in queryset.order_by("name"):
+    for counterparty in queryset.order_by("name")[:limit]:
         data.append(
             {
                 "id": counterparty.id,
@@ -122,15 +135,11 @@ def get_counterparty_details_json(request, pk):
 def search_counterparties_public(request):
     """Поиск контрагентов для публичных форм (без авторизации)"""
     search_term = request.GET.get("search", "")
-    limit = request.GET.get("limit", 10)
 
     if not search_term or len(search_term) < 2:
         return JsonResponse([], safe=False)
 
-    try:
-        limit = int(limit)
-    except ValueError:
-        limit = 10
+    limit = _search_limit(request, 10)
 
     queryset = Counterparty.objects.filter(is_active=True).filter(
         Q(name__icontains=search_term)
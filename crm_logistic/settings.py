@@ -35,11 +35,9 @@ if IS_PRODUCTION:
         "fftzar-crm.ru",
         "www.fftzar-crm.ru",
     ]
-    print("⚙️  Загружены ПРОДАКШЕН настройки")
 else:
     DEBUG = True
     ALLOWED_HOSTS = ["localhost", "127.0.0.1", "0.0.0.0"]
-    print("🔧 Загружены РАЗРАБОТОЧНЫЕ настройки")
 
 
 INSTALLED_APPS = [
@@ -56,14 +54,19 @@ INSTALLED_APPS = [
     "order_form.apps.OrderFormConfig",
     "warehouses.apps.WarehousesConfig",
     "counterparties.apps.CounterpartiesConfig",
+    "monitoring.apps.MonitoringConfig",
+    "sync.apps.SyncConfig",
 ]
 
 MIDDLEWARE = [
+    "monitoring.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "users.middleware.RolesMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -83,6 +86,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "django.template.context_processors.media",
+                "utils.vendor_assets.vendor_assets",
             ],
         },
     },
@@ -91,6 +95,23 @@ TEMPLATES = [
 WSGI_APPLICATION = "crm_logistic.wsgi.application"
 
 
+# Постоянные соединения с БД: сколько секунд соединение живет между
+# запросами (0 - новое на каждый запрос) и проверка его перед повторным
+# использованием. Значение должно быть меньше wait_timeout MySQL
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+DB_CONN_HEALTH_CHECKS = str_to_bool(os.getenv("DB_CONN_HEALTH_CHECKS", "True"))
+
+# Пул соединений MySQL (пакет django-db-connection-pool): общий пул процесса
+# вместо соединения на поток - для gunicorn с потоками. Размер, допустимое
+# превышение и время жизни соединения в пуле (сек)
+MYSQL_POOL = str_to_bool(os.getenv("MYSQL_POOL", "False"))
+MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "10"))
+MYSQL_POOL_MAX_OVERFLOW = int(os.getenv("MYSQL_POOL_MAX_OVERFLOW", "10"))
+MYSQL_POOL_RECYCLE = int(os.getenv("MYSQL_POOL_RECYCLE", "300"))
+
+# SQLite для разработки: сколько секунд ждать блокировку записи
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "20"))
+
 if IS_PRODUCTION:
     DATABASES = {
         "default": {
@@ -100,21 +121,44 @@ if IS_PRODUCTION:
             "PASSWORD": os.getenv("MYSQL_PASSWORD", ""),
             "HOST": os.getenv("MYSQL_HOST", "localhost"),
             "PORT": os.getenv("MYSQL_PORT", "3306"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
             "OPTIONS": {
                 "charset": "utf8mb4",
                 "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
             },
         }
     }
-    print(f"📊 База данных: MySQL ({os.getenv('MYSQL_DATABASE')})")
+    if MYSQL_POOL:
+        # Соединения держит пул, Django при закрытии возвращает их в пул
+        DATABASES["default"].update(
+            ENGINE="dj_db_conn_pool.backends.mysql",
+            CONN_MAX_AGE=0,
+            POOL_OPTIONS={
+                "POOL_SIZE": MYSQL_POOL_SIZE,
+                "MAX_OVERFLOW": MYSQL_POOL_MAX_OVERFLOW,
+                "RECYCLE": MYSQL_POOL_RECYCLE,
+                "pre_ping": DB_CONN_HEALTH_CHECKS,
+            },
+        )
 else:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
+            "OPTIONS": {
+                # WAL: чтение не ждет записи, как в MySQL; запись берет
+                # блокировку сразу (IMMEDIATE) и ждет ее до busy timeout,
+                # поэтому нагрузочные тесты показывают конфликты записи, а не
+                # мгновенные "database is locked"
+                "timeout": SQLITE_BUSY_TIMEOUT,
+                "transaction_mode": "IMMEDIATE",
+                "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+            },
         }
     }
-    print(f"📊 База данных: SQLite ({BASE_DIR / 'db.sqlite3'})")
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -143,7 +187,25 @@ USE_TZ = True
 
 
 STATIC_URL = "/static/"
-STATICFILES_DIRS = []
+
+# Исходники статики проекта: бандлы страниц (css/, js/) и скачанные
+# командой fetch_vendor_assets библиотеки (vendor/)
+ASSETS_DIR = BASE_DIR / "assets"
+STATICFILES_DIRS = [ASSETS_DIR]
+
+# В продакшене collectstatic добавляет хеш содержимого в имена файлов и
+# создает .gz/.br копии, а WhiteNoise отдает их с кэшем на год
+if IS_PRODUCTION:
+    STORAGES = {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {
+            "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        },
+    }
+
+# Подключать Bootstrap, иконки, jQuery и Select2 из своей статики (файлы,
+# которых там нет, - с CDN); 0 - все с CDN
+VENDOR_ASSETS_LOCAL = os.getenv("VENDOR_ASSETS_LOCAL", "1") == "1"
 
 if not os.path.exists(os.path.join(BASE_DIR, "static")):
     os.makedirs(os.path.join(BASE_DIR, "static"))
@@ -160,8 +222,6 @@ if IS_PRODUCTION:
 else:
     SITE_URL = "http://localhost:8000"
 
-print(f"🌐 SITE_URL: {SITE_URL}")
-
 if IS_PRODUCTION:
     EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
     EMAIL_HOST = "localhost" 
@@ -171,16 +231,228 @@ if IS_PRODUCTION:
     EMAIL_HOST_USER = ""
     EMAIL_HOST_PASSWORD = ""
     DEFAULT_FROM_EMAIL = "noreply@fftzar-crm.ru"
-    print("📧 Email: SMTP (продакшен)")
 else:
     EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
-    print("📧 Email: Console (разработка)")
 
-if IS_PRODUCTION:
-    required_vars = ["SECRET_KEY", "MYSQL_DATABASE", "MYSQL_USER", "MYSQL_PASSWORD"]
-    missing = [var for var in required_vars if not os.getenv(var)]
-    if missing:
-        print(f"⚠️  ВНИМАНИЕ: Отсутствуют переменные окружения: {missing}")
+# Переменные окружения, без которых продакшен не работает (проверяются при
+# старте, см. utils.log.log_startup)
+REQUIRED_ENV_VARS = ["SECRET_KEY", "MYSQL_DATABASE", "MYSQL_USER", "MYSQL_PASSWORD"]
+
+
+# Инструментирование запросов: доля запросов в выборке (0 - выключено),
+# размер кольцевого буфера, интервал сброса (сек) и приемник: db или jsonl
+REQUEST_METRICS_SAMPLE_RATE = float(os.getenv("REQUEST_METRICS_SAMPLE_RATE", "0"))
+REQUEST_METRICS_BUFFER_SIZE = int(os.getenv("REQUEST_METRICS_BUFFER_SIZE", "5000"))
+REQUEST_METRICS_FLUSH_INTERVAL = int(os.getenv("REQUEST_METRICS_FLUSH_INTERVAL", "60"))
+REQUEST_METRICS_SINK = os.getenv("REQUEST_METRICS_SINK", "db")
+REQUEST_METRICS_JSONL_PATH = os.getenv(
+    "REQUEST_METRICS_JSONL_PATH", os.path.join(BASE_DIR, "logs", "request_metrics.jsonl")
+)
+# Сколько дней хранить замеры в БД (manage.py purge_request_samples) и за
+# сколько последних дней строится сводка по URL в админке
+REQUEST_METRICS_RETENTION_DAYS = int(os.getenv("REQUEST_METRICS_RETENTION_DAYS", "30"))
+REQUEST_METRICS_STATS_DAYS = int(os.getenv("REQUEST_METRICS_STATS_DAYS", "7"))
+
+# Inline-редактирование: время жизни кэша справочников (сек) и размер пакета правок
+INLINE_EDIT_LOOKUP_TTL = int(os.getenv("INLINE_EDIT_LOOKUP_TTL", "300"))
+INLINE_EDIT_MAX_BATCH = int(os.getenv("INLINE_EDIT_MAX_BATCH", "100"))
+
+# Время жизни кэша ролей пользователя (request.roles), сек
+ROLES_CACHE_TTL = int(os.getenv("ROLES_CACHE_TTL", "600"))
+
+# Кэш справочников для выпадающих списков форм (сек) и число вариантов
+# в ответе поиска контрагентов
+REFERENCE_CACHE_TTL = int(os.getenv("REFERENCE_CACHE_TTL", "3600"))
+COUNTERPARTY_SEARCH_LIMIT = int(os.getenv("COUNTERPARTY_SEARCH_LIMIT", "50"))
+
+# Потоки для фоновых задач (QR-коды); 0 - выполнять сразу после коммита
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "2"))
+
+# Импорт заявок из CSV/XLSX: строк в пакете проверки и вставки, предел строк
+# в файле и сколько ошибок показывать пользователю
+ORDER_IMPORT_CHUNK_SIZE = int(os.getenv("ORDER_IMPORT_CHUNK_SIZE", "500"))
+ORDER_IMPORT_MAX_ROWS = int(os.getenv("ORDER_IMPORT_MAX_ROWS", "20000"))
+ORDER_IMPORT_MAX_ERRORS = int(os.getenv("ORDER_IMPORT_MAX_ERRORS", "200"))
+
+# Лента изменений для внешних систем (api/sync/): размер страницы по умолчанию
+# и максимальный, задержка выдачи свежих записей (сек) и срок хранения
+# записей об удалениях (дней)
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+SYNC_MAX_PAGE_SIZE = int(os.getenv("SYNC_MAX_PAGE_SIZE", "2000"))
+SYNC_LAG_SECONDS = int(os.getenv("SYNC_LAG_SECONDS", "5"))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90"))
+
+# PDF заявок: сколько хранить готовые байты в кэше (сек), больше какого
+# размера не кэшировать (байт) и max-age для браузера (сек, затем
+# перепроверка по ETag)
+ORDER_PDF_CACHE_TTL = int(os.getenv("ORDER_PDF_CACHE_TTL", "86400"))
+ORDER_PDF_CACHE_MAX_BYTES = int(os.getenv("ORDER_PDF_CACHE_MAX_BYTES", "2097152"))
+ORDER_PDF_MAX_AGE = int(os.getenv("ORDER_PDF_MAX_AGE", "0"))
+
+# Пакетная печать QR-этикеток: предел заявок и страниц (мест) в одном PDF
+LABEL_BATCH_MAX_ORDERS = int(os.getenv("LABEL_BATCH_MAX_ORDERS", "500"))
+LABEL_BATCH_MAX_PAGES = int(os.getenv("LABEL_BATCH_MAX_PAGES", "5000"))
+
+# Списки заявок: строк на странице по умолчанию и максимум для JSON-данных
+# таблицы (api/orders/)
+GRID_PAGE_SIZE = int(os.getenv("GRID_PAGE_SIZE", "20"))
+GRID_MAX_PAGE_SIZE = int(os.getenv("GRID_MAX_PAGE_SIZE", "200"))
+
+# Списки в админке: до скольких строк число записей считается точно (больше -
+# оценка по статистике СУБД без фильтров, предел при фильтрах)
+ADMIN_EXACT_COUNT_LIMIT = int(os.getenv("ADMIN_EXACT_COUNT_LIMIT", "10000"))
+
+# Перегенерация QR-кодов из админки: заявок в пачке и процессов для
+# кодирования PNG (меньше 2 - кодировать в потоке фоновой задачи)
+QR_REGENERATION_CHUNK_SIZE = int(os.getenv("QR_REGENERATION_CHUNK_SIZE", "200"))
+QR_REGENERATION_PROCESSES = int(os.getenv("QR_REGENERATION_PROCESSES", "2"))
+# Через сколько секунд без отметки о прогрессе задача считается брошенной
+# (воркер перезапущен) и помечается ошибкой
+QR_JOB_STALE_AFTER = int(os.getenv("QR_JOB_STALE_AFTER", "600"))
+
+# Кэш: locmem (по умолчанию, свой в каждом процессе), file (общий каталог
+# CACHE_FILE_DIR) или redis (Redis-совместимый сервер по CACHE_REDIS_URL,
+# нужен пакет redis)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+# Общий кэш (file/redis) виден всем воркерам gunicorn. С locmem у каждого
+# процесса свой кэш, и сброс записи в одном воркере не доходит до других,
+# поэтому сессии, пользователь сессии и роли тогда не кэшируются
+CACHE_SHARED = CACHE_BACKEND != "locmem"
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/1")
+CACHE_FILE_DIR = os.getenv("CACHE_FILE_DIR", str(BASE_DIR / "cache"))
+# Локальный уровень перед общим кэшем справочников (file/redis): время
+# жизни записи в памяти процесса (сек) и число записей
+CACHE_LOCAL_TTL = int(os.getenv("CACHE_LOCAL_TTL", "60"))
+CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1000"))
+# Сколько готовых документов (PDF) держать в кэше renders (locmem/file)
+CACHE_RENDERS_MAX_ENTRIES = int(os.getenv("CACHE_RENDERS_MAX_ENTRIES", "200"))
+# Сколько сессий держать в кэше sessions (locmem/file); остальные читаются из БД
+CACHE_SESSIONS_MAX_ENTRIES = int(os.getenv("CACHE_SESSIONS_MAX_ENTRIES", "10000"))
+
+
+def cache_config(name, backend="utils.caching.InstrumentedCache", **options):
+    """
+    Именованный кэш поверх бэкенда CACHE_BACKEND; обертка backend считает
+    попадания и промахи (utils.caching)
+    """
+    if CACHE_BACKEND == "redis":
+        inner = "django.core.cache.backends.redis.RedisCache"
+        location = CACHE_REDIS_URL
+    elif CACHE_BACKEND == "file":
+        inner = "django.core.cache.backends.filebased.FileBasedCache"
+        location = os.path.join(CACHE_FILE_DIR, name)
+    else:
+        inner = "django.core.cache.backends.locmem.LocMemCache"
+        location = name
+    if CACHE_BACKEND == "redis":
+        # Redis сам вытесняет записи, MAX_ENTRIES клиент не принимает
+        options.pop("MAX_ENTRIES", None)
+    return {
+        "BACKEND": backend,
+        "LOCATION": location,
+        "KEY_PREFIX": name,
+        "OPTIONS": {"BACKEND": inner, "NAME": name, **options},
+    }
+
+
+CACHES = {
+    # Версии справочников, роли и другие записи, которые сбрасываются
+    # удалением и должны сразу меняться во всех процессах
+    "default": cache_config("default"),
+    # Справочники под ключами с версиями: с общим бэкендом - еще и копия в
+    # памяти процесса
+    "reference_data": cache_config(
+        "reference_data",
+        backend=(
+            "utils.caching.InstrumentedCache"
+            if CACHE_BACKEND == "locmem"
+            else "utils.caching.TieredCache"
+        ),
+        LOCAL_TIMEOUT=CACHE_LOCAL_TTL,
+        LOCAL_MAX_ENTRIES=CACHE_LOCAL_MAX_ENTRIES,
+    ),
+    # Готовые документы (PDF заявок)
+    "renders": cache_config("renders", MAX_ENTRIES=CACHE_RENDERS_MAX_ENTRIES),
+    # Сессии (SESSION_CACHE_ALIAS) - отдельно, чтобы их не вытесняли другие записи
+    "sessions": cache_config("sessions", MAX_ENTRIES=CACHE_SESSIONS_MAX_ENTRIES),
+}
+
+# Сессии: cached_db - чтение из кэша sessions, запись и в БД (переживают
+# очистку кэша и перезапуск); cache - только кэш, без БД. Оба варианта - только
+# с общим кэшем (CACHE_SHARED), иначе сессии читаются из БД. Истекшие строки
+# удаляет команда clear_expired_sessions
+SESSION_ENGINE = os.getenv(
+    "SESSION_ENGINE",
+    "django.contrib.sessions.backends.cached_db"
+    if CACHE_SHARED
+    else "django.contrib.sessions.backends.db",
+)
+SESSION_CACHE_ALIAS = "sessions"
+
+# Пользователь сессии берется из кэша (users.backends, только при
+# CACHE_SHARED) - время жизни записи (сек). ModelBackend остается в списке:
+# сессии, созданные до смены бэкенда, хранят его путь и без него разлогинились
+# бы; такие сессии читают пользователя из БД до следующего входа
+AUTHENTICATION_BACKENDS = [
+    "users.backends.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))
+
+# Логи (utils.log): уровень (DEBUG - подробности по каждой заявке и PDF),
+# формат json (строка JSON на запись, для сборщика логов) или text, размер
+# очереди до вывода - при переполнении записи отбрасываются, запрос не ждет
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json" if IS_PRODUCTION else "text")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "utils.log.JsonFormatter"},
+        "text": {"format": "%(asctime)s %(levelname)s %(name)s: %(message)s"},
+    },
+    "filters": {
+        "require_debug_false": {"()": "django.utils.log.RequireDebugFalse"},
+    },
+    "handlers": {
+        "queue": {
+            "()": "utils.log.QueueHandler",
+            "formatter": LOG_FORMAT,
+            "queue_size": LOG_QUEUE_SIZE,
+        },
+        # Как в логировании Django по умолчанию: письма ADMINS об ошибках 500
+        "mail_admins": {
+            "level": "ERROR",
+            "filters": ["require_debug_false"],
+            "class": "django.utils.log.AdminEmailHandler",
+        },
+    },
+    "loggers": {
+        **{
+            app: {"handlers": ["queue"], "level": LOG_LEVEL, "propagate": False}
+            for app in (
+                "crm_logistic",
+                "logistic",
+                "pickup",
+                "order_form",
+                "users",
+                "warehouses",
+                "counterparties",
+                "monitoring",
+                "sync",
+                "utils",
+            )
+        },
+        "django": {
+            "handlers": ["queue", "mail_admins"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+    "root": {"handlers": ["queue"], "level": "WARNING"},
+}
 
 
 LOGIN_URL = "/accounts/login/"
@@ -31,6 +31,7 @@ urlpatterns = [
     ),
     path("warehouses/", include("warehouses.urls")),
     path("counterparties/", include("counterparties.urls")),
+    path("api/sync/", include("sync.urls")),
 ]
 
 if settings.DEBUG:
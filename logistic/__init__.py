@@ -1,8 +1,11 @@
+import logging
 import json
 from pathlib import Path
 import os
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 
 def load_email_settings():
     """Загружает настройки email из файла"""
@@ -41,7 +44,7 @@ def load_email_settings():
                     settings.OPERATOR_EMAIL = email_settings.get("operator_email", "")
 
     except Exception as e:
-        print(f"⚠️ Не удалось загрузить настройки email: {e}")
+        logger.warning("Не удалось загрузить настройки email: %s", e)
 
 
 if not os.getenv("DJANGO_PRODUCTION", False):
@@ -1,9 +1,27 @@
 from django.contrib import admin
-from .models import DeliveryOrder
+from django.shortcuts import redirect
+from django.utils.html import format_html
+
+from counterparties.models import Counterparty
+from utils.changelist import SearchTextAdminMixin
+
+from .models import DeliveryOrder, DeliveryStatusChange, QrRegenerationJob
+
+
+class DeliveryStatusChangeInline(admin.TabularInline):
+    model = DeliveryStatusChange
+    fields = ["changed_at", "from_status", "to_status", "changed_by"]
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(DeliveryOrder)
-class DeliveryOrderAdmin(admin.ModelAdmin):
+class DeliveryOrderAdmin(SearchTextAdminMixin, admin.ModelAdmin):
+    inlines = [DeliveryStatusChangeInline]
     list_display = [
         "tracking_number",
         "shipped_at",
@@ -16,18 +34,21 @@ class DeliveryOrderAdmin(admin.ModelAdmin):
         "logistic_display",
     ]
     list_filter = ["status", "delivery_date", "logistic"]
-    search_fields = [
-        "tracking_number",
-        "sender__name",
-        "pickup_address",
-        "recipient__name",
-        "delivery_address",
-        "driver_name",
-        "vehicle",
-        "logistic__username",
-        "logistic__first_name",
-        "logistic__last_name",
+    list_select_related = [
+        "sender",
+        "recipient",
+        "pickup_warehouse",
+        "delivery_warehouse",
+        "logistic",
     ]
+    autocomplete_fields = ["sender", "recipient"]
+    # Поиск: search_text заявки (SEARCH_FIELDS модели) и связанные записи
+    search_fields = ["search_text"]
+    search_related = {
+        "sender": Counterparty.objects.search,
+        "recipient": Counterparty.objects.search,
+        "logistic": ("username", "first_name", "last_name"),
+    }
     readonly_fields = [
         "qr_code_preview",
         "created_at",
@@ -125,14 +146,100 @@ class DeliveryOrderAdmin(admin.ModelAdmin):
     actions = ["regenerate_qr_codes"]
 
     def regenerate_qr_codes(self, request, queryset):
-        """Действие для перегенерации QR-кодов"""
-        count = 0
-        for order in queryset:
-            if order.regenerate_qr_code():
-                count += 1
-
-        self.message_user(
-            request, f"Перегенерировано {count} QR-кодов (только ссылка на PDF)"
-        )
+        """Действие для перегенерации QR-кодов: фоновая задача с прогрессом"""
+        job = QrRegenerationJob.start("delivery", queryset, request.user)
+        return qr_job_response(self, request, job)
 
     regenerate_qr_codes.short_description = "Перегенерировать QR-коды (ссылка на PDF)"
+
+    def save_model(self, request, obj, form, change):
+        obj.status_changed_by_id = request.user.pk
+        super().save_model(request, obj, form, change)
+
+
+def qr_job_response(model_admin, request, job):
+    """
+    Ответ действия перегенерации QR: страница задачи с прогрессом или, если
+    пользователю она недоступна, возврат к списку с сообщением
+    """
+    model_admin.message_user(
+        request, f"Перегенерация {job.total} QR-кодов поставлена в очередь"
+    )
+    if request.user.has_perm("logistic.view_qrregenerationjob"):
+        return redirect("admin:logistic_qrregenerationjob_change", job.pk)
+    return None
+
+
+@admin.register(QrRegenerationJob)
+class QrRegenerationJobAdmin(admin.ModelAdmin):
+    """Задачи перегенерации QR-кодов: страница задачи показывает прогресс"""
+
+    list_display = [
+        "created_at",
+        "kind",
+        "status",
+        "progress_display",
+        "failed",
+        "created_by",
+        "finished_at",
+    ]
+    list_filter = ["kind", "status"]
+    list_select_related = ["created_by"]
+    fields = [
+        "kind",
+        "status",
+        "progress_display",
+        "total",
+        "processed",
+        "failed",
+        "error",
+        "created_by",
+        "created_at",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+    ]
+    readonly_fields = fields
+    actions = ["restart_jobs"]
+
+    def get_queryset(self, request):
+        # Список ID заявок может быть большим и на страницах не нужен
+        return super().get_queryset(request).defer("object_ids")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        # Брошенные задачи показываются ошибкой, а не вечным "Выполняется"
+        QrRegenerationJob.objects.fail_stale()
+        return super().changelist_view(request, extra_context)
+
+    def change_view(self, request, object_id, form_url="", extra_context=None):
+        QrRegenerationJob.objects.fail_stale()
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    @admin.action(description="Запустить заново (задачи с ошибкой)")
+    def restart_jobs(self, request, queryset):
+        jobs = []
+        for job in queryset.filter(status="failed"):
+            app_label, model_name = job.KIND_MODELS[job.kind].lower().split(".")
+            if request.user.has_perm(f"{app_label}.change_{model_name}"):
+                jobs.append(job.restart(request.user))
+        self.message_user(request, f"Запущено задач заново: {len(jobs)}")
+        if len(jobs) == 1:
+            return redirect("admin:logistic_qrregenerationjob_change", jobs[0].pk)
+        return None
+
+    def progress_display(self, obj):
+        return format_html(
+            '<progress value="{}" max="100"></progress> {}% ({} из {})',
+            obj.percent,
+            obj.percent,
+            obj.processed,
+            obj.total,
+        )
+
+    progress_display.short_description = "Прогресс"
@@ -1,20 +1,9 @@
 from django import forms
 from django.utils import timezone
-from django.contrib.auth.models import User
 from logistic.models import DeliveryOrder
 from warehouses.models import City, Warehouse
 from counterparties.models import Counterparty
-
-
-class LogisticModelChoiceField(forms.ModelChoiceField):
-    """Кастомное поле для выбора логиста с отображением полного имени"""
-
-    def label_from_instance(self, obj):
-        """Возвращает полное имя пользователя или логин, если имя отсутствует"""
-        full_name = obj.get_full_name()
-        if full_name and full_name.strip():
-            return full_name
-        return obj.username
+from utils.reference_cache import CachedModelChoiceField, SearchSelect, user_choices
 
 
 class DailyReportForm(forms.Form):
@@ -80,6 +69,20 @@ class DateRangeReportForm(forms.Form):
     )
 
 
+class StatusDurationReportForm(DateRangeReportForm):
+    """Период (по дате создания заявок) и группировка отчета по времени в статусах"""
+
+    group_by = forms.ChoiceField(
+        label="Группировка",
+        choices=[
+            ("warehouse", "По складам"),
+            ("logistic", "По логистам"),
+        ],
+        initial="warehouse",
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+
+
 class EmailSettingsForm(forms.Form):
     """Упрощенная форма для настройки параметров email"""
 
@@ -233,7 +236,7 @@ class DeliveryOrderCreateForm(forms.ModelForm):
             "delivery_date": forms.DateInput(
                 attrs={"type": "date", "class": "form-control", "required": "required"}
             ),
-            "sender": forms.Select(
+            "sender": SearchSelect(
                 attrs={
                     "class": "form-select counterparty-select",
                     "data-counterparty-type": "sender",
@@ -246,7 +249,7 @@ class DeliveryOrderCreateForm(forms.ModelForm):
                     "placeholder": "Адрес отправки (если отправитель не выбран)",
                 }
             ),
-            "recipient": forms.Select(
+            "recipient": SearchSelect(
                 attrs={
                     "class": "form-select counterparty-select",
                     "data-counterparty-type": "recipient",
@@ -316,11 +319,9 @@ class DeliveryOrderCreateForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         self.fields["status"].initial = "submitted"
 
-        # Используем кастомное поле для выбора логиста
-        self.fields["logistic"] = LogisticModelChoiceField(
-            queryset=User.objects.filter(profile__role="logistic").order_by(
-                "first_name", "last_name", "username"
-            ),
+        # Список логистов берется из кэша справочников
+        self.fields["logistic"] = CachedModelChoiceField(
+            user_choices("logistic"),
             required=False,
             widget=forms.Select(attrs={"class": "form-select"}),
             label="Логист",
@@ -0,0 +1,47 @@
+import re
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.vendor_assets import all_vendor_files
+
+# Ссылки на .map-файлы убираются: карт в поставке нет, а collectstatic
+# с хешированием имен падает на отсутствующих файлах
+SOURCE_MAP_RE = re.compile(rb"\n?/[/*]# sourceMappingURL=[^\n]*")
+
+
+class Command(BaseCommand):
+    help = (
+        "Скачивает Bootstrap, иконки, jQuery и Select2 в assets/vendor, чтобы "
+        "отдавать их из своей статики (затем collectstatic)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Скачать заново уже имеющиеся файлы"
+        )
+
+    def handle(self, *args, **options):
+        target_dir = Path(settings.ASSETS_DIR)
+        for url, path in all_vendor_files():
+            target = target_dir / path
+            if target.exists() and not options["force"]:
+                self.stdout.write(f"⏭️ {path} уже есть")
+                continue
+
+            try:
+                with urlopen(url, timeout=30) as response:
+                    content = response.read()
+            except OSError as e:
+                raise CommandError(f"Не удалось скачать {url}: {e}")
+
+            if path.endswith((".css", ".js")):
+                content = SOURCE_MAP_RE.sub(b"", content)
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+            self.stdout.write(self.style.SUCCESS(f"✅ {path} ({len(content)} байт)"))
+
+        self.stdout.write(self.style.SUCCESS("📦 Готово: выполните collectstatic"))
@@ -0,0 +1,429 @@
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from counterparties.models import Counterparty
+from logistic.models import DeliveryOrder
+from pickup.models import PickupOrder
+from users.models import UserProfile
+from utils import demo_data
+from warehouses.models import City, Warehouse, WarehouseSchedule
+
+# Распределения статусов: большая часть заявок в архиве
+DELIVERY_STATUS_WEIGHTS = {
+    "submitted": 15,
+    "driver_assigned": 10,
+    "on_the_way": 10,
+    "shipped": 65,
+}
+COUNTERPARTY_TYPE_WEIGHTS = {
+    "legal": 60,
+    "entrepreneur": 25,
+    "individual": 10,
+    "self_employed": 5,
+}
+PICKUP_STATUS_WEIGHTS = {
+    "ready": 15,
+    "payment": 10,
+    "in_transit": 10,
+    "accepted": 65,
+}
+
+LOAD_USER_PREFIX = "load_"
+LOAD_WAREHOUSE_PREFIX = "LD-"
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def last_tracking_number(model, prefix):
+    """Последний занятый номер с префиксом (та же логика, что и в save())"""
+    last = (
+        model.objects.filter(tracking_number__startswith=prefix)
+        .order_by(Length("tracking_number"), "tracking_number")
+        .values_list("tracking_number", flat=True)
+        .last()
+    )
+    if not last:
+        return 0
+    try:
+        return int(last.split("-")[-1])
+    except ValueError:
+        return 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует синтетические данные для нагрузочного тестирования: "
+        "контрагентов, склады с графиками, заявки на забор и доставку. "
+        "Вставка идет через bulk_create пачками, без генерации QR-кодов, "
+        "сквозные номера рассчитываются заранее. Для каждой заявки создается "
+        "история статусов до текущего. Результат детерминирован по --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--deliveries", type=int, default=100000)
+        parser.add_argument("--pickups", type=int, default=100000)
+        parser.add_argument("--counterparties", type=int, default=5000)
+        parser.add_argument("--warehouses", type=int, default=50)
+        parser.add_argument("--operators", type=int, default=20)
+        parser.add_argument("--logistics", type=int, default=5)
+        parser.add_argument(
+            "--days", type=int, default=365, help="Глубина истории заявок в днях"
+        )
+        parser.add_argument(
+            "--linked",
+            type=float,
+            default=0.3,
+            help="Доля принятых заборов, связанных с заявкой на доставку",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Удалить все заявки, контрагентов и ранее сгенерированные склады/пользователей",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size должен быть положительным")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.today = date.today()
+        self.days = max(options["days"], 1)
+        self.verbosity = options["verbosity"]
+        started = time.perf_counter()
+
+        if options["clear"]:
+            self.clear()
+
+        operator_ids, logistic_ids = self.create_users(
+            options["operators"], options["logistics"]
+        )
+        city_ids = self.create_cities()
+        warehouse_ids = self.create_warehouses(options["warehouses"], city_ids)
+        counterparty_ids = self.create_counterparties(options["counterparties"])
+        carrier_ids = [carrier.pk for carrier in demo_data.create_carriers()]
+
+        self.refs = {
+            "operators": operator_ids,
+            "logistics": logistic_ids,
+            "cities": city_ids,
+            "warehouses": warehouse_ids,
+            "counterparties": counterparty_ids,
+            "carriers": carrier_ids,
+        }
+
+        delivery_ids = self.create_deliveries(options["deliveries"])
+        self.create_pickups(options["pickups"], delivery_ids, options["linked"])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Сгенерировано: {options['deliveries']} доставок, "
+                f"{options['pickups']} заборов, {len(counterparty_ids)} контрагентов, "
+                f"{len(warehouse_ids)} складов за {elapsed:.1f} с"
+            )
+        )
+
+    def log(self, message):
+        if self.verbosity >= 1:
+            self.stdout.write(message)
+
+    def clear(self):
+        self.log("🗑️  Удаление данных...")
+        PickupOrder.objects.all().delete()
+        DeliveryOrder.objects.all().delete()
+        Counterparty.objects.all().delete()
+        Warehouse.objects.filter(code__startswith=LOAD_WAREHOUSE_PREFIX).delete()
+        User.objects.filter(username__startswith=LOAD_USER_PREFIX).delete()
+
+    def insert(self, model, objects, label):
+        """
+        Вставляет объекты пачками и возвращает их id.
+        Если СУБД не возвращает id из bulk_create (MySQL), они читаются
+        как последние id таблицы - генератор рассчитан на единственного писателя.
+        """
+        ids = []
+        total = 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                created = model.objects.bulk_create(batch)
+                if created[0].pk is None:
+                    batch_ids = list(
+                        model.objects.order_by("-pk").values_list("pk", flat=True)[
+                            : len(batch)
+                        ]
+                    )
+                    batch_ids.reverse()
+                else:
+                    batch_ids = [obj.pk for obj in created]
+            ids.extend(batch_ids)
+            total += len(batch)
+            self.log(f"  {label}: {total}")
+        return ids
+
+    def create_users(self, operators, logistics):
+        self.log("👥 Пользователи...")
+        password = make_password("load123")
+        wanted = [(f"{LOAD_USER_PREFIX}operator{i}", "operator") for i in range(operators)]
+        wanted += [(f"{LOAD_USER_PREFIX}logistic{i}", "logistic") for i in range(logistics)]
+
+        existing = set(
+            User.objects.filter(username__startswith=LOAD_USER_PREFIX).values_list(
+                "username", flat=True
+            )
+        )
+        missing = [(username, role) for username, role in wanted if username not in existing]
+
+        # bulk_create не вызывает сигнал post_save, профили создаются явно
+        User.objects.bulk_create(
+            [User(username=username, password=password) for username, _ in missing]
+        )
+        users = dict(
+            User.objects.filter(username__in=[username for username, _ in missing])
+            .values_list("username", "pk")
+        )
+        UserProfile.objects.bulk_create(
+            [UserProfile(user_id=users[username], role=role) for username, role in missing]
+        )
+
+        ids_by_role = {"operator": [], "logistic": []}
+        for pk, role in (
+            UserProfile.objects.filter(
+                user__username__in=[username for username, _ in wanted]
+            )
+            .order_by("user__username")
+            .values_list("user_id", "role")
+        ):
+            ids_by_role[role].append(pk)
+
+        if not ids_by_role["operator"]:
+            raise CommandError("Нужен хотя бы один оператор (--operators)")
+        return ids_by_role["operator"], ids_by_role["logistic"]
+
+    def create_cities(self):
+        for city_data in demo_data.CITIES:
+            City.objects.get_or_create(
+                name=city_data["name"], defaults={"region": city_data["region"]}
+            )
+        return list(City.objects.order_by("pk").values_list("pk", flat=True))
+
+    def create_warehouses(self, count, city_ids):
+        self.log("🏢 Склады...")
+        existing = set(
+            Warehouse.objects.filter(code__startswith=LOAD_WAREHOUSE_PREFIX).values_list(
+                "code", flat=True
+            )
+        )
+        # Первый город (Москва) получает заметно больше складов
+        city_weights = [len(city_ids)] + [1] * (len(city_ids) - 1)
+
+        new_warehouses = []
+        for i in range(count):
+            code = f"{LOAD_WAREHOUSE_PREFIX}{i:04d}"
+            city_id = self.rng.choices(city_ids, weights=city_weights)[0]
+            area = self.rng.randrange(1000, 10000, 500)
+            if code in existing:
+                continue
+            new_warehouses.append(
+                Warehouse(
+                    code=code,
+                    city_id=city_id,
+                    name=f"Склад нагрузочный {i + 1}",
+                    address=self.rng.choice(demo_data.PICKUP_ADDRESSES),
+                    total_area=area,
+                    available_area=area // 2,
+                    visible_to_clients=True,
+                )
+            )
+        created_ids = self.insert(Warehouse, new_warehouses, "склады")
+
+        schedules = []
+        for warehouse_id in created_ids:
+            working_days = self.rng.choice([5, 6, 7])
+            if self.rng.random() < 0.2:
+                opening, closing = dt_time(0, 0), dt_time(23, 59)
+            else:
+                opening = dt_time(self.rng.choice([8, 9]), 0)
+                closing = dt_time(self.rng.choice([18, 19, 20]), 0)
+            schedules.extend(
+                WarehouseSchedule(
+                    warehouse_id=warehouse_id,
+                    day_of_week=day,
+                    is_working=day <= working_days,
+                    opening_time=opening,
+                    closing_time=closing,
+                )
+                for day in range(1, 8)
+            )
+        self.insert(WarehouseSchedule, schedules, "графики")
+
+        return list(
+            Warehouse.objects.filter(code__startswith=LOAD_WAREHOUSE_PREFIX)
+            .order_by("code")
+            .values_list("pk", flat=True)
+        )
+
+    def create_counterparties(self, count):
+        self.log("🤝 Контрагенты...")
+        rng = self.rng
+        types = list(COUNTERPARTY_TYPE_WEIGHTS)
+        weights = list(COUNTERPARTY_TYPE_WEIGHTS.values())
+
+        def build():
+            for i in range(count):
+                yield Counterparty(
+                    type=rng.choices(types, weights=weights)[0],
+                    name=f"{rng.choice(demo_data.COMPANIES)} #{i + 1}",
+                    address=rng.choice(demo_data.PICKUP_ADDRESSES),
+                    phone=f"+7916{rng.randrange(10**7):07d}",
+                    inn=f"{rng.randrange(10**9, 10**10)}",
+                    is_customer=True,
+                    is_supplier=rng.random() < 0.2,
+                )
+
+        return self.insert(Counterparty, build(), "контрагенты")
+
+    def random_date(self):
+        """Дата в пределах истории; свежие даты встречаются чаще"""
+        offset = int(self.rng.expovariate(3 / self.days))
+        return self.today - timedelta(days=min(offset, self.days))
+
+    def cargo(self):
+        rng = self.rng
+        return {
+            "quantity": max(1, int(rng.lognormvariate(1, 0.8))),
+            "weight": round(rng.lognormvariate(4.5, 1.0), 1),
+            "volume": round(rng.lognormvariate(0, 0.7), 2),
+        }
+
+    def pick(self, key, optional_rate=0.0):
+        values = self.refs[key]
+        if not values or self.rng.random() < optional_rate:
+            return None
+        return self.rng.choice(values)
+
+    def create_deliveries(self, count):
+        self.log("🚚 Заявки на доставку...")
+        rng = self.rng
+        statuses = list(DELIVERY_STATUS_WEIGHTS)
+        weights = list(DELIVERY_STATUS_WEIGHTS.values())
+        prefix = f"FFC-{timezone.now().year}-"
+        start = last_tracking_number(DeliveryOrder, prefix)
+        started = []
+
+        def build():
+            for i in range(count):
+                shipped_at = self.random_date()
+                status = rng.choices(statuses, weights=weights)[0]
+                started.append((status, shipped_at))
+                has_driver = status != "submitted"
+                yield DeliveryOrder(
+                    tracking_number=f"{prefix}{start + i + 1:05d}",
+                    shipped_at=shipped_at,
+                    delivery_date=shipped_at + timedelta(days=rng.randint(1, 5)),
+                    sender_id=self.pick("counterparties", 0.05),
+                    recipient_id=self.pick("counterparties", 0.05),
+                    pickup_address=rng.choice(demo_data.PICKUP_ADDRESSES),
+                    pickup_warehouse_id=self.pick("warehouses", 0.3),
+                    delivery_address=rng.choice(demo_data.DELIVERY_ADDRESSES),
+                    delivery_warehouse_id=self.pick("warehouses", 0.2),
+                    delivery_city_id=self.pick("cities"),
+                    logistic_id=self.pick("logistics", 0.1),
+                    operator_id=self.pick("operators"),
+                    status=status,
+                    driver_name=rng.choice(demo_data.DRIVER_NAMES) if has_driver else None,
+                    driver_phone=f"+7916{rng.randrange(10**7):07d}" if has_driver else None,
+                    vehicle=rng.choice(demo_data.VEHICLES) if has_driver else None,
+                    **self.cargo(),
+                )
+
+        ids = self.insert(DeliveryOrder, build(), "доставки")
+        self.create_status_history(DeliveryOrder, ids, started, statuses)
+        return ids
+
+    def create_pickups(self, count, delivery_ids, linked_rate):
+        self.log("📦 Заявки на забор...")
+        rng = self.rng
+        statuses = list(PICKUP_STATUS_WEIGHTS)
+        weights = list(PICKUP_STATUS_WEIGHTS.values())
+        prefix = f"PUP-{timezone.now().year}-"
+        start = last_tracking_number(PickupOrder, prefix)
+
+        # Каждая доставка может быть связана не более чем с одним забором
+        available_deliveries = iter(delivery_ids)
+        started = []
+
+        def build():
+            for i in range(count):
+                pickup_date = self.random_date()
+                status = rng.choices(statuses, weights=weights)[0]
+                started.append((status, pickup_date))
+                delivery_id = None
+                if status == "accepted" and rng.random() < linked_rate:
+                    delivery_id = next(available_deliveries, None)
+                hour = rng.randint(8, 17)
+                yield PickupOrder(
+                    tracking_number=f"{prefix}{start + i + 1:05d}",
+                    pickup_date=pickup_date,
+                    pickup_time_from=dt_time(hour, 0),
+                    pickup_time_to=dt_time(hour + 1, 0),
+                    pickup_address=rng.choice(demo_data.PICKUP_ADDRESSES),
+                    contact_person=f"Контакт {rng.randrange(10000)}",
+                    sender_id=self.pick("counterparties", 0.05),
+                    recipient_id=self.pick("counterparties", 0.05),
+                    desired_delivery_date=pickup_date + timedelta(days=rng.randint(1, 7)),
+                    delivery_address=rng.choice(demo_data.DELIVERY_ADDRESSES),
+                    invoice_number=f"INV-{rng.randrange(10**6)}" if rng.random() < 0.3 else None,
+                    receiving_operator_id=self.pick("operators", 0.2),
+                    receiving_warehouse_id=self.pick("warehouses", 0.1),
+                    delivery_city_id=self.pick("cities"),
+                    operator_id=self.pick("operators"),
+                    logistic_id=self.pick("logistics", 0.2),
+                    carrier_id=self.pick("carriers", 0.5),
+                    delivery_order_id=delivery_id,
+                    status=status,
+                    **self.cargo(),
+                )
+
+        ids = self.insert(PickupOrder, build(), "заборы")
+        self.create_status_history(PickupOrder, ids, started, statuses)
+        return ids
+
+    def create_status_history(self, model, ids, started, flow):
+        """
+        История статусов: заявка проходит статусы flow по порядку до текущего,
+        начиная с 9:00 даты заявки, со случайными интервалами в часах
+        """
+        history = model._meta.get_field("status_changes").related_model
+        rng = self.rng
+
+        def build():
+            for order_id, (status, day) in zip(ids, started):
+                moment = timezone.make_aware(datetime.combine(day, dt_time(9, 0)))
+                previous = ""
+                for step in flow[: flow.index(status) + 1]:
+                    yield history(
+                        order_id=order_id,
+                        from_status=previous,
+                        to_status=step,
+                        changed_at=moment,
+                    )
+                    previous = step
+                    moment += timedelta(hours=rng.lognormvariate(2.5, 0.8))
+
+        self.insert(history, build(), "история статусов")
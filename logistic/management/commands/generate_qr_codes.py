@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from logistic.models import DeliveryOrder
+from pickup.models import PickupOrder
+from utils.qr_utils import generate_missing_qr_codes
+
+MODELS = {
+    "pickup": ("заявок на забор", PickupOrder),
+    "delivery": ("заявок на доставку", DeliveryOrder),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Создает недостающие QR-коды заявок (после массового создания "
+        "или если фоновая задача не выполнилась)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=["pickup", "delivery", "all"],
+            default="all",
+            help="Для каких заявок создавать QR-коды",
+        )
+
+    def handle(self, *args, **options):
+        names = list(MODELS) if options["model"] == "all" else [options["model"]]
+
+        total = 0
+        for name in names:
+            title, model = MODELS[name]
+            created = generate_missing_qr_codes(model)
+            total += created
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Создано QR-кодов для {title}: {created}")
+            )
+
+        self.stdout.write(f"📊 Всего: {total}")
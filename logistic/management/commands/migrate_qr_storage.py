@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from logistic.models import DeliveryOrder
+from pickup.models import PickupOrder
+from utils.qr_storage import migrate_qr_files
+
+MODELS = {
+    "pickup": ("заявок на забор", PickupOrder),
+    "delivery": ("заявок на доставку", DeliveryOrder),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Переносит QR-коды заявок в подкаталоги по хешу номера "
+        "(qr_codes/<вид>/<шард>/) и обновляет ссылки в БД"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=[*MODELS, "all"],
+            default="all",
+            help="Для каких заявок переносить QR-коды",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Заявок в одной пачке",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только посчитать файлы для переноса",
+        )
+
+    def handle(self, *args, **options):
+        names = list(MODELS) if options["model"] == "all" else [options["model"]]
+
+        total = 0
+        for name in names:
+            title, model = MODELS[name]
+            counts = migrate_qr_files(
+                model, options["batch_size"], dry_run=options["dry_run"]
+            )
+            total += counts["moved"]
+            action = "К переносу" if options["dry_run"] else "Перенесено"
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ {action} QR-кодов {title}: {counts['moved']} "
+                    f"(уже на месте {counts['current']}, нет файла {counts['missing']})"
+                )
+            )
+
+        self.stdout.write(f"📊 Всего: {total}")
@@ -0,0 +1,128 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Тяжёлые библиотеки, которые не должны загружаться при старте воркера
+HEAVY_MODULES = ["pandas", "numpy", "weasyprint", "qrcode", "PIL", "openpyxl"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Измеряет стоимость импорта модулей при холодном старте проекта "
+        "(python -X importtime в отдельном процессе) и пиковый RSS"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            default=None,
+            help="Модуль, импорт которого измеряется (по умолчанию ROOT_URLCONF)",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=25, help="Сколько строк выводить"
+        )
+        parser.add_argument(
+            "--group",
+            action="store_true",
+            help="Суммировать время по пакетам верхнего уровня",
+        )
+        parser.add_argument(
+            "--project-only",
+            action="store_true",
+            help="Показывать только модули проекта",
+        )
+
+    def handle(self, *args, **options):
+        target = options["target"] or settings.ROOT_URLCONF
+
+        code = (
+            "import resource, sys, django; django.setup(); "
+            f"import {target}; "
+            "sys.stdout.write('\\nRSS=%d' % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+        )
+        if result.returncode != 0:
+            raise CommandError(
+                f"Не удалось импортировать {target}:\n{result.stderr[-2000:]}"
+            )
+
+        modules = self.parse_importtime(result.stderr)
+        rss_kb = self.parse_rss(result.stdout)
+
+        project_packages = {
+            path.name for path in Path(settings.BASE_DIR).iterdir() if path.is_dir()
+        }
+
+        if options["group"]:
+            grouped = defaultdict(int)
+            for name, self_us, _ in modules:
+                grouped[name.split(".")[0]] += self_us
+            rows = [(name, total, total) for name, total in grouped.items()]
+        else:
+            rows = modules
+
+        if options["project_only"]:
+            rows = [row for row in rows if row[0].split(".")[0] in project_packages]
+
+        rows.sort(key=lambda row: row[2], reverse=True)
+
+        total_us = sum(self_us for _, self_us, _ in modules)
+
+        self.stdout.write(f"Импорт {target}: {len(modules)} модулей")
+        self.stdout.write(f"Суммарное время импорта: {total_us / 1000:.1f} мс")
+        if rss_kb:
+            self.stdout.write(f"Пиковый RSS процесса: {rss_kb / 1024:.1f} МБ")
+        self.stdout.write("")
+        self.stdout.write(f"{'self, мс':>10} {'cumul., мс':>11}  модуль")
+        for name, self_us, cumulative_us in rows[: options["limit"]]:
+            self.stdout.write(
+                f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>11.1f}  {name}"
+            )
+
+        self.stdout.write("")
+        loaded = {name for name, _, _ in modules}
+        for heavy in HEAVY_MODULES:
+            if heavy in loaded:
+                self.stdout.write(
+                    self.style.WARNING(f"⚠️  {heavy} загружается при старте")
+                )
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(f"✅ {heavy} не загружается при старте")
+                )
+
+    @staticmethod
+    def parse_importtime(stderr):
+        """Разбирает вывод -X importtime в список (модуль, self, cumulative) в мкс"""
+        modules = []
+        for line in stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            parts = line[len("import time:") :].split("|")
+            if len(parts) != 3:
+                continue
+            try:
+                self_us = int(parts[0].strip())
+                cumulative_us = int(parts[1].strip())
+            except ValueError:
+                continue
+            modules.append((parts[2].strip(), self_us, cumulative_us))
+        return modules
+
+    @staticmethod
+    def parse_rss(stdout):
+        for line in reversed(stdout.splitlines()):
+            if line.startswith("RSS="):
+                return int(line[4:])
+        return None
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from logistic.models import DeliveryOrder
+from pickup.models import PickupOrder
+from utils.qr_storage import delete_orphan_qr_files, find_orphan_qr_files
+
+MODELS = {
+    "pickup": ("заявок на забор", PickupOrder),
+    "delivery": ("заявок на доставку", DeliveryOrder),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет QR-файлы, на которые не ссылается ни одна заявка "
+        "(остались от удаленных заявок или перегенерации)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=[*MODELS, "all"],
+            default="all",
+            help="Для каких заявок искать файлы",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=60,
+            help="Не трогать файлы моложе стольких минут",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Файлов в одной пачке удаления",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать число файлов без заявки",
+        )
+
+    def handle(self, *args, **options):
+        names = list(MODELS) if options["model"] == "all" else [options["model"]]
+        batch_size = options["batch_size"]
+
+        total = 0
+        for name in names:
+            title, model = MODELS[name]
+            orphans, missing = find_orphan_qr_files(
+                model, timedelta(minutes=options["min_age"])
+            )
+            if options["dry_run"]:
+                deleted = len(orphans)
+            else:
+                deleted = sum(
+                    delete_orphan_qr_files(model, orphans[start : start + batch_size])
+                    for start in range(0, len(orphans), batch_size)
+                )
+            total += deleted
+            action = "Без заявки" if options["dry_run"] else "Удалено"
+            self.stdout.write(self.style.SUCCESS(f"✅ {action} QR-файлов {title}: {deleted}"))
+            if missing:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"⚠️ Ссылок на отсутствующие файлы у {title}: {missing}"
+                    )
+                )
+
+        self.stdout.write(f"📊 Всего: {total}")
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from counterparties.models import Counterparty
+from logistic.models import DeliveryOrder
+from pickup.models import PickupOrder
+from utils.search_text import fill_search_text
+
+MODELS = {
+    "pickup": ("заявок на забор", PickupOrder),
+    "delivery": ("заявок на доставку", DeliveryOrder),
+    "counterparties": ("контрагентов", Counterparty),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересобирает колонку search_text (после изменения SEARCH_FIELDS "
+        "или правки данных в обход save())"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=[*MODELS, "all"],
+            default="all",
+            help="Для каких записей пересобирать текст",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Записей в одном UPDATE",
+        )
+
+    def handle(self, *args, **options):
+        names = list(MODELS) if options["model"] == "all" else [options["model"]]
+
+        total = 0
+        for name in names:
+            title, model = MODELS[name]
+            updated = fill_search_text(
+                model.objects.all(), model.SEARCH_FIELDS, options["batch_size"]
+            )
+            total += updated
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Обновлен текст для поиска у {title}: {updated}")
+            )
+
+        self.stdout.write(f"📊 Всего: {total}")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_created_at(apps, schema_editor):
+    # Для существующих заявок время изменения неизвестно - берем время создания
+    DeliveryOrder = apps.get_model("logistic", "DeliveryOrder")
+    DeliveryOrder.objects.update(updated_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('counterparties', '0001_initial'),
+        ('logistic', '0016_remove_deliveryorder_fulfilled_at'),
+        ('warehouses', '0008_warehouse_visible_to_clients'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deliveryorder',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата обновления'),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='deliveryorder',
+            index=models.Index(fields=['updated_at', 'id'], name='delivery_updated_at_id_idx'),
+        ),
+    ]
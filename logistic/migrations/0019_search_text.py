@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:59
+
+from django.db import migrations, models
+
+from utils.search_text import fill_search_text
+
+SEARCH_FIELDS = ('tracking_number', 'pickup_address', 'delivery_address', 'driver_name', 'vehicle')
+
+
+def fill(apps, schema_editor):
+    # Текст для поиска у уже существующих записей
+    DeliveryOrder = apps.get_model("logistic", "DeliveryOrder")
+    fill_search_text(DeliveryOrder.objects.all(), SEARCH_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logistic', '0018_deliverystatuschange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deliveryorder',
+            name='search_text',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=500, verbose_name='Текст для поиска'),
+        ),
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:16
+
+import utils.qr_storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logistic', '0020_qrregenerationjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='deliveryorder',
+            name='qr_code',
+            field=models.ImageField(blank=True, null=True, upload_to=utils.qr_storage.ShardedQrPath('delivery'), verbose_name='QR-код'),
+        ),
+    ]
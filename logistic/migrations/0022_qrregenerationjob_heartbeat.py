@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logistic', '0021_qr_code_sharded'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='qrregenerationjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Последняя отметка'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logistic', '0022_qrregenerationjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='deliveryorder',
+            name='search_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=500, verbose_name='Текст для поиска'),
+        ),
+    ]
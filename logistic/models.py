@@ -1,16 +1,26 @@
-from pathlib import Path
+import logging
 from django.db import models
+from django.db.models.functions import Length
 from django.urls import reverse
 from django.conf import settings
 from django.utils import timezone
-import qrcode
+from datetime import timedelta
 import os
-from io import BytesIO
 from django.core.files import File
+from utils.qr_storage import ShardedQrPath
+from utils.qr_utils import make_qr_png
+from utils.search_text import SEARCH_TEXT_MAX_LENGTH, SearchTextMixin, SearchTextQuerySet
+from utils.status_history import StatusChange, StatusHistoryMixin, StatusQuerySet
 from warehouses.models import Warehouse, City
 
+logger = logging.getLogger(__name__)
 
-class DeliveryOrder(models.Model):
+
+class DeliveryOrderQuerySet(SearchTextQuerySet, StatusQuerySet):
+    pass
+
+
+class DeliveryOrder(SearchTextMixin, StatusHistoryMixin, models.Model):
     STATUS_CHOICES = [
         ("submitted", "Заявка подана"),
         ("driver_assigned", "Назначен водитель"),
@@ -124,18 +134,44 @@ class DeliveryOrder(models.Model):
         related_name="created_delivery_orders",
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")
 
     tracking_number = models.CharField(
         max_length=50, unique=True, blank=True, verbose_name="Сквозной номер заказа"
     )
     qr_code = models.ImageField(
-        upload_to="qr_codes/delivery/", blank=True, null=True, verbose_name="QR-код"
+        upload_to=ShardedQrPath("delivery"),
+        blank=True,
+        null=True,
+        verbose_name="QR-код",
+    )
+    search_text = models.CharField(
+        max_length=SEARCH_TEXT_MAX_LENGTH,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Текст для поиска",
+    )
+
+    # Поля, из которых собирается search_text (поиск в админке)
+    SEARCH_FIELDS = (
+        "tracking_number",
+        "pickup_address",
+        "delivery_address",
+        "driver_name",
+        "vehicle",
     )
 
+    objects = DeliveryOrderQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Заявка на доставку"
         verbose_name_plural = "Заявки на доставку"
+        indexes = [
+            # Ленточная выборка изменений для синхронизации (sync)
+            models.Index(fields=["updated_at", "id"], name="delivery_updated_at_id_idx"),
+        ]
 
     def __str__(self):
         if self.tracking_number:
@@ -211,28 +247,35 @@ class DeliveryOrder(models.Model):
 
     def generate_tracking_number(self):
         """Генерирует уникальный сквозной номер заказа"""
+        return self.allocate_tracking_numbers(1)[0]
+
+    @classmethod
+    def allocate_tracking_numbers(cls, count):
+        """Следующие count сквозных номеров - одним запросом для массового создания"""
         year = timezone.now().year
-        last_order = (
-            DeliveryOrder.objects.filter(tracking_number__startswith=f"FFC-{year}-")
-            .order_by("tracking_number")
+        last_number = (
+            cls.objects.filter(tracking_number__startswith=f"FFC-{year}-")
+            .order_by(Length("tracking_number"), "tracking_number")
+            .values_list("tracking_number", flat=True)
             .last()
         )
 
-        if last_order and last_order.tracking_number:
-            try:
-                last_num = int(last_order.tracking_number.split("-")[-1])
-                new_num = last_num + 1
-            except:
-                new_num = 1
-        else:
-            new_num = 1
+        try:
+            last_num = int(last_number.split("-")[-1]) if last_number else 0
+        except ValueError:
+            last_num = 0
 
-        return f"FFC-{year}-{new_num:05d}"
+        return [f"FFC-{year}-{last_num + i:05d}" for i in range(1, count + 1)]
+
+    def qr_code_data(self):
+        """Содержимое QR-кода - ссылка на PDF заявки"""
+        return f"{settings.SITE_URL}{reverse('delivery_order_pdf', kwargs={'pk': self.pk})}"
+
+    def qr_code_filename(self):
+        return f'delivery_qr_{self.tracking_number.replace("/", "_")}.png'
 
     def generate_qr_code(self):
         """Генерирует QR-код с ссылкой на PDF файл заявки"""
-        from django.conf import settings
-
         if self.qr_code:
             try:
                 if os.path.exists(self.qr_code.path):
@@ -240,44 +283,22 @@ class DeliveryOrder(models.Model):
             except (ValueError, FileNotFoundError, AttributeError):
                 pass
 
-        pdf_url = f"{settings.SITE_URL}{reverse('delivery_order_pdf', kwargs={'pk': self.pk})}"
-
-        qr_data = pdf_url
+        qr_data = self.qr_code_data()
 
         try:
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(qr_data)
-            qr.make(fit=True)
-
-            img = qr.make_image(fill_color="black", back_color="white")
-
-            qr_dir = Path(settings.MEDIA_ROOT) / "qr_codes" / "delivery"
-            qr_dir.mkdir(parents=True, exist_ok=True)
+            buffer = make_qr_png(qr_data)
 
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            buffer.seek(0)
-
-            filename = f'delivery_qr_{self.tracking_number.replace("/", "_")}.png'
-            self.qr_code.save(filename, File(buffer), save=False)
+            self.qr_code.save(self.qr_code_filename(), File(buffer), save=False)
 
             buffer.close()
 
             super().save(update_fields=["qr_code"])
-            print(f"✅ QR-код создан для заявки на доставку #{self.id}")
+            logger.debug("QR-код создан для заявки на доставку #%s", self.id)
 
         except Exception as e:
-            print(
-                f"❌ Ошибка при создании QR-кода для заявки на доставку #{self.id}: {e}"
+            logger.exception(
+                "Ошибка при создании QR-кода для заявки на доставку #%s: %s", self.id, e
             )
-            import traceback
-
-            traceback.print_exc()
 
     def regenerate_qr_code(self):
         """Принудительно пересоздает QR-код"""
@@ -294,5 +315,172 @@ class DeliveryOrder(models.Model):
             self.generate_qr_code()
             return True
         except Exception as e:
-            print(f"❌ Ошибка при пересоздании QR-кода для доставки #{self.id}: {e}")
+            logger.error(
+                "Ошибка при пересоздании QR-кода для доставки #%s: %s", self.id, e
+            )
             return False
+
+
+class DeliveryStatusChange(StatusChange):
+    """Смена статуса заявки на доставку"""
+
+    order = models.ForeignKey(
+        DeliveryOrder,
+        on_delete=models.CASCADE,
+        related_name="status_changes",
+        verbose_name="Заявка",
+    )
+
+    class Meta(StatusChange.Meta):
+        verbose_name = "Смена статуса заявки на доставку"
+        verbose_name_plural = "История статусов заявок на доставку"
+        indexes = [
+            models.Index(fields=["order", "changed_at"], name="delivery_status_order_at_idx"),
+            models.Index(fields=["changed_at"], name="delivery_status_changed_at_idx"),
+        ]
+
+
+class QrRegenerationJobQuerySet(models.QuerySet):
+    def stale(self):
+        """
+        Незавершенные задачи без отметки о работе дольше QR_JOB_STALE_AFTER:
+        процесс с пулом задач перезапустился, и их уже никто не выполнит
+        """
+        threshold = timezone.now() - timedelta(seconds=settings.QR_JOB_STALE_AFTER)
+        return self.filter(status__in=("pending", "running")).filter(
+            models.Q(heartbeat_at__lt=threshold)
+            | models.Q(heartbeat_at__isnull=True, created_at__lt=threshold)
+        )
+
+    def fail_stale(self):
+        """Помечает брошенные задачи ошибкой, возвращает их число"""
+        return self.stale().update(
+            status="failed",
+            error="Задача прервана: процесс остановлен до ее завершения",
+            finished_at=timezone.now(),
+        )
+
+
+class QrRegenerationJob(models.Model):
+    """
+    Фоновая перегенерация QR-кодов выбранных в админке заявок.
+    Заявки обрабатываются пачками вне запроса, прогресс пишется в запись.
+    После каждой пачки обновляется heartbeat_at: задача, которая давно не
+    отмечалась (перезапуск воркера), помечается ошибкой (fail_stale) и
+    может быть запущена заново из админки.
+    """
+
+    KIND_CHOICES = [
+        ("delivery", "Заявки на доставку"),
+        ("pickup", "Заявки на забор"),
+    ]
+    KIND_MODELS = {
+        "delivery": "logistic.DeliveryOrder",
+        "pickup": "pickup.PickupOrder",
+    }
+
+    STATUS_CHOICES = [
+        ("pending", "В очереди"),
+        ("running", "Выполняется"),
+        ("done", "Завершена"),
+        ("failed", "Ошибка"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Заявки")
+    object_ids = models.JSONField(default=list, verbose_name="ID заявок")
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default="pending", verbose_name="Статус"
+    )
+    total = models.PositiveIntegerField(default=0, verbose_name="Всего")
+    processed = models.PositiveIntegerField(default=0, verbose_name="Обработано")
+    failed = models.PositiveIntegerField(default=0, verbose_name="Ошибок")
+    error = models.TextField(blank=True, default="", verbose_name="Текст ошибки")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="Запустил",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создана")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Начата")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Завершена")
+    heartbeat_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Последняя отметка"
+    )
+
+    objects = QrRegenerationJobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Перегенерация QR-кодов"
+        verbose_name_plural = "Перегенерации QR-кодов"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.processed}/{self.total}"
+
+    @property
+    def is_finished(self):
+        return self.status in ("done", "failed")
+
+    @property
+    def percent(self):
+        return int(self.processed * 100 / self.total) if self.total else 100
+
+    @classmethod
+    def start(cls, kind, queryset, user=None):
+        """Создает задачу по заявкам queryset и ставит ее в фоновую очередь"""
+        from utils.background import submit_on_commit
+
+        ids = list(queryset.order_by().values_list("pk", flat=True))
+        job = cls.objects.create(
+            kind=kind,
+            object_ids=ids,
+            total=len(ids),
+            created_by=user if user and user.is_authenticated else None,
+        )
+        submit_on_commit(run_qr_regeneration_job, job.pk)
+        return job
+
+    def restart(self, user=None):
+        """Новая задача по тем же заявкам (после ошибки или прерывания)"""
+        from django.apps import apps
+
+        model = apps.get_model(self.KIND_MODELS[self.kind])
+        return QrRegenerationJob.start(
+            self.kind, model.objects.filter(pk__in=self.object_ids), user
+        )
+
+    def run(self):
+        from django.apps import apps
+
+        from utils.qr_utils import regenerate_qr_codes
+
+        now = timezone.now()
+        started = QrRegenerationJob.objects.filter(pk=self.pk, status="pending").update(
+            status="running", started_at=now, heartbeat_at=now
+        )
+        if not started:
+            # Задачу уже пометили брошенной или выполнили
+            return
+        # Записи меняются, только пока задача не помечена брошенной
+        jobs = QrRegenerationJob.objects.filter(pk=self.pk, status="running")
+
+        def progress(processed, failed):
+            jobs.update(processed=processed, failed=failed, heartbeat_at=timezone.now())
+
+        model = apps.get_model(self.KIND_MODELS[self.kind])
+        try:
+            processed, failed = regenerate_qr_codes(model, self.object_ids, progress)
+        except Exception as e:
+            jobs.update(status="failed", error=str(e), finished_at=timezone.now())
+            raise
+        jobs.update(
+            status="done", processed=processed, failed=failed, finished_at=timezone.now()
+        )
+        logger.info("Перегенерировано QR-кодов (%s): %s", self.kind, processed - failed)
+
+
+def run_qr_regeneration_job(job_id):
+    """Точка входа фоновой задачи (в очередь передается только ID)"""
+    QrRegenerationJob.objects.get(pk=job_id).run()
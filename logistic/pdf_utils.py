@@ -1,8 +1,12 @@
+import logging
 from datetime import datetime
-from weasyprint import HTML
 from django.conf import settings
 from django.template.loader import render_to_string
+from utils.labels import label_sheet, render_label_sheets
 from utils.pdf_generator import generate_pdf_from_template, DEFAULT_CSS
+from utils.pdf_render import render_context
+
+logger = logging.getLogger(__name__)
 
 
 def create_delivery_order_pdf(delivery_order):
@@ -18,6 +22,33 @@ def create_delivery_order_pdf(delivery_order):
     )
 
 
+def delivery_label_sheet(delivery_order, qr_png=None):
+    """Лист этикеток заявки на доставку"""
+    return label_sheet(
+        delivery_order,
+        "labels/delivery_label.html",
+        qr_png=qr_png,
+        from_address=(delivery_order.pickup_address or "").strip() or "не указан",
+        to_address=(delivery_order.delivery_address or "").strip() or "Не указан",
+    )
+
+
+def create_delivery_labels_pdf(delivery_order):
+    """PDF с QR-этикетками на каждое место заявки на доставку"""
+    return render_label_sheets([delivery_label_sheet(delivery_order)])
+
+
+def create_delivery_labels_batch_pdf(delivery_orders, qr_pngs=None):
+    """
+    PDF с QR-этикетками нескольких заявок на доставку одним документом.
+    qr_pngs - PNG QR-кодов по id заявки (label_qr_pngs).
+    """
+    qr_pngs = qr_pngs or {}
+    return render_label_sheets(
+        [delivery_label_sheet(order, qr_pngs.get(order.pk)) for order in delivery_orders]
+    )
+
+
 def create_daily_report_pdf(date, orders):
     """Создание ежедневного отчета по доставкам"""
     stats = {
@@ -224,14 +255,12 @@ def generate_delivery_pdf(order):
 
         html_string = render_to_string("logistic/delivery_pdf.html", context)
 
-        html = HTML(string=html_string, base_url=settings.SITE_URL)
-
-        pdf_bytes = html.write_pdf()
+        pdf_bytes = render_context().write_pdf(html_string)
 
         return pdf_bytes
 
     except Exception as e:
-        print(f"Ошибка при генерации PDF для доставки #{order.id}: {e}")
+        logger.error("Ошибка при генерации PDF для доставки #%s: %s", order.id, e)
         return None
 
 
@@ -246,14 +275,12 @@ def generate_pickup_pdf(order):
 
         html_string = render_to_string("pickup/pickup_pdf.html", context)
 
-        html = HTML(string=html_string, base_url=settings.SITE_URL)
-
-        pdf_bytes = html.write_pdf()
+        pdf_bytes = render_context().write_pdf(html_string)
 
         return pdf_bytes
 
     except Exception as e:
-        print(f"Ошибка при генерации PDF для забора #{order.id}: {e}")
+        logger.error("Ошибка при генерации PDF для забора #%s: %s", order.id, e)
         return None
 
 
@@ -287,11 +314,10 @@ def generate_daily_report_pdf(date, orders, report_type="delivery"):
         }
 
         html_string = render_to_string(template, context)
-        html = HTML(string=html_string, base_url=settings.SITE_URL)
-        pdf_bytes = html.write_pdf()
+        pdf_bytes = render_context().write_pdf(html_string)
 
         return pdf_bytes
 
     except Exception as e:
-        print(f"Ошибка при генерации отчета: {e}")
+        logger.error("Ошибка при генерации отчета: %s", e)
         return None
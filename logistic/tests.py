@@ -1,3 +1,828 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Permission, User
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.messages import get_messages
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.cache import cache, caches
+from django.db import DatabaseError, IntegrityError
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from counterparties.models import Counterparty
+from pickup.models import PickupOrder
+from utils import demo_data, order_import, pdf_cache, pdf_render
+from utils.inline_edit import get_lookups
+from utils.labels import label_qr_pngs
+from utils.qr_storage import find_orphan_qr_files, migrate_qr_files, qr_shard
+from utils.reference_cache import user_full_name
+from utils.vendor_assets import VENDOR_FILES, vendor_urls
+from warehouses.models import Warehouse
+
+from utils.status_history import status_durations
+
+from .models import DeliveryOrder, DeliveryStatusChange, QrRegenerationJob
+from .views import DELIVERY_GRID, DELIVERY_IMPORT
+
+TEST_MEDIA_ROOT = tempfile.mkdtemp(prefix="crm_test_media_")
+
+try:
+    import weasyprint  # noqa: F401
+
+    HAS_WEASYPRINT = True
+except (ImportError, OSError):
+    # WeasyPrint установлен, но без системных библиотек (pango) не загружается
+    HAS_WEASYPRINT = False
+
+
+@override_settings(
+    MEDIA_ROOT=TEST_MEDIA_ROOT,
+    BACKGROUND_WORKERS=0,
+    QR_REGENERATION_PROCESSES=0,
+    QR_JOB_STALE_AFTER=60,
+)
+class QrRegenerationJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        demo_data.seed()
+        cls.admin = User.objects.create_superuser("root", password="x")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
+    def orders(self):
+        return DeliveryOrder.objects.filter(
+            pk__in=DeliveryOrder.objects.order_by("pk").values("pk")[:3]
+        )
+
+    def start_job(self):
+        # Задача ставится в очередь после коммита - без выполнения остается pending
+        with self.captureOnCommitCallbacks(execute=False):
+            return QrRegenerationJob.start("delivery", self.orders(), self.admin)
+
+    def test_job_runs_to_done(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = QrRegenerationJob.start("delivery", self.orders(), self.admin)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.processed, 3)
+        self.assertIsNotNone(job.heartbeat_at)
+
+    def test_abandoned_jobs_marked_failed(self):
+        fresh = self.start_job()
+        pending = self.start_job()
+        running = self.start_job()
+        old = timezone.now() - timedelta(seconds=120)
+        QrRegenerationJob.objects.filter(pk=pending.pk).update(created_at=old)
+        QrRegenerationJob.objects.filter(pk=running.pk).update(
+            status="running", heartbeat_at=old
+        )
+
+        self.assertEqual(QrRegenerationJob.objects.fail_stale(), 2)
+        statuses = dict(QrRegenerationJob.objects.values_list("pk", "status"))
+        self.assertEqual(statuses[fresh.pk], "pending")
+        self.assertEqual(statuses[pending.pk], "failed")
+        self.assertEqual(statuses[running.pk], "failed")
+
+        # Запоздавший запуск брошенной задачи ее не возобновляет
+        pending.run()
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, "failed")
+
+    def test_change_page_stops_refreshing_abandoned_job(self):
+        job = self.start_job()
+        url = reverse("admin:logistic_qrregenerationjob_change", args=[job.pk])
+        self.client.force_login(self.admin)
+        self.assertContains(self.client.get(url), 'http-equiv="refresh"')
+
+        QrRegenerationJob.objects.filter(pk=job.pk).update(
+            created_at=timezone.now() - timedelta(seconds=120)
+        )
+        self.assertNotContains(self.client.get(url), 'http-equiv="refresh"')
+
+    def test_restart_failed_job(self):
+        job = self.start_job()
+        QrRegenerationJob.objects.filter(pk=job.pk).update(status="failed")
+        self.client.force_login(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("admin:logistic_qrregenerationjob_changelist"),
+                {"action": "restart_jobs", ACTION_CHECKBOX_NAME: [job.pk]},
+            )
+        restarted = QrRegenerationJob.objects.exclude(pk=job.pk).get()
+        self.assertEqual(restarted.status, "done")
+        self.assertEqual(restarted.object_ids, job.object_ids)
+
+    def test_pickup_action_without_job_permission_stays_on_changelist(self):
+        user = User.objects.create_user("pickup_admin", password="x", is_staff=True)
+        user.user_permissions.set(
+            Permission.objects.filter(
+                content_type__app_label="pickup",
+                codename__in=["view_pickuporder", "change_pickuporder"],
+            )
+        )
+        self.client.force_login(user)
+        changelist = reverse("admin:pickup_pickuporder_changelist")
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.post(
+                changelist,
+                {
+                    "action": "regenerate_qr_codes",
+                    ACTION_CHECKBOX_NAME: [PickupOrder.objects.first().pk],
+                },
+            )
+        self.assertRedirects(response, changelist, fetch_redirect_response=False)
+        self.assertEqual(QrRegenerationJob.objects.get().kind, "pickup")
+
+
+class InlineEditTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        data = demo_data.seed()
+        cls.order = data["deliveries"][0]
+        cls.other = data["deliveries"][1]
+        cls.admin = User.objects.create_superuser("root", password="x")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def edit_field(self, field, value, order=None):
+        order = order or self.order
+        return self.client.post(
+            reverse("delivery_order_update_field", args=[order.pk]),
+            data=json.dumps({"field": field, "value": value}),
+            content_type="application/json",
+        ).json()
+
+    def edit_batch(self, edits):
+        return self.client.post(
+            reverse("delivery_orders_update_fields"),
+            data=json.dumps({"edits": edits}),
+            content_type="application/json",
+        ).json()
+
+    def test_valid_edit_saved(self):
+        response = self.edit_field("driver_name", "Иванов")
+        self.assertEqual(response, {"success": True, "display_value": "Иванов"})
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.driver_name, "Иванов")
+
+    def test_too_long_value_returns_json_error(self):
+        response = self.edit_field("driver_name", "x" * 300)
+        self.assertFalse(response["success"])
+        self.assertIn("200", response["error"])
+        self.order.refresh_from_db()
+        self.assertNotEqual(self.order.driver_name, "x" * 300)
+
+    def test_batch_with_invalid_value_saves_nothing(self):
+        response = self.edit_batch(
+            [
+                {"id": self.order.pk, "field": "driver_name", "value": "Петров"},
+                {"id": self.other.pk, "field": "driver_phone", "value": "9" * 100},
+            ]
+        )
+        self.assertFalse(response["success"])
+        self.assertEqual(
+            [(e["id"], e["field"]) for e in response["errors"]],
+            [(self.other.pk, "driver_phone")],
+        )
+        self.order.refresh_from_db()
+        self.assertNotEqual(self.order.driver_name, "Петров")
+
+    def test_database_error_returns_json_error(self):
+        with mock.patch.object(DeliveryOrder, "save", side_effect=DatabaseError):
+            response = self.edit_field("driver_name", "Иванов")
+        self.assertEqual(
+            response, {"success": False, "error": "Не удалось сохранить изменения"}
+        )
+
+    @override_settings(CACHE_SHARED=True)
+    def test_city_rename_refreshes_warehouse_lookup(self):
+        warehouse = Warehouse.objects.select_related("city").first()
+        get_lookups("warehouse", [warehouse.pk])
+        with self.assertNumQueries(0):
+            get_lookups("warehouse", [warehouse.pk])
+        city = warehouse.city
+        city.name = "Новый город"
+        city.save()
+        self.assertEqual(
+            get_lookups("warehouse", [warehouse.pk])[warehouse.pk]["city"], "Новый город"
+        )
+
+    @override_settings(CACHE_SHARED=False)
+    def test_lookups_not_cached_without_shared_backend(self):
+        warehouse = Warehouse.objects.first()
+        get_lookups("warehouse", [warehouse.pk])
+        # Изменение в обход сигналов (как в другом воркере) видно сразу
+        Warehouse.objects.filter(pk=warehouse.pk).update(name="Новый склад")
+        self.assertEqual(
+            get_lookups("warehouse", [warehouse.pk])[warehouse.pk]["name"], "Новый склад"
+        )
+
+
+class VendorAssetsTests(TestCase):
+    def setUp(self):
+        self.assets = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.assets)
+        vendor_urls.cache_clear()
+        self.addCleanup(vendor_urls.cache_clear)
+
+    def add_asset(self, path):
+        target = self.assets / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text("/* */")
+
+    def urls(self, **settings):
+        with override_settings(STATICFILES_DIRS=[self.assets], **settings):
+            vendor_urls.cache_clear()
+            return vendor_urls()
+
+    def test_local_files_used_with_cdn_fallback(self):
+        self.add_asset(VENDOR_FILES["jquery_js"][1])
+        # Стили иконок без шрифтов, на которые они ссылаются, не подключаются
+        self.add_asset(VENDOR_FILES["bootstrap_icons_css"][1])
+
+        urls = self.urls()
+        self.assertEqual(urls["jquery_js"], "/static/vendor/jquery/jquery.min.js")
+        self.assertEqual(
+            urls["bootstrap_icons_css"], VENDOR_FILES["bootstrap_icons_css"][0]
+        )
+        self.assertEqual(urls["bootstrap_css"], VENDOR_FILES["bootstrap_css"][0])
+
+    def test_cdn_when_disabled(self):
+        self.add_asset(VENDOR_FILES["jquery_js"][1])
+        urls = self.urls(VENDOR_ASSETS_LOCAL=False)
+        self.assertEqual(urls["jquery_js"], VENDOR_FILES["jquery_js"][0])
+
+
+class AdminSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        data = demo_data.seed()
+        cls.order = data["deliveries"][0]
+        cls.admin = User.objects.create_superuser("root", password="x")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def search(self, query):
+        response = self.client.get(
+            reverse("admin:logistic_deliveryorder_changelist"), {"q": query}
+        )
+        return {order.pk for order in response.context["cl"].result_list}
+
+    def test_fragment_inside_tracking_number(self):
+        fragment = self.order.tracking_number[2:-2]
+        self.assertIn(self.order.pk, self.search(fragment.upper()))
+
+    def test_every_word_must_match(self):
+        sender = self.order.sender
+        own_sender = self.search(f"{self.order.tracking_number} {sender.inn}")
+        self.assertEqual(own_sender, {self.order.pk})
+
+        other_inn = Counterparty.objects.exclude(
+            pk__in=[self.order.sender_id, self.order.recipient_id]
+        ).values_list("inn", flat=True)[0]
+        self.assertEqual(self.search(f"{self.order.tracking_number} {other_inn}"), set())
+
+    def test_extra_spaces_and_case_normalized(self):
+        number = self.order.tracking_number.lower()
+        username = self.order.logistic.username.upper()
+        self.assertEqual(self.search(f"  {number}   {username}  "), {self.order.pk})
+
+
+class FakeRenderContext:
+    def __init__(self):
+        self.pid = pdf_render.os.getpid()
+
+
+class RenderContextTests(TestCase):
+    def in_thread(self, func):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(func()))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_context_per_thread(self):
+        with mock.patch.object(pdf_render, "RenderContext", FakeRenderContext):
+            own = self.in_thread(
+                lambda: (pdf_render.render_context(), pdf_render.render_context())
+            )
+            other = self.in_thread(pdf_render.render_context)
+        self.assertIs(own[0], own[1])
+        self.assertIsNot(own[0], other)
+
+    def test_new_context_after_fork(self):
+        def contexts():
+            before = pdf_render.render_context()
+            # Контекст, унаследованный от родительского процесса
+            before.pid = -1
+            return before, pdf_render.render_context()
+
+        with mock.patch.object(pdf_render, "RenderContext", FakeRenderContext):
+            before, after = self.in_thread(contexts)
+        self.assertIsNot(before, after)
+
+    @unittest.skipUnless(HAS_WEASYPRINT, "WeasyPrint недоступен в этом окружении")
+    def test_concurrent_rendering(self):
+        css = "@page { size: A6 } body { font-family: DejaVu Sans }"
+        results = []
+
+        def render():
+            for _ in range(3):
+                context = pdf_render.render_context()
+                results.append(context.write_pdf("<p>Тест</p>", [css]))
+            results.append(len(pdf_render.render_context().stylesheets))
+
+        threads = [threading.Thread(target=render) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        pdfs = [r for r in results if isinstance(r, bytes)]
+        self.assertEqual(len(pdfs), 12)
+        self.assertTrue(all(pdf.startswith(b"%PDF") for pdf in pdfs))
+        # CSS разбирается один раз на поток
+        self.assertEqual([r for r in results if isinstance(r, int)], [1] * 4)
+
+
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT, QR_REGENERATION_PROCESSES=0)
+class LabelQrCodesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        demo_data.seed()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
+    def orders(self, count):
+        return list(DeliveryOrder.objects.order_by("pk")[:count])
+
+    def test_missing_codes_rendered_without_saving(self):
+        orders = self.orders(3)
+        orders[0].generate_qr_code()
+        with orders[0].qr_code.open("rb") as f:
+            kept = f.read()
+        # Ссылка есть, а файла нет
+        orders[1].generate_qr_code()
+        orders[1].qr_code.storage.delete(orders[1].qr_code.name)
+        DeliveryOrder.objects.filter(pk=orders[2].pk).update(qr_code="")
+        before = dict(DeliveryOrder.objects.values_list("pk", "qr_code"))
+
+        orders = self.orders(3)
+        with self.assertNumQueries(0):
+            pngs = label_qr_pngs(orders)
+        self.assertEqual(set(pngs), {o.pk for o in orders})
+        self.assertEqual(pngs[orders[0].pk], kept)
+        self.assertTrue(pngs[orders[2].pk].startswith(b"\x89PNG"))
+        # Печать ничего не записывает в БД и хранилище
+        self.assertEqual(dict(DeliveryOrder.objects.values_list("pk", "qr_code")), before)
+        self.assertFalse(orders[1].qr_code.storage.exists(orders[1].qr_code.name))
+
+    def test_bad_order_ids_show_error(self):
+        admin = User.objects.create_superuser("root", password="x")
+        self.client.force_login(admin)
+        response = self.client.get(reverse("delivery_orders_labels"), {"order_ids": "abc"})
+        self.assertRedirects(
+            response, reverse("delivery_order_list"), fetch_redirect_response=False
+        )
+        self.assertEqual(
+            [str(m) for m in get_messages(response.wsgi_request)],
+            ["Не выбраны заявки для печати этикеток"],
+        )
+
+
+@override_settings(BACKGROUND_WORKERS=0, ORDER_IMPORT_CHUNK_SIZE=2)
+class OrderImportTests(TestCase):
+    HEADER = "Дата доставки;Отправитель;Получатель;Количество мест;Вес (кг);Объем (м³)"
+
+    @classmethod
+    def setUpTestData(cls):
+        data = demo_data.seed()
+        cls.user = data["users"]["operator1"]
+        cls.sender, cls.recipient = data["counterparties"][:2]
+
+    def row(self, quantity=1):
+        return f"15.01.2030;{self.sender.inn};{self.recipient.inn};{quantity};10,5;0,2"
+
+    def upload(self, *lines, name="orders.csv", tail=b""):
+        content = "\n".join([self.HEADER, *lines, ""]).encode("utf-8") + tail
+        return SimpleUploadedFile(name, content)
+
+    def run_import(self, uploaded):
+        importer = order_import.OrderImporter(DELIVERY_IMPORT, self.user)
+        with self.captureOnCommitCallbacks(execute=False):
+            return importer, importer.run(uploaded)
+
+    def test_rows_imported_and_errors_reported(self):
+        before = DeliveryOrder.objects.count()
+        _, result = self.run_import(
+            self.upload(self.row(), "15.01.2030;0000;;1;1;1", self.row(2))
+        )
+        self.assertEqual((result.total, result.created), (3, 2))
+        self.assertEqual([row for row, _ in result.errors], [3])
+        self.assertIn("не найден", result.errors[0][1])
+        self.assertEqual(DeliveryOrder.objects.count(), before + 2)
+
+    def test_decode_error_mid_file_reports_imported_rows(self):
+        # Некорректный байт за пределами образца, по которому выбрана кодировка
+        filler = ["; ; ; ;"] * 20000
+        uploaded = self.upload(
+            self.row(), self.row(), self.row(), *filler, tail=b"\xff\xfe;1\n"
+        )
+        importer = order_import.OrderImporter(DELIVERY_IMPORT, self.user)
+        with self.captureOnCommitCallbacks(execute=False):
+            with self.assertRaisesMessage(
+                order_import.ImportFileError, "Загружено заявок - 3"
+            ):
+                importer.run(uploaded)
+        self.assertEqual(importer.result.created, 3)
+
+    def test_corrupt_xlsx_is_file_error(self):
+        uploaded = SimpleUploadedFile("orders.xlsx", b"PK\x03\x04 not a workbook")
+        with self.assertRaisesMessage(
+            order_import.ImportFileError, "Не удалось прочитать файл"
+        ):
+            self.run_import(uploaded)
+
+    def test_taken_numbers_retried_with_fresh_ones(self):
+        taken = DeliveryOrder.objects.exclude(tracking_number="").first().tracking_number
+        allocate = DeliveryOrder.allocate_tracking_numbers
+        calls = []
+
+        def allocate_once_taken(count):
+            calls.append(count)
+            return [taken] if len(calls) == 1 else allocate(count)
+
+        with mock.patch.object(
+            DeliveryOrder, "allocate_tracking_numbers", side_effect=allocate_once_taken
+        ):
+            _, result = self.run_import(self.upload(self.row()))
+        self.assertEqual((result.created, result.error_count), (1, 0))
+        self.assertEqual(len(calls), 2)
+
+    def test_database_error_cause_reported(self):
+        with mock.patch(
+            "utils.order_import.record_created",
+            side_effect=IntegrityError("CHECK constraint failed: quantity"),
+        ):
+            _, result = self.run_import(self.upload(self.row(), self.row()))
+        self.assertEqual(result.created, 0)
+        message = result.errors[0][1]
+        self.assertIn("Строки 2-3 не загружены", message)
+        self.assertIn("CHECK constraint failed: quantity", message)
+        self.assertNotIn("параллельно", message)
+
+
+class StatusHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        data = demo_data.seed()
+        cls.user = data["users"]["logistic"]
+        cls.admin = data["users"]["admin"]
+
+    def setUp(self):
+        DeliveryStatusChange.objects.all().delete()
+
+    def history(self, order):
+        return list(
+            DeliveryStatusChange.objects.filter(order=order).values_list(
+                "from_status", "to_status", "changed_by"
+            )
+        )
+
+    def test_save_records_status_change(self):
+        order = DeliveryOrder.objects.filter(status="submitted").first()
+        order.status = "driver_assigned"
+        order.status_changed_by_id = self.user.pk
+        order.save()
+        self.assertEqual(
+            self.history(order), [("submitted", "driver_assigned", self.user.pk)]
+        )
+
+        # Сохранение без смены статуса и с update_fields без статуса - без истории
+        order.driver_name = "Иванов"
+        order.save()
+        order.save(update_fields=["driver_name"])
+        self.assertEqual(len(self.history(order)), 1)
+
+    def test_bulk_set_status_records_changed_orders_only(self):
+        orders = DeliveryOrder.objects.filter(
+            pk__in=DeliveryOrder.objects.filter(status="submitted").values("pk")[:3]
+        )
+        ids = list(orders.values_list("pk", flat=True))
+        already = DeliveryOrder.objects.filter(status="shipped").first()
+        queryset = DeliveryOrder.objects.filter(pk__in=[*ids, already.pk])
+
+        # Выборка под блокировкой, один UPDATE и одна вставка истории
+        # (плюс SAVEPOINT и RELEASE транзакции)
+        with self.assertNumQueries(5):
+            changed = queryset.set_status("shipped", changed_by=self.user)
+        self.assertEqual(changed, len(ids))
+        self.assertEqual(
+            set(DeliveryOrder.objects.filter(pk__in=ids).values_list("status", flat=True)),
+            {"shipped"},
+        )
+        self.assertEqual(
+            sorted(
+                DeliveryStatusChange.objects.values_list("order_id", "from_status", "to_status")
+            ),
+            [(pk, "submitted", "shipped") for pk in sorted(ids)],
+        )
+        self.assertEqual(queryset.set_status("shipped"), 0)
+
+    def test_durations_between_consecutive_changes(self):
+        first, second = DeliveryOrder.objects.order_by("pk")[:2]
+        DeliveryOrder.objects.filter(pk__in=[first.pk, second.pk]).update(
+            operator=self.user
+        )
+        start = timezone.now() - timedelta(days=1)
+        steps = [
+            (first, "submitted", 0),
+            (first, "driver_assigned", 2),
+            (first, "shipped", 5),
+            (second, "submitted", 0),
+            (second, "driver_assigned", 4),
+        ]
+        DeliveryStatusChange.objects.bulk_create(
+            DeliveryStatusChange(
+                order=order, to_status=status, changed_at=start + timedelta(hours=hours)
+            )
+            for order, status, hours in steps
+        )
+
+        rows = status_durations(
+            DeliveryStatusChange.objects.all(),
+            "order__operator_id",
+            dict(DeliveryOrder.STATUS_CHOICES),
+        )
+        report = {
+            row["status"]: (row["count"], row["avg"], row["p50"], row["max"])
+            for row in rows
+        }
+        self.assertEqual({row["group"] for row in rows}, {self.user.pk})
+        # Текущий статус заявки (shipped, второй driver_assigned) не завершен
+        self.assertEqual(
+            report,
+            {"submitted": (2, 3.0, 2.0, 4.0), "driver_assigned": (1, 3.0, 3.0, 3.0)},
+        )
+
+    def test_report_groups_by_logist(self):
+        order = DeliveryOrder.objects.exclude(logistic=None).first()
+        start = timezone.now() - timedelta(hours=3)
+        DeliveryStatusChange.objects.bulk_create(
+            [
+                DeliveryStatusChange(order=order, to_status="submitted", changed_at=start),
+                DeliveryStatusChange(
+                    order=order,
+                    to_status="shipped",
+                    changed_at=start + timedelta(hours=1),
+                ),
+            ]
+        )
+        self.client.force_login(self.admin)
+        today = timezone.now().date()
+        response = self.client.get(
+            reverse("status_durations_report"),
+            {
+                "start_date": order.created_at.date(),
+                "end_date": today,
+                "report_type": "delivery",
+                "group_by": "logistic",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["group"], row["status"], row["count"]) for row in response.context["rows"]],
+            [(user_full_name(order.logistic), "submitted", 1)],
+        )
+
+
+class OrderPdfCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        demo_data.seed()
+
+    def setUp(self):
+        cache.clear()
+        caches["renders"].clear()
+        self.renders = 0
+        self.order = self.load()
+
+    def load(self):
+        return (
+            DeliveryOrder.objects.only(*pdf_cache.VERSION_FIELDS).order_by("pk").first()
+        )
+
+    def render(self):
+        self.renders += 1
+        return b"%PDF-1.7 test"
+
+    def get(self, order=None, **headers):
+        request = RequestFactory().get("/", headers=headers)
+        return pdf_cache.order_pdf_response(
+            request, order or self.order, self.render, "order.pdf"
+        )
+
+    def test_repeat_requests_served_from_cache(self):
+        first = self.get()
+        self.assertEqual(first.content, b"%PDF-1.7 test")
+        self.assertIn("public", first["Cache-Control"])
+        self.assertFalse(first.has_header("Vary"))
+        self.assertEqual(self.get()["ETag"], first["ETag"])
+        self.assertEqual(self.renders, 1)
+
+    def test_matching_etag_gets_304(self):
+        etag = self.get()["ETag"]
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.renders, 1)
+
+    def test_order_change_invalidates(self):
+        etag = self.get()["ETag"]
+        DeliveryOrder.objects.get(pk=self.order.pk).save()
+
+        response = self.get(self.load(), if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.renders, 2)
+
+    @override_settings(CACHE_SHARED=True)
+    def test_user_rename_invalidates(self):
+        etag = self.get()["ETag"]
+        user = User.objects.get(username="logistic")
+        user.last_name = "Новая"
+        user.save()
+        self.assertNotEqual(self.get()["ETag"], etag)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_user_rename_invalidates_without_shared_backend(self):
+        etag = self.get()["ETag"]
+        # Изменение в обход сигналов (как в другом воркере) меняет ETag
+        User.objects.filter(pk=self.order.logistic_id).update(last_name="Новая")
+        self.assertNotEqual(self.get()["ETag"], etag)
+
+    @override_settings(ORDER_PDF_CACHE_MAX_BYTES=4)
+    def test_large_pdf_not_cached(self):
+        self.get()
+        self.get()
+        self.assertEqual(self.renders, 2)
+
+    def test_render_failure_returns_none(self):
+        self.render = lambda: None
+        self.assertIsNone(self.get())
+
+
+class OrderGridTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        demo_data.seed()
+        cls.admin = User.objects.create_superuser("root", password="x")
+        cls.admin.profile.role = "admin"
+        cls.admin.profile.save()
+        # shipped_at: у части заявок одинаковое значение, у остальных NULL
+        moment = timezone.now() - timedelta(days=1)
+        ids = DeliveryOrder.objects.order_by("pk").values_list("pk", flat=True)
+        DeliveryOrder.objects.update(shipped_at=None)
+        DeliveryOrder.objects.filter(pk__in=list(ids[:6])).update(shipped_at=moment)
+        DeliveryOrder.objects.filter(pk__in=list(ids[6:9])).update(
+            shipped_at=moment + timedelta(hours=1)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def expected(self, params):
+        return list(
+            DELIVERY_GRID.order(DeliveryOrder.objects.all(), params).values_list(
+                "pk", flat=True
+            )
+        )
+
+    def read_all(self, params, cursor=None):
+        ids = []
+        while True:
+            response = self.client.get(
+                reverse("delivery_orders_data"), {**params, "cursor": cursor or ""}
+            )
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            ids.extend(row[page["fields"].index("id")] for row in page["rows"])
+            cursor = page["next_cursor"]
+            if not page["has_more"]:
+                return ids
+
+    def test_cursor_pages_with_equal_and_null_sort_values(self):
+        for order in ("asc", "desc"):
+            params = {"sort": "shipped_at", "order": order, "limit": 4}
+            with self.subTest(order=order):
+                ids = self.read_all(params)
+                self.assertEqual(ids, self.expected(params))
+                # Пустые значения - в конце в обоих направлениях
+                nulls = set(
+                    DeliveryOrder.objects.filter(shipped_at=None).values_list(
+                        "pk", flat=True
+                    )
+                )
+                self.assertEqual(set(ids[-len(nulls) :]), nulls)
+
+    def test_json_continues_after_server_page(self):
+        params = {"sort": "shipped_at", "order": "asc"}
+        response = self.client.get(reverse("delivery_order_list"), params)
+        cursor = response.context["grid_next_cursor"]
+        page_size = len(response.context["orders"])
+
+        ids = self.read_all({**params, "limit": 50}, cursor)
+        self.assertEqual(ids, self.expected(params)[page_size:])
+
+    def test_invalid_cursor_rejected(self):
+        response = self.client.get(reverse("delivery_orders_data"), {"cursor": "!!"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
+class QrStorageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        demo_data.seed()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+        self.storage = DeliveryOrder._meta.get_field("qr_code").storage
+        self.order = DeliveryOrder.objects.order_by("pk").first()
+
+    def save_file(self, name, age=None):
+        name = self.storage.save(name, ContentFile(b"png"))
+        if age is not None:
+            stamp = (timezone.now() - age).timestamp()
+            os.utime(self.storage.path(name), (stamp, stamp))
+        return name
+
+    def test_flat_file_moved_to_shard(self):
+        legacy = self.save_file("qr_codes/delivery/legacy.png")
+        DeliveryOrder.objects.filter(pk=self.order.pk).update(qr_code=legacy)
+        other = DeliveryOrder.objects.exclude(pk=self.order.pk).first()
+        DeliveryOrder.objects.filter(pk=other.pk).update(qr_code="qr_codes/delivery/gone.png")
+
+        counts = migrate_qr_files(DeliveryOrder, dry_run=True)
+        self.assertEqual((counts["moved"], counts["missing"]), (1, 1))
+        # Пробный запуск ничего не меняет
+        self.assertTrue(self.storage.exists(legacy))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.qr_code.name, legacy)
+
+        migrate_qr_files(DeliveryOrder)
+        self.order.refresh_from_db()
+        expected = f"qr_codes/delivery/{qr_shard(self.order.tracking_number)}/legacy.png"
+        self.assertEqual(self.order.qr_code.name, expected)
+        self.assertTrue(self.storage.exists(expected))
+        self.assertFalse(self.storage.exists(legacy))
+
+    def test_young_orphans_kept(self):
+        referenced = self.save_file("qr_codes/delivery/aa/bb/own.png", timedelta(days=1))
+        DeliveryOrder.objects.filter(pk=self.order.pk).update(qr_code=referenced)
+        old = self.save_file("qr_codes/delivery/aa/bb/old.png", timedelta(days=1))
+        self.save_file("qr_codes/delivery/aa/bb/new.png")
+
+        orphans, _ = find_orphan_qr_files(DeliveryOrder, timedelta(hours=1))
+        self.assertEqual(orphans, [old])
+
+        out = io.StringIO()
+        call_command("reap_qr_orphans", "--model", "delivery", stdout=out)
+        self.assertIn("Удалено QR-файлов заявок на доставку: 1", out.getvalue())
+        self.assertFalse(self.storage.exists(old))
+        self.assertTrue(self.storage.exists("qr_codes/delivery/aa/bb/new.png"))
+        self.assertTrue(self.storage.exists(referenced))
+
+    def test_file_deleted_with_order(self):
+        name = self.save_file("qr_codes/delivery/aa/bb/deleted.png")
+        DeliveryOrder.objects.filter(pk=self.order.pk).update(qr_code=name)
+        order = DeliveryOrder.objects.get(pk=self.order.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            order.delete()
+        self.assertFalse(self.storage.exists(name))
@@ -30,9 +30,19 @@ urlpatterns = [
         views.update_delivery_order_field,
         name="delivery_order_update_field",
     ),
+    path(
+        "update-fields/",
+        views.update_delivery_order_fields,
+        name="delivery_orders_update_fields",
+    ),
     path("reports/", views.reports_dashboard, name="reports_dashboard"),
     path("reports/daily/", views.generate_daily_report, name="generate_daily_report"),
     path("reports/statistics/", views.statistics_report, name="statistics_report"),
+    path(
+        "reports/status-durations/",
+        views.status_durations_report,
+        name="status_durations_report",
+    ),
     path("get-logistics/", views.get_logistics, name="get_logistics"),
     path(
         "delivery/<int:pk>/update-field/",
@@ -45,6 +55,9 @@ urlpatterns = [
         views.bulk_update_delivery_orders,
         name="delivery_orders_bulk_update",
     ),
+    path("import/", views.import_delivery_orders, name="delivery_orders_import"),
     path("list-pdf/", views.delivery_orders_list_pdf, name="delivery_orders_list_pdf"),
+    path("labels/", views.delivery_orders_labels, name="delivery_orders_labels"),
+    path("api/orders/", views.delivery_orders_data, name="delivery_orders_data"),
 ]
 
@@ -1,4 +1,4 @@
-import base64
+import logging
 import json
 import os
 from pathlib import Path
@@ -10,22 +10,29 @@ from django.urls import reverse
 from django.contrib import messages
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import date, datetime, timedelta
 from django.db.models import Count, Sum, Q
 from django.http import HttpResponse, JsonResponse
-import pandas as pd
 from io import BytesIO
 import zipfile
 
 from django.views.decorators.http import require_POST
-from weasyprint import HTML
 
 
-from .models import DeliveryOrder
-from pickup.models import PickupOrder
+from .models import DeliveryOrder, DeliveryStatusChange
+from monitoring.metrics import track_render
+from utils import inline_edit, order_import, pdf_cache
+from utils.grid import CursorError, Grid
+from utils.labels import label_qr_pngs
+from utils.reference_cache import user_full_name
+from utils.status_history import status_durations
+from pickup.models import PickupOrder, PickupStatusChange
 from .pdf_utils import (
     create_delivery_order_pdf,
+    create_delivery_labels_batch_pdf,
+    create_delivery_labels_pdf,
     create_daily_report_pdf,
     create_delivery_orders_list_pdf,
 )
@@ -34,107 +41,128 @@ from .forms import (
     DateRangeReportForm,
     DeliveryOrderCreateForm,
     EmailSettingsForm,
+    StatusDurationReportForm,
 )
 
+logger = logging.getLogger(__name__)
 
-class DeliveryOrderListView(LoginRequiredMixin, ListView):
-    model = DeliveryOrder
-    template_name = "logistic/delivery_order_list.html"
-    context_object_name = "orders"
-    paginate_by = 20
-
-    def get_queryset(self):
-        queryset = super().get_queryset()
-
-        if self.request.user.is_authenticated and hasattr(self.request.user, "profile"):
-            if self.request.user.profile.role == "operator":
-                queryset = queryset.filter(operator=self.request.user)
-
-        date_gte = self.request.GET.get("date__gte")
-        date_lte = self.request.GET.get("date__lte")
-        city = self.request.GET.get("city")
-        warehouse = self.request.GET.get("warehouse")
-        status = self.request.GET.get("status")
-        logistic = self.request.GET.get("logistic")
-
-        if date_gte:
-            queryset = queryset.filter(delivery_date__gte=date_gte)
-        if date_lte:
-            queryset = queryset.filter(delivery_date__gte=date_lte)
-        if city and city != "":
-            queryset = queryset.filter(city_id=city)
-        if warehouse and warehouse != "":
-            queryset = queryset.filter(warehouse_id=warehouse)
-        if status:
-            queryset = queryset.filter(status=status)
-        if logistic:
-            queryset = queryset.filter(logistic_id=logistic)
-
-        sort = self.request.GET.get("sort", "date")
-        order = self.request.GET.get("order", "desc")
-
-        allowed_sort_fields = [
-            "shipped_at",
-            "delivery_date",
-            "city",
-            "warehouse",
-            "logistic",
-            "quantity",
-            "weight",
-            "status",
-            "driver_name",
-        ]
 
-        if sort in allowed_sort_fields:
-            if order == "desc":
-                sort_field = f"-{sort}"
-            else:
-                sort_field = sort
-            queryset = queryset.order_by(sort_field)
-        else:
-            queryset = queryset.order_by("-delivery_date")
+DELIVERY_STATUS_LABELS = dict(DeliveryOrder.STATUS_CHOICES)
 
-        return queryset
+DELIVERY_GRID = Grid(
+    columns=[
+        "id",
+        "delivery_date",
+        "pickup_address",
+        "delivery_address",
+        "quantity",
+        "weight",
+        "volume",
+        "status",
+        "status_display",
+        "driver_name",
+        "driver_phone",
+    ],
+    values=[
+        "delivery_date",
+        "pickup_address",
+        "pickup_warehouse__address",
+        "delivery_address",
+        "delivery_warehouse__address",
+        "quantity",
+        "weight",
+        "volume",
+        "status",
+        "driver_name",
+        "driver_phone",
+    ],
+    row=lambda v: [
+        v["id"],
+        v["delivery_date"],
+        v["pickup_warehouse__address"] or v["pickup_address"] or "",
+        v["delivery_warehouse__address"] or v["delivery_address"] or "",
+        v["quantity"],
+        v["weight"],
+        v["volume"],
+        v["status"],
+        DELIVERY_STATUS_LABELS.get(v["status"], v["status"]),
+        v["driver_name"] or "",
+        v["driver_phone"] or "",
+    ],
+    sorts={
+        "delivery_date": "delivery_date",
+        "shipped_at": "shipped_at",
+        "pickup_address": "pickup_address",
+        "delivery_address": "delivery_address",
+        "quantity": "quantity",
+        "weight": "weight",
+        "status": "status",
+        "driver_name": "driver_name",
+    },
+    default_sort="delivery_date",
+)
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context["is_operator"] = (
-            self.request.user.is_authenticated
-            and hasattr(self.request.user, "profile")
-            and self.request.user.profile.role == "operator"
-        )
-        context["is_logistic"] = (
-            self.request.user.is_authenticated
-            and hasattr(self.request.user, "profile")
-            and self.request.user.profile.role == "logistic"
-        )
-        context["sort"] = self.request.GET.get("sort", "date")
-        context["order"] = self.request.GET.get("order", "desc")
 
-        from django.contrib.auth.models import User
+def filter_delivery_orders(request, queryset):
+    """Фильтры списка заявок на доставку из GET-параметров"""
+    if request.roles.is_operator:
+        queryset = queryset.filter(operator=request.user)
 
-        context["logistics_list"] = User.objects.filter(
-            is_active=True, profile__role="logistic"
-        ).order_by("first_name", "last_name", "username")
+    params = request.GET
+    if params.get("date__gte"):
+        queryset = queryset.filter(delivery_date__gte=params["date__gte"])
+    if params.get("date__lte"):
+        queryset = queryset.filter(delivery_date__lte=params["date__lte"])
+    if params.get("city"):
+        queryset = queryset.filter(delivery_city_id=params["city"])
+    if params.get("warehouse"):
+        queryset = queryset.filter(delivery_warehouse_id=params["warehouse"])
+    if params.get("status"):
+        queryset = queryset.filter(status=params["status"])
+    if params.get("logistic"):
+        queryset = queryset.filter(logistic_id=params["logistic"])
+    return queryset
 
-        from warehouses.models import City, Warehouse
 
-        context["cities"] = City.objects.all().order_by("name")
+class DeliveryOrderListView(LoginRequiredMixin, ListView):
+    model = DeliveryOrder
+    template_name = "logistic/delivery_order_list.html"
+    context_object_name = "orders"
+    paginate_by = django_settings.GRID_PAGE_SIZE
 
-        context["warehouses"] = (
-            Warehouse.objects.select_related("city").all().order_by("name")
+    def get_queryset(self):
+        queryset = filter_delivery_orders(self.request, super().get_queryset())
+        return DELIVERY_GRID.order(
+            queryset.select_related("pickup_warehouse", "delivery_warehouse"),
+            self.request.GET,
         )
 
-        if self.request.GET.get("logistic"):
-            try:
-                logistic_user = User.objects.get(id=self.request.GET.get("logistic"))
-                context["selected_logistic"] = logistic_user
-            except User.DoesNotExist:
-                pass
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["is_operator"] = self.request.roles.is_operator
+        context["is_logistic"] = self.request.roles.is_logistic
+        context["sort"], descending = DELIVERY_GRID.sorting(self.request.GET)
+        context["order"] = "desc" if descending else "asc"
+        page = context["page_obj"]
+        if page.has_next():
+            context["grid_next_cursor"] = DELIVERY_GRID.cursor_after(
+                page.object_list[len(page.object_list) - 1]
+            )
 
         return context
 
 
+@login_required
+def delivery_orders_data(request):
+    """Страница списка заявок на доставку в JSON для клиентской таблицы"""
+    queryset = filter_delivery_orders(request, DeliveryOrder.objects.all())
+    try:
+        page = DELIVERY_GRID.page(queryset, request.GET)
+    except CursorError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse(page, json_dumps_params={"separators": (",", ":")})
+
+
 class DeliveryOrderDetailView(LoginRequiredMixin, DetailView):
     model = DeliveryOrder
     template_name = "logistic/delivery_order_detail.html"
@@ -143,10 +171,7 @@ class DeliveryOrderDetailView(LoginRequiredMixin, DetailView):
     def get_queryset(self):
         queryset = super().get_queryset()
 
-        if (
-            hasattr(self.request.user, "profile")
-            and self.request.user.profile.is_operator
-        ):
+        if self.request.roles.is_operator:
             queryset = queryset.filter(operator=self.request.user)
 
         return queryset
@@ -163,10 +188,7 @@ class DeliveryOrderUpdateView(LoginRequiredMixin, UpdateView):
     def get_queryset(self):
         queryset = super().get_queryset()
 
-        if (
-            hasattr(self.request.user, "profile")
-            and self.request.user.profile.is_operator
-        ):
+        if self.request.roles.is_operator:
             queryset = queryset.filter(operator=self.request.user)
 
         return queryset
@@ -187,161 +209,93 @@ class DeliveryOrderUpdateView(LoginRequiredMixin, UpdateView):
                 "Заявка отмечена как отправленная. Дальнейшее редактирование будет ограничено.",
             )
 
+        form.instance.status_changed_by_id = self.request.user.pk
         response = super().form_valid(form)
         messages.success(self.request, "Данные водителя успешно обновлены!")
         return response
 
 
+def _user_display(order, value, info):
+    if not info:
+        return "Не назначен"
+    full_name = f"{info['first_name']} {info['last_name']}".strip()
+    return full_name or info["username"]
+
+
+def _can_change_logistic(roles):
+    return roles.is_superuser or roles.is_admin
+
+
+DELIVERY_INLINE_FIELDS = {
+    "sender": inline_edit.RelatedField(
+        "counterparty",
+        "Контрагент не найден",
+        display=lambda order, value, info: (
+            info["name"] if info else order.get_sender_display()
+        ),
+    ),
+    "pickup_address": inline_edit.Field(),
+    "pickup_warehouse": inline_edit.RelatedField(
+        "warehouse",
+        "Склад не найден",
+        display=lambda order, value, info: info["address"] if info else "",
+    ),
+    "recipient": inline_edit.RelatedField(
+        "counterparty",
+        "Контрагент не найден",
+        display=lambda order, value, info: (
+            info["name"] if info else order.get_recipient_display()
+        ),
+    ),
+    "delivery_address": inline_edit.Field(),
+    "delivery_warehouse": inline_edit.RelatedField(
+        "warehouse",
+        "Склад не найден",
+        display=lambda order, value, info: info["address"] if info else "",
+    ),
+    "delivery_city": inline_edit.RelatedField(
+        "city",
+        "Город не найден",
+        display=lambda order, value, info: info["name"] if info else "",
+    ),
+    "quantity": inline_edit.IntegerField(),
+    "weight": inline_edit.FloatField(),
+    "volume": inline_edit.FloatField(),
+    "status": inline_edit.ChoiceField(),
+    "driver_name": inline_edit.Field(),
+    "driver_phone": inline_edit.Field(),
+    "shipped_at": inline_edit.DateField(),
+    "delivery_date": inline_edit.DateField(),
+    "logistic": inline_edit.RelatedField(
+        "user",
+        "Пользователь не найден",
+        display=_user_display,
+        permission=_can_change_logistic,
+        permission_error="Только администратор может изменять логиста",
+    ),
+}
+
+delivery_inline_editor = inline_edit.InlineEditor(
+    DeliveryOrder,
+    DELIVERY_INLINE_FIELDS,
+    can_edit=lambda roles, order: (
+        roles.in_logists_group or roles.user_id == order.operator_id
+    ),
+)
+
+
 @require_POST
 @login_required
 def update_delivery_order_field(request, pk):
     """Обновление одного поля заявки на доставку"""
-    try:
-        order = DeliveryOrder.objects.get(pk=pk)
-    except DeliveryOrder.DoesNotExist:
-        return JsonResponse({"success": False, "error": "Заявка не найдена"})
-
-    if not (
-        request.user.is_superuser
-        or request.user.groups.filter(name="Логисты").exists()
-        or request.user == order.operator
-    ):
-        return JsonResponse({"success": False, "error": "Нет прав на редактирование"})
-
-    data = json.loads(request.body)
-    field = data.get("field")
-    value = data.get("value")
-
-    allowed_fields = [
-        "sender",
-        "pickup_address",
-        "pickup_warehouse",
-        "recipient",
-        "delivery_address",
-        "delivery_warehouse",
-        "delivery_city",
-        "quantity",
-        "weight",
-        "volume",
-        "status",
-        "driver_name",
-        "driver_phone",
-        "shipped_at",
-        "delivery_date",
-        "logistic",
-    ]
-
-    if field not in allowed_fields:
-        return JsonResponse(
-            {"success": False, "error": "Поле не доступно для редактирования"}
-        )
-
-    try:
-        if field in ["quantity"]:
-            value = int(value)
-        elif field in ["weight", "volume"]:
-            value = float(value) if value else None
-        elif field == "delivery_date":
-            try:
-                value = datetime.strptime(value, "%Y-%m-%d").date()
-            except ValueError:
-                return JsonResponse({"success": False, "error": "Неверный формат даты"})
-        elif field == "logistic":
-            if not (
-                request.user.is_superuser
-                or hasattr(request.user, "profile")
-                and request.user.profile.is_admin
-            ):
-                return JsonResponse(
-                    {
-                        "success": False,
-                        "error": "Только администратор может изменять логиста",
-                    }
-                )
-
-            if value:
-                from django.contrib.auth.models import User
-
-                try:
-                    value = User.objects.get(id=value)
-                except User.DoesNotExist:
-                    return JsonResponse(
-                        {"success": False, "error": "Пользователь не найден"}
-                    )
-            else:
-                value = None
-        elif field in ["sender", "recipient"]:
-            if value:
-                from counterparties.models import Counterparty
-
-                try:
-                    value = Counterparty.objects.get(id=value)
-                except Counterparty.DoesNotExist:
-                    return JsonResponse(
-                        {"success": False, "error": "Контрагент не найден"}
-                    )
-            else:
-                value = None
-        elif field in ["pickup_warehouse", "delivery_warehouse"]:
-            if value:
-                from warehouses.models import Warehouse
-
-                try:
-                    value = Warehouse.objects.get(id=value)
-                except Warehouse.DoesNotExist:
-                    return JsonResponse({"success": False, "error": "Склад не найден"})
-            else:
-                value = None
-        elif field == "delivery_city":
-            if value:
-                from warehouses.models import City
-
-                try:
-                    value = City.objects.get(id=value)
-                except City.DoesNotExist:
-                    return JsonResponse({"success": False, "error": "Город не найден"})
-            else:
-                value = None
-        elif field in ["pickup_address", "delivery_address"]:
-            pass
+    return delivery_inline_editor.single_field_view(request, pk)
 
-        setattr(order, field, value)
-        order.save()
 
-        if field == "status":
-            display_value = order.get_status_display()
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "shipped_at":
-            display_value = order.date.strftime("%d.%m.%Y")
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "delivery_date":
-            display_value = order.date.strftime("%d.%m.%Y")
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "logistic":
-            display_value = order.get_logistic_display()
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "sender":
-            display_value = order.get_sender_display()
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "recipient":
-            display_value = order.get_recipient_display()
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field in ["pickup_address", "delivery_address"]:
-            display_value = value if value else ""
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "pickup_warehouse":
-            display_value = value.address if value else ""
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "delivery_warehouse":
-            display_value = value.address if value else ""
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "delivery_city":
-            display_value = value.name if value else ""
-            return JsonResponse({"success": True, "display_value": display_value})
-
-        return JsonResponse({"success": True})
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)})
+@require_POST
+@login_required
+def update_delivery_order_fields(request):
+    """Пакетное обновление полей нескольких заявок на доставку"""
+    return delivery_inline_editor.batch_view(request)
 
 
 @login_required
@@ -349,8 +303,9 @@ def dashboard(request):
     today = date.today()
 
     user = request.user
+    roles = request.roles
     queryset_filter = Q()
-    if hasattr(user, "profile") and user.profile.is_operator:
+    if roles.is_operator:
         queryset_filter = Q(operator=user)
 
     # Исправляем delivery_stats с новым статусом "on_the_way"
@@ -373,7 +328,7 @@ def dashboard(request):
         ).count(),
     }
 
-    if hasattr(user, "profile") and (user.profile.is_admin or user.profile.is_logistic):
+    if roles.is_admin or roles.is_logistic:
         delivery_stats["total_weight"] = (
             DeliveryOrder.objects.aggregate(Sum("weight"))["weight__sum"] or 0
         )
@@ -395,7 +350,7 @@ def dashboard(request):
         )
 
     pickup_filter = Q()
-    if hasattr(user, "profile") and user.profile.is_operator:
+    if roles.is_operator:
         pickup_filter = Q(operator=user)
 
     pickup_stats = {
@@ -445,29 +400,34 @@ def dashboard(request):
         # "email_settings": email_settings,
     }
 
-    if hasattr(request.user, "profile"):
-        context["user_role"] = request.user.profile.get_role_display()
-        context["is_operator"] = request.user.profile.is_operator
-        context["is_logistic"] = request.user.profile.is_logistic
-        context["is_admin"] = request.user.profile.is_admin
+    if request.roles.has_profile:
+        context["user_role"] = request.roles.role_display
+        context["is_operator"] = request.roles.is_operator
+        context["is_logistic"] = request.roles.is_logistic
+        context["is_admin"] = request.roles.is_admin
 
     return render(request, "dashboard/dashboard.html", context)
 
 
 def delivery_order_pdf(request, pk):
-    order = get_object_or_404(DeliveryOrder, pk=pk)
+    order = get_object_or_404(
+        DeliveryOrder.objects.only(*pdf_cache.VERSION_FIELDS), pk=pk
+    )
 
-    if hasattr(request.user, "profile") and request.user.profile.is_operator:
-        if order.operator != request.user:
+    if request.roles.is_operator:
+        if order.operator_id != request.user.pk:
             messages.error(request, "У вас нет доступа к этой заявке")
             return redirect("delivery_order_list")
 
-    pdf = create_delivery_order_pdf(order)
+    def render_pdf():
+        full_order = DeliveryOrder.objects.select_related(
+            "logistic", "operator"
+        ).get(pk=pk)
+        return create_delivery_order_pdf(full_order)
 
-    if pdf:
-        response = HttpResponse(pdf, content_type="application/pdf")
-        filename = f"delivery_{order.tracking_number or order.id}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    filename = f"delivery_{order.tracking_number or order.id}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    response = pdf_cache.order_pdf_response(request, order, render_pdf, filename)
+    if response is not None:
         return response
     else:
         messages.error(request, "Ошибка при генерации PDF")
@@ -486,7 +446,7 @@ def daily_report_pdf(request):
 
     orders = DeliveryOrder.objects.filter(delivery_date=report_date)
 
-    if hasattr(request.user, "profile") and request.user.profile.is_operator:
+    if request.roles.is_operator:
         orders = orders.filter(operator=request.user)
 
     pdf = create_daily_report_pdf(report_date, orders)
@@ -512,7 +472,7 @@ def delivery_orders_bulk_pdf(request):
     try:
         orders = DeliveryOrder.objects.filter(id__in=order_ids)
 
-        if hasattr(request.user, "profile") and request.user.profile.is_operator:
+        if request.roles.is_operator:
             orders = orders.filter(operator=request.user)
 
         if not orders.exists():
@@ -530,14 +490,13 @@ def delivery_orders_bulk_pdf(request):
                         filename = f"delivery_{order.tracking_number or order.id}.pdf"
                         zip_file.writestr(filename, pdf)
                         success_count += 1
-                        print(f"✅ PDF создан для заявки {order.id}: {filename}")
+                        logger.debug("PDF создан для заявки %s: %s", order.id, filename)
                     else:
-                        print(f"⚠️ PDF не создан для заявки {order.id}")
+                        logger.warning("PDF не создан для заявки %s", order.id)
                 except Exception as e:
-                    print(f"❌ Ошибка при создании PDF для заявки {order.id}: {e}")
-                    import traceback
-
-                    traceback.print_exc()
+                    logger.exception(
+                        "Ошибка при создании PDF для заявки %s: %s", order.id, e
+                    )
 
         if success_count == 0:
             messages.error(request, "Не удалось создать ни одного PDF файла")
@@ -547,14 +506,11 @@ def delivery_orders_bulk_pdf(request):
         response = HttpResponse(zip_buffer, content_type="application/zip")
         response["Content-Disposition"] = 'attachment; filename="delivery_orders.zip"'
 
-        print(f"✅ Создан архив с {success_count} файлами")
+        logger.info("Создан архив с %s файлами", success_count)
         return response
 
     except Exception as e:
-        print(f"❌ Критическая ошибка при создании архива: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Критическая ошибка при создании архива: %s", e)
         messages.error(request, f"Ошибка при создании архива: {str(e)[:100]}")
         return redirect("delivery_order_list")
 
@@ -565,11 +521,11 @@ def reports_dashboard(request):
         "range_form": DateRangeReportForm(),
     }
 
-    if hasattr(request.user, "profile"):
-        context["user_role"] = request.user.profile.get_role_display()
-        context["is_operator"] = request.user.profile.is_operator
-        context["is_logistic"] = request.user.profile.is_logistic
-        context["is_admin"] = request.user.profile.is_admin
+    if request.roles.has_profile:
+        context["user_role"] = request.roles.role_display
+        context["is_operator"] = request.roles.is_operator
+        context["is_logistic"] = request.roles.is_logistic
+        context["is_admin"] = request.roles.is_admin
 
     return render(request, "reports/reports_dashboard.html", context)
 
@@ -584,7 +540,7 @@ def generate_daily_report(request):
             format_type = form.cleaned_data["format"]
 
             user_filter = {}
-            if hasattr(request.user, "profile") and request.user.profile.is_operator:
+            if request.roles.is_operator:
                 user_filter = {"operator": request.user}
 
             if format_type == "pdf":
@@ -621,22 +577,29 @@ def generate_daily_report(request):
                         return response
 
             elif format_type == "excel":
-                return generate_excel_report(report_date, report_type, user_filter)
+                with track_render("excel"):
+                    return generate_excel_report(report_date, report_type, user_filter)
 
     messages.error(request, "Ошибка при генерации отчета")
     return redirect("reports_dashboard")
 
 
 def generate_excel_report(date, report_type, user_filter):
+    import pandas as pd
+
     if report_type == "delivery":
-        orders = DeliveryOrder.objects.filter(date=date, **user_filter)
+        orders = DeliveryOrder.objects.filter(
+            delivery_date=date, **user_filter
+        ).select_related("operator", "logistic")
 
         data = []
         for order in orders:
             data.append(
                 {
                     "Номер": order.tracking_number or f"#{order.id}",
-                    "Дата отгрузки со склада": order.shipped_at.strftime("%d.%m.%Y"),
+                    "Дата отгрузки со склада": (
+                        order.shipped_at.strftime("%d.%m.%Y") if order.shipped_at else ""
+                    ),
                     "Дата доставки": order.delivery_date.strftime("%d.%m.%Y"),
                     "Адрес отправки": order.pickup_address or "",
                     "Адрес доставки": order.delivery_address or "",
@@ -681,7 +644,11 @@ def generate_excel_report(date, report_type, user_filter):
         return response
 
     elif report_type == "pickup":
-        orders = PickupOrder.objects.filter(pickup_date=date, **user_filter)
+        orders = PickupOrder.objects.filter(
+            pickup_date=date, **user_filter
+        ).select_related(
+            "sender", "receiving_warehouse", "receiving_operator", "logistic", "operator"
+        )
 
         data = []
         for order in orders:
@@ -689,15 +656,12 @@ def generate_excel_report(date, report_type, user_filter):
                 {
                     "Номер": order.tracking_number or f"#{order.id}",
                     "Дата забора": order.pickup_date.strftime("%d.%m.%Y"),
-                    "Время забора": (
-                        order.pickup_time.strftime("%H:%M") if order.pickup_time else ""
-                    ),
+                    "Время забора": order.pickup_time_range,
                     "Адрес забора": order.pickup_address or "",
                     "Контакт для выдачи": order.contact_person or "",
-                    "Клиент": order.client_name or "",
-                    "Компания": order.client_company or "",
-                    "Телефон": order.client_phone or "",
-                    "Email": order.client_email or "",
+                    "Клиент": order.get_client_name(),
+                    "Телефон": (order.sender.phone or "") if order.sender else "",
+                    "Email": (order.sender.email or "") if order.sender else "",
                     "Дата поставки": order.desired_delivery_date.strftime("%d.%m.%Y"),
                     "Адрес доставки": order.delivery_address or "",
                     "Номер накладной": order.invoice_number or "",
@@ -715,7 +679,11 @@ def generate_excel_report(date, report_type, user_filter):
                     "Вес (кг)": order.weight,
                     "Объем (м³)": order.volume,
                     "Статус": order.get_status_display(),
-                    "Логист": order.get_logistic_display() if order.logistic else "",
+                    "Логист": (
+                        order.logistic.get_full_name() or order.logistic.username
+                        if order.logistic
+                        else ""
+                    ),
                     "Оператор": order.operator.username if order.operator else "",
                 }
             )
@@ -768,7 +736,7 @@ def statistics_report(request):
             }
 
             user_filter = {}
-            if hasattr(request.user, "profile") and request.user.profile.is_operator:
+            if request.roles.is_operator:
                 user_filter = {"operator": request.user}
 
             if report_type == "delivery":
@@ -992,6 +960,73 @@ def statistics_report(request):
 #     return None
 
 
+# Поле склада для группировки отчета по времени в статусах
+STATUS_REPORT_WAREHOUSE = {
+    "delivery": "order__pickup_warehouse__name",
+    "pickup": "order__receiving_warehouse__name",
+}
+
+
+@login_required
+def status_durations_report(request):
+    """Время нахождения заявок в статусах по складам или логистам"""
+    today = timezone.now().date()
+    form = StatusDurationReportForm(
+        request.GET
+        or {
+            "start_date": today - timedelta(days=30),
+            "end_date": today,
+            "report_type": "delivery",
+            "group_by": "warehouse",
+        }
+    )
+    context = {"form": form}
+    if not form.is_valid():
+        return render(request, "reports/status_durations_report.html", context)
+
+    report_type = form.cleaned_data["report_type"]
+    group_by = form.cleaned_data["group_by"]
+    if report_type == "delivery":
+        model, history = DeliveryOrder, DeliveryStatusChange
+    else:
+        model, history = PickupOrder, PickupStatusChange
+
+    # Период задает набор заявок (по дате создания), а не смен статуса:
+    # оконной функции нужны все смены статуса заявки
+    changes = history.objects.filter(
+        order__created_at__date__range=[
+            form.cleaned_data["start_date"],
+            form.cleaned_data["end_date"],
+        ]
+    )
+    if request.roles.is_operator:
+        changes = changes.filter(order__operator=request.user)
+
+    group_field = (
+        STATUS_REPORT_WAREHOUSE[report_type]
+        if group_by == "warehouse"
+        else "order__logistic_id"
+    )
+    rows = status_durations(changes, group_field, dict(model.STATUS_CHOICES))
+
+    if group_by == "logistic":
+        users = User.objects.in_bulk({row["group"] for row in rows} - {None})
+        for row in rows:
+            user = users.get(row["group"])
+            row["group"] = user_full_name(user) if user else None
+
+    context.update(
+        {
+            "rows": rows,
+            "report_type": report_type,
+            "group_by": group_by,
+            "start_date": form.cleaned_data["start_date"],
+            "end_date": form.cleaned_data["end_date"],
+        }
+    )
+    return render(request, "reports/status_durations_report.html", context)
+
+
 class DeliveryOrderCreateView(LoginRequiredMixin, CreateView):
     """Создание новой заявки на доставку"""
 
@@ -1007,11 +1042,11 @@ class DeliveryOrderCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         form.instance.operator = self.request.user
+        form.instance.status_changed_by_id = self.request.user.pk
 
         if (
             not form.instance.logistic
-            and hasattr(self.request.user, "profile")
-            and self.request.user.profile.is_logistic
+            and self.request.roles.is_logistic
         ):
             form.instance.logistic = self.request.user
 
@@ -1024,13 +1059,43 @@ class DeliveryOrderCreateView(LoginRequiredMixin, CreateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        if hasattr(self.request.user, "profile"):
-            context["is_operator"] = self.request.user.profile.is_operator
-            context["is_logistic"] = self.request.user.profile.is_logistic
-            context["is_admin"] = self.request.user.profile.is_admin
+        if self.request.roles.has_profile:
+            context["is_operator"] = self.request.roles.is_operator
+            context["is_logistic"] = self.request.roles.is_logistic
+            context["is_admin"] = self.request.roles.is_admin
         return context
 
 
+DELIVERY_IMPORT = order_import.ImportSpec(
+    DeliveryOrder,
+    [
+        order_import.Column("delivery_date", order_import.parse_date),
+        order_import.Column("sender_id", order_import.parse_counterparty),
+        order_import.Column("pickup_address"),
+        order_import.Column("pickup_warehouse_id", order_import.parse_warehouse),
+        order_import.Column("recipient_id", order_import.parse_counterparty),
+        order_import.Column("delivery_address"),
+        order_import.Column("delivery_warehouse_id", order_import.parse_warehouse),
+        order_import.Column("delivery_city_id", order_import.parse_city),
+        order_import.Column("quantity", order_import.parse_int),
+        order_import.Column("weight", order_import.parse_float),
+        order_import.Column("volume", order_import.parse_float),
+    ],
+    defaults=lambda user: {"operator": user, "status": "submitted"},
+)
+
+
+@login_required
+def import_delivery_orders(request):
+    """Загрузка заявок на доставку из CSV/XLSX"""
+    return DELIVERY_IMPORT.view(
+        request,
+        "Импорт заявок на доставку",
+        reverse("delivery_order_list"),
+        "delivery_orders_template.csv",
+    )
+
+
 @login_required
 def get_logistics(request):
     """API для получения списка логистов с полными именами"""
@@ -1061,7 +1126,7 @@ def delivery_order_qr_pdf(request, pk):
     """Скачать QR-коды заявки на доставку"""
     order = get_object_or_404(DeliveryOrder, pk=pk)
 
-    if hasattr(request.user, "profile") and request.user.profile.is_operator:
+    if request.roles.is_operator:
         if order.operator != request.user:
             messages.error(request, "У вас нет доступа к этой заявке")
             return redirect("delivery_order_list")
@@ -1079,213 +1144,22 @@ def delivery_order_qr_pdf(request, pk):
             messages.error(request, "Файл QR-кода не найден")
             return redirect("delivery_order_detail", pk=pk)
 
-        with open(qr_code_path, "rb") as f:
-            qr_image_data = base64.b64encode(f.read()).decode("utf-8")
-
-        sender_display = (
-            order.pickup_address
-            if order.pickup_address and order.pickup_address.strip()
-            else "не указан"
-        )
-        recipient_display = (
-            order.delivery_address
-            if order.delivery_address and order.delivery_address.strip()
-            else "Не указан"
+        filename = f"delivery_qr_{order.tracking_number or order.id}_{order.quantity}_places.pdf"
+        response = pdf_cache.order_pdf_response(
+            request,
+            order,
+            lambda: create_delivery_labels_pdf(order),
+            filename,
+            extra_version=("labels",),
         )
-
-        qr_items_html = ""
-        total_items = order.quantity
-        shipped_at_str = order.shipped_at.strftime("%d.%m.%Y") if order.shipped_at else 'не указана'
-        delivery_date_str = order.delivery_date.strftime("%d.%m.%Y") if order.delivery_date else 'не указана' 
-
-        for i in range(1, total_items + 1):
-            qr_items_html += f"""
-            <div class="page">
-                <div class="qr-container">
-                    <div class="header-section">
-                        <div class="company-name">Фулфилмент Царицыно</div>
-                        <div class="order-header">
-                            <div class="order-number">Заявка: {order.tracking_number or f"#{order.id}"}</div>
-                            <div class="order-date">Дата отгрузки со склада: {shipped_at_str}</div>
-                            <div class="order-date">Дата доставки: {delivery_date_str}</div>
-                        </div>
-                    </div>
-                    
-                    <div class="address-section">
-                        <div class="address-block">
-                            <div class="address-label">Откуда:</div>
-                            <div class="address-text">{sender_display}</div>
-                        </div>
-                        <div class="address-block">
-                            <div class="address-label">Куда:</div>
-                            <div class="address-text">{recipient_display}</div>
-                        </div>
-                    </div>
-                    
-                    <div class="qr-code-section">
-                        <img src="data:image/png;base64,{qr_image_data}" class="qr-image" />
-                    </div>
-                    
-                    <div class="footer-section">
-                        <div class="counter">Место {i} из {total_items}</div>
-                        <div class="cargo-info">
-                            <div class="cargo-item">Мест: {order.quantity}</div>
-                            <div class="cargo-item">Вес: {order.weight} кг</div>
-                            <div class="cargo-item">Объем: {order.volume} м³</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                @page {{
-                    size: 75mm 120mm;
-                    margin: 2mm;
-                }}
-                body {{
-                    margin: 0;
-                    padding: 0;
-                    font-family: Arial, sans-serif;
-                    font-size: 13px;
-                    line-height: 1.1;
-                }}
-                .page {{
-                    page-break-after: always;
-                    width: 71mm;
-                    height: 116mm;
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                }}
-                .page:last-child {{
-                    page-break-after: avoid;
-                }}
-                .qr-container {{
-                    width: 100%;
-                    height: 100%;
-                    display: flex;
-                    flex-direction: column;
-                    justify-content: flex-start;
-                    align-items: center;
-                    padding: 0.5mm;
-                    box-sizing: border-box;
-                    border: 0.3mm solid #ccc;
-                    border-radius: 1mm;
-                }}
-                .header-section {{
-                    width: 100%;
-                    text-align: center;
-                    margin-bottom: 0.2mm;
-                }}
-                .company-name {{
-                    font-weight: bold;
-                    font-size: 13px;
-                    color: #000;
-                    margin-bottom: 0.2mm;
-                }}
-                .order-header {{
-                    display: flex;
-                    justify-content: flex-start;
-                    font-size: 10px;
-                    color: #444;
-                }}
-                .address-section {{
-                    width: 100%;
-                    margin: 0.5mm 0;
-                }}
-                .address-block {{
-                    margin-bottom: 0.2mm;
-                }}
-                .address-label {{
-                    font-weight: bold;
-                    font-size: 13px;
-                    color: #000;
-                    margin-bottom: 0.3mm;
-                }}
-                .address-text {{
-                    font-size: 13px;
-                    color: #333;
-                    word-break: break-word;
-                    line-height: 1.2;
-                }}
-                .qr-code-section {{
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                    width: 100%;
-                    margin: 0.2mm 0;
-                }}
-                .qr-image {{
-                    width: 55mm;
-                    height: 55mm;
-                    max-width: 90%;
-                    max-height: 90%;
-                }}
-                .footer-section {{
-                    width: 100%;
-                    text-align: center;
-                }}
-                .counter {{
-                    font-size: 10px;
-                    color: #000;
-                    margin-bottom: 0.2mm;
-                }}
-                .cargo-info {{
-                    width: calc(100% + 2mm); 
-                    margin-left: -6mm;
-                    margin-right: -6mm;
-                    font-weight: bold;
-                    display: flex;
-                    font-size: 9px;
-                    color: #000;
-                    border-top: 0.3mm solid #eee;
-                    padding-top: 0.3mm;
-                    box-sizing: border-box;
-                }}
-                .cargo-item {{
-                    text-align: center;
-                    box-sizing: border-box;
-                }}
-                .cargo-item:nth-child(1) {{
-                width: 22mm;
-                flex-shrink: 0;
-                flex-grow: 0;
-                }}
-                .cargo-item:nth-child(2),
-                .cargo-item:nth-child(3) {{
-                flex: 1;
-                }}
-            </style>
-        </head>
-        <body>
-            {qr_items_html}
-        </body>
-        </html>
-        """
-
-        html = HTML(string=html_content)
-        pdf = html.write_pdf()
-
-        if pdf:
-            response = HttpResponse(pdf, content_type="application/pdf")
-            filename = f"delivery_qr_{order.tracking_number or order.id}_{order.quantity}_places.pdf"
-            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        if response is not None:
             return response
         else:
             messages.error(request, "Ошибка при генерации PDF")
             return redirect("delivery_order_detail", pk=pk)
 
     except Exception as e:
-        print(f"❌ Ошибка при создании PDF с QR-кодами: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Ошибка при создании PDF с QR-кодами: %s", e)
         messages.error(request, f"Ошибка при создании PDF: {str(e)}")
         return redirect("delivery_order_detail", pk=pk)
 
@@ -1296,8 +1170,7 @@ def bulk_update_delivery_orders(request):
     """Массовое обновление выбранных заявок"""
     try:
         if not (
-            request.user.is_superuser
-            or request.user.groups.filter(name="Логисты").exists()
+            request.roles.in_logists_group
         ):
             return JsonResponse(
                 {"success": False, "error": "Нет прав на массовое редактирование"}
@@ -1338,16 +1211,28 @@ def bulk_update_delivery_orders(request):
 
         orders = DeliveryOrder.objects.filter(id__in=order_ids)
 
-        if hasattr(request.user, "profile") and request.user.profile.is_operator:
+        if request.roles.is_operator:
             orders = orders.filter(operator=request.user)
 
         if not orders.exists():
             return JsonResponse({"success": False, "error": "Заявки не найдены"})
 
+        if field == "status":
+            # Один UPDATE на всю выборку и запись в историю статусов
+            if value not in dict(DeliveryOrder.STATUS_CHOICES):
+                return JsonResponse({"success": False, "error": "Неверный статус"})
+            return JsonResponse(
+                {
+                    "success": True,
+                    "updated_count": orders.set_status(value, changed_by=request.user),
+                    "total_count": len(order_ids),
+                }
+            )
+
         updated_count = 0
         for order in orders:
             try:
-                if order.status == "shipped" and field != "status":
+                if order.status == "shipped":
                     continue
 
                 if field in ["quantity"]:
@@ -1361,11 +1246,7 @@ def bulk_update_delivery_orders(request):
                         continue
                 elif field == "logistic":
                     # Проверяем права на изменение логиста
-                    if not (
-                        request.user.is_superuser
-                        or hasattr(request.user, "profile")
-                        and request.user.profile.is_admin
-                    ):
+                    if not (request.roles.is_superuser or request.roles.is_admin):
                         continue  # Пропускаем для не-админов
 
                     if value:
@@ -1385,7 +1266,7 @@ def bulk_update_delivery_orders(request):
                 updated_count += 1
 
             except Exception as e:
-                print(f"Ошибка при обновлении заявки {order.id}: {e}")
+                logger.error("Ошибка при обновлении заявки %s: %s", order.id, e)
                 continue
 
         return JsonResponse(
@@ -1401,6 +1282,72 @@ def bulk_update_delivery_orders(request):
 
 
 @login_required
+def delivery_orders_labels(request):
+    """
+    QR-этикетки выбранных заявок (order_ids) или всех заявок с датой
+    доставки date одним PDF: шаблон, стили и шрифты разбираются один раз
+    на весь документ.
+    """
+    try:
+        order_ids = [int(pk) for pk in request.GET.getlist("order_ids")]
+    except ValueError:
+        messages.error(request, "Не выбраны заявки для печати этикеток")
+        return redirect("delivery_order_list")
+    date_str = request.GET.get("date")
+
+    orders = DeliveryOrder.objects.all()
+    if order_ids:
+        orders = orders.filter(id__in=order_ids)
+    elif date_str:
+        try:
+            labels_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        except ValueError:
+            messages.error(request, "Неверный формат даты")
+            return redirect("delivery_order_list")
+        orders = orders.filter(delivery_date=labels_date)
+    else:
+        messages.error(request, "Не выбраны заявки для печати этикеток")
+        return redirect("delivery_order_list")
+
+    if request.roles.is_operator:
+        orders = orders.filter(operator=request.user)
+
+    max_orders = django_settings.LABEL_BATCH_MAX_ORDERS
+    orders = list(orders.order_by("delivery_date", "id")[: max_orders + 1])
+    if not orders:
+        messages.error(request, "Не найдено заявок для печати этикеток")
+        return redirect("delivery_order_list")
+    if len(orders) > max_orders:
+        messages.error(request, f"За один раз можно напечатать этикетки не более {max_orders} заявок")
+        return redirect("delivery_order_list")
+
+    total_places = sum(order.quantity or 1 for order in orders)
+    if total_places > django_settings.LABEL_BATCH_MAX_PAGES:
+        messages.error(
+            request,
+            f"Слишком много мест ({total_places}), максимум {django_settings.LABEL_BATCH_MAX_PAGES}",
+        )
+        return redirect("delivery_order_list")
+
+    try:
+        pdf = create_delivery_labels_batch_pdf(orders, label_qr_pngs(orders))
+
+        if pdf:
+            response = HttpResponse(pdf, content_type="application/pdf")
+            suffix = date_str if date_str and not order_ids else datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"delivery_labels_{suffix}.pdf"
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return response
+        else:
+            messages.error(request, "Ошибка при генерации PDF с этикетками")
+            return redirect("delivery_order_list")
+
+    except Exception as e:
+        logger.exception("Ошибка при создании PDF с этикетками: %s", e)
+        messages.error(request, f"Ошибка при создании PDF с этикетками: {str(e)[:100]}")
+        return redirect("delivery_order_list")
+
+
 def delivery_orders_list_pdf(request):
     """Экспорт списка выбранных заявок на доставку в PDF (одним файлом)"""
     order_ids = request.GET.getlist("order_ids")
@@ -1412,7 +1359,7 @@ def delivery_orders_list_pdf(request):
     try:
         orders = DeliveryOrder.objects.filter(id__in=order_ids)
 
-        if hasattr(request.user, "profile") and request.user.profile.is_operator:
+        if request.roles.is_operator:
             orders = orders.filter(operator=request.user)
 
         if not orders.exists():
@@ -1431,9 +1378,6 @@ def delivery_orders_list_pdf(request):
             return redirect("delivery_order_list")
 
     except Exception as e:
-        print(f"❌ Ошибка при создании PDF списка: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Ошибка при создании PDF списка: %s", e)
         messages.error(request, f"Ошибка при создании PDF списка: {str(e)[:100]}")
         return redirect("delivery_order_list")
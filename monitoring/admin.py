@@ -0,0 +1,117 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib import admin
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from . import metrics
+from .models import RequestSample
+
+
+@admin.register(RequestSample)
+class RequestSampleAdmin(admin.ModelAdmin):
+    list_display = [
+        "created_at",
+        "url_name",
+        "method",
+        "status_code",
+        "duration_ms",
+        "query_count",
+        "query_ms",
+        "render_kind",
+        "render_ms",
+        "cache_hits",
+        "cache_misses",
+        "connection_reused",
+    ]
+    list_filter = ["url_name", "method", "render_kind", "connection_reused", "created_at"]
+    search_fields = ["url_name"]
+    date_hierarchy = "created_at"
+    list_per_page = 100
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        # Сбрасываем буфер текущего процесса, чтобы свежие замеры попали в отчет
+        metrics.buffer.flush()
+
+        response = super().changelist_view(request, extra_context)
+
+        try:
+            queryset = response.context_data["cl"].queryset
+        except (AttributeError, KeyError):
+            return response
+
+        response.context_data["url_stats"] = self.build_url_stats(queryset)
+        response.context_data["stats_days"] = settings.REQUEST_METRICS_STATS_DAYS
+        response.context_data["cache_stats"] = metrics.cache_stats.snapshot()
+        return response
+
+    @staticmethod
+    def hit_rate(hits, misses):
+        """Доля попаданий в кэш, %; None - запрос кэш не читал"""
+        total = hits + misses
+        return hits * 100 / total if total else None
+
+    def build_url_stats(self, queryset):
+        """
+        Сводка по имени URL: число запросов, перцентили, средние SQL и рендер.
+        Для перцентилей время ответа читается построчно, поэтому берутся
+        только замеры за последние REQUEST_METRICS_STATS_DAYS дней.
+        """
+        since = timezone.now() - timedelta(days=settings.REQUEST_METRICS_STATS_DAYS)
+        queryset = queryset.filter(created_at__gte=since)
+        aggregates = {
+            row["url_name"]: row
+            for row in queryset.order_by()
+            .values("url_name")
+            .annotate(
+                count=Count("id"),
+                avg_queries=Avg("query_count"),
+                avg_query_ms=Avg("query_ms"),
+                avg_render_ms=Avg("render_ms"),
+                reused=Count("id", filter=Q(connection_reused=True)),
+                reuse_known=Count("id", filter=Q(connection_reused__isnull=False)),
+                cache_hits=Sum("cache_hits"),
+                cache_misses=Sum("cache_misses"),
+            )
+        }
+
+        durations = defaultdict(list)
+        for url_name, duration in queryset.order_by("url_name", "duration_ms").values_list(
+            "url_name", "duration_ms"
+        ):
+            durations[url_name].append(duration)
+
+        stats = []
+        for url_name, row in aggregates.items():
+            values = durations[url_name]
+            stats.append(
+                {
+                    "url_name": url_name,
+                    "count": row["count"],
+                    "p50": metrics.percentile(values, 0.50),
+                    "p95": metrics.percentile(values, 0.95),
+                    "p99": metrics.percentile(values, 0.99),
+                    "avg_queries": row["avg_queries"] or 0,
+                    "avg_query_ms": row["avg_query_ms"] or 0,
+                    "avg_render_ms": row["avg_render_ms"] or 0,
+                    "reuse_rate": (
+                        row["reused"] * 100 / row["reuse_known"]
+                        if row["reuse_known"]
+                        else None
+                    ),
+                    "cache_hit_rate": self.hit_rate(
+                        row["cache_hits"] or 0, row["cache_misses"] or 0
+                    ),
+                }
+            )
+
+        stats.sort(key=lambda item: item["p95"], reverse=True)
+        return stats
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
+    verbose_name = "Мониторинг"
+
+    def ready(self):
+        # Регистрация проверок соединений с БД
+        from . import checks  # noqa: F401
+        from utils.log import log_startup
+
+        log_startup()
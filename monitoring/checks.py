@@ -0,0 +1,84 @@
+"""
+Проверки настроек соединений с БД при старте (manage.py check / migrate).
+
+- monitoring.W001 (check --deploy): в продакшене без постоянных соединений
+  каждый запрос заново подключается к MySQL;
+- monitoring.W002 (migrate, check --database default): CONN_MAX_AGE не меньше
+  wait_timeout MySQL - сервер закроет соединение раньше Django, и запрос
+  получит "MySQL server has gone away" (без CONN_HEALTH_CHECKS);
+- monitoring.W003: SQLite для разработки работает не в режиме WAL;
+- monitoring.W004 (check --deploy): в продакшене кэш locmem - у каждого
+  воркера свой, поэтому сессии, пользователь, роли и справочники
+  читаются из БД.
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.db import connections
+
+
+@register(Tags.database, deploy=True)
+def check_persistent_connections(app_configs=None, **kwargs):
+    database = settings.DATABASES["default"]
+    if not settings.IS_PRODUCTION or "dj_db_conn_pool" in database["ENGINE"]:
+        return []
+    if database.get("CONN_MAX_AGE"):
+        return []
+    return [
+        Warning(
+            "Соединения с БД открываются заново на каждый запрос",
+            hint="Задайте DB_CONN_MAX_AGE > 0 или включите MYSQL_POOL",
+            id="monitoring.W001",
+        )
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs=None, **kwargs):
+    if not settings.IS_PRODUCTION or settings.CACHE_SHARED:
+        return []
+    return [
+        Warning(
+            "Кэш locmem не общий для воркеров: сессии, пользователь, роли и "
+            "справочники не кэшируются",
+            hint="Задайте CACHE_BACKEND=redis или file",
+            id="monitoring.W004",
+        )
+    ]
+
+
+@register(Tags.database)
+def check_database_connection(app_configs=None, databases=None, **kwargs):
+    if not databases or "default" not in databases:
+        return []
+
+    connection = connections["default"]
+    errors = []
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute("SELECT @@wait_timeout")
+            wait_timeout = int(cursor.fetchone()[0])
+            max_age = connection.settings_dict.get("CONN_MAX_AGE", 0)
+            expires = max_age is None or max_age >= wait_timeout
+            if expires and not connection.settings_dict.get("CONN_HEALTH_CHECKS"):
+                errors.append(
+                    Warning(
+                        f"CONN_MAX_AGE ({max_age}) не меньше wait_timeout MySQL "
+                        f"({wait_timeout} сек)",
+                        hint="Уменьшите DB_CONN_MAX_AGE или включите "
+                        "DB_CONN_HEALTH_CHECKS",
+                        id="monitoring.W002",
+                    )
+                )
+        elif connection.vendor == "sqlite" and not connection.is_in_memory_db():
+            cursor.execute("PRAGMA journal_mode")
+            mode = cursor.fetchone()[0]
+            if mode.lower() != "wal":
+                errors.append(
+                    Warning(
+                        f"SQLite работает в режиме журнала {mode}, а не WAL",
+                        hint="Проверьте OPTIONS.init_command в DATABASES",
+                        id="monitoring.W003",
+                    )
+                )
+    return errors
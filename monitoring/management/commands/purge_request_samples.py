@@ -0,0 +1,55 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from monitoring.models import RequestSample
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет замеры запросов старше REQUEST_METRICS_RETENTION_DAYS пачками, "
+        "чтобы не блокировать таблицу одним большим DELETE"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.REQUEST_METRICS_RETENTION_DAYS,
+            help="Сколько дней хранить замеры",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Замеров в одном DELETE",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.1,
+            help="Пауза между пачками (сек), чтобы не мешать рабочим запросам",
+        )
+
+    def handle(self, *args, **options):
+        border = timezone.now() - timedelta(days=options["days"])
+        deleted = 0
+        while True:
+            ids = list(
+                RequestSample.objects.filter(created_at__lt=border)
+                .order_by()
+                .values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not ids:
+                break
+            count, _ = RequestSample.objects.filter(pk__in=ids).delete()
+            deleted += count
+            self.stdout.write(f"🗑️  Удалено замеров: {deleted}")
+            time.sleep(options["pause"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Удалено старых замеров запросов: {deleted}")
+        )
@@ -0,0 +1,207 @@
+import atexit
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+# Замер текущего запроса; None, если запрос не попал в выборку
+_current_sample = ContextVar("request_metrics_sample", default=None)
+
+
+class SampleBuffer:
+    """
+    Кольцевой буфер замеров в памяти процесса.
+    При переполнении старые замеры вытесняются. Запрос только добавляет
+    замер, в хранилище буфер раз в flush_interval секунд сбрасывает
+    отдельный поток процесса (и оставшееся - при завершении процесса).
+    """
+
+    def __init__(self, size, flush_interval):
+        self._items = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._flush_interval = flush_interval
+        self._thread = None
+        self._pid = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def append(self, sample):
+        with self._lock:
+            self._items.append(sample)
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                # Первый замер процесса (в том числе после fork воркера)
+                self._start_flusher()
+
+    def _start_flusher(self):
+        if self._pid is None:
+            atexit.register(self.flush)
+        self._pid = os.getpid()
+        self._thread = threading.Thread(
+            target=self._flush_loop, name="request-metrics-flush", daemon=True
+        )
+        self._thread.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self._flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception("Ошибка сброса замеров запросов: %s", e)
+            finally:
+                # У потока свои соединения с БД - между сбросами не держим их
+                connections.close_all()
+
+    def drain(self):
+        with self._lock:
+            items = list(self._items)
+            self._items.clear()
+        return items
+
+    def flush(self):
+        """Сбрасывает накопленные замеры в таблицу или JSON-lines файл"""
+        items = self.drain()
+        if not items:
+            return 0
+
+        if settings.REQUEST_METRICS_SINK == "jsonl":
+            path = Path(settings.REQUEST_METRICS_JSONL_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                for item in items:
+                    f.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+        else:
+            from .models import RequestSample
+
+            RequestSample.objects.bulk_create(
+                [RequestSample(**item) for item in items], batch_size=500
+            )
+
+        return len(items)
+
+
+buffer = SampleBuffer(
+    size=settings.REQUEST_METRICS_BUFFER_SIZE,
+    flush_interval=settings.REQUEST_METRICS_FLUSH_INTERVAL,
+)
+
+
+def start_sample(connection_reused=False):
+    sample = {
+        "connection_reused": connection_reused,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "query_count": 0,
+        "query_ms": 0.0,
+        "render_kind": "",
+        "render_ms": 0.0,
+    }
+    token = _current_sample.set(sample)
+    return sample, token
+
+
+def finish_sample(token):
+    _current_sample.reset(token)
+
+
+class QueryTimer:
+    """execute_wrapper, считающий SQL-запросы и их время в текущем замере"""
+
+    def __init__(self, sample):
+        self.sample = sample
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sample["query_count"] += 1
+            self.sample["query_ms"] += (time.perf_counter() - start) * 1000
+
+
+class CacheStats:
+    """
+    Счетчики попаданий и промахов по именованным кэшам с запуска процесса.
+    Попадания в локальный уровень TieredCache считаются отдельно.
+    """
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, name, hits, misses, local=False):
+        with self._lock:
+            self._counts[(name, "local_hits" if local else "hits")] += hits
+            self._counts[(name, "misses")] += misses
+
+    def snapshot(self):
+        """[{name, hits, local_hits, misses, hit_rate}] по именам кэшей"""
+        with self._lock:
+            counts = dict(self._counts)
+        names = sorted({name for name, _ in counts})
+        rows = []
+        for name in names:
+            hits = counts.get((name, "hits"), 0)
+            local_hits = counts.get((name, "local_hits"), 0)
+            misses = counts.get((name, "misses"), 0)
+            total = hits + local_hits + misses
+            rows.append(
+                {
+                    "name": name,
+                    "hits": hits,
+                    "local_hits": local_hits,
+                    "misses": misses,
+                    "hit_rate": (hits + local_hits) * 100 / total if total else 0,
+                }
+            )
+        return rows
+
+
+cache_stats = CacheStats()
+
+
+def record_cache(name, hits, misses, local=False):
+    """Учитывает чтение из кэша name в счетчиках процесса и замере запроса"""
+    cache_stats.add(name, hits, misses, local)
+    sample = _current_sample.get()
+    if sample is not None:
+        sample["cache_hits"] += hits
+        sample["cache_misses"] += misses
+
+
+@contextmanager
+def track_render(kind):
+    """
+    Замеряет время генерации документа (pdf/excel) внутри запроса.
+    Если запрос не попал в выборку, ничего не делает.
+    """
+    sample = _current_sample.get()
+    if sample is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample["render_kind"] = kind
+        sample["render_ms"] += (time.perf_counter() - start) * 1000
+
+
+def percentile(sorted_values, fraction):
+    """Перцентиль по отсортированному списку (ближайший ранг)"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
@@ -0,0 +1,55 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils import timezone
+
+from . import metrics
+
+
+class RequestMetricsMiddleware:
+    """
+    Записывает время ответа, число и время SQL-запросов, время генерации
+    PDF/Excel и повторное использование соединения с БД для доли запросов
+    REQUEST_METRICS_SAMPLE_RATE. С пулом соединений (MYSQL_POOL) Django
+    закрывает соединение после каждого запроса (CONN_MAX_AGE=0), а берет ли
+    пул из очереди открытое соединение, снаружи не видно - тогда повторное
+    использование не записывается (None).
+    При нулевой доле middleware отключается при старте и не стоит ничего.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+        self.pooled = "dj_db_conn_pool" in connection.settings_dict["ENGINE"]
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        # Соединение, открытое к началу запроса, осталось от предыдущего
+        # (CONN_MAX_AGE): устаревшие закрываются раньше, по request_started
+        sample, token = metrics.start_sample(
+            connection_reused=None if self.pooled else connection.connection is not None
+        )
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics.QueryTimer(sample)):
+                response = self.get_response(request)
+        finally:
+            metrics.finish_sample(token)
+
+        match = request.resolver_match
+        sample.update(
+            url_name=(match.view_name if match else "") or "<unresolved>",
+            method=request.method,
+            status_code=response.status_code,
+            duration_ms=(time.perf_counter() - start) * 1000,
+            created_at=timezone.now(),
+        )
+        metrics.buffer.append(sample)
+        return response
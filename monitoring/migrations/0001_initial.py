@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_name', models.CharField(max_length=200, verbose_name='Имя URL')),
+                ('method', models.CharField(max_length=10, verbose_name='Метод')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='HTTP-статус')),
+                ('duration_ms', models.FloatField(verbose_name='Время ответа (мс)')),
+                ('query_count', models.PositiveIntegerField(default=0, verbose_name='SQL-запросов')),
+                ('query_ms', models.FloatField(default=0.0, verbose_name='Время SQL (мс)')),
+                ('render_kind', models.CharField(blank=True, default='', help_text='pdf или excel, если запрос генерировал документ', max_length=10, verbose_name='Тип рендера')),
+                ('render_ms', models.FloatField(default=0.0, verbose_name='Время рендера (мс)')),
+                ('created_at', models.DateTimeField(verbose_name='Время запроса')),
+            ],
+            options={
+                'verbose_name': 'Замер запроса',
+                'verbose_name_plural': 'Замеры запросов',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['url_name', 'created_at'], name='monitoring__url_nam_eeb886_idx'), models.Index(fields=['created_at'], name='monitoring__created_793413_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestsample',
+            name='connection_reused',
+            field=models.BooleanField(default=False, help_text='Запрос получил уже открытое соединение (CONN_MAX_AGE)', verbose_name='Соединение с БД повторно'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0002_requestsample_connection_reused'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestsample',
+            name='cache_hits',
+            field=models.PositiveIntegerField(default=0, verbose_name='Попаданий в кэш'),
+        ),
+        migrations.AddField(
+            model_name='requestsample',
+            name='cache_misses',
+            field=models.PositiveIntegerField(default=0, verbose_name='Промахов кэша'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0003_requestsample_cache_counts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='requestsample',
+            name='connection_reused',
+            field=models.BooleanField(default=False, help_text='Запрос получил уже открытое соединение (CONN_MAX_AGE); пусто - соединения выдает пул MYSQL_POOL, и повторное использование не видно', null=True, verbose_name='Соединение с БД повторно'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import models
+
+
+class RequestSample(models.Model):
+    """
+    Замер одного запроса, сброшенный из кольцевого буфера middleware
+    """
+
+    url_name = models.CharField(max_length=200, verbose_name="Имя URL")
+    method = models.CharField(max_length=10, verbose_name="Метод")
+    status_code = models.PositiveSmallIntegerField(verbose_name="HTTP-статус")
+    duration_ms = models.FloatField(verbose_name="Время ответа (мс)")
+    query_count = models.PositiveIntegerField(
+        default=0, verbose_name="SQL-запросов"
+    )
+    query_ms = models.FloatField(default=0.0, verbose_name="Время SQL (мс)")
+    render_kind = models.CharField(
+        max_length=10,
+        blank=True,
+        default="",
+        verbose_name="Тип рендера",
+        help_text="pdf или excel, если запрос генерировал документ",
+    )
+    render_ms = models.FloatField(default=0.0, verbose_name="Время рендера (мс)")
+    cache_hits = models.PositiveIntegerField(default=0, verbose_name="Попаданий в кэш")
+    cache_misses = models.PositiveIntegerField(default=0, verbose_name="Промахов кэша")
+    connection_reused = models.BooleanField(
+        null=True,
+        default=False,
+        verbose_name="Соединение с БД повторно",
+        help_text=(
+            "Запрос получил уже открытое соединение (CONN_MAX_AGE); пусто - "
+            "соединения выдает пул MYSQL_POOL, и повторное использование не видно"
+        ),
+    )
+    created_at = models.DateTimeField(verbose_name="Время запроса")
+
+    class Meta:
+        verbose_name = "Замер запроса"
+        verbose_name_plural = "Замеры запросов"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["url_name", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.url_name} {self.duration_ms:.0f} мс"
@@ -0,0 +1,477 @@
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from django.utils.log import AdminEmailHandler
+
+from utils import demo_data
+from utils.log import JsonFormatter, QueueHandler
+
+from . import checks, metrics
+from .admin import RequestSampleAdmin
+from .models import RequestSample
+
+BUDGETS_PATH = Path(__file__).resolve().parent / "query_budgets.json"
+
+# Запас по времени при перезаписи бюджетов (UPDATE_QUERY_BUDGETS=1)
+TIME_HEADROOM = 5
+MIN_TIME_BUDGET_MS = 250
+
+# Время ответа зависит от машины и ее загрузки, поэтому max_ms проверяется
+# только по явному запросу (CHECK_TIME_BUDGETS=1), например на стенде
+# с постоянным железом; число SQL-запросов проверяется всегда
+CHECK_TIME_BUDGETS = os.getenv("CHECK_TIME_BUDGETS") == "1"
+
+# Пространства имен, которые не проверяются (админка Django)
+SKIPPED_NAMESPACES = {"admin"}
+
+TEST_MEDIA_ROOT = tempfile.mkdtemp(prefix="crm_test_media_")
+
+try:
+    import weasyprint  # noqa: F401
+
+    HAS_WEASYPRINT = True
+except (ImportError, OSError):
+    # WeasyPrint установлен, но без системных библиотек (pango) не загружается
+    HAS_WEASYPRINT = False
+
+
+def iter_named_urls(patterns=None, namespace=None):
+    """Обходит все именованные URL проекта, включая подключенные через include()"""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in SKIPPED_NAMESPACES:
+                continue
+            yield from iter_named_urls(
+                pattern.url_patterns, pattern.namespace or namespace
+            )
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+            yield name, list(pattern.pattern.regex.groupindex)
+
+
+def load_budgets():
+    with open(BUDGETS_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_budgets(budgets):
+    with open(BUDGETS_PATH, "w", encoding="utf-8") as f:
+        json.dump(budgets, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+# Бюджеты считаются для продакшена с общим кэшем (CACHE_BACKEND redis/file);
+# в одном процессе теста locmem ведет себя так же
+@override_settings(
+    MEDIA_ROOT=TEST_MEDIA_ROOT,
+    REQUEST_METRICS_SAMPLE_RATE=0,
+    CACHE_SHARED=True,
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+)
+class QueryBudgetTests(TestCase):
+    """
+    Проверяет каждый именованный URL на наборе данных реалистичного объема:
+    число SQL-запросов и время ответа не должны превышать значения из
+    query_budgets.json. URL без бюджета считается ошибкой.
+
+    Пересчитать бюджеты после осознанного изменения:
+        UPDATE_QUERY_BUDGETS=1 python manage.py test monitoring
+    Проверить также время ответа:
+        CHECK_TIME_BUDGETS=1 python manage.py test monitoring
+    """
+
+    # Множитель demo_data.seed: 200 доставок, 125 заборов, 40 контрагентов -
+    # больше одной страницы в каждом списке, чтобы N+1 проявлялся в числе
+    # запросов
+    SCALE = 5
+    MIN_ROWS = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        data = demo_data.seed(scale=cls.SCALE)
+        cls.user = data["users"]["admin"]
+        # Суперпользователь видит все ветки кода, включая массовые операции
+        cls.user.is_superuser = cls.user.is_staff = True
+        cls.user.save()
+        cls.seeded_rows = min(len(data["deliveries"]), len(data["pickups"]))
+
+        linked_ids = {pickup.pk for pickup, _ in data["linked"]}
+        unlinked_pickup = next(
+            p
+            for p in data["pickups"]
+            if p.status == "ready" and p.pk not in linked_ids
+        )
+
+        # Объекты, подставляемые в аргументы URL (ключ "args" в бюджете)
+        # и в параметры запроса (строки вида "@delivery")
+        cls.url_objects = {
+            "delivery": data["deliveries"][0].pk,
+            "pickup": data["pickups"][0].pk,
+            "pickup_unlinked": unlinked_pickup.pk,
+            "counterparty": data["counterparties"][0].pk,
+            "city": data["cities"]["Москва"].pk,
+            "warehouse": data["warehouses"]["MSK-EL"].pk,
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
+    def build_url(self, name, arg_names, budget):
+        args = budget.get("args", {})
+        kwargs = {arg: self.url_objects[args[arg]] for arg in arg_names}
+        return reverse(name, kwargs=kwargs)
+
+    def resolve_refs(self, value):
+        if isinstance(value, dict):
+            return {key: self.resolve_refs(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve_refs(item) for item in value]
+        if isinstance(value, str) and value.startswith("@"):
+            return self.url_objects[value[1:]]
+        return value
+
+    def request(self, url, budget):
+        method = budget.get("method", "get")
+        if "json" in budget:
+            return getattr(self.client, method)(
+                url,
+                data=json.dumps(self.resolve_refs(budget["json"])),
+                content_type="application/json",
+            )
+        return getattr(self.client, method)(
+            url, data=self.resolve_refs(budget.get("params", {}))
+        )
+
+    def measure(self, name, arg_names, budget):
+        self.client.force_login(self.user)
+        url = self.build_url(name, arg_names, budget)
+
+        # Точка сохранения снаружи замера: ошибка БД в одном представлении
+        # не ломает транзакцию для остальных URL
+        with transaction.atomic(), CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = self.request(url, budget)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.assertLess(
+            response.status_code, 500, f"{name}: ответ {response.status_code}"
+        )
+        return ctx.captured_queries, elapsed_ms
+
+    def test_views_within_budget(self):
+        self.assertGreaterEqual(self.seeded_rows, self.MIN_ROWS)
+        budgets = load_budgets()
+        update = os.getenv("UPDATE_QUERY_BUDGETS") == "1"
+        urls = dict(iter_named_urls())
+
+        missing = sorted(set(urls) - set(budgets))
+        if update:
+            for name in missing:
+                budgets[name] = {"max_queries": 0, "max_ms": 0}
+        else:
+            self.assertFalse(
+                missing,
+                f"Нет бюджета для URL: {', '.join(missing)}. "
+                f"Добавьте их в {BUDGETS_PATH.name}",
+            )
+
+        for name in sorted(urls):
+            budget = budgets[name]
+            with self.subTest(url=name):
+                if "skip" in budget:
+                    self.skipTest(budget["skip"])
+                if budget.get("requires") == "weasyprint" and not HAS_WEASYPRINT:
+                    self.skipTest("WeasyPrint недоступен в этом окружении")
+
+                queries, elapsed_ms = self.measure(name, urls[name], budget)
+
+                if update:
+                    budget["max_queries"] = len(queries)
+                    budget["max_ms"] = max(
+                        MIN_TIME_BUDGET_MS, round(elapsed_ms * TIME_HEADROOM, -1)
+                    )
+                    continue
+
+                self.assertLessEqual(
+                    len(queries),
+                    budget["max_queries"],
+                    f"{name}: {len(queries)} SQL-запросов при бюджете "
+                    f"{budget['max_queries']}\n{self.describe_queries(queries)}",
+                )
+                if CHECK_TIME_BUDGETS:
+                    self.assertLessEqual(
+                        elapsed_ms,
+                        budget["max_ms"],
+                        f"{name}: {elapsed_ms:.0f} мс при бюджете {budget['max_ms']} мс",
+                    )
+
+        if update:
+            save_budgets(budgets)
+
+    @staticmethod
+    def describe_queries(queries, limit=5):
+        """Самые частые запросы - обычно это и есть N+1"""
+        counts = Counter(q["sql"].split(" WHERE ")[0] for q in queries)
+        return "\n".join(
+            f"  {count} x {sql[:200]}" for sql, count in counts.most_common(limit)
+        )
+
+
+class RequestMetricsTests(TestCase):
+    def test_execute_wrapper_counts_queries(self):
+        sample, token = metrics.start_sample()
+        try:
+            with connection.execute_wrapper(metrics.QueryTimer(sample)):
+                for _ in range(3):
+                    RequestSample.objects.count()
+        finally:
+            metrics.finish_sample(token)
+        self.assertEqual(sample["query_count"], 3)
+        self.assertGreater(sample["query_ms"], 0)
+
+    def test_samples_isolated_between_threads(self):
+        sample, token = metrics.start_sample()
+        seen = {}
+
+        def other_request():
+            seen["outside"] = metrics._current_sample.get()
+            other, other_token = metrics.start_sample()
+            metrics.record_cache("default", 5, 0)
+            metrics.finish_sample(other_token)
+            seen["other"] = other
+
+        try:
+            metrics.record_cache("default", 1, 1)
+            thread = threading.Thread(target=other_request)
+            thread.start()
+            thread.join()
+        finally:
+            metrics.finish_sample(token)
+
+        self.assertIsNone(seen["outside"])
+        self.assertEqual((sample["cache_hits"], sample["cache_misses"]), (1, 1))
+        self.assertEqual(seen["other"]["cache_hits"], 5)
+        self.assertIsNone(metrics._current_sample.get())
+
+    def test_append_does_not_flush_in_request(self):
+        buffer = metrics.SampleBuffer(size=10, flush_interval=3600)
+        sample, token = metrics.start_sample()
+        metrics.finish_sample(token)
+        sample.update(
+            url_name="x",
+            method="GET",
+            status_code=200,
+            duration_ms=1,
+            created_at=timezone.now(),
+        )
+        with self.assertNumQueries(0):
+            buffer.append(sample)
+        self.assertEqual(len(buffer), 1)
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(RequestSample.objects.count(), 1)
+
+    def test_background_thread_flushes(self):
+        path = Path(TEST_MEDIA_ROOT) / "request_metrics.jsonl"
+        buffer = metrics.SampleBuffer(size=10, flush_interval=0.05)
+        with override_settings(
+            REQUEST_METRICS_SINK="jsonl", REQUEST_METRICS_JSONL_PATH=str(path)
+        ):
+            buffer.append({"url_name": "x"})
+            deadline = time.monotonic() + 5
+            while len(buffer) and time.monotonic() < deadline:
+                time.sleep(0.05)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(json.loads(path.read_text().splitlines()[0])["url_name"], "x")
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1)
+    def test_middleware_records_sample(self):
+        buffer = metrics.SampleBuffer(size=10, flush_interval=3600)
+        with mock.patch.object(metrics, "buffer", buffer):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse("login"))
+        [sample] = buffer.drain()
+        self.assertEqual(sample["url_name"], "login")
+        self.assertEqual(sample["status_code"], response.status_code)
+        self.assertEqual(sample["query_count"], len(ctx.captured_queries))
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1)
+    def test_pooled_connection_reuse_not_recorded(self):
+        buffer = metrics.SampleBuffer(size=10, flush_interval=3600)
+        pooled = {"ENGINE": "dj_db_conn_pool.backends.mysql"}
+        with mock.patch.object(metrics, "buffer", buffer), mock.patch.dict(
+            connection.settings_dict, pooled
+        ):
+            self.client.get(reverse("login"))
+        [sample] = buffer.drain()
+        self.assertIsNone(sample["connection_reused"])
+
+        buffer.append({**sample, "method": "GET", "created_at": timezone.now()})
+        buffer.flush()
+        model_admin = RequestSampleAdmin(RequestSample, admin.site)
+        [row] = model_admin.build_url_stats(RequestSample.objects.all())
+        self.assertIsNone(row["reuse_rate"])
+
+
+class RequestSampleRetentionTests(TestCase):
+    def create_sample(self, age):
+        return RequestSample.objects.create(
+            url_name="login",
+            method="GET",
+            status_code=200,
+            duration_ms=10,
+            created_at=timezone.now() - age,
+        )
+
+    def test_purge_keeps_recent_samples(self):
+        for _ in range(3):
+            self.create_sample(timedelta(days=40))
+        recent = self.create_sample(timedelta(days=1))
+
+        out = io.StringIO()
+        call_command(
+            "purge_request_samples", "--batch-size", "2", "--pause", "0", stdout=out
+        )
+        self.assertIn("Удалено старых замеров запросов: 3", out.getvalue())
+        self.assertEqual(
+            list(RequestSample.objects.values_list("pk", flat=True)), [recent.pk]
+        )
+
+    @override_settings(REQUEST_METRICS_STATS_DAYS=7)
+    def test_url_stats_use_recent_window(self):
+        self.create_sample(timedelta(days=10))
+        self.create_sample(timedelta(hours=1))
+        model_admin = RequestSampleAdmin(RequestSample, admin.site)
+        [row] = model_admin.build_url_stats(RequestSample.objects.all())
+        self.assertEqual(row["count"], 1)
+
+
+class SettingsChecksTests(SimpleTestCase):
+    def ids(self, warnings):
+        return [warning.id for warning in warnings]
+
+    def default_db(self, **values):
+        return mock.patch.dict(settings.DATABASES["default"], values)
+
+    @override_settings(IS_PRODUCTION=True)
+    def test_w001_without_persistent_connections(self):
+        with self.default_db(ENGINE="django.db.backends.mysql", CONN_MAX_AGE=0):
+            self.assertEqual(
+                self.ids(checks.check_persistent_connections()), ["monitoring.W001"]
+            )
+        with self.default_db(ENGINE="django.db.backends.mysql", CONN_MAX_AGE=600):
+            self.assertEqual(checks.check_persistent_connections(), [])
+        with self.default_db(ENGINE="dj_db_conn_pool.backends.mysql", CONN_MAX_AGE=0):
+            self.assertEqual(checks.check_persistent_connections(), [])
+
+    @override_settings(IS_PRODUCTION=False)
+    def test_w001_only_in_production(self):
+        with self.default_db(CONN_MAX_AGE=0):
+            self.assertEqual(checks.check_persistent_connections(), [])
+
+    def database_checks(self, vendor, result="", in_memory=False, **settings_dict):
+        connection = mock.MagicMock(vendor=vendor, settings_dict=settings_dict)
+        connection.is_in_memory_db.return_value = in_memory
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (result,)
+        with mock.patch.object(checks, "connections", {"default": connection}):
+            return self.ids(checks.check_database_connection(databases=["default"]))
+
+    def test_w002_conn_max_age_not_below_wait_timeout(self):
+        for max_age, health_checks, expected in [
+            (600, False, []),
+            (28800, False, ["monitoring.W002"]),
+            (None, False, ["monitoring.W002"]),
+            (28800, True, []),
+        ]:
+            with self.subTest(max_age=max_age, health_checks=health_checks):
+                self.assertEqual(
+                    self.database_checks(
+                        "mysql",
+                        "28800",
+                        CONN_MAX_AGE=max_age,
+                        CONN_HEALTH_CHECKS=health_checks,
+                    ),
+                    expected,
+                )
+
+    def test_w003_sqlite_without_wal(self):
+        self.assertEqual(self.database_checks("sqlite", "delete"), ["monitoring.W003"])
+        self.assertEqual(self.database_checks("sqlite", "wal"), [])
+        self.assertEqual(self.database_checks("sqlite", "delete", in_memory=True), [])
+
+    def test_database_checks_need_default_database(self):
+        self.assertEqual(checks.check_database_connection(), [])
+        self.assertEqual(checks.check_database_connection(databases=["other"]), [])
+
+    @override_settings(IS_PRODUCTION=True, CACHE_SHARED=False)
+    def test_w004_locmem_in_production(self):
+        self.assertEqual(self.ids(checks.check_shared_cache()), ["monitoring.W004"])
+
+    def test_w004_not_raised_for_shared_cache_or_development(self):
+        for production, shared in [(True, True), (False, False)]:
+            with self.subTest(production=production, shared=shared):
+                with override_settings(IS_PRODUCTION=production, CACHE_SHARED=shared):
+                    self.assertEqual(checks.check_shared_cache(), [])
+
+
+class LoggingTests(TestCase):
+    def make_logger(self, handler):
+        logger = logging.getLogger("crm_logistic.tests.queue")
+        logger.handlers = [handler]
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        self.addCleanup(handler.close)
+        self.addCleanup(setattr, logger, "handlers", [])
+        return logger
+
+    def test_records_reach_listener(self):
+        stream = io.StringIO()
+        handler = QueueHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        logger = self.make_logger(handler)
+
+        logger.info("Заявка %s", 7, extra={"duration_ms": 1.5})
+        handler.stop()
+
+        record = json.loads(stream.getvalue())
+        self.assertEqual(record["message"], "Заявка 7")
+        self.assertEqual(record["duration_ms"], 1.5)
+        self.assertEqual(handler.dropped, 0)
+
+    def test_full_queue_drops_records(self):
+        handler = QueueHandler(io.StringIO(), queue_size=2)
+        handler.stop()  # без потока вывода очередь не разбирается
+        logger = self.make_logger(handler)
+
+        for i in range(5):
+            logger.info("запись %s", i)
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+
+    def test_django_errors_mailed_to_admins(self):
+        handlers = logging.getLogger("django").handlers
+        self.assertTrue(any(isinstance(h, QueueHandler) for h in handlers))
+        self.assertTrue(any(isinstance(h, AdminEmailHandler) for h in handlers))
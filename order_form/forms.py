@@ -6,6 +6,7 @@ from pickup.models import PickupOrder
 from logistic.models import DeliveryOrder
 from warehouses.models import City, Warehouse, WarehouseSchedule
 from counterparties.models import Counterparty
+from utils.reference_cache import CachedModelChoiceField, user_choices
 
 
 class ClientPickupForm(forms.ModelForm):
@@ -679,8 +680,8 @@ class ClientDeliveryForm(forms.ModelForm):
         help_text="Склад, откуда будет отправлен груз",
     )
 
-    logistic = forms.ModelChoiceField(
-        queryset=None,  # Будет установлено в __init__
+    logistic = CachedModelChoiceField(
+        user_choices("logistic", label=str),
         required=False,
         label="Логист",
         widget=forms.Select(attrs={"class": "form-select"}),
@@ -852,13 +853,6 @@ class ClientDeliveryForm(forms.ModelForm):
             lambda obj: f"{obj.name} ({obj.city.name})"
         )
 
-        # Установка queryset для логиста
-        from django.contrib.auth.models import User
-
-        self.fields["logistic"].queryset = User.objects.filter(
-            profile__role="logistic"
-        ).order_by("first_name", "last_name", "username")
-
         self.fields["sender"].queryset = Counterparty.objects.filter(
             is_active=True
         ).order_by("name")
@@ -1,3 +1,4 @@
+import logging
 import json
 from django.shortcuts import render, redirect
 from django.views.generic import FormView
@@ -7,11 +8,15 @@ from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
+from django.core.cache import caches
 from django.db.models import Prefetch
 
 from .forms import ClientPickupForm, ClientDeliveryForm
 from warehouses.models import City, ContainerType, WarehouseSchedule
 from counterparties.models import Counterparty
+from utils.reference_cache import versions_stamp
+
+logger = logging.getLogger(__name__)
 
 
 def get_cities_with_warehouses_data():
@@ -91,7 +96,20 @@ def get_cities_with_warehouses_data():
 
 
 def get_box_sizes_data():
-    """Функция для получения данных о типах коробок"""
+    """Данные о типах коробок (из кэша до изменения типов тары)"""
+    if not settings.CACHE_SHARED:
+        # Версия типов тары в locmem не видна другим воркерам
+        return build_box_sizes_data()
+    key = f"box_sizes:{versions_stamp((ContainerType,))}"
+    reference_cache = caches["reference_data"]
+    box_sizes = reference_cache.get(key)
+    if box_sizes is None:
+        box_sizes = build_box_sizes_data()
+        reference_cache.set(key, box_sizes, settings.REFERENCE_CACHE_TTL)
+    return box_sizes
+
+
+def build_box_sizes_data():
     box_types = ContainerType.objects.filter(category="box").order_by("volume")
     box_sizes = []
 
@@ -149,21 +167,23 @@ class PickupOrderFormView(FormView):
             order.save()
             order.refresh_from_db()
 
-            print(
-                f"✅ Заявка на забор создана: ID={order.id}, Tracking={order.tracking_number}"
+            logger.info(
+                "Заявка на забор создана: ID=%s, Tracking=%s",
+                order.id,
+                order.tracking_number,
             )
 
             try:
                 self.send_confirmation_email(order)
-                print(f"✅ Email отправлен клиенту")
+                logger.debug("Email отправлен клиенту")
             except Exception as e:
-                print(f"❌ Ошибка при отправке email клиенту: {e}")
+                logger.error("Ошибка при отправке email клиенту: %s", e)
 
             try:
                 self.send_operator_notification(order)
-                print(f"✅ Уведомление отправлено оператору")
+                logger.debug("Уведомление отправлено оператору")
             except Exception as e:
-                print(f"❌ Ошибка при отправке уведомления оператору: {e}")
+                logger.error("Ошибка при отправке уведомления оператору: %s", e)
 
             self.request.session["order_id"] = order.id
             self.request.session["tracking_number"] = order.tracking_number
@@ -175,10 +195,7 @@ class PickupOrderFormView(FormView):
             return redirect(self.get_success_url())
 
         except Exception as e:
-            import traceback
-
-            print(f"❌ Ошибка при сохранении заявки на забор: {e}")
-            print(traceback.format_exc())
+            logger.exception("Ошибка при сохранении заявки на забор: %s", e)
             messages.error(
                 self.request,
                 f"Произошла ошибка при отправке заявки: {str(e)[:100]}... Пожалуйста, попробуйте еще раз или свяжитесь с нами по телефону.",
@@ -213,7 +230,7 @@ class PickupOrderFormView(FormView):
             return True
 
         except Exception as e:
-            print(f"❌ Ошибка при отправке email клиенту: {e}")
+            logger.error("Ошибка при отправке email клиенту: %s", e)
             return False
 
     def send_operator_notification(self, order):
@@ -248,7 +265,7 @@ class PickupOrderFormView(FormView):
             return True
 
         except Exception as e:
-            print(f"❌ Ошибка при отправке email оператору: {e}")
+            logger.error("Ошибка при отправке email оператору: %s", e)
             return False
 
 
@@ -280,8 +297,10 @@ class DeliveryOrderFormView(FormView):
             order.save()
             order.refresh_from_db()
 
-            print(
-                f"✅ Заявка на доставку создана: ID={order.id}, Tracking={order.tracking_number}"
+            logger.info(
+                "Заявка на доставку создана: ID=%s, Tracking=%s",
+                order.id,
+                order.tracking_number,
             )
 
             try:
@@ -293,15 +312,15 @@ class DeliveryOrderFormView(FormView):
                         form.cleaned_data["client_name"],
                         client_email,
                     )
-                    print(f"✅ Email отправлен клиенту: {client_email}")
+                    logger.debug("Email отправлен клиенту: %s", client_email)
             except Exception as e:
-                print(f"❌ Ошибка при отправке email клиенту: {e}")
+                logger.error("Ошибка при отправке email клиенту: %s", e)
 
             try:
                 self.send_operator_notification(order)
-                print(f"✅ Уведомление отправлено оператору")
+                logger.debug("Уведомление отправлено оператору")
             except Exception as e:
-                print(f"❌ Ошибка при отправке уведомления оператору: {e}")
+                logger.error("Ошибка при отправке уведомления оператору: %s", e)
 
             self.request.session["order_id"] = order.id
             self.request.session["tracking_number"] = order.tracking_number
@@ -313,10 +332,7 @@ class DeliveryOrderFormView(FormView):
             return redirect(self.get_success_url())
 
         except Exception as e:
-            import traceback
-
-            print(f"❌ Ошибка при сохранении заявки на доставку: {e}")
-            print(traceback.format_exc())
+            logger.exception("Ошибка при сохранении заявки на доставку: %s", e)
             messages.error(
                 self.request,
                 f"Произошла ошибка при отправке заявки: {str(e)[:100]}... Пожалуйста, попробуйте еще раз или свяжитесь с нами по телефону.",
@@ -361,7 +377,7 @@ class DeliveryOrderFormView(FormView):
             return True
 
         except Exception as e:
-            print(f"❌ Ошибка при отправке email клиенту: {e}")
+            logger.error("Ошибка при отправке email клиенту: %s", e)
             return False
 
     def send_operator_notification(self, order):
@@ -396,7 +412,7 @@ class DeliveryOrderFormView(FormView):
             return True
 
         except Exception as e:
-            print(f"❌ Ошибка при отправке email оператору: {e}")
+            logger.error("Ошибка при отправке email оператору: %s", e)
             return False
 
 
@@ -406,8 +422,11 @@ def order_success_view(request):
     tracking_number = request.session.get("tracking_number")
     order_type = request.session.get("order_type", "delivery")
 
-    print(
-        f"🔍 order_success_view вызван: order_id={order_id}, tracking_number={tracking_number}, order_type={order_type}"
+    logger.debug(
+        "order_success_view вызван: order_id=%s, tracking_number=%s, order_type=%s",
+        order_id,
+        tracking_number,
+        order_type,
     )
 
     context = {
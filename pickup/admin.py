@@ -1,5 +1,11 @@
 from django.contrib import admin
-from .models import PickupOrder, Carrier
+
+from counterparties.models import Counterparty
+from logistic.admin import qr_job_response
+from logistic.models import QrRegenerationJob
+from utils.changelist import SearchTextAdminMixin
+
+from .models import PickupOrder, PickupStatusChange, Carrier
 
 
 @admin.register(Carrier)
@@ -50,8 +56,20 @@ class CarrierAdmin(admin.ModelAdmin):
     readonly_fields = ["created_at", "updated_at"]
 
 
+class PickupStatusChangeInline(admin.TabularInline):
+    model = PickupStatusChange
+    fields = ["changed_at", "from_status", "to_status", "changed_by"]
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(PickupOrder)
-class PickupOrderAdmin(admin.ModelAdmin):
+class PickupOrderAdmin(SearchTextAdminMixin, admin.ModelAdmin):
+    inlines = [PickupStatusChangeInline]
     list_display = [
         "tracking_number",
         "pickup_date",
@@ -80,19 +98,24 @@ class PickupOrderAdmin(admin.ModelAdmin):
         "carrier",
         "created_at",
     ]
-    search_fields = [
-        "tracking_number",
-        "sender__name",
-        "sender__inn",
-        "recipient__name",
-        "recipient__inn",
-        "contact_person",
-        "pickup_address",
-        "invoice_number",
-        "receiving_warehouse__name",
-        "carrier__name",
-        "cargo_description",
+    list_select_related = [
+        "sender",
+        "recipient",
+        "receiving_operator",
+        "logistic",
+        "receiving_warehouse__city",
+        "carrier",
+        "operator",
     ]
+    autocomplete_fields = ["sender", "recipient"]
+    # Поиск: search_text заявки (SEARCH_FIELDS модели) и связанные записи
+    search_fields = ["search_text"]
+    search_related = {
+        "sender": Counterparty.objects.search,
+        "recipient": Counterparty.objects.search,
+        "receiving_warehouse": ("name",),
+        "carrier": ("name",),
+    }
     list_per_page = 50
     date_hierarchy = "pickup_date"
 
@@ -198,14 +221,12 @@ class PickupOrderAdmin(admin.ModelAdmin):
     get_carrier_display.short_description = "Перевозчик"
 
     def regenerate_qr_codes(self, request, queryset):
-        """Действие для перегенерации QR-кодов"""
-        count = 0
-        for order in queryset:
-            if order.regenerate_qr_code():
-                count += 1
-
-        self.message_user(
-            request, f"Перегенерировано {count} QR-кодов (только ссылка на PDF)"
-        )
+        """Действие для перегенерации QR-кодов: фоновая задача с прогрессом"""
+        job = QrRegenerationJob.start("pickup", queryset, request.user)
+        return qr_job_response(self, request, job)
 
     regenerate_qr_codes.short_description = "Перегенерировать QR-коды (ссылка на PDF)"
+
+    def save_model(self, request, obj, form, change):
+        obj.status_changed_by_id = request.user.pk
+        super().save_model(request, obj, form, change)
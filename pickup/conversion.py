@@ -0,0 +1,132 @@
+"""
+Преобразование заявок на забор в заявки на доставку.
+
+Пачка заявок обрабатывается фиксированным числом запросов независимо от
+размера: выборка подходящих заявок, резервирование сквозных номеров,
+bulk_create доставок, bulk_update ссылок в заборах. QR-коды доставок
+создаются в фоне после коммита (utils.background).
+"""
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from logistic.models import DeliveryOrder
+from utils.background import submit_on_commit
+from utils.qr_utils import generate_missing_qr_codes
+from utils.status_history import record_created
+
+from .models import PickupOrder
+
+# Статус заявки на забор, из которого можно создать доставку
+CONVERTIBLE_STATUS = "ready"
+
+
+def convertible_pickups(ids, user=None, operator_only=False):
+    """
+    Заявки из ids, готовые к преобразованию (статус ready, доставки еще нет),
+    одним запросом вместе с профилем оператора приемки.
+    operator_only ограничивает выборку заявками оператора user.
+    """
+    pickups = PickupOrder.objects.filter(
+        pk__in=ids, status=CONVERTIBLE_STATUS, delivery_order__isnull=True
+    ).select_related("receiving_operator__profile")
+    if operator_only:
+        pickups = pickups.filter(operator=user)
+    return pickups
+
+
+class _FulfillmentResolver:
+    """
+    Оператор фулфилмента для новой доставки: оператор приемки забора,
+    текущий пользователь-оператор, любой оператор или текущий пользователь.
+    Запасной оператор запрашивается не больше одного раза на пачку.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.user_is_operator = (
+            getattr(getattr(user, "profile", None), "role", None) == "operator"
+        )
+        self._fallback = None
+        self._fallback_loaded = False
+
+    def _is_operator(self, candidate):
+        profile = getattr(candidate, "profile", None)
+        return profile is not None and profile.role == "operator"
+
+    def resolve(self, pickup):
+        if pickup.receiving_operator and self._is_operator(pickup.receiving_operator):
+            return pickup.receiving_operator
+        if self.user_is_operator:
+            return self.user
+        if not self._fallback_loaded:
+            self._fallback = User.objects.filter(profile__role="operator").first()
+            self._fallback_loaded = True
+        return self._fallback or self.user
+
+
+def build_delivery(pickup, tracking_number, operator):
+    return DeliveryOrder(
+        tracking_number=tracking_number,
+        delivery_date=pickup.desired_delivery_date,
+        sender_id=pickup.sender_id,
+        pickup_address=pickup.pickup_address,
+        pickup_warehouse_id=pickup.receiving_warehouse_id,
+        recipient_id=pickup.recipient_id,
+        delivery_address=pickup.delivery_address or "",
+        delivery_city_id=pickup.delivery_city_id,
+        quantity=pickup.quantity,
+        weight=pickup.weight or 0,
+        volume=pickup.volume or 0,
+        status="submitted",
+        logistic_id=pickup.logistic_id,
+        operator=operator,
+    )
+
+
+def convert_to_deliveries(pickups, user):
+    """
+    Создает доставки для заявок pickups (уже отобранных convertible_pickups)
+    и возвращает список пар (забор, доставка).
+    """
+    pickups = list(pickups)
+    if not pickups:
+        return []
+
+    resolver = _FulfillmentResolver(user)
+
+    with transaction.atomic():
+        tracking_numbers = DeliveryOrder.allocate_tracking_numbers(len(pickups))
+        deliveries = [
+            build_delivery(pickup, number, resolver.resolve(pickup))
+            for pickup, number in zip(pickups, tracking_numbers)
+        ]
+        DeliveryOrder.objects.bulk_create(deliveries)
+
+        if any(delivery.pk is None for delivery in deliveries):
+            # БД без RETURNING (MySQL): id находим по зарезервированным номерам
+            ids = dict(
+                DeliveryOrder.objects.filter(
+                    tracking_number__in=tracking_numbers
+                ).values_list("tracking_number", "pk")
+            )
+            for delivery in deliveries:
+                delivery.pk = ids[delivery.tracking_number]
+
+        record_created(deliveries, changed_by=user)
+
+        # bulk_update не заполняет auto_now - updated_at ставим сами
+        now = timezone.now()
+        for pickup, delivery in zip(pickups, deliveries):
+            pickup.delivery_order = delivery
+            pickup.updated_at = now
+        PickupOrder.objects.bulk_update(pickups, ["delivery_order", "updated_at"])
+
+        submit_on_commit(
+            generate_missing_qr_codes,
+            DeliveryOrder,
+            [delivery.pk for delivery in deliveries],
+        )
+
+    return list(zip(pickups, deliveries))
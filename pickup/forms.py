@@ -1,8 +1,14 @@
 from django import forms
 from django.utils import timezone
-from django.contrib.auth.models import User
-from .models import PickupOrder, Carrier
+from .models import PickupOrder
 from counterparties.models import Counterparty
+from utils.reference_cache import (
+    CARRIERS,
+    CachedModelChoiceField,
+    SearchSelect,
+    user_choices,
+    user_short_name,
+)
 from warehouses.models import Warehouse
 
 
@@ -26,7 +32,7 @@ class PickupOrderForm(forms.ModelForm):
     sender = forms.ModelChoiceField(
         queryset=Counterparty.objects.filter(is_active=True),
         required=True,
-        widget=forms.Select(attrs={"class": "form-select"}),
+        widget=SearchSelect(attrs={"class": "form-select"}),
         label="Отправитель *",
         help_text="Контрагент, который отправляет груз",
     )
@@ -34,7 +40,7 @@ class PickupOrderForm(forms.ModelForm):
     recipient = forms.ModelChoiceField(
         queryset=Counterparty.objects.filter(is_active=True),
         required=True,
-        widget=forms.Select(attrs={"class": "form-select"}),
+        widget=SearchSelect(attrs={"class": "form-select"}),
         label="Получатель *",
         help_text="Контрагент, который получает груз",
     )
@@ -46,25 +52,25 @@ class PickupOrderForm(forms.ModelForm):
         label="Склад приемки",
     )
 
-    receiving_operator = forms.ModelChoiceField(
-        queryset=User.objects.filter(
-            is_active=True, profile__role__in=["operator", "logistic", "admin"]
+    receiving_operator = CachedModelChoiceField(
+        user_choices(
+            "operator", "logistic", "admin", active_only=True, label=user_short_name
         ),
         required=False,
         widget=forms.Select(attrs={"class": "form-select"}),
         label="Оператор фулфилмента",
     )
 
-    logistic = forms.ModelChoiceField(
-        queryset=User.objects.filter(is_active=True, profile__role="logistic"),
+    logistic = CachedModelChoiceField(
+        user_choices("logistic", active_only=True, label=user_short_name),
         required=False,
         widget=forms.Select(attrs={"class": "form-select"}),
         label="Логист",
         help_text="Ответственный логист",
     )
 
-    carrier = forms.ModelChoiceField(
-        queryset=Carrier.objects.filter(is_active=True),
+    carrier = CachedModelChoiceField(
+        CARRIERS,
         required=False,
         widget=forms.Select(attrs={"class": "form-select"}),
         label="Перевозчик",
@@ -177,10 +183,6 @@ class PickupOrderForm(forms.ModelForm):
             ("accepted", "Принята"),
         ]
 
-        # Настройка отображения имен пользователей
-        for field_name in ["receiving_operator", "logistic"]:
-            self.fields[field_name].label_from_instance = self.get_user_display_name
-
         # Логика в зависимости от роли пользователя
         if self.user and hasattr(self.user, "profile"):
             user_role = self.user.profile.role
@@ -195,8 +197,8 @@ class PickupOrderForm(forms.ModelForm):
                 )
 
                 # Оператора фулфилмента логист может выбирать
-                self.fields["receiving_operator"].queryset = User.objects.filter(
-                    is_active=True, profile__role="operator"
+                self.fields["receiving_operator"].use(
+                    user_choices("operator", active_only=True, label=user_short_name)
                 )
 
             elif user_role == "operator":
@@ -209,32 +211,27 @@ class PickupOrderForm(forms.ModelForm):
                 )
 
                 # Логиста оператор может выбирать
-                self.fields["logistic"].queryset = User.objects.filter(
-                    is_active=True, profile__role="logistic"
+                self.fields["logistic"].use(
+                    user_choices("logistic", active_only=True, label=user_short_name)
                 )
 
             elif user_role == "admin":
                 # Админ может выбирать и оператора и логиста
-                self.fields["receiving_operator"].queryset = User.objects.filter(
-                    is_active=True, profile__role__in=["operator", "admin"]
+                self.fields["receiving_operator"].use(
+                    user_choices(
+                        "operator", "admin", active_only=True, label=user_short_name
+                    )
                 )
-                self.fields["logistic"].queryset = User.objects.filter(
-                    is_active=True, profile__role__in=["logistic", "admin"]
+                self.fields["logistic"].use(
+                    user_choices(
+                        "logistic", "admin", active_only=True, label=user_short_name
+                    )
                 )
                 self.fields["receiving_operator"].help_text = (
                     "Выберите оператора фулфилмента"
                 )
                 self.fields["logistic"].help_text = "Выберите логиста"
 
-    def get_user_display_name(self, user):
-        """Возвращает отображаемое имя пользователя (Фамилия Имя)"""
-        if user.first_name and user.last_name:
-            return f"{user.last_name} {user.first_name}"
-        elif user.first_name:
-            return user.first_name
-        else:
-            return user.username
-
     def clean_pickup_time_from(self):
         """Очистка поля времени"""
         time = self.cleaned_data.get("pickup_time_from")
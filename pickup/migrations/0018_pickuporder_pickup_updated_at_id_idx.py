@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('counterparties', '0001_initial'),
+        ('logistic', '0017_deliveryorder_updated_at_and_more'),
+        ('pickup', '0017_remove_pickuporder_marketplace'),
+        ('warehouses', '0008_warehouse_visible_to_clients'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pickuporder',
+            index=models.Index(fields=['updated_at', 'id'], name='pickup_updated_at_id_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pickup', '0018_pickuporder_pickup_updated_at_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PickupStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, default='', max_length=20, verbose_name='Прежний статус')),
+                ('to_status', models.CharField(max_length=20, verbose_name='Новый статус')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Время смены')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Кто изменил')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='pickup.pickuporder', verbose_name='Заявка')),
+            ],
+            options={
+                'verbose_name': 'Смена статуса заявки на забор',
+                'verbose_name_plural': 'История статусов заявок на забор',
+                'ordering': ['changed_at', 'id'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['order', 'changed_at'], name='pickup_status_order_at_idx'), models.Index(fields=['changed_at'], name='pickup_status_changed_at_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:59
+
+from django.db import migrations, models
+
+from utils.search_text import fill_search_text
+
+SEARCH_FIELDS = ('tracking_number', 'invoice_number', 'contact_person', 'pickup_address', 'cargo_description')
+
+
+def fill(apps, schema_editor):
+    # Текст для поиска у уже существующих записей
+    PickupOrder = apps.get_model("pickup", "PickupOrder")
+    fill_search_text(PickupOrder.objects.all(), SEARCH_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pickup', '0019_pickupstatuschange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pickuporder',
+            name='search_text',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=500, verbose_name='Текст для поиска'),
+        ),
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
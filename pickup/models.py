@@ -1,15 +1,20 @@
-from pathlib import Path
+import logging
 from django.db import models
+from django.db.models.functions import Length
 from django.urls import reverse
 from django.conf import settings
 from django.utils import timezone
 from logistic.models import DeliveryOrder
 from warehouses.models import Warehouse, City
 from counterparties.models import Counterparty
-import qrcode
 import os
-from io import BytesIO
 from django.core.files import File
+from utils.qr_storage import ShardedQrPath
+from utils.qr_utils import make_qr_png
+from utils.search_text import SEARCH_TEXT_MAX_LENGTH, SearchTextMixin, SearchTextQuerySet
+from utils.status_history import StatusChange, StatusHistoryMixin, StatusQuerySet
+
+logger = logging.getLogger(__name__)
 
 
 class Carrier(models.Model):
@@ -63,7 +68,11 @@ class Carrier(models.Model):
         return info
 
 
-class PickupOrder(models.Model):
+class PickupOrderQuerySet(SearchTextQuerySet, StatusQuerySet):
+    pass
+
+
+class PickupOrder(SearchTextMixin, StatusHistoryMixin, models.Model):
     """
     Заявка на забор груза от клиента
     """
@@ -258,13 +267,38 @@ class PickupOrder(models.Model):
         max_length=50, unique=True, blank=True, verbose_name="Сквозной номер заказа"
     )
     qr_code = models.ImageField(
-        upload_to="qr_codes/pickup/", blank=True, null=True, verbose_name="QR-код"
+        upload_to=ShardedQrPath("pickup"),
+        blank=True,
+        null=True,
+        verbose_name="QR-код",
+    )
+    search_text = models.CharField(
+        max_length=SEARCH_TEXT_MAX_LENGTH,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Текст для поиска",
     )
 
+    # Поля, из которых собирается search_text (поиск в админке)
+    SEARCH_FIELDS = (
+        "tracking_number",
+        "invoice_number",
+        "contact_person",
+        "pickup_address",
+        "cargo_description",
+    )
+
+    objects = PickupOrderQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Заявки на забор груза"
         verbose_name_plural = "Заявки на забор груза"
         ordering = ["-pickup_date", "-created_at"]
+        indexes = [
+            # Ленточная выборка изменений для синхронизации (sync)
+            models.Index(fields=["updated_at", "id"], name="pickup_updated_at_id_idx"),
+        ]
 
     def __str__(self):
         if self.tracking_number:
@@ -326,23 +360,32 @@ class PickupOrder(models.Model):
 
     def generate_tracking_number(self):
         """Генерирует уникальный сквозной номер заказа"""
+        return self.allocate_tracking_numbers(1)[0]
+
+    @classmethod
+    def allocate_tracking_numbers(cls, count):
+        """Следующие count сквозных номеров - одним запросом для массового создания"""
         year = timezone.now().year
-        last_order = (
-            PickupOrder.objects.filter(tracking_number__startswith=f"PUP-{year}-")
-            .order_by("tracking_number")
+        last_number = (
+            cls.objects.filter(tracking_number__startswith=f"PUP-{year}-")
+            .order_by(Length("tracking_number"), "tracking_number")
+            .values_list("tracking_number", flat=True)
             .last()
         )
 
-        if last_order and last_order.tracking_number:
-            try:
-                last_num = int(last_order.tracking_number.split("-")[-1])
-                new_num = last_num + 1
-            except:
-                new_num = 1
-        else:
-            new_num = 1
+        try:
+            last_num = int(last_number.split("-")[-1]) if last_number else 0
+        except ValueError:
+            last_num = 0
+
+        return [f"PUP-{year}-{last_num + i:05d}" for i in range(1, count + 1)]
+
+    def qr_code_data(self):
+        """Содержимое QR-кода - ссылка на PDF заявки"""
+        return f"{settings.SITE_URL}{reverse('pickup_order_pdf', kwargs={'pk': self.pk})}"
 
-        return f"PUP-{year}-{new_num:05d}"
+    def qr_code_filename(self):
+        return f'pickup_qr_{self.tracking_number.replace("/", "_")}.png'
 
     def generate_qr_code(self):
         """Генерирует QR-код с ссылкой на PDF файл заявки"""
@@ -353,43 +396,21 @@ class PickupOrder(models.Model):
             except (ValueError, FileNotFoundError, AttributeError):
                 pass
 
-        pdf_url = (
-            f"{settings.SITE_URL}{reverse('pickup_order_pdf', kwargs={'pk': self.pk})}"
-        )
-
-        qr_data = pdf_url
+        qr_data = self.qr_code_data()
 
         try:
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(qr_data)
-            qr.make(fit=True)
-
-            img = qr.make_image(fill_color="black", back_color="white")
+            buffer = make_qr_png(qr_data)
 
-            qr_dir = Path(settings.MEDIA_ROOT) / "qr_codes" / "pickup"
-            qr_dir.mkdir(parents=True, exist_ok=True)
-
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            buffer.seek(0)
-
-            filename = f'pickup_qr_{self.tracking_number.replace("/", "_")}.png'
-            self.qr_code.save(filename, File(buffer), save=False)
+            self.qr_code.save(self.qr_code_filename(), File(buffer), save=False)
             buffer.close()
 
             super().save(update_fields=["qr_code"])
-            print(f"✅ QR-код создан для заявки на забор #{self.id}")
+            logger.debug("QR-код создан для заявки на забор #%s", self.id)
 
         except Exception as e:
-            print(f"❌ Ошибка при создании QR-кода для заявки #{self.id}: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception(
+                "Ошибка при создании QR-кода для заявки #%s: %s", self.id, e
+            )
 
     def regenerate_qr_code(self):
         """Принудительно пересоздает QR-код"""
@@ -406,50 +427,38 @@ class PickupOrder(models.Model):
             self.generate_qr_code()
             return True
         except Exception as e:
-            print(f"❌ Ошибка при пересоздании QR-кода для заявки #{self.id}: {e}")
+            logger.error(
+                "Ошибка при пересоздании QR-кода для заявки #%s: %s", self.id, e
+            )
             return False
 
     def create_delivery_order(self, user):
         """
         Создаёт заявку на доставку на основе заявки на забор
         """
+        from .conversion import convert_to_deliveries
+
         if not self.is_convertible_to_delivery:
             return None
 
-        fulfillment_user = None
+        converted = convert_to_deliveries([self], user)
+        return converted[0][1] if converted else None
 
-        if self.receiving_operator and hasattr(self.receiving_operator, "profile"):
-            if self.receiving_operator.profile.role == "operator":
-                fulfillment_user = self.receiving_operator
 
-        if not fulfillment_user and hasattr(user, "profile"):
-            if user.profile.role == "operator":
-                fulfillment_user = user
+class PickupStatusChange(StatusChange):
+    """Смена статуса заявки на забор"""
 
-        if not fulfillment_user:
-            from django.contrib.auth.models import User
-
-            try:
-                fulfillment_user = User.objects.filter(profile__role="operator").first()
-            except:
-                fulfillment_user = None
-
-        if not fulfillment_user:
-            fulfillment_user = user
-
-        delivery = DeliveryOrder.objects.create(
-            date=self.desired_delivery_date,
-            pickup_address=self.pickup_address,
-            delivery_address=self.delivery_address,
-            fulfillment=fulfillment_user,
-            quantity=self.quantity,
-            weight=self.weight or 0,
-            volume=self.volume or 0,
-            status="submitted",
-            operator=user,
-        )
-
-        self.delivery_order = delivery
-        self.save()
+    order = models.ForeignKey(
+        PickupOrder,
+        on_delete=models.CASCADE,
+        related_name="status_changes",
+        verbose_name="Заявка",
+    )
 
-        return delivery
+    class Meta(StatusChange.Meta):
+        verbose_name = "Смена статуса заявки на забор"
+        verbose_name_plural = "История статусов заявок на забор"
+        indexes = [
+            models.Index(fields=["order", "changed_at"], name="pickup_status_order_at_idx"),
+            models.Index(fields=["changed_at"], name="pickup_status_changed_at_idx"),
+        ]
@@ -1,6 +1,10 @@
+import logging
+from utils.labels import label_sheet, render_label_sheets
 from utils.pdf_generator import generate_pdf_from_template, DEFAULT_CSS
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 def create_pickup_order_pdf(pickup_order):
     """Создание PDF для заявки на забор"""
@@ -15,13 +19,29 @@ def create_pickup_order_pdf(pickup_order):
             "pickup/pickup_pdf.html", context, DEFAULT_CSS
         )
     except Exception as e:
-        print(f"❌ Ошибка в create_pickup_order_pdf для заявки {pickup_order.id}: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception(
+            "Ошибка в create_pickup_order_pdf для заявки %s: %s", pickup_order.id, e
+        )
         return None
 
 
+def pickup_label_sheet(pickup_order):
+    """Лист этикеток заявки на забор"""
+    return label_sheet(
+        pickup_order,
+        "labels/pickup_label.html",
+        date=pickup_order.pickup_date or datetime.now(),
+        client=pickup_order.get_client_name() or "не указан",
+        from_address=pickup_order.pickup_address or "не указан",
+        to_address=pickup_order.delivery_address or "не указан",
+    )
+
+
+def create_pickup_labels_pdf(pickup_order):
+    """PDF с QR-этикетками на каждое место заявки на забор"""
+    return render_label_sheets([pickup_label_sheet(pickup_order)])
+
+
 def create_daily_pickup_report_pdf(date, orders):
     """Создание ежедневного отчета по заборам"""
     stats = {
@@ -184,8 +204,5 @@ def create_pickup_orders_list_pdf(orders):
             "pickup/pickup_orders_list_pdf.html", context, landscape_css
         )
     except Exception as e:
-        print(f"❌ Ошибка в create_pickup_orders_list_pdf: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Ошибка в create_pickup_orders_list_pdf: %s", e)
         return None
@@ -1,3 +1,87 @@
-from django.test import TestCase
+import io
+import json
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from logistic.models import DeliveryOrder
+from utils import demo_data
+
+from .models import PickupOrder
+
+TEST_MEDIA_ROOT = tempfile.mkdtemp(prefix="crm_test_media_")
+
+
+@override_settings(
+    MEDIA_ROOT=TEST_MEDIA_ROOT, BACKGROUND_WORKERS=0, QR_REGENERATION_PROCESSES=0
+)
+class BulkConversionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        demo_data.seed()
+        cls.admin = User.objects.create_superuser("root", password="x")
+        # Профиль по умолчанию - оператор, который видит только свои заявки
+        cls.admin.profile.role = "admin"
+        cls.admin.profile.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def convert(self, ids):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("pickup_orders_bulk_convert"),
+                data=json.dumps({"order_ids": ids}),
+                content_type="application/json",
+            )
+        return response.json()
+
+    def test_bulk_convert_links_deliveries_and_creates_qr(self):
+        ready = list(
+            PickupOrder.objects.filter(status="ready", delivery_order__isnull=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:3]
+        )
+        other = PickupOrder.objects.exclude(status="ready").values_list("pk", flat=True)[0]
+
+        response = self.convert(ready + [other])
+        self.assertTrue(response["success"])
+        self.assertEqual(response["converted_count"], len(ready))
+        self.assertEqual(response["skipped_count"], 1)
+
+        deliveries = DeliveryOrder.objects.filter(pk__in=response["delivery_ids"])
+        self.assertEqual(
+            set(PickupOrder.objects.filter(pk__in=ready).values_list("delivery_order", flat=True)),
+            set(response["delivery_ids"]),
+        )
+        self.assertEqual(len({d.tracking_number for d in deliveries}), len(ready))
+        # QR-коды создаются после коммита фоновой задачей
+        self.assertTrue(all(d.qr_code for d in deliveries))
+
+        # Повторное преобразование тех же заявок ничего не создает
+        self.assertEqual(self.convert(ready)["converted_count"], 0)
+
+    def test_generate_qr_codes_fills_only_missing(self):
+        orders = list(DeliveryOrder.objects.order_by("pk")[:3])
+        for order in orders:
+            order.generate_qr_code()
+        kept = orders[0].qr_code.name
+        DeliveryOrder.objects.filter(pk__in=[o.pk for o in orders[1:]]).update(qr_code="")
+        missing = DeliveryOrder.objects.filter(qr_code="").count()
+
+        out = io.StringIO()
+        call_command("generate_qr_codes", "--model", "delivery", stdout=out)
+
+        self.assertIn(f"Создано QR-кодов для заявок на доставку: {missing}", out.getvalue())
+        self.assertFalse(DeliveryOrder.objects.filter(qr_code="").exists())
+        orders[0].refresh_from_db()
+        self.assertEqual(orders[0].qr_code.name, kept)
@@ -24,6 +24,11 @@ urlpatterns = [
         views.update_pickup_order_field,
         name="pickup_order_update_field",
     ),
+    path(
+        "update-fields/",
+        views.update_pickup_order_fields,
+        name="pickup_orders_update_fields",
+    ),
     path("api/operators/", views.get_operators, name="get_operators"),
     path("<int:pk>/qr-pdf/", views.pickup_order_qr_pdf, name="pickup_order_qr_pdf"),
     path(
@@ -31,7 +36,14 @@ urlpatterns = [
         views.bulk_update_pickup_orders,
         name="pickup_orders_bulk_update",
     ),
+    path("import/", views.import_pickup_orders, name="pickup_orders_import"),
+    path(
+        "bulk-convert/",
+        views.bulk_convert_to_delivery,
+        name="pickup_orders_bulk_convert",
+    ),
     path("list-pdf/", views.pickup_orders_list_pdf, name="pickup_orders_list_pdf"),
+    path("api/orders/", views.pickup_orders_data, name="pickup_orders_data"),
     path(
         "api/create-carrier/", views.create_carrier_api, name="create_carrier_api"
     ),  # Добавлено
@@ -1,4 +1,4 @@
-import base64
+import logging
 import json
 import os
 import zipfile
@@ -14,19 +14,25 @@ from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 from django.views.decorators.http import require_POST
-import qrcode
-from weasyprint import HTML
 
 from counterparties.models import Counterparty
 from crm_logistic import settings
+from utils import inline_edit, order_import, pdf_cache
+from utils.grid import CursorError, Grid
 from utils.pdf_generator import generate_qr_code_pdf
-from warehouses.models import Warehouse
-
+from utils.reference_cache import versions_stamp
 
+from .conversion import convert_to_deliveries, convertible_pickups
 from .models import PickupOrder, Carrier
 from .filters import PickupOrderFilter
 from .forms import PickupOrderForm
-from .pdf_utils import create_pickup_order_pdf, create_pickup_orders_list_pdf
+from .pdf_utils import (
+    create_pickup_labels_pdf,
+    create_pickup_order_pdf,
+    create_pickup_orders_list_pdf,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def get_user_display_name(user):
@@ -39,88 +45,165 @@ def get_user_display_name(user):
         return user.username
 
 
+def _user_name(first_name, last_name, username):
+    return f"{first_name or ''} {last_name or ''}".strip() or username or ""
+
+
+PICKUP_STATUS_LABELS = dict(PickupOrder.STATUS_CHOICES)
+
+PICKUP_GRID = Grid(
+    columns=[
+        "id",
+        "invoice_number",
+        "pickup_date",
+        "quantity",
+        "pickup_address",
+        "desired_delivery_date",
+        "status",
+        "status_display",
+        "client_name",
+        "client_inn",
+        "operator_id",
+        "operator_name",
+        "receiving_operator_id",
+        "receiving_operator_name",
+        "receiving_warehouse_id",
+        "receiving_warehouse_name",
+        "receiving_warehouse_city",
+        "convertible",
+    ],
+    values=[
+        "invoice_number",
+        "pickup_date",
+        "quantity",
+        "pickup_address",
+        "desired_delivery_date",
+        "status",
+        "sender__name",
+        "sender__inn",
+        "operator_id",
+        "operator__first_name",
+        "operator__last_name",
+        "operator__username",
+        "receiving_operator_id",
+        "receiving_operator__first_name",
+        "receiving_operator__last_name",
+        "receiving_operator__username",
+        "receiving_warehouse_id",
+        "receiving_warehouse__name",
+        "receiving_warehouse__city__name",
+        "delivery_order",
+    ],
+    row=lambda v: [
+        v["id"],
+        v["invoice_number"] or "",
+        v["pickup_date"],
+        v["quantity"],
+        v["pickup_address"] or "",
+        v["desired_delivery_date"],
+        v["status"],
+        PICKUP_STATUS_LABELS.get(v["status"], v["status"]),
+        v["sender__name"] or "Не указано",
+        v["sender__inn"] or "",
+        v["operator_id"],
+        _user_name(
+            v["operator__first_name"],
+            v["operator__last_name"],
+            v["operator__username"],
+        ),
+        v["receiving_operator_id"],
+        _user_name(
+            v["receiving_operator__first_name"],
+            v["receiving_operator__last_name"],
+            v["receiving_operator__username"],
+        ),
+        v["receiving_warehouse_id"],
+        v["receiving_warehouse__name"] or "",
+        v["receiving_warehouse__city__name"] or "",
+        v["status"] == "ready" and v["delivery_order"] is None,
+    ],
+    sorts={
+        "invoice_number": "invoice_number",
+        "pickup_date": "pickup_date",
+        "quantity": "quantity",
+        "pickup_address": "pickup_address",
+        "desired_delivery_date": "desired_delivery_date",
+        "status": "status",
+        "sender__name": "sender__name",
+        "operator": "operator__last_name",
+        "receiving_operator": "receiving_operator__last_name",
+        "receiving_warehouse": "receiving_warehouse__name",
+    },
+    default_sort="pickup_date",
+)
+
+
+def filter_pickup_orders(request, queryset):
+    """Фильтры списка заявок на забор из GET-параметров"""
+    if request.roles.is_operator:
+        queryset = queryset.filter(operator=request.user)
+
+    params = request.GET
+    if params.get("pickup_date__gte"):
+        queryset = queryset.filter(pickup_date__gte=params["pickup_date__gte"])
+    if params.get("pickup_date__lte"):
+        queryset = queryset.filter(pickup_date__lte=params["pickup_date__lte"])
+    if params.get("client_name"):
+        queryset = queryset.filter(sender__name__icontains=params["client_name"])
+    if params.get("pickup_address"):
+        queryset = queryset.filter(pickup_address__icontains=params["pickup_address"])
+    if params.get("invoice_number"):
+        queryset = queryset.filter(invoice_number__icontains=params["invoice_number"])
+    if params.get("status"):
+        queryset = queryset.filter(status=params["status"])
+    return queryset
+
+
 class PickupOrderListView(LoginRequiredMixin, ListView):
     model = PickupOrder
     template_name = "pickup/pickup_order_list.html"
     context_object_name = "orders"
-    paginate_by = 20
+    paginate_by = settings.GRID_PAGE_SIZE
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-
-        if self.request.user.is_authenticated and hasattr(self.request.user, "profile"):
-            if self.request.user.profile.role == "operator":
-                queryset = queryset.filter(operator=self.request.user)
-
-        pickup_date_gte = self.request.GET.get("pickup_date__gte")
-        pickup_date_lte = self.request.GET.get("pickup_date__lte")
-        client_name = self.request.GET.get("client_name")
-        pickup_address = self.request.GET.get("pickup_address")
-        invoice_number = self.request.GET.get("invoice_number")
-        status = self.request.GET.get("status")
-
-        if pickup_date_gte:
-            queryset = queryset.filter(pickup_date__gte=pickup_date_gte)
-        if pickup_date_lte:
-            queryset = queryset.filter(pickup_date__lte=pickup_date_lte)
-        if client_name:
-            queryset = queryset.filter(client_name__icontains=client_name)
-        if pickup_address:
-            queryset = queryset.filter(pickup_address__icontains=pickup_address)
-        if invoice_number:
-            queryset = queryset.filter(invoice_number__icontains=invoice_number)
-        if status:
-            queryset = queryset.filter(status=status)
-
-        sort = self.request.GET.get("sort", "-pickup_date")
-        order = self.request.GET.get("order", "desc")
-
-        allowed_sort_fields = [
-            "invoice_number",
-            "pickup_date",
-            "pickup_address",
-            "desired_delivery_date",
-            "status",
-            "client_name",
-            "operator",
-            "receiving_operator",
-            "receiving_warehouse",
-            "quantity",
-        ]
-
-        if sort in allowed_sort_fields:
-            if order == "desc":
-                sort_field = f"-{sort}"
-            else:
-                sort_field = sort
-            queryset = queryset.order_by(sort_field)
-        else:
-            queryset = queryset.order_by("-pickup_date")
-
-        return queryset
+        queryset = filter_pickup_orders(self.request, super().get_queryset())
+        return PICKUP_GRID.order(
+            queryset.select_related(
+                "sender",
+                "operator",
+                "receiving_operator",
+                "receiving_warehouse__city",
+                "delivery_order",
+            ),
+            self.request.GET,
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["is_operator"] = (
-            self.request.user.is_authenticated
-            and hasattr(self.request.user, "profile")
-            and self.request.user.profile.role == "operator"
-        )
-        context["is_logistic"] = (
-            self.request.user.is_authenticated
-            and hasattr(self.request.user, "profile")
-            and self.request.user.profile.role == "logistic"
-        )
-        context["is_admin"] = (
-            self.request.user.is_authenticated
-            and hasattr(self.request.user, "profile")
-            and self.request.user.profile.role == "admin"
-        )
-        context["sort"] = self.request.GET.get("sort", "pickup_date")
-        context["order"] = self.request.GET.get("order", "desc")
+        context["is_operator"] = self.request.roles.is_operator
+        context["is_logistic"] = self.request.roles.is_logistic
+        context["is_admin"] = self.request.roles.is_admin
+        context["sort"], descending = PICKUP_GRID.sorting(self.request.GET)
+        context["order"] = "desc" if descending else "asc"
+        page = context["page_obj"]
+        if page.has_next():
+            context["grid_next_cursor"] = PICKUP_GRID.cursor_after(
+                page.object_list[len(page.object_list) - 1]
+            )
         return context
 
 
+@login_required
+def pickup_orders_data(request):
+    """Страница списка заявок на забор в JSON для клиентской таблицы"""
+    queryset = filter_pickup_orders(request, PickupOrder.objects.all())
+    try:
+        page = PICKUP_GRID.page(queryset, request.GET)
+    except CursorError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse(page, json_dumps_params={"separators": (",", ":")})
+
+
 class PickupOrderDetailView(LoginRequiredMixin, DetailView):
     model = PickupOrder
     template_name = "pickup/pickup_order_detail.html"
@@ -129,10 +212,7 @@ class PickupOrderDetailView(LoginRequiredMixin, DetailView):
     def get_queryset(self):
         queryset = super().get_queryset()
 
-        if (
-            hasattr(self.request.user, "profile")
-            and self.request.user.profile.is_operator
-        ):
+        if self.request.roles.is_operator:
             queryset = queryset.filter(operator=self.request.user)
 
         return queryset
@@ -140,10 +220,10 @@ class PickupOrderDetailView(LoginRequiredMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        if hasattr(self.request.user, "profile"):
-            context["is_operator"] = self.request.user.profile.is_operator
-            context["is_logistic"] = self.request.user.profile.is_logistic
-            context["is_admin"] = self.request.user.profile.is_admin
+        if self.request.roles.has_profile:
+            context["is_operator"] = self.request.roles.is_operator
+            context["is_logistic"] = self.request.roles.is_logistic
+            context["is_admin"] = self.request.roles.is_admin
 
         return context
 
@@ -159,20 +239,9 @@ class PickupOrderCreateView(LoginRequiredMixin, CreateView):
         kwargs["user"] = self.request.user
         return kwargs
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context["counterparties"] = Counterparty.objects.filter(
-            is_active=True
-        ).order_by("name")
-        context["operators"] = User.objects.filter(
-            is_active=True, profile__role__in=["operator", "logistic", "admin"]
-        ).order_by("first_name", "last_name")
-        context["warehouses"] = Warehouse.objects.all().order_by("city__name", "name")
-        context["carriers"] = Carrier.objects.filter(is_active=True).order_by("name")
-        return context
-
     def form_valid(self, form):
         form.instance.operator = self.request.user
+        form.instance.status_changed_by_id = self.request.user.pk
         response = super().form_valid(form)
         messages.success(self.request, "Заявка на забор успешно создана!")
         return response
@@ -192,30 +261,16 @@ class PickupOrderUpdateView(LoginRequiredMixin, UpdateView):
         kwargs["user"] = self.request.user
         return kwargs
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context["counterparties"] = Counterparty.objects.filter(
-            is_active=True
-        ).order_by("name")
-        context["operators"] = User.objects.filter(
-            is_active=True, profile__role__in=["operator", "logistic", "admin"]
-        ).order_by("first_name", "last_name")
-        context["warehouses"] = Warehouse.objects.all().order_by("city__name", "name")
-        context["carriers"] = Carrier.objects.filter(is_active=True).order_by("name")
-        return context
-
     def get_queryset(self):
         queryset = super().get_queryset()
 
-        if (
-            hasattr(self.request.user, "profile")
-            and self.request.user.profile.is_operator
-        ):
+        if self.request.roles.is_operator:
             queryset = queryset.filter(operator=self.request.user)
 
         return queryset
 
     def form_valid(self, form):
+        form.instance.status_changed_by_id = self.request.user.pk
         response = super().form_valid(form)
         messages.success(self.request, "Заявка успешно обновлена!")
         return response
@@ -270,203 +325,120 @@ class ConvertToDeliveryView(LoginRequiredMixin, DetailView):
             return redirect("pickup_order_detail", pk=self.object.pk)
 
 
+def _truncate(value, length):
+    return (value[:length] + "...") if value and len(value) > length else (value or "")
+
+
+def _user_info_display(order, value, info):
+    if not info:
+        return ""
+    if info["first_name"] and info["last_name"]:
+        return f"{info['last_name']} {info['first_name']}"
+    return info["first_name"] or info["username"]
+
+
+def _warehouse_display(order, value, info):
+    return f"{info['name']} ({info['city']})" if info else ""
+
+
+def _carrier_display(order, value, info):
+    if not info:
+        return ""
+    if info["contact_person"]:
+        return f"{info['name']} ({info['contact_person']})"
+    return info["name"]
+
+
+def _time_range_display(order, value, info):
+    return order.pickup_time_range
+
+
+PICKUP_INLINE_FIELDS = {
+    "invoice_number": inline_edit.Field(),
+    "pickup_date": inline_edit.DateField(),
+    "pickup_time_from": inline_edit.TimeField(display=_time_range_display),
+    "pickup_time_to": inline_edit.TimeField(display=_time_range_display),
+    "pickup_address": inline_edit.Field(
+        display=lambda order, value, info: _truncate(value, 30)
+    ),
+    "contact_person": inline_edit.Field(
+        display=lambda order, value, info: (
+            _truncate(value, 20) or order.get_client_name()
+        )
+    ),
+    "desired_delivery_date": inline_edit.DateField(),
+    "quantity": inline_edit.IntegerField(empty=1),
+    "status": inline_edit.ChoiceField(),
+    "operator": inline_edit.RelatedField(
+        "user", "Пользователь не найден", display=_user_info_display
+    ),
+    "receiving_warehouse": inline_edit.RelatedField(
+        "warehouse", "Склад не найден", display=_warehouse_display
+    ),
+    "receiving_operator": inline_edit.RelatedField(
+        "user", "Пользователь не найден", display=_user_info_display
+    ),
+    "logistic": inline_edit.RelatedField(
+        "user", "Пользователь не найден", display=_user_info_display
+    ),
+    "carrier": inline_edit.RelatedField(
+        "carrier", "Перевозчик не найден", display=_carrier_display
+    ),
+}
+
+pickup_inline_editor = inline_edit.InlineEditor(
+    PickupOrder,
+    PICKUP_INLINE_FIELDS,
+    can_edit=lambda roles, order: (
+        roles.in_logists_group or roles.user_id == order.operator_id
+    ),
+)
+
+
 @require_POST
 @login_required
 def update_pickup_order_field(request, pk):
     """Обновление одного поля заявки на забор"""
-    try:
-        order = PickupOrder.objects.get(pk=pk)
-    except PickupOrder.DoesNotExist:
-        return JsonResponse({"success": False, "error": "Заявка не найдена"})
-
-    if not (
-        request.user.is_superuser
-        or request.user.groups.filter(name="Логисты").exists()
-        or request.user == order.operator
-    ):
-        return JsonResponse({"success": False, "error": "Нет прав на редактирование"})
-
-    data = json.loads(request.body)
-    field = data.get("field")
-    value = data.get("value")
-
-    allowed_fields = [
-        "invoice_number",
-        "pickup_date",
-        "pickup_time_from",
-        "pickup_time_to",
-        "pickup_address",
-        "contact_person",
-        "client_name",
-        "desired_delivery_date",
-        "quantity",
-        "status",
-        "operator",
-        "receiving_warehouse",
-        "receiving_operator",
-        "logistic",
-        "carrier",
-    ]
-
-    if field not in allowed_fields:
-        return JsonResponse(
-            {"success": False, "error": "Поле не доступно для редактирования"}
-        )
-
-    try:
-        if field == "quantity":
-            value = int(value) if value else 1
-        elif field == "pickup_date" and value:
-            value = datetime.strptime(value, "%Y-%m-%d").date()
-        elif field in ["pickup_time_from", "pickup_time_to"]:
-            if value and value.strip():
-                value = datetime.strptime(value, "%H:%M").time()
-            else:
-                value = None
-        elif field == "desired_delivery_date" and value:
-            value = datetime.strptime(value, "%Y-%m-%d").date()
-        elif field == "operator":
-            if value:
-                try:
-                    value = User.objects.get(id=value)
-                except User.DoesNotExist:
-                    return JsonResponse(
-                        {"success": False, "error": "Пользователь не найден"}
-                    )
-            else:
-                value = None
-        elif field == "receiving_warehouse":
-            if value:
-                try:
-                    from warehouses.models import Warehouse
-
-                    value = Warehouse.objects.get(id=value)
-                except Warehouse.DoesNotExist:
-                    return JsonResponse({"success": False, "error": "Склад не найден"})
-            else:
-                value = None
-        elif field == "receiving_operator":
-            if value:
-                try:
-                    value = User.objects.get(id=value)
-                except User.DoesNotExist:
-                    return JsonResponse(
-                        {"success": False, "error": "Пользователь не найден"}
-                    )
-            else:
-                value = None
-        elif field == "logistic":
-            if value:
-                try:
-                    value = User.objects.get(id=value)
-                except User.DoesNotExist:
-                    return JsonResponse(
-                        {"success": False, "error": "Пользователь не найден"}
-                    )
-            else:
-                value = None
-        elif field == "carrier":
-            if value:
-                try:
-                    value = Carrier.objects.get(id=value)
-                except Carrier.DoesNotExist:
-                    return JsonResponse(
-                        {"success": False, "error": "Перевозчик не найден"}
-                    )
-            else:
-                value = None
+    return pickup_inline_editor.single_field_view(request, pk)
 
-        setattr(order, field, value)
-        order.save()
 
-        if field == "status":
-            display_value = order.get_status_display()
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "operator":
-            display_value = ""
-            if order.operator:
-                display_value = get_user_display_name(order.operator)
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "receiving_operator":
-            display_value = ""
-            if order.receiving_operator:
-                display_value = get_user_display_name(order.receiving_operator)
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "logistic":
-            display_value = ""
-            if order.logistic:
-                display_value = get_user_display_name(order.logistic)
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "receiving_warehouse":
-            display_value = ""
-            if order.receiving_warehouse:
-                display_value = f"{order.receiving_warehouse.name} ({order.receiving_warehouse.city.name})"
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "carrier":
-            display_value = ""
-            if order.carrier:
-                display_value = order.carrier.name
-                if order.carrier.contact_person:
-                    display_value += f" ({order.carrier.contact_person})"
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field in ["pickup_time_from", "pickup_time_to"]:
-            return JsonResponse(
-                {"success": True, "display_value": order.pickup_time_range}
-            )
-        elif field == "pickup_date":
-            display_value = (
-                order.pickup_date.strftime("%d.%m.%Y") if order.pickup_date else ""
-            )
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "desired_delivery_date":
-            display_value = (
-                order.desired_delivery_date.strftime("%d.%m.%Y")
-                if order.desired_delivery_date
-                else ""
-            )
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "invoice_number":
-            display_value = value or ""
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "client_name":
-            display_value = (
-                (value[:20] + "...") if value and len(value) > 20 else (value or "")
-            )
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "contact_person":
-            display_value = (
-                (value[:20] + "...")
-                if value and len(value) > 20
-                else (value or order.client_name or "")
-            )
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "pickup_address":
-            display_value = (
-                (value[:30] + "...") if value and len(value) > 30 else (value or "")
-            )
-            return JsonResponse({"success": True, "display_value": display_value})
-        elif field == "quantity":
-            return JsonResponse({"success": True, "display_value": str(value)})
-
-        return JsonResponse({"success": True})
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)})
+@require_POST
+@login_required
+def update_pickup_order_fields(request):
+    """Пакетное обновление полей нескольких заявок на забор"""
+    return pickup_inline_editor.batch_view(request)
 
 
 def pickup_order_pdf(request, pk):
-    order = get_object_or_404(PickupOrder, pk=pk)
-
-    if hasattr(request.user, "profile") and request.user.profile.is_operator:
-        if order.operator != request.user:
+    # в PDF печатается статус связанной доставки - ее версия входит в ETag
+    order = get_object_or_404(
+        PickupOrder.objects.select_related("delivery_order").only(
+            *pdf_cache.VERSION_FIELDS, "delivery_order__updated_at"
+        ),
+        pk=pk,
+    )
+
+    if request.roles.is_operator:
+        if order.operator_id != request.user.pk:
             messages.error(request, "У вас нет доступа к этой заявке")
             return redirect("pickup_order_list")
 
-    pdf = create_pickup_order_pdf(order)
-
-    if pdf:
-        response = HttpResponse(pdf, content_type="application/pdf")
-        filename = f"pickup_{order.tracking_number or order.id}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    def render_pdf():
+        full_order = PickupOrder.objects.select_related(
+            "operator", "delivery_order"
+        ).get(pk=pk)
+        return create_pickup_order_pdf(full_order)
+
+    delivery = order.delivery_order
+    filename = f"pickup_{order.tracking_number or order.id}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    response = pdf_cache.order_pdf_response(
+        request,
+        order,
+        render_pdf,
+        filename,
+        extra_version=(delivery.updated_at.isoformat() if delivery else "",),
+    )
+    if response is not None:
         return response
     else:
         messages.error(request, "Ошибка при генерации PDF")
@@ -484,7 +456,7 @@ def pickup_orders_bulk_pdf(request):
     try:
         orders = PickupOrder.objects.filter(id__in=order_ids)
 
-        if hasattr(request.user, "profile") and request.user.profile.is_operator:
+        if request.roles.is_operator:
             orders = orders.filter(operator=request.user)
 
         if not orders.exists():
@@ -502,14 +474,13 @@ def pickup_orders_bulk_pdf(request):
                         filename = f"pickup_{order.tracking_number or order.id}.pdf"
                         zip_file.writestr(filename, pdf)
                         success_count += 1
-                        print(f"✅ PDF создан для заявки {order.id}: {filename}")
+                        logger.debug("PDF создан для заявки %s: %s", order.id, filename)
                     else:
-                        print(f"⚠️ PDF не создан для заявки {order.id}")
+                        logger.warning("PDF не создан для заявки %s", order.id)
                 except Exception as e:
-                    print(f"❌ Ошибка при создании PDF для заявки {order.id}: {e}")
-                    import traceback
-
-                    traceback.print_exc()
+                    logger.exception(
+                        "Ошибка при создании PDF для заявки %s: %s", order.id, e
+                    )
 
         if success_count == 0:
             messages.error(request, "Не удалось создать ни одного PDF файла")
@@ -519,14 +490,11 @@ def pickup_orders_bulk_pdf(request):
         response = HttpResponse(zip_buffer, content_type="application/zip")
         response["Content-Disposition"] = 'attachment; filename="pickup_orders.zip"'
 
-        print(f"✅ Создан архив с {success_count} файлами")
+        logger.info("Создан архив с %s файлами", success_count)
         return response
 
     except Exception as e:
-        print(f"❌ Критическая ошибка при создании архива: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Критическая ошибка при создании архива: %s", e)
         messages.error(request, f"Ошибка при создании архива: {str(e)[:100]}")
         return redirect("pickup_order_list")
 
@@ -556,10 +524,10 @@ def get_operators(request):
 
 def pickup_order_qr_pdf(request, pk):
     """Скачать QR-коды заявки на забор в PDF формате (по одному QR на страницу 75x120 мм)"""
-    order = get_object_or_404(PickupOrder, pk=pk)
+    order = get_object_or_404(PickupOrder.objects.select_related("sender"), pk=pk)
 
-    if hasattr(request.user, "profile") and request.user.profile.is_operator:
-        if order.operator != request.user:
+    if request.roles.is_operator:
+        if order.operator_id != request.user.pk:
             messages.error(request, "У вас нет доступа к этой заявке")
             return redirect("pickup_order_list")
 
@@ -576,239 +544,23 @@ def pickup_order_qr_pdf(request, pk):
             messages.error(request, "Файл QR-кода не найден")
             return redirect("pickup_order_detail", pk=pk)
 
-        with open(qr_code_path, "rb") as f:
-            qr_image_data = base64.b64encode(f.read()).decode("utf-8")
-
-        sender_display = order.get_client_name() or "не указан"
-        pickup_display = order.pickup_address or "не указан"
-        delivery_display = order.delivery_address or "не указан"
-
-        contact_person = order.contact_person or ""
-
-        qr_items_html = ""
-        total_items = order.quantity
-
-        for i in range(1, total_items + 1):
-            qr_items_html += f"""
-            <div class="page">
-                <div class="qr-container">
-                    <div class="header-section">
-                        <div class="company-name">Фулфилмент Царицыно</div>
-                        <div class="order-header">
-                            <div class="order-number">Заявка: {order.tracking_number or f"#{order.id}"}</div>
-                            <div class="order-date">Дата: {order.pickup_date.strftime('%d.%m.%Y') if order.pickup_date else datetime.now().strftime('%d.%m.%Y')}</div>
-                        </div>
-                        <div class="order-invoice">Накладная: {order.invoice_number or "-"}</div>
-                    </div>
-                    
-                    <div class="info-section">
-                        <div class="client-block">
-                            <div class="info-label">Клиент:</div>
-                            <div class="info-text">{sender_display}</div>
-                        </div>
-                        {f'<div class="contact-block"><div class="info-label">Контакты:</div><div class="info-text">{contact_person}</div></div>' if contact_person else ''}
-                    </div>
-                    
-                    <div class="address-section">
-                        <div class="address-block">
-                            <div class="address-label">Откуда:</div>
-                            <div class="address-text">{pickup_display}</div>
-                        </div>
-                        <div class="address-block">
-                            <div class="address-label">Куда:</div>
-                            <div class="address-text">{delivery_display}</div>
-                        </div>
-                    </div>
-                    
-                    <div class="qr-code-section">
-                        <img src="data:image/png;base64,{qr_image_data}" class="qr-image" />
-                    </div>
-                    
-                    <div class="footer-section">
-                        <div class="counter">Место {i} из {total_items}</div>
-                        <div class="cargo-info">
-                            <div class="cargo-item">Мест: {order.quantity}</div>
-                            <div class="cargo-item">Вес: {order.weight} кг</div>
-                            <div class="cargo-item">Объем: {order.volume} м³</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                @page {{
-                    size: 75mm 120mm;
-                    margin: 2mm;
-                }}
-                body {{
-                    margin: 0;
-                    padding: 0;
-                    font-family: Arial, sans-serif;
-                    font-size: 13px;
-                    line-height: 1.1;
-                }}
-                .page {{
-                    page-break-after: always;
-                    width: 71mm;
-                    height: 116mm;
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                }}
-                .page:last-child {{
-                    page-break-after: avoid;
-                }}
-                .qr-container {{
-                    width: 100%;
-                    height: 100%;
-                    display: flex;
-                    flex-direction: column;
-                    justify-content: flex-start;
-                    align-items: center;
-                    padding: 0.5mm;
-                    box-sizing: border-box;
-                    border: 0.3mm solid #ccc;
-                    border-radius: 1mm;
-                }}
-                .header-section {{
-                    width: 100%;
-                    text-align: center;
-                    margin-bottom: 0.2mm;
-                }}
-                .company-name {{
-                    font-weight: bold;
-                    font-size: 13px;
-                    color: #000;
-                    margin-bottom: 0.2mm;
-                }}
-                .order-header {{
-                    display: flex;
-                    justify-content: space-between;
-                    font-size: 10px;
-                    color: #444;
-                }}
-                .order-invoice {{
-                    font-size: 10px;
-                    color: #444;
-                    text-align: left;
-                    margin-top: 0.5mm;
-                }}
-                .info-section {{
-                    width: 100%;
-                    margin-bottom: 0.2mm;
-                }}
-                .client-block, .contact-block {{
-                    margin-bottom: 0.2mm;
-                }}
-                .info-label {{
-                    font-weight: bold;
-                    font-size: 13px;
-                    color: #000;
-                    margin-bottom: 0.1mm;
-                }}
-                .info-text {{
-                    font-size: 13px;
-                    color: #333;
-                    word-break: break-word;
-                }}
-                .address-section {{
-                    width: 100%;
-                    margin-bottom: 0.5mm;
-                }}
-                .address-block {{
-                    margin-bottom: 0.3mm;
-                }}
-                .address-label {{
-                    font-weight: bold;
-                    font-size: 13px;
-                    color: #000;
-                    margin-bottom: 0.1mm;
-                }}
-                .address-text {{
-                    font-size: 13px;
-                    color: #333;
-                    word-break: break-word;
-                    line-height: 1.1;
-                }}
-                .qr-code-section {{
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                    width: 100%;
-                    margin: 0.2mm 0;
-                }}
-                .qr-image {{
-                    width: 55mm;
-                    height: 55mm;
-                    max-width: 90%;
-                    max-height: 90%;
-                }}
-                .footer-section {{
-                    width: 100%;
-                    text-align: center;
-                }}
-                .counter {{
-                    font-size: 10px;
-                    color: #000;
-                    margin-bottom: 0.2mm;
-                }}
-                .cargo-info {{
-                    width: calc(100% + 2mm);
-                    margin-left: -6mm;
-                    margin-right: -6mm;
-                    font-weight: bold;
-                    display: flex;
-                    font-size: 9px;
-                    color: #000;
-                    border-top: 0.3mm solid #eee;
-                    padding-top: 0.3mm;
-                    box-sizing: border-box;
-                }}
-                .cargo-item {{
-                    text-align: center;
-                    box-sizing: border-box;
-                }}
-                .cargo-item:nth-child(1) {{
-                width: 22mm;
-                flex-shrink: 0;
-                flex-grow: 0;
-                }}
-                .cargo-item:nth-child(2),
-                .cargo-item:nth-child(3) {{
-                flex: 1;
-                }}
-
-            </style>
-        </head>
-        <body>
-            {qr_items_html}
-        </body>
-        </html>
-        """
-
-        html = HTML(string=html_content)
-        pdf = html.write_pdf()
-
-        if pdf:
-            response = HttpResponse(pdf, content_type="application/pdf")
-            filename = f"pickup_qr_{order.tracking_number or order.id}_{order.quantity}_places.pdf"
-            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        # на этикетке печатается имя клиента - учитываем версию контрагентов
+        filename = f"pickup_qr_{order.tracking_number or order.id}_{order.quantity}_places.pdf"
+        response = pdf_cache.order_pdf_response(
+            request,
+            order,
+            lambda: create_pickup_labels_pdf(order),
+            filename,
+            extra_version=("labels", versions_stamp((Counterparty,))),
+        )
+        if response is not None:
             return response
         else:
             messages.error(request, "Ошибка при генерации PDF")
             return redirect("pickup_order_detail", pk=pk)
 
     except Exception as e:
-        print(f"❌ Ошибка при создании PDF с QR-кодами для забора: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Ошибка при создании PDF с QR-кодами для забора: %s", e)
         messages.error(request, f"Ошибка при создании PDF: {str(e)}")
         return redirect("pickup_order_detail", pk=pk)
 
@@ -839,7 +591,7 @@ def bulk_update_pickup_orders(request):
 
         orders = PickupOrder.objects.filter(id__in=order_ids)
 
-        if hasattr(request.user, "profile") and request.user.profile.role == "operator":
+        if request.roles.is_operator:
             orders = orders.filter(operator=request.user)
 
         if not orders.exists():
@@ -866,6 +618,19 @@ def bulk_update_pickup_orders(request):
                 }
             )
 
+        if field == "status":
+            # Один UPDATE на всю выборку и запись в историю статусов
+            if value not in dict(PickupOrder.STATUS_CHOICES):
+                return JsonResponse({"success": False, "error": "Неверный статус"})
+            updated_count = orders.set_status(value, changed_by=request.user)
+            return JsonResponse(
+                {
+                    "success": True,
+                    "updated_count": updated_count,
+                    "message": f"Обновлено {updated_count} из {len(order_ids)} заявок",
+                }
+            )
+
         updated_count = 0
 
         for order in orders:
@@ -880,10 +645,6 @@ def bulk_update_pickup_orders(request):
                     else:
                         order.operator = None
 
-                elif field == "status":
-                    if value in ["ready", "payment", "in_transit", "accepted"]:
-                        order.status = value
-
                 elif field == "receiving_warehouse":
                     if value:
                         try:
@@ -947,7 +708,7 @@ def bulk_update_pickup_orders(request):
                 updated_count += 1
 
             except Exception as e:
-                print(f"Ошибка при обновлении заявки {order.id}: {e}")
+                logger.error("Ошибка при обновлении заявки %s: %s", order.id, e)
                 continue
 
         return JsonResponse(
@@ -959,10 +720,76 @@ def bulk_update_pickup_orders(request):
         )
 
     except Exception as e:
-        print(f"Ошибка в bulk_update_pickup_orders: {e}")
+        logger.error("Ошибка в bulk_update_pickup_orders: %s", e)
         return JsonResponse({"success": False, "error": str(e)})
 
 
+PICKUP_IMPORT = order_import.ImportSpec(
+    PickupOrder,
+    [
+        order_import.Column("pickup_date", order_import.parse_date),
+        order_import.Column("pickup_address"),
+        order_import.Column("contact_person"),
+        order_import.Column("sender_id", order_import.parse_counterparty),
+        order_import.Column("recipient_id", order_import.parse_counterparty),
+        order_import.Column("order_1c_number"),
+        order_import.Column("desired_delivery_date", order_import.parse_date),
+        order_import.Column("delivery_address"),
+        order_import.Column("invoice_number"),
+        order_import.Column("receiving_warehouse_id", order_import.parse_warehouse),
+        order_import.Column("delivery_city_id", order_import.parse_city),
+        order_import.Column("quantity", order_import.parse_int),
+        order_import.Column("weight", order_import.parse_float),
+        order_import.Column("volume", order_import.parse_float),
+        order_import.Column("cargo_description"),
+    ],
+    defaults=lambda user: {"operator": user},
+)
+
+
+@login_required
+def import_pickup_orders(request):
+    """Загрузка заявок на забор из CSV/XLSX"""
+    return PICKUP_IMPORT.view(
+        request,
+        "Импорт заявок на забор",
+        reverse("pickup_order_list"),
+        "pickup_orders_template.csv",
+    )
+
+
+@require_POST
+@login_required
+def bulk_convert_to_delivery(request):
+    """Создание заявок на доставку по выбранным заявкам на забор"""
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Некорректный JSON"})
+
+    order_ids = data.get("order_ids", [])
+    if not order_ids:
+        return JsonResponse({"success": False, "error": "Не выбраны заявки"})
+
+    pickups = convertible_pickups(
+        order_ids, request.user, operator_only=request.roles.is_operator
+    )
+    try:
+        converted = convert_to_deliveries(pickups, request.user)
+    except Exception as e:
+        logger.error("Ошибка в bulk_convert_to_delivery: %s", e)
+        return JsonResponse({"success": False, "error": str(e)})
+
+    return JsonResponse(
+        {
+            "success": True,
+            "converted_count": len(converted),
+            "skipped_count": len(order_ids) - len(converted),
+            "delivery_ids": [delivery.pk for _, delivery in converted],
+        }
+    )
+
+
 def pickup_orders_list_pdf(request):
     """Экспорт выбранных заявок на забор в один PDF файл (таблица)"""
     order_ids = request.GET.getlist("order_ids")
@@ -974,7 +801,7 @@ def pickup_orders_list_pdf(request):
     try:
         orders = PickupOrder.objects.filter(id__in=order_ids)
 
-        if hasattr(request.user, "profile") and request.user.profile.is_operator:
+        if request.roles.is_operator:
             orders = orders.filter(operator=request.user)
 
         if not orders.exists():
@@ -997,10 +824,7 @@ def pickup_orders_list_pdf(request):
             return redirect("pickup_order_list")
 
     except Exception as e:
-        print(f"❌ Ошибка при создании списка PDF: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Ошибка при создании списка PDF: %s", e)
         messages.error(request, f"Ошибка при создании PDF: {str(e)[:100]}")
         return redirect("pickup_order_list")
 
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import OrderTombstone
+
+
+@admin.register(OrderTombstone)
+class OrderTombstoneAdmin(admin.ModelAdmin):
+    list_display = ["deleted_at", "kind", "object_id", "tracking_number"]
+    list_filter = ["kind", "deleted_at"]
+    search_fields = ["tracking_number"]
+    date_hierarchy = "deleted_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "sync"
+    verbose_name = "Синхронизация"
+
+    def ready(self):
+        # Подключение сигналов записи удалений
+        from . import feed  # noqa: F401
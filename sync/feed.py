@@ -0,0 +1,185 @@
+"""
+Лента изменений заявок для внешних систем (дашборды, 1С).
+
+Изменения отдаются ленточно (keyset) по паре (updated_at, id) с индексом
+на обеих моделях: курсор - непрозрачная строка с последней отданной парой,
+страница - один запрос с LIMIT без OFFSET. Удаления пишутся сигналом
+post_delete в OrderTombstone и отдаются отдельной лентой по (deleted_at, id).
+
+Записи моложе SYNC_LAG_SECONDS не отдаются: транзакция, начатая раньше,
+может зафиксироваться позже и получить меньший updated_at, чем уже
+отданный клиенту курсор.
+"""
+
+import base64
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from logistic.models import DeliveryOrder
+from pickup.models import PickupOrder
+
+from .models import OrderTombstone
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(moment, pk):
+    raw = f"{moment.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        moment, pk = raw.rsplit("|", 1)
+        moment = parse_datetime(moment)
+        pk = int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise CursorError("Некорректный курсор")
+    if moment is None:
+        raise CursorError("Некорректный курсор")
+    return moment, pk
+
+
+class Feed:
+    """Лента записей queryset, упорядоченных по (time_field, id)"""
+
+    def __init__(self, queryset, time_field, fields):
+        self.queryset = queryset
+        self.time_field = time_field
+        self.fields = fields
+
+    def page(self, cursor=None, limit=None):
+        """
+        Страница ленты после курсора:
+        {"fields": [...], "rows": [[...], ...], "next_cursor", "has_more"}
+        """
+        limit = min(limit or settings.SYNC_PAGE_SIZE, settings.SYNC_MAX_PAGE_SIZE)
+        settled = timezone.now() - timedelta(seconds=settings.SYNC_LAG_SECONDS)
+
+        rows = self.queryset().filter(**{f"{self.time_field}__lt": settled})
+        if cursor:
+            moment, pk = decode_cursor(cursor)
+            rows = rows.filter(
+                Q(**{f"{self.time_field}__gt": moment})
+                | Q(**{self.time_field: moment, "id__gt": pk})
+            )
+        rows = list(
+            rows.order_by(self.time_field, "id").values_list(*self.fields)[: limit + 1]
+        )
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        time_index = self.fields.index(self.time_field)
+        id_index = self.fields.index("id")
+        if rows:
+            last = rows[-1]
+            next_cursor = encode_cursor(last[time_index], last[id_index])
+        else:
+            # Пустая страница: клиент продолжает с того же места
+            next_cursor = cursor
+        return {
+            "fields": list(self.fields),
+            "rows": rows,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+
+
+FEEDS = {
+    "deliveries": Feed(
+        DeliveryOrder.objects.all,
+        "updated_at",
+        (
+            "id",
+            "tracking_number",
+            "status",
+            "delivery_date",
+            "shipped_at",
+            "sender_id",
+            "pickup_address",
+            "pickup_warehouse_id",
+            "recipient_id",
+            "delivery_address",
+            "delivery_warehouse_id",
+            "delivery_city_id",
+            "quantity",
+            "weight",
+            "volume",
+            "driver_name",
+            "driver_phone",
+            "vehicle",
+            "logistic_id",
+            "operator_id",
+            "created_at",
+            "updated_at",
+        ),
+    ),
+    "pickups": Feed(
+        PickupOrder.objects.all,
+        "updated_at",
+        (
+            "id",
+            "tracking_number",
+            "status",
+            "pickup_date",
+            "pickup_time_from",
+            "pickup_time_to",
+            "pickup_address",
+            "contact_person",
+            "sender_id",
+            "recipient_id",
+            "order_1c_number",
+            "desired_delivery_date",
+            "delivery_address",
+            "invoice_number",
+            "receiving_operator_id",
+            "receiving_warehouse_id",
+            "delivery_city_id",
+            "quantity",
+            "weight",
+            "volume",
+            "operator_id",
+            "logistic_id",
+            "carrier_id",
+            "delivery_order_id",
+            "created_at",
+            "updated_at",
+        ),
+    ),
+    "deleted": Feed(
+        OrderTombstone.objects.all,
+        "deleted_at",
+        ("id", "kind", "object_id", "tracking_number", "deleted_at"),
+    ),
+}
+
+
+# --- Запись удалений ---
+
+
+def _order_deleted(kind):
+    def handler(sender, instance, **kwargs):
+        OrderTombstone.objects.create(
+            kind=kind,
+            object_id=instance.pk,
+            tracking_number=instance.tracking_number or "",
+        )
+
+    return handler
+
+
+_delivery_deleted = _order_deleted("delivery")
+_pickup_deleted = _order_deleted("pickup")
+
+post_delete.connect(
+    _delivery_deleted, sender=DeliveryOrder, dispatch_uid="sync_delivery_deleted"
+)
+post_delete.connect(_pickup_deleted, sender=PickupOrder, dispatch_uid="sync_pickup_deleted")
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sync.models import OrderTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет записи об удаленных заявках старше SYNC_TOMBSTONE_RETENTION_DAYS "
+        "(клиенты синхронизации должны забирать изменения чаще)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+            help="Сколько дней хранить записи",
+        )
+
+    def handle(self, *args, **options):
+        border = timezone.now() - timedelta(days=options["days"])
+        deleted, _ = OrderTombstone.objects.filter(deleted_at__lt=border).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"🗑️ Удалено записей об удаленных заявках: {deleted}")
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('delivery', 'Заявка на доставку'), ('pickup', 'Заявка на забор')], max_length=20, verbose_name='Тип заявки')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID заявки')),
+                ('tracking_number', models.CharField(blank=True, default='', max_length=50, verbose_name='Сквозной номер заказа')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Время удаления')),
+            ],
+            options={
+                'verbose_name': 'Удаленная заявка',
+                'verbose_name_plural': 'Удаленные заявки',
+                'ordering': ['-deleted_at'],
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='sync_ordert_deleted_a6078f_idx')],
+            },
+        ),
+    ]
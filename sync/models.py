@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OrderTombstone(models.Model):
+    """
+    Запись об удаленной заявке для инкрементальной синхронизации:
+    внешние системы получают удаления вместе с изменениями
+    """
+
+    KIND_CHOICES = [
+        ("delivery", "Заявка на доставку"),
+        ("pickup", "Заявка на забор"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Тип заявки")
+    object_id = models.PositiveBigIntegerField(verbose_name="ID заявки")
+    tracking_number = models.CharField(
+        max_length=50, blank=True, default="", verbose_name="Сквозной номер заказа"
+    )
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name="Время удаления")
+
+    class Meta:
+        verbose_name = "Удаленная заявка"
+        verbose_name_plural = "Удаленные заявки"
+        ordering = ["-deleted_at"]
+        indexes = [
+            models.Index(fields=["deleted_at", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id} ({self.tracking_number})"
@@ -0,0 +1,103 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from logistic.models import DeliveryOrder
+from utils import demo_data
+
+from .feed import FEEDS, encode_cursor
+from .models import OrderTombstone
+
+
+class ChangeFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        demo_data.seed()
+        cls.admin = User.objects.create_superuser("root", password="x")
+        cls.admin.profile.role = "admin"
+        cls.admin.profile.save()
+
+    def setUp(self):
+        self.moment = timezone.now() - timedelta(hours=1)
+        # Одинаковое время изменения у всех заявок: порядок держится на id
+        DeliveryOrder.objects.update(updated_at=self.moment)
+
+    def read_all(self, feed, cursor=None, limit=7):
+        ids = []
+        while True:
+            page = FEEDS[feed].page(cursor, limit)
+            ids.extend(row[page["fields"].index("id")] for row in page["rows"])
+            cursor = page["next_cursor"]
+            if not page["has_more"]:
+                return ids, cursor
+
+    def test_pages_cover_rows_with_equal_timestamps(self):
+        ids, _ = self.read_all("deliveries")
+        expected = sorted(DeliveryOrder.objects.values_list("pk", flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_cursor_returns_only_later_changes(self):
+        _, cursor = self.read_all("deliveries")
+        order = DeliveryOrder.objects.order_by("pk").first()
+        DeliveryOrder.objects.filter(pk=order.pk).update(
+            updated_at=self.moment + timedelta(minutes=1)
+        )
+
+        ids, next_cursor = self.read_all("deliveries", cursor)
+        self.assertEqual(ids, [order.pk])
+        # Новых изменений нет - курсор остается прежним
+        self.assertEqual(self.read_all("deliveries", next_cursor), ([], next_cursor))
+
+    def test_recent_changes_held_back(self):
+        order = DeliveryOrder.objects.order_by("pk").first()
+        DeliveryOrder.objects.filter(pk=order.pk).update(updated_at=timezone.now())
+        ids, _ = self.read_all("deliveries")
+        self.assertNotIn(order.pk, ids)
+
+    @override_settings(SYNC_LAG_SECONDS=0)
+    def test_deleted_orders_in_tombstone_feed(self):
+        order = DeliveryOrder.objects.order_by("pk").first()
+        pk = order.pk
+        order.delete()
+        page = FEEDS["deleted"].page()
+        fields = page["fields"]
+        self.assertEqual(
+            [
+                (row[fields.index("kind")], row[fields.index("object_id")])
+                for row in page["rows"]
+            ],
+            [("delivery", pk)],
+        )
+
+    def test_view_rejects_bad_input_and_operators(self):
+        url = reverse("sync_deliveries")
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(url, {"cursor": "не курсор"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"limit": "-1"}).status_code, 400)
+
+        cursor = encode_cursor(self.moment - timedelta(seconds=1), 0)
+        response = self.client.get(url, {"cursor": cursor, "limit": 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["rows"]), 5)
+
+        operator = User.objects.get(username="operator1")
+        self.client.force_login(operator)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_purge_tombstones_keeps_recent(self):
+        OrderTombstone.objects.create(
+            kind="delivery", object_id=1, deleted_at=timezone.now() - timedelta(days=10)
+        )
+        recent = OrderTombstone.objects.create(kind="delivery", object_id=2)
+
+        out = io.StringIO()
+        call_command("purge_tombstones", "--days", "7", stdout=out)
+        self.assertIn("Удалено записей об удаленных заявках: 1", out.getvalue())
+        self.assertEqual(
+            list(OrderTombstone.objects.values_list("pk", flat=True)), [recent.pk]
+        )
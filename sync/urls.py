@@ -0,0 +1,13 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path(
+        "deliveries/",
+        views.changes,
+        {"feed": "deliveries"},
+        name="sync_deliveries",
+    ),
+    path("pickups/", views.changes, {"feed": "pickups"}, name="sync_pickups"),
+    path("deleted/", views.changes, {"feed": "deleted"}, name="sync_deleted"),
+]
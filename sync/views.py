@@ -0,0 +1,30 @@
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+
+from .feed import FEEDS, CursorError
+
+
+@login_required
+def changes(request, feed):
+    """
+    Изменения заявок после курсора: ?cursor=<next_cursor прошлого ответа>&limit=N.
+    Без курсора лента отдается с начала.
+    """
+    if feed not in FEEDS:
+        raise Http404
+    # Операторам в интерфейсе доступны только их заявки - полная лента не для них
+    if request.roles.is_operator:
+        return JsonResponse({"error": "Недостаточно прав"}, status=403)
+
+    try:
+        limit = int(request.GET.get("limit") or 0) or None
+    except ValueError:
+        return JsonResponse({"error": "Некорректный limit"}, status=400)
+    if limit is not None and limit < 1:
+        return JsonResponse({"error": "Некорректный limit"}, status=400)
+
+    try:
+        page = FEEDS[feed].page(request.GET.get("cursor"), limit)
+    except CursorError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse(page, json_dumps_params={"separators": (",", ":")})
@@ -0,0 +1,65 @@
+"""
+Бэкенд аутентификации с кэшем пользователя.
+
+AuthenticationMiddleware на каждом запросе загружает пользователя сессии
+(ModelBackend.get_user - один SELECT). Здесь пользователь вместе с профилем
+хранится в кэше по id (USER_CACHE_TTL) и сбрасывается сигналами при
+изменении или удалении пользователя и профиля. Вместе с кэшируемыми
+сессиями (SESSION_ENGINE cached_db) запрос авторизованного пользователя
+при попадании в кэш не обращается к БД.
+
+Кэш используется только с общим бэкендом (CACHE_SHARED): сброс записи в
+locmem одного воркера не виден другим, и там выключенный или вышедший
+пользователь оставался бы в кэше до USER_CACHE_TTL.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from .models import UserProfile
+
+UserModel = get_user_model()
+
+
+def _cache_key(user_id):
+    return f"auth_user:{user_id}"
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        if not settings.CACHE_SHARED:
+            return super().get_user(user_id)
+        key = _cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = UserModel._default_manager.select_related("profile").get(
+                    pk=user_id
+                )
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(key, user, settings.USER_CACHE_TTL)
+        return user if self.user_can_authenticate(user) else None
+
+
+def invalidate_user(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+def _user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+def _profile_changed(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+
+post_save.connect(_user_changed, sender=UserModel, dispatch_uid="auth_user_cache_save")
+post_delete.connect(_user_changed, sender=UserModel, dispatch_uid="auth_user_cache_delete")
+post_save.connect(_profile_changed, sender=UserProfile, dispatch_uid="auth_profile_cache_save")
+post_delete.connect(
+    _profile_changed, sender=UserProfile, dispatch_uid="auth_profile_cache_delete"
+)
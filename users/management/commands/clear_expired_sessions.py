@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет истекшие сессии из БД пачками (clearsessions удаляет их "
+        "одним DELETE и надолго блокирует таблицу)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сессий в одном DELETE",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.1,
+            help="Пауза между пачками (сек), чтобы не мешать рабочим запросам",
+        )
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE.endswith(".cache"):
+            self.stdout.write("ℹ️  Сессии хранятся только в кэше и истекают сами")
+            return
+
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(
+                Session.objects.filter(expire_date__lt=now).values_list(
+                    "session_key", flat=True
+                )[: options["batch_size"]]
+            )
+            if not keys:
+                break
+            count, _ = Session.objects.filter(session_key__in=keys).delete()
+            deleted += count
+            self.stdout.write(f"🗑️  Удалено сессий: {deleted}")
+            time.sleep(options["pause"])
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Удалено истекших сессий: {deleted}"))
@@ -0,0 +1,19 @@
+from django.utils.functional import SimpleLazyObject
+
+from .roles import get_roles
+
+
+class RolesMiddleware:
+    """
+    Добавляет request.roles - роль и группы текущего пользователя.
+    Данные загружаются при первом обращении и берутся из кэша, поэтому
+    проверки прав в представлениях не выполняют SQL-запросов.
+    Должен стоять после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.roles = SimpleLazyObject(lambda: get_roles(request.user))
+        return self.get_response(request)
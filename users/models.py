@@ -41,7 +41,10 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+def save_user_profile(sender, instance, update_fields=None, **kwargs):
     """Сохраняет профиль если он существует"""
+    # Вход в систему сохраняет только last_login - профиль не меняется
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
     if hasattr(instance, "profile"):
         instance.profile.save()
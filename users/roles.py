@@ -0,0 +1,173 @@
+"""
+Роли и группы пользователя для проверок прав в представлениях.
+
+Профиль и имена групп читаются один раз и хранятся в кэше по id
+пользователя (ROLES_CACHE_TTL); при изменении профиля, пользователя или
+состава групп запись сбрасывается сигналами. В запросе данные доступны как
+request.roles (см. RolesMiddleware) без обращений к БД.
+
+Без общего кэша (CACHE_SHARED) роли не кэшируются: сброс в locmem одного
+воркера не виден другим, и там отозванная роль действовала бы до
+ROLES_CACHE_TTL.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from .models import UserProfile
+
+LOGISTS_GROUP = "Логисты"
+
+
+class Roles:
+    """Неизменяемый снимок роли пользователя"""
+
+    def __init__(self, user_id=None, role=None, is_superuser=False, groups=()):
+        self.user_id = user_id
+        self.role = role
+        self.is_superuser = is_superuser
+        self.groups = frozenset(groups)
+
+    @property
+    def has_profile(self):
+        return self.role is not None
+
+    @property
+    def is_operator(self):
+        return self.role == "operator"
+
+    @property
+    def is_logistic(self):
+        return self.role == "logistic"
+
+    @property
+    def is_admin(self):
+        return self.role == "admin"
+
+    @property
+    def role_display(self):
+        return dict(UserProfile.ROLE_CHOICES).get(self.role, "")
+
+    @property
+    def in_logists_group(self):
+        """Суперпользователь или член группы «Логисты»"""
+        return self.is_superuser or LOGISTS_GROUP in self.groups
+
+    def has_group(self, name):
+        return name in self.groups
+
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "role": self.role,
+            "is_superuser": self.is_superuser,
+            "groups": sorted(self.groups),
+        }
+
+    def __repr__(self):
+        return f"<Roles user={self.user_id} role={self.role}>"
+
+
+ANONYMOUS_ROLES = Roles()
+
+
+def _cache_key(user_id):
+    return f"user_roles:{user_id}"
+
+
+def load_roles(user):
+    """Читает роль и группы пользователя из БД (два запроса)"""
+    role = (
+        UserProfile.objects.filter(user_id=user.pk).values_list("role", flat=True).first()
+    )
+    groups = user.groups.values_list("name", flat=True)
+    return Roles(user.pk, role, user.is_superuser, groups)
+
+
+def get_roles(user):
+    """Роли пользователя из кэша; при промахе читаются из БД и кэшируются"""
+    if not user.is_authenticated:
+        return ANONYMOUS_ROLES
+    if not settings.CACHE_SHARED:
+        return load_roles(user)
+
+    data = cache.get(_cache_key(user.pk))
+    if data is not None:
+        return Roles(**data)
+
+    roles = load_roles(user)
+    cache.set(_cache_key(user.pk), roles.to_dict(), settings.ROLES_CACHE_TTL)
+    return roles
+
+
+def invalidate_roles(user_ids):
+    cache.delete_many([_cache_key(pk) for pk in user_ids])
+
+
+# --- Сброс кэша ---
+
+
+def _profile_saved(sender, instance, **kwargs):
+    # Профиль пересохраняется при каждом user.save() (в т.ч. при входе),
+    # поэтому запись сбрасывается только при смене роли
+    data = cache.get(_cache_key(instance.user_id))
+    if data is not None and data["role"] != instance.role:
+        invalidate_roles([instance.user_id])
+
+
+def _profile_deleted(sender, instance, **kwargs):
+    invalidate_roles([instance.user_id])
+
+
+def _user_changed(sender, instance, update_fields=None, **kwargs):
+    # Вход в систему сохраняет только last_login - роли не меняются
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    invalidate_roles([instance.pk])
+
+
+def _groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        # user.groups.add/remove/clear
+        invalidate_roles([instance.pk])
+    elif action == "pre_clear":
+        invalidate_roles(instance.user_set.values_list("pk", flat=True))
+    else:
+        # group.user_set.add/remove
+        invalidate_roles(pk_set)
+
+
+def _group_saved(sender, instance, **kwargs):
+    # Переименование группы затрагивает всех ее участников
+    invalidate_roles(instance.user_set.values_list("pk", flat=True))
+
+
+def _group_deleting(sender, instance, **kwargs):
+    # После удаления связи с пользователями уже стерты - участники
+    # запоминаются до него
+    instance._roles_member_ids = list(instance.user_set.values_list("pk", flat=True))
+
+
+def _group_deleted(sender, instance, **kwargs):
+    user_ids = getattr(instance, "_roles_member_ids", [])
+    invalidate_roles(user_ids)
+    # Запрос, прочитавший роли до фиксации удаления, мог снова их закэшировать
+    transaction.on_commit(lambda: invalidate_roles(user_ids))
+
+
+post_save.connect(_profile_saved, sender=UserProfile, dispatch_uid="roles_profile_save")
+post_delete.connect(
+    _profile_deleted, sender=UserProfile, dispatch_uid="roles_profile_delete"
+)
+post_save.connect(_user_changed, sender=User, dispatch_uid="roles_user_save")
+m2m_changed.connect(
+    _groups_changed, sender=User.groups.through, dispatch_uid="roles_groups_changed"
+)
+post_save.connect(_group_saved, sender=Group, dispatch_uid="roles_group_save")
+pre_delete.connect(_group_deleting, sender=Group, dispatch_uid="roles_group_deleting")
+post_delete.connect(_group_deleted, sender=Group, dispatch_uid="roles_group_delete")
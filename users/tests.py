@@ -1,3 +1,211 @@
-from django.test import TestCase
+import io
+from datetime import timedelta
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from utils.reference_cache import user_choices, versions_stamp
+
+from .backends import _cache_key as user_cache_key
+from .middleware import RolesMiddleware
+from .models import UserProfile
+from .roles import LOGISTS_GROUP, get_roles
+
+
+@override_settings(CACHE_SHARED=True)
+class RolesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("operator_1", password="x")
+        self.group = Group.objects.create(name=LOGISTS_GROUP)
+
+    def test_cached_roles_need_no_queries(self):
+        get_roles(self.user)
+        with self.assertNumQueries(0):
+            roles = get_roles(self.user)
+        self.assertTrue(roles.is_operator)
+        self.assertFalse(roles.in_logists_group)
+
+    def test_profile_change_invalidates(self):
+        get_roles(self.user)
+        profile = self.user.profile
+        profile.role = "admin"
+        profile.save()
+        roles = get_roles(self.user)
+        self.assertTrue(roles.is_admin)
+        self.assertEqual(roles.role_display, "Администратор")
+
+    def test_group_change_invalidates(self):
+        get_roles(self.user)
+        self.user.groups.add(self.group)
+        self.assertTrue(get_roles(self.user).in_logists_group)
+
+        self.group.user_set.remove(self.user)
+        self.assertFalse(get_roles(self.user).in_logists_group)
+
+        self.group.user_set.add(self.user)
+        get_roles(self.user)
+        self.group.user_set.clear()
+        self.assertFalse(get_roles(self.user).in_logists_group)
+
+    def test_group_delete_revokes_role(self):
+        self.user.groups.add(self.group)
+        self.assertTrue(get_roles(self.user).in_logists_group)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.delete()
+        self.assertFalse(get_roles(self.user).in_logists_group)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_roles_not_cached_without_shared_backend(self):
+        get_roles(self.user)
+        self.user.groups.through.objects.create(user=self.user, group=self.group)
+        self.assertTrue(get_roles(self.user).in_logists_group)
+
+    def test_middleware_sets_lazy_roles(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        seen = {}
+
+        def view(request):
+            seen["roles"] = request.roles
+            return None
+
+        RolesMiddleware(view)(request)
+        self.assertEqual(seen["roles"].user_id, self.user.pk)
+        self.assertTrue(seen["roles"].is_operator)
+
+
+@override_settings(
+    CACHE_SHARED=True, SESSION_ENGINE="django.contrib.sessions.backends.cached_db"
+)
+class CachedSessionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches[settings.SESSION_CACHE_ALIAS].clear()
+        self.user = User.objects.create_user("operator_1", password="x")
+        self.client.force_login(self.user)
+        self.url = reverse("dashboard")
+
+    def assertLoggedIn(self, client):
+        self.assertEqual(client.get(self.url).status_code, 200)
+
+    def assertLoggedOut(self, client):
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response["Location"].startswith(settings.LOGIN_URL))
+
+    def test_logout_rejects_old_session(self):
+        other = Client()
+        other.cookies = self.client.cookies
+        self.assertLoggedIn(other)
+
+        self.client.post(reverse("logout"))
+        self.assertLoggedOut(other)
+
+    def test_deactivated_user_rejected(self):
+        self.assertLoggedIn(self.client)
+        self.user.is_active = False
+        self.user.save()
+        self.assertLoggedOut(self.client)
+
+    def test_password_change_rejects_old_session(self):
+        self.assertLoggedIn(self.client)
+        self.user.set_password("y")
+        self.user.save()
+        self.assertLoggedOut(self.client)
+
+    def test_session_from_model_backend_kept(self):
+        # Сессия, созданная до перехода на CachedModelBackend
+        client = Client()
+        client.force_login(
+            self.user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+        self.assertLoggedIn(client)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_local_cache_ignored_without_shared_backend(self):
+        # Запись в кэше осталась от другого воркера, который не видел
+        # изменения пользователя
+        self.assertLoggedIn(self.client)
+        cache.set(user_cache_key(self.user.pk), self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertLoggedOut(self.client)
+
+
+@override_settings(CACHE_SHARED=True)
+class ReferenceVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["reference_data"].clear()
+        self.user = User.objects.create_user("operator_1", password="x")
+        self.models = (User, UserProfile)
+
+    def test_login_keeps_user_choices_cached(self):
+        operators = user_choices("operator")
+        operators.choices()
+        stamp = versions_stamp(self.models)
+
+        self.client.post(
+            reverse("login"), {"username": "operator_1", "password": "x"}
+        )
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+        self.assertEqual(versions_stamp(self.models), stamp)
+
+    def test_name_change_refreshes_user_choices(self):
+        operators = user_choices("operator")
+        operators.choices()
+        stamp = versions_stamp(self.models)
+
+        self.user.first_name = "Иван"
+        self.user.save(update_fields=["first_name"])
+        self.assertNotEqual(versions_stamp(self.models), stamp)
+        self.assertIn((self.user.pk, "Иван"), operators.choices())
+
+    @override_settings(CACHE_SHARED=False)
+    def test_choices_not_cached_without_shared_backend(self):
+        operators = user_choices("operator")
+        operators.choices()
+        # Изменение в обход сигналов (как в другом воркере) видно сразу
+        User.objects.filter(pk=self.user.pk).update(first_name="Петр")
+        self.assertIn((self.user.pk, "Петр"), operators.choices())
+
+
+class ClearExpiredSessionsTests(TestCase):
+    def create_session(self, expires_in):
+        store = SessionStore()
+        store["value"] = 1
+        store.create()
+        Session.objects.filter(session_key=store.session_key).update(
+            expire_date=timezone.now() + expires_in
+        )
+        return store.session_key
+
+    def test_expired_sessions_deleted_in_batches(self):
+        for _ in range(3):
+            self.create_session(timedelta(days=-1))
+        alive = self.create_session(timedelta(days=1))
+
+        out = io.StringIO()
+        call_command(
+            "clear_expired_sessions", "--batch-size", "2", "--pause", "0", stdout=out
+        )
+        self.assertIn("Удалено сессий: 2", out.getvalue())
+        self.assertIn("Удалено истекших сессий: 3", out.getvalue())
+        self.assertEqual(
+            list(Session.objects.values_list("session_key", flat=True)), [alive]
+        )
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cache")
+    def test_cache_sessions_skipped(self):
+        out = io.StringIO()
+        call_command("clear_expired_sessions", stdout=out)
+        self.assertIn("истекают сами", out.getvalue())
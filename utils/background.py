@@ -0,0 +1,55 @@
+"""
+Фоновое выполнение тяжелых задач (QR-коды, файлы) вне цикла запроса.
+
+Задачи выполняются в пуле потоков процесса после фиксации транзакции,
+чтобы поток видел созданные записи. Если процесс завершится раньше,
+недостающие QR-коды создаст команда generate_qr_codes, а незавершенная
+перегенерация из админки будет помечена ошибкой (QrRegenerationJob.fail_stale)
+и ее можно запустить заново.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BACKGROUND_WORKERS,
+            thread_name_prefix="crm-background",
+        )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception as e:
+        logger.exception("Ошибка фоновой задачи %s: %s", func.__name__, e)
+    finally:
+        # У потока пула свои соединения с БД - закрываем их после задачи
+        connections.close_all()
+
+
+def submit_on_commit(func, *args, **kwargs):
+    """
+    Ставит func(*args, **kwargs) в фоновую очередь после фиксации текущей
+    транзакции. При BACKGROUND_WORKERS = 0 задача выполняется сразу в
+    текущем потоке (например, в тестах и командах).
+    """
+
+    def start():
+        if settings.BACKGROUND_WORKERS:
+            _get_executor().submit(_run, func, args, kwargs)
+        else:
+            func(*args, **kwargs)
+
+    transaction.on_commit(start)
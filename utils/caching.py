@@ -0,0 +1,175 @@
+"""
+Бэкенды кэша проекта (CACHES в settings).
+
+- InstrumentedCache: обертка над любым бэкендом Django (OPTIONS["BACKEND"]),
+  считает попадания и промахи в monitoring.metrics - в замер запроса и в
+  счетчики процесса;
+- TieredCache: то же с локальным уровнем в памяти процесса перед общим
+  кэшем (файлы, Redis). Повторное чтение той же записи не идет по сети.
+  Локальная копия живет LOCAL_TIMEOUT секунд и не сбрасывается delete() в
+  других процессах, поэтому уровень подходит для ключей с версией
+  (reference_cache.versions_stamp), которые после записи не меняются.
+
+Ключи строит внутренний бэкенд (KEY_PREFIX, VERSION, KEY_FUNCTION), обертка
+передает ему исходные ключи.
+"""
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.module_loading import import_string
+
+from monitoring import metrics
+
+_MISSING = object()
+
+
+class InstrumentedCache(BaseCache):
+    def __init__(self, location, params):
+        options = dict(params.get("OPTIONS", {}))
+        backend = options.pop("BACKEND")
+        self.name = options.pop("NAME", location)
+        self.local_options = {
+            key: options.pop(key)
+            for key in ("LOCAL_TIMEOUT", "LOCAL_MAX_ENTRIES")
+            if key in options
+        }
+        inner_params = {**params, "OPTIONS": options}
+        super().__init__(inner_params)
+        self.inner = import_string(backend)(location, inner_params)
+
+    def _record(self, hits, misses):
+        metrics.record_cache(self.name, hits, misses)
+
+    def get(self, key, default=None, version=None):
+        value = self.inner.get(key, _MISSING, version)
+        if value is _MISSING:
+            self._record(0, 1)
+            return default
+        self._record(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = self.inner.get_many(keys, version)
+        self._record(len(found), len(keys) - len(found))
+        return found
+
+    def has_key(self, key, version=None):
+        return self.inner.has_key(key, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.inner.add(key, value, timeout, version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.inner.set(key, value, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.inner.set_many(data, timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.inner.touch(key, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        return self.inner.incr(key, delta, version)
+
+    def decr(self, key, delta=1, version=None):
+        return self.inner.decr(key, delta, version)
+
+    def delete(self, key, version=None):
+        return self.inner.delete(key, version)
+
+    def delete_many(self, keys, version=None):
+        self.inner.delete_many(keys, version)
+
+    def clear(self):
+        self.inner.clear()
+
+    def close(self, **kwargs):
+        self.inner.close(**kwargs)
+
+
+class TieredCache(InstrumentedCache):
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self.local_timeout = self.local_options.get("LOCAL_TIMEOUT", 60)
+        self.local = LocMemCache(
+            f"tiered:{self.name}",
+            {
+                "TIMEOUT": self.local_timeout,
+                "KEY_PREFIX": params.get("KEY_PREFIX", ""),
+                "VERSION": params.get("VERSION", 1),
+                "OPTIONS": {
+                    "MAX_ENTRIES": self.local_options.get("LOCAL_MAX_ENTRIES", 1000)
+                },
+            },
+        )
+
+    def _local_timeout(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    def get(self, key, default=None, version=None):
+        value = self.local.get(key, _MISSING, version)
+        if value is not _MISSING:
+            metrics.record_cache(self.name, 1, 0, local=True)
+            return value
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            return default
+        self.local.set(key, value, self.local_timeout, version)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = self.local.get_many(keys, version)
+        if found:
+            metrics.record_cache(self.name, len(found), 0, local=True)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            fresh = super().get_many(missing, version)
+            if fresh:
+                self.local.set_many(fresh, self.local_timeout, version)
+            found.update(fresh)
+        return found
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = super().add(key, value, timeout, version)
+        if added:
+            self.local.set(key, value, self._local_timeout(timeout), version)
+        return added
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        super().set(key, value, timeout, version)
+        self.local.set(key, value, self._local_timeout(timeout), version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = super().set_many(data, timeout, version)
+        self.local.set_many(
+            {key: value for key, value in data.items() if key not in failed},
+            self._local_timeout(timeout),
+            version,
+        )
+        return failed
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(key, version)
+        return super().incr(key, delta, version)
+
+    def decr(self, key, delta=1, version=None):
+        self.local.delete(key, version)
+        return super().decr(key, delta, version)
+
+    def delete(self, key, version=None):
+        self.local.delete(key, version)
+        return super().delete(key, version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.local.delete_many(keys, version)
+        super().delete_many(keys, version)
+
+    def clear(self):
+        self.local.clear()
+        super().clear()
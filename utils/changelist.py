@@ -0,0 +1,107 @@
+"""
+Списки записей в админке на больших таблицах.
+
+Django для каждой страницы списка выполняет COUNT(*) по отфильтрованному
+запросу и еще один - по всей таблице ("показать все"), а поиск по
+search_fields с полями через __ строит JOIN и icontains по каждой колонке.
+На сотнях тысяч заявок это секунды на каждое открытие.
+
+Здесь:
+- EstimatedCountPaginator: без фильтров число строк берется из статистики
+  СУБД (MySQL - information_schema, PostgreSQL - pg_class), с фильтрами
+  считается не дальше ADMIN_EXACT_COUNT_LIMIT строк;
+- SearchTextAdminMixin: поиск по одной колонке search_text
+  (utils.search_text) вместо icontains по десятку колонок, а поля связанных
+  записей - подзапросами к маленьким справочникам вместо JOIN по заявкам.
+"""
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from utils.search_text import search_terms
+
+
+def estimated_table_rows(model, using="default"):
+    """Оценка числа строк таблицы по статистике СУБД или None"""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table],
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [table],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор списка админки без полного COUNT(*) на больших таблицах.
+    Если оценка не дотягивает до порога, число строк считается точно.
+    """
+
+    @cached_property
+    def count(self):
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+        if query is None:
+            return super().count
+
+        if not query.where:
+            estimate = estimated_table_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > limit:
+                return estimate
+            return super().count
+
+        # С фильтрами - не больше limit + 1 строки: дальше листать все равно не будут
+        return queryset.order_by()[: limit + 1].count()
+
+
+class SearchTextAdminMixin:
+    """
+    Подмешивается к ModelAdmin модели с search_text. Каждое слово запроса
+    ищется в search_text записи или в связанных записях из search_related:
+    {"sender": Counterparty.objects.search, "carrier": ("name",)} - либо
+    функция поиска, либо поля справочника для icontains. Поля справочников
+    сравниваются с нормализованным словом: без учета регистра это делает
+    collation MySQL, в SQLite кириллица ищется только в нижнем регистре.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    search_related = {}
+
+    def get_search_results(self, request, queryset, search_term):
+        terms = search_terms(search_term)
+        if not terms:
+            return queryset, False
+
+        for term in terms:
+            condition = Q(search_text__contains=term)
+            for field, lookup in self.search_related.items():
+                related = queryset.model._meta.get_field(field).related_model
+                if callable(lookup):
+                    matches = lookup(term)
+                else:
+                    names = Q()
+                    for name in lookup:
+                        names |= Q(**{f"{name}__icontains": term})
+                    matches = related._default_manager.filter(names)
+                condition |= Q(**{f"{field}__in": matches.values("pk")})
+            queryset = queryset.filter(condition)
+        return queryset, False
@@ -0,0 +1,474 @@
+"""
+Наборы тестовых данных CRM: пользователи, города, склады, контрагенты,
+перевозчики и заявки. Используется скриптом create_all_test_data.py
+и тестами производительности; объем задается параметром scale.
+"""
+
+from datetime import date, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+USERS = [
+    {
+        "username": "admin",
+        "password": "admin123",
+        "email": "admin@example.com",
+        "first_name": "Администратор",
+        "last_name": "Системы",
+        "role": "admin",
+    },
+    {
+        "username": "logistic",
+        "password": "logistic123",
+        "email": "logistic@example.com",
+        "first_name": "Иван",
+        "last_name": "Логистов",
+        "role": "logistic",
+    },
+    {
+        "username": "operator1",
+        "password": "operator123",
+        "email": "operator1@example.com",
+        "first_name": "Мария",
+        "last_name": "Операторова",
+        "role": "operator",
+        "fulfillment": "Фулфилмент Царицыно",
+    },
+    {
+        "username": "operator2",
+        "password": "operator123",
+        "email": "operator2@example.com",
+        "first_name": "Петр",
+        "last_name": "Заборщиков",
+        "role": "operator",
+        "fulfillment": "Фулфилмент Люберцы",
+    },
+    {
+        "username": "operator3",
+        "password": "operator123",
+        "email": "operator3@example.com",
+        "first_name": "Анна",
+        "last_name": "Диспетчер",
+        "role": "operator",
+        "fulfillment": "Фулфилмент Химки",
+    },
+]
+
+CITIES = [
+    {"name": "Москва", "region": "Московская область"},
+    {"name": "Казань", "region": "Республика Татарстан"},
+    {"name": "Санкт-Петербург", "region": "Ленинградская область"},
+    {"name": "Новосибирск", "region": "Новосибирская область"},
+    {"name": "Екатеринбург", "region": "Свердловская область"},
+    {"name": "Краснодар", "region": "Краснодарский край"},
+    {"name": "Тула", "region": "Тульская область"},
+    {"name": "Владивосток", "region": "Приморский край"},
+]
+
+WAREHOUSES = [
+    {
+        "name": "Склад Электросталь",
+        "code": "MSK-EL",
+        "city": "Москва",
+        "address": "Московская область, г. Электросталь, ул. Промышленная, 1",
+        "phone": "+7 (495) 111-11-11",
+        "email": "electrostal@example.com",
+        "total_area": 5000,
+        "available_area": 3500,
+        "opening_time": time(8, 0),
+        "closing_time": time(20, 0),
+        "working_days": 6,
+    },
+    {
+        "name": "Склад Подольск",
+        "code": "MSK-POD",
+        "city": "Москва",
+        "address": "Московская область, г. Подольск, ул. Заводская, 15",
+        "phone": "+7 (495) 222-22-22",
+        "email": "podolsk@example.com",
+        "total_area": 3000,
+        "available_area": 2000,
+        "opening_time": time(9, 0),
+        "closing_time": time(19, 0),
+        "working_days": 5,
+    },
+    {
+        "name": "Склад Коледино",
+        "code": "MSK-KOL",
+        "city": "Москва",
+        "address": "Московская область, г. Домодедово, промзона Коледино",
+        "phone": "+7 (495) 333-33-33",
+        "email": "koledino@example.com",
+        "total_area": 8000,
+        "available_area": 6000,
+        "opening_time": time(0, 0),
+        "closing_time": time(23, 59),
+        "working_days": 7,
+    },
+    {
+        "name": "Основной склад Казань",
+        "code": "KZN-MAIN",
+        "city": "Казань",
+        "address": "г. Казань, ул. Промышленная, 10",
+        "phone": "+7 (843) 333-33-33",
+        "email": "kazan@example.com",
+        "total_area": 4000,
+        "available_area": 2500,
+        "opening_time": time(9, 0),
+        "closing_time": time(18, 0),
+        "working_days": 6,
+    },
+    {
+        "name": "Склад Санкт-Петербург",
+        "code": "SPB-MAIN",
+        "city": "Санкт-Петербург",
+        "address": "г. Санкт-Петербург, ул. Индустриальная, 5",
+        "phone": "+7 (812) 444-44-44",
+        "email": "spb@example.com",
+        "total_area": 3500,
+        "available_area": 2000,
+        "opening_time": time(8, 0),
+        "closing_time": time(20, 0),
+        "working_days": 5,
+    },
+]
+
+COMPANIES = [
+    "ООО 'Ромашка'",
+    "ИП Иванов",
+    "АО 'СтройМаш'",
+    "ЗАО 'ТехноПром'",
+    "ООО 'ЛогистикГрупп'",
+    "ИП Петров",
+    "АО 'МеталлТрейд'",
+    "ЗАО 'СтройГрад'",
+]
+
+CARRIERS = [
+    {"name": "ТК Деловые Линии", "contact_person": "Соколов Олег", "phone": "+7 (495) 100-00-01"},
+    {"name": "ТК ПЭК", "contact_person": "Орлова Ирина", "phone": "+7 (495) 100-00-02"},
+    {"name": "ТК СДЭК", "contact_person": "Волков Павел", "phone": "+7 (495) 100-00-03"},
+]
+
+PICKUP_ADDRESSES = [
+    "Москва, ул. Тверская, д. 10, офис 25",
+    "Москва, пр-т Мира, д. 15, склад 3",
+    "Казань, ул. Баумана, д. 45, помещение 12",
+    "Санкт-Петербург, Невский пр., д. 100, офис 305",
+    "Екатеринбург, ул. Малышева, д. 50",
+    "Новосибирск, ул. Ленина, д. 30, склад 5",
+    "Краснодар, ул. Красная, д. 150, офис 10",
+    "Тула, пр-т Ленина, д. 80, помещение 4",
+]
+
+DELIVERY_ADDRESSES = [
+    "Москва, ул. Пушкина, д. 20, кв. 45",
+    "Москва, ул. Лермонтова, д. 15, офис 12",
+    "Казань, ул. Габдуллы Тукая, д. 60, кв. 33",
+    "Санкт-Петербург, ул. Садовая, д. 25, офис 8",
+    "Екатеринбург, ул. 8 Марта, д. 70, склад 2",
+    "Новосибирск, ул. Кирова, д. 40, помещение 15",
+    "Краснодар, ул. Северная, д. 300, офис 5",
+    "Тула, ул. Советская, д. 90, кв. 12",
+]
+
+DRIVER_NAMES = [
+    "Иванов Иван Иванович",
+    "Петров Петр Петрович",
+    "Сидоров Алексей Владимирович",
+    "Кузнецов Дмитрий Сергеевич",
+    "Смирнова Анна Михайловна",
+    "Попов Андрей Николаевич",
+    "Лебедев Сергей Алексеевич",
+    "Козлова Екатерина Дмитриевна",
+]
+
+VEHICLES = [
+    "ГАЗель NEXT А123АА777",
+    "Форд Транзит В234ВВ777",
+    "Мерседес Спринтер С345СС777",
+    "Фольксваген Крафтер D456DD777",
+    "Исузу Эльф Е567ЕЕ777",
+    "Пежо Боксер F678FF777",
+    "Рено Мастер G789GG777",
+    "Фиат Дукато H890HH777",
+]
+
+
+def create_users():
+    """Создает пользователей с ролями; возвращает словарь username -> User"""
+    from users.models import UserProfile
+
+    users = {}
+    for user_data in USERS:
+        user, created = User.objects.get_or_create(
+            username=user_data["username"],
+            defaults={
+                "email": user_data["email"],
+                "first_name": user_data["first_name"],
+                "last_name": user_data["last_name"],
+            },
+        )
+        if created:
+            user.set_password(user_data["password"])
+            user.save()
+
+        profile, _ = UserProfile.objects.get_or_create(user=user)
+        profile.role = user_data["role"]
+        profile.fulfillment = user_data.get("fulfillment")
+        profile.save()
+        # Сигнал post_save(User) сохраняет закэшированный user.profile при
+        # каждом user.save() (в том числе при входе) - кэш должен быть актуальным
+        user.profile = profile
+
+        users[user.username] = user
+    return users
+
+
+def create_cities_and_warehouses(manager=None):
+    """Создает города, склады и их графики работы"""
+    from warehouses.models import City, Warehouse, WarehouseSchedule
+
+    cities = {}
+    for city_data in CITIES:
+        city, _ = City.objects.get_or_create(
+            name=city_data["name"], defaults={"region": city_data["region"]}
+        )
+        cities[city.name] = city
+
+    warehouses = {}
+    for wh_data in WAREHOUSES:
+        warehouse, created = Warehouse.objects.get_or_create(
+            code=wh_data["code"],
+            defaults={
+                "city": cities[wh_data["city"]],
+                "manager": manager,
+                "name": wh_data["name"],
+                "address": wh_data["address"],
+                "phone": wh_data["phone"],
+                "email": wh_data["email"],
+                "total_area": wh_data["total_area"],
+                "available_area": wh_data["available_area"],
+                "visible_to_clients": True,
+            },
+        )
+        warehouses[warehouse.code] = warehouse
+
+        if created:
+            WarehouseSchedule.objects.bulk_create(
+                [
+                    WarehouseSchedule(
+                        warehouse=warehouse,
+                        day_of_week=day_num,
+                        is_working=day_num <= wh_data["working_days"],
+                        opening_time=wh_data["opening_time"],
+                        closing_time=wh_data["closing_time"],
+                    )
+                    for day_num in range(1, 8)
+                ]
+            )
+
+    return cities, warehouses
+
+
+def create_counterparties(count, created_by=None):
+    from counterparties.models import Counterparty
+
+    types = [code for code, _ in Counterparty.TYPE_CHOICES]
+    counterparties = []
+    for i in range(count):
+        counterparties.append(
+            Counterparty(
+                type=types[i % len(types)],
+                name=f"{COMPANIES[i % len(COMPANIES)]} #{i + 1}",
+                address=PICKUP_ADDRESSES[i % len(PICKUP_ADDRESSES)],
+                phone=f"+7916{2000000 + i:07d}",
+                email=f"counterparty{i}@example.com",
+                inn=f"{7700000000 + i}",
+                is_customer=True,
+                created_by=created_by,
+            )
+        )
+    return Counterparty.objects.bulk_create(counterparties)
+
+
+def create_carriers():
+    from pickup.models import Carrier
+
+    return [
+        Carrier.objects.get_or_create(name=data["name"], defaults=data)[0]
+        for data in CARRIERS
+    ]
+
+
+def create_delivery_orders(count, operators, logistic, counterparties, warehouses, cities):
+    """Создает заявки на доставку через save() (с номером и QR-кодом)"""
+    from logistic.models import DeliveryOrder
+
+    today = date.today()
+    warehouse_list = list(warehouses.values())
+    city_list = list(cities.values())
+    orders = []
+
+    for i in range(count):
+        operator = operators[i % len(operators)]
+
+        if i % 3 == 0:
+            status = "driver_assigned"
+        elif i % 5 == 0:
+            status = "shipped"
+        elif i % 7 == 0:
+            status = "on_the_way"
+        else:
+            status = "submitted"
+
+        order = DeliveryOrder(
+            shipped_at=today + timedelta(days=i % 14),
+            delivery_date=today + timedelta(days=i % 14 + 1),
+            sender=counterparties[i % len(counterparties)] if counterparties else None,
+            pickup_address=PICKUP_ADDRESSES[i % len(PICKUP_ADDRESSES)],
+            pickup_warehouse=warehouse_list[i % len(warehouse_list)],
+            recipient=(
+                counterparties[(i + 1) % len(counterparties)] if counterparties else None
+            ),
+            delivery_address=DELIVERY_ADDRESSES[i % len(DELIVERY_ADDRESSES)],
+            delivery_warehouse=warehouse_list[(i + 1) % len(warehouse_list)],
+            delivery_city=city_list[i % len(city_list)],
+            logistic=logistic,
+            quantity=(i % 10) + 1,
+            weight=(i % 100) + 50.5,
+            volume=(i % 3) + 0.5,
+            status=status,
+            operator=operator,
+        )
+
+        if status in ("driver_assigned", "on_the_way", "shipped"):
+            order.driver_name = DRIVER_NAMES[i % len(DRIVER_NAMES)]
+            order.driver_phone = f"+7916{1000000 + i * 1000}"
+            order.vehicle = VEHICLES[i % len(VEHICLES)]
+
+        if i % 20 == 0:
+            order.driver_pass_info = (
+                f"Пропуск №{1000 + i}, действует до {today + timedelta(days=365)}"
+            )
+
+        order.save()
+        orders.append(order)
+
+    return orders
+
+
+def create_pickup_orders(
+    count, operators, logistic, counterparties, warehouses, cities, carriers
+):
+    """Создает заявки на забор через save() (с номером и QR-кодом)"""
+    from pickup.models import PickupOrder
+
+    today = date.today()
+    warehouse_list = list(warehouses.values())
+    city_list = list(cities.values())
+    statuses = ["ready", "payment", "in_transit", "accepted"]
+    orders = []
+
+    for i in range(count):
+        operator = operators[i % len(operators)]
+        order = PickupOrder(
+            pickup_date=today + timedelta(days=i % 10),
+            pickup_time_from=time(9 + i % 8, 0),
+            pickup_time_to=time(10 + i % 8, 0),
+            pickup_address=PICKUP_ADDRESSES[i % len(PICKUP_ADDRESSES)],
+            contact_person=f"Контактное лицо {i + 1}",
+            sender=counterparties[i % len(counterparties)] if counterparties else None,
+            recipient=(
+                counterparties[(i + 2) % len(counterparties)] if counterparties else None
+            ),
+            desired_delivery_date=today + timedelta(days=(i % 7) + 2),
+            delivery_address=f"ул. Доставки, д.{i + 1}, кв.{i % 10 + 1}",
+            invoice_number=f"INV-{1000 + i}" if i % 3 == 0 else None,
+            receiving_operator=operator,
+            receiving_warehouse=warehouse_list[i % len(warehouse_list)],
+            delivery_city=city_list[i % len(city_list)],
+            quantity=(i % 8) + 1,
+            weight=(i % 200) + 50.0,
+            volume=(i % 5) + 0.5,
+            cargo_description=f"Тестовый груз #{i + 1}. "
+            + ("Хрупкий груз" if i % 4 == 0 else "Обычный груз"),
+            special_requirements="Требуется бережная перевозка" if i % 4 == 0 else "",
+            status=statuses[i % 2] if i % 5 else statuses[2 + i % 2],
+            operator=operator,
+            logistic=logistic,
+            carrier=carriers[i % len(carriers)] if carriers else None,
+            notes=f"Тестовая заявка #{i + 1}. Создана автоматически.",
+        )
+        order.save()
+        orders.append(order)
+
+    return orders
+
+
+def link_pickups_to_deliveries(count):
+    """Создает доставки для части готовых заявок на забор"""
+    from logistic.models import DeliveryOrder
+    from pickup.models import PickupOrder
+
+    pickups = PickupOrder.objects.filter(
+        status="ready", delivery_order__isnull=True
+    ).select_related("operator")[:count]
+
+    linked = []
+    for pickup in pickups:
+        with transaction.atomic():
+            delivery = DeliveryOrder.objects.create(
+                delivery_date=pickup.desired_delivery_date,
+                pickup_address=pickup.pickup_address,
+                delivery_address=pickup.delivery_address,
+                sender=pickup.sender,
+                recipient=pickup.recipient,
+                quantity=pickup.quantity,
+                weight=pickup.weight,
+                volume=pickup.volume,
+                status="submitted",
+                operator=pickup.operator,
+            )
+            pickup.delivery_order = delivery
+            pickup.save()
+            linked.append((pickup, delivery))
+    return linked
+
+
+def seed(scale=1):
+    """
+    Создает полный набор тестовых данных.
+    scale=1 соответствует исходному скрипту (40 доставок, 25 заборов).
+    """
+    users = create_users()
+    operators = [users[name] for name in ("operator1", "operator2", "operator3")]
+    cities, warehouses = create_cities_and_warehouses(manager=users["admin"])
+    counterparties = create_counterparties(8 * scale, created_by=users["admin"])
+    carriers = create_carriers()
+
+    deliveries = create_delivery_orders(
+        40 * scale, operators, users["logistic"], counterparties, warehouses, cities
+    )
+    pickups = create_pickup_orders(
+        25 * scale,
+        operators,
+        users["logistic"],
+        counterparties,
+        warehouses,
+        cities,
+        carriers,
+    )
+    linked = link_pickups_to_deliveries(5 * scale)
+
+    return {
+        "users": users,
+        "cities": cities,
+        "warehouses": warehouses,
+        "counterparties": counterparties,
+        "carriers": carriers,
+        "deliveries": deliveries,
+        "pickups": pickups,
+        "linked": linked,
+    }
@@ -0,0 +1,126 @@
+"""
+Данные списков заявок в JSON для клиентской таблицы.
+
+Ответ компактный, как у ленты синхронизации: имена колонок один раз и
+строки массивами значений из values() без создания моделей. Страницы
+листаются курсором по паре (поле сортировки, id) без OFFSET, поэтому
+дальние страницы стоят столько же, сколько первая. Пустые значения поля
+сортировки идут в конце в обоих направлениях.
+
+Серверная страница списка сортируется тем же порядком (Grid.order) и
+отдает курсор своей последней строки, так что таблица продолжает листание
+с того места, где остановился шаблон.
+"""
+
+import base64
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+
+SORT_VALUE = "grid_sort_value"
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(value, pk):
+    raw = json.dumps([value, pk], cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        value, pk = json.loads(raw)
+        pk = int(pk)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise CursorError("Некорректный курсор")
+    if isinstance(value, (list, dict)):
+        raise CursorError("Некорректный курсор")
+    return value, pk
+
+
+class Grid:
+    """
+    columns - имена колонок ответа, values - поля для values(),
+    row(values) - строка ответа из словаря values, sorts - допустимые
+    сортировки {ключ из запроса: поле модели}.
+    """
+
+    def __init__(self, columns, values, row, sorts, default_sort):
+        self.columns = columns
+        self.values = values
+        self.row = row
+        self.sorts = sorts
+        self.default_sort = default_sort
+
+    def sorting(self, params):
+        """(ключ сортировки, по убыванию) из параметров sort и order"""
+        sort = params.get("sort")
+        if sort not in self.sorts:
+            sort = self.default_sort
+        return sort, params.get("order", "desc") != "asc"
+
+    def order(self, queryset, params):
+        """queryset в порядке таблицы со значением поля сортировки в SORT_VALUE"""
+        sort, descending = self.sorting(params)
+        field = F(self.sorts[sort])
+        if descending:
+            ordering = [field.desc(nulls_last=True), "-pk"]
+        else:
+            ordering = [field.asc(nulls_last=True), "pk"]
+        return queryset.annotate(**{SORT_VALUE: field}).order_by(*ordering)
+
+    @staticmethod
+    def cursor_after(obj):
+        """Курсор страницы, следующей за объектом из order()"""
+        return encode_cursor(getattr(obj, SORT_VALUE), obj.pk)
+
+    def page(self, queryset, params):
+        """Страница queryset по параметрам запроса sort, order, cursor, limit"""
+        sort, descending = self.sorting(params)
+
+        try:
+            limit = int(params.get("limit") or settings.GRID_PAGE_SIZE)
+        except ValueError:
+            raise CursorError("Некорректный limit")
+        limit = max(1, min(limit, settings.GRID_MAX_PAGE_SIZE))
+
+        queryset = self.order(queryset, params)
+        cursor = params.get("cursor")
+        if cursor:
+            queryset = queryset.filter(
+                self._after(self.sorts[sort], descending, *decode_cursor(cursor))
+            )
+
+        items = list(queryset.values("id", SORT_VALUE, *self.values)[: limit + 1])
+        has_more = len(items) > limit
+        items = items[:limit]
+
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor(items[-1][SORT_VALUE], items[-1]["id"])
+
+        return {
+            "fields": self.columns,
+            "rows": [self.row(item) for item in items],
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+            "sort": sort,
+            "order": "desc" if descending else "asc",
+        }
+
+    @staticmethod
+    def _after(field, descending, value, pk):
+        """Условие "после строки (value, pk)" в порядке сортировки"""
+        op = "lt" if descending else "gt"
+        if value is None:
+            return Q(**{f"{field}__isnull": True, f"pk__{op}": pk})
+        return (
+            Q(**{f"{field}__{op}": value})
+            | Q(**{field: value, f"pk__{op}": pk})
+            | Q(**{f"{field}__isnull": True})
+        )
@@ -0,0 +1,434 @@
+"""
+Быстрое inline-редактирование полей заявок из таблиц списков.
+
+Записывается только измененный столбец (save(update_fields=...)), связанные
+объекты не загружаются из БД: их существование и отображаемые значения берутся
+из кэша справочников, который сбрасывается сигналами при изменении записи
+(только с общим кэшем CACHE_SHARED: сброс в locmem одного воркера не виден
+другим, поэтому без него справочники читаются из БД).
+Несколько правок одного клиента применяются одним запросом в одной транзакции.
+Значения проверяются валидаторами полей модели (clean_fields: длина, выбор,
+пустые значения) до записи; ошибки проверки и БД возвращаются в JSON, как и
+прочие ошибки правки.
+"""
+
+import json
+import logging
+from contextlib import nullcontext
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import JsonResponse
+
+from counterparties.models import Counterparty
+from pickup.models import Carrier
+from warehouses.models import City, Warehouse
+
+logger = logging.getLogger(__name__)
+
+class InlineEditError(Exception):
+    """Ошибка правки, текст показывается пользователю"""
+
+
+# --- Кэш справочников для связанных полей ---
+
+def _user_info(user):
+    return {
+        "username": user.username,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+    }
+
+
+def _warehouse_info(warehouse):
+    return {
+        "name": warehouse.name,
+        "address": warehouse.address,
+        "city": warehouse.city.name if warehouse.city_id else "",
+    }
+
+
+def _carrier_info(carrier):
+    return {"name": carrier.name, "contact_person": carrier.contact_person or ""}
+
+
+# Вид справочника -> (queryset, функция сборки данных для отображения)
+LOOKUPS = {
+    "user": (lambda: User.objects.all(), _user_info),
+    "counterparty": (lambda: Counterparty.objects.all(), lambda c: {"name": c.name}),
+    "warehouse": (lambda: Warehouse.objects.select_related("city"), _warehouse_info),
+    "city": (lambda: City.objects.all(), lambda c: {"name": c.name}),
+    "carrier": (lambda: Carrier.objects.all(), _carrier_info),
+}
+
+
+def _cache_key(kind, pk):
+    return f"inline_lookup:{kind}:{pk}"
+
+
+def get_lookups(kind, ids):
+    """
+    Данные для отображения записей справочника по id.
+    Отсутствующие в кэше записи читаются одним запросом; несуществующих id
+    в результате нет.
+    """
+    ids = {int(pk) for pk in ids}
+    queryset, build = LOOKUPS[kind]
+    if not settings.CACHE_SHARED:
+        return {obj.pk: build(obj) for obj in queryset().filter(pk__in=ids)}
+
+    keys = {_cache_key(kind, pk): pk for pk in ids}
+    found = {keys[key]: info for key, info in cache.get_many(keys).items()}
+
+    missing = ids - set(found)
+    if missing:
+        fresh = {obj.pk: build(obj) for obj in queryset().filter(pk__in=missing)}
+        cache.set_many(
+            {_cache_key(kind, pk): info for pk, info in fresh.items()},
+            settings.INLINE_EDIT_LOOKUP_TTL,
+        )
+        found.update(fresh)
+
+    return found
+
+
+def _connect_invalidation(kind, model):
+    def invalidate(sender, instance, **kwargs):
+        cache.delete(_cache_key(kind, instance.pk))
+
+    uid = f"inline_lookup_{kind}"
+    post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+
+
+for _kind, _model in [
+    ("user", User),
+    ("counterparty", Counterparty),
+    ("warehouse", Warehouse),
+    ("city", City),
+    ("carrier", Carrier),
+]:
+    _connect_invalidation(_kind, _model)
+
+
+def _invalidate_city_warehouses(sender, instance, **kwargs):
+    # В данных склада есть название города
+    cache.delete_many(
+        [
+            _cache_key("warehouse", pk)
+            for pk in Warehouse.objects.filter(city_id=instance.pk).values_list(
+                "pk", flat=True
+            )
+        ]
+    )
+
+
+post_save.connect(
+    _invalidate_city_warehouses, sender=City, dispatch_uid="inline_lookup_city_warehouses"
+)
+# Склады удаленного города удаляются каскадом, их записи сбрасывает сигнал склада
+
+
+# --- Типы полей ---
+
+class Field:
+    """Текстовое поле; базовый класс для остальных типов"""
+
+    def __init__(self, display=None, permission=None, permission_error=None):
+        self.display_func = display
+        self.permission = permission
+        self.permission_error = permission_error or "Нет прав на изменение этого поля"
+
+    def parse(self, value, model_field):
+        if value in (None, ""):
+            return None if model_field.null else ""
+        return str(value)
+
+    def assign(self, order, name, value):
+        setattr(order, name, value)
+
+    def display(self, order, name, value, info=None):
+        if self.display_func:
+            return self.display_func(order, value, info)
+        return "" if value is None else str(value)
+
+
+class IntegerField(Field):
+    def __init__(self, empty=None, **kwargs):
+        super().__init__(**kwargs)
+        self.empty = empty
+
+    def parse(self, value, model_field):
+        if value in (None, "") and self.empty is not None:
+            return self.empty
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise InlineEditError("Неверное число")
+
+
+class FloatField(Field):
+    def parse(self, value, model_field):
+        if value in (None, ""):
+            return None if model_field.null else 0.0
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise InlineEditError("Неверное число")
+
+
+class DateField(Field):
+    def parse(self, value, model_field):
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            raise InlineEditError("Неверный формат даты")
+
+    def display(self, order, name, value, info=None):
+        if self.display_func:
+            return self.display_func(order, value, info)
+        return value.strftime("%d.%m.%Y") if value else ""
+
+
+class TimeField(Field):
+    def parse(self, value, model_field):
+        if not value or not str(value).strip():
+            return None
+        try:
+            return datetime.strptime(value, "%H:%M").time()
+        except (TypeError, ValueError):
+            raise InlineEditError("Неверный формат времени")
+
+
+class ChoiceField(Field):
+    def parse(self, value, model_field):
+        if value not in dict(model_field.choices):
+            raise InlineEditError("Недопустимое значение")
+        return value
+
+    def display(self, order, name, value, info=None):
+        return getattr(order, f"get_{name}_display")()
+
+
+class RelatedField(Field):
+    """
+    Внешний ключ: записывается только <field>_id, существование записи и
+    отображаемое значение берутся из кэша справочника kind.
+    """
+
+    def __init__(self, kind, not_found, **kwargs):
+        super().__init__(**kwargs)
+        self.kind = kind
+        self.not_found = not_found
+
+    def parse(self, value, model_field):
+        if value in (None, ""):
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise InlineEditError(self.not_found)
+
+    def assign(self, order, name, value):
+        setattr(order, f"{name}_id", value)
+
+    def display(self, order, name, value, info=None):
+        return self.display_func(order, value, info) if self.display_func else ""
+
+
+# --- Редактор ---
+
+class InlineEditor:
+    """
+    Применяет правки вида {"id", "field", "value"} к заявкам модели model.
+    fields - словарь имя поля -> тип поля; can_edit(roles, order) проверяет
+    право на редактирование заявки по request.roles.
+    """
+
+    def __init__(self, model, fields, can_edit):
+        self.model = model
+        self.fields = fields
+        self.can_edit = can_edit
+        self.model_field_names = {f.name for f in model._meta.concrete_fields}
+
+    def _parse(self, edit):
+        name = edit.get("field")
+        field = self.fields.get(name)
+        if field is None:
+            raise InlineEditError("Поле не доступно для редактирования")
+        model_field = self.model._meta.get_field(name)
+        return name, field, field.parse(edit.get("value"), model_field)
+
+    def apply(self, roles, edits):
+        """
+        Проверяет все правки и, если ошибок нет, сохраняет их в одной транзакции.
+        Возвращает (results, errors): results - [{"id", "field", "display_value"}],
+        errors - [{"id", "field", "error"}]; при ошибках ничего не записывается.
+        """
+        errors = []
+        orders = self.model.objects.in_bulk(
+            {pk for pk in (_as_int(edit.get("id")) for edit in edits) if pk is not None}
+        )
+        parsed = []
+        lookup_ids = {}
+        for edit in edits:
+            order = orders.get(_as_int(edit.get("id")))
+            if order is None:
+                errors.append(
+                    _error(edit.get("id"), edit.get("field"), "Заявка не найдена")
+                )
+                continue
+
+            try:
+                if not self.can_edit(roles, order):
+                    raise InlineEditError("Нет прав на редактирование")
+                name, field, value = self._parse(edit)
+                if field.permission and not field.permission(roles):
+                    raise InlineEditError(field.permission_error)
+            except InlineEditError as e:
+                errors.append(_error(order.pk, edit.get("field"), str(e)))
+                continue
+
+            parsed.append((order, name, field, value))
+            if isinstance(field, RelatedField) and value is not None:
+                lookup_ids.setdefault(field.kind, set()).add(value)
+
+        lookups = {
+            kind: get_lookups(kind, kind_ids) for kind, kind_ids in lookup_ids.items()
+        }
+        for order, name, field, value in parsed:
+            if (
+                isinstance(field, RelatedField)
+                and value is not None
+                and value not in lookups[field.kind]
+            ):
+                errors.append(_error(order.pk, name, field.not_found))
+
+        if errors:
+            return [], errors
+
+        changed = {}
+        for order, name, field, value in parsed:
+            field.assign(order, name, value)
+            changed.setdefault(order.pk, (order, set()))[1].add(name)
+
+        for order, names in changed.values():
+            errors.extend(self._validate(order, names))
+        if errors:
+            return [], errors
+
+        # Одна заявка сохраняется одним UPDATE, без точек сохранения
+        try:
+            with transaction.atomic() if len(changed) > 1 else nullcontext():
+                for order, names in changed.values():
+                    update_fields = {
+                        f"{name}_id" if isinstance(self.fields[name], RelatedField) else name
+                        for name in names
+                    }
+                    if "updated_at" in self.model_field_names:
+                        update_fields.add("updated_at")
+                    # Автор смены статуса для истории статусов
+                    order.status_changed_by_id = roles.user_id
+                    order.save(update_fields=sorted(update_fields))
+        except DatabaseError as e:
+            logger.exception("Ошибка сохранения inline-правок: %s", e)
+            return [], [
+                _error(order.pk, name, "Не удалось сохранить изменения")
+                for order, name, field, value in parsed
+            ]
+
+        results = []
+        for order, name, field, value in parsed:
+            info = lookups.get(getattr(field, "kind", None), {}).get(value)
+            results.append(
+                {
+                    "id": order.pk,
+                    "field": name,
+                    "display_value": field.display(order, name, value, info),
+                }
+            )
+        return results, []
+
+    def _validate(self, order, names):
+        """
+        Проверяет измененные поля заявки валидаторами модели. Внешние ключи
+        уже проверены по кэшу справочников и повторно не запрашиваются.
+        """
+        exclude = {
+            field.name
+            for field in self.model._meta.concrete_fields
+            if field.name not in names
+            or isinstance(self.fields.get(field.name), RelatedField)
+        }
+        try:
+            order.clean_fields(exclude=exclude)
+        except ValidationError as e:
+            return [
+                _error(order.pk, name, " ".join(messages))
+                for name, messages in e.message_dict.items()
+            ]
+        return []
+
+    def single_field_view(self, request, pk):
+        """Ответ в формате прежнего эндпоинта одного поля"""
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({"success": False, "error": "Неверный формат запроса"})
+
+        edit = {"id": pk, "field": data.get("field"), "value": data.get("value")}
+        try:
+            results, errors = self.apply(request.roles, [edit])
+        except Exception as e:
+            logger.exception("Ошибка inline-правки заявки #%s: %s", pk, e)
+            return JsonResponse({"success": False, "error": "Ошибка сервера"})
+        if errors:
+            return JsonResponse({"success": False, "error": errors[0]["error"]})
+        return JsonResponse(
+            {"success": True, "display_value": results[0]["display_value"]}
+        )
+
+    def batch_view(self, request):
+        """Пакет правок {"edits": [{"id", "field", "value"}, ...]}"""
+        try:
+            edits = json.loads(request.body).get("edits")
+        except (ValueError, AttributeError):
+            edits = None
+        if (
+            not isinstance(edits, list)
+            or not edits
+            or not all(isinstance(edit, dict) for edit in edits)
+        ):
+            return JsonResponse({"success": False, "error": "Нет правок"})
+        limit = settings.INLINE_EDIT_MAX_BATCH
+        if len(edits) > limit:
+            return JsonResponse(
+                {"success": False, "error": f"Не более {limit} правок за запрос"}
+            )
+
+        try:
+            results, errors = self.apply(request.roles, edits)
+        except Exception as e:
+            logger.exception("Ошибка пакета inline-правок: %s", e)
+            return JsonResponse({"success": False, "error": "Ошибка сервера"})
+        return JsonResponse(
+            {"success": not errors, "results": results, "errors": errors}
+        )
+
+
+def _error(order_id, field, message):
+    return {"id": order_id, "field": field, "error": message}
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
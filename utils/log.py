@@ -0,0 +1,117 @@
+"""
+Логирование проекта (LOGGING в settings).
+
+Записи из кода запроса не пишутся в stdout напрямую: QueueHandler кладет
+их в очередь и сразу возвращает управление, вывод делает отдельный поток
+(QueueListener). При переполнении очереди записи отбрасываются - запрос
+не ждет сборщик логов. JsonFormatter выводит запись одной строкой JSON с
+временем, задержкой в очереди и полями из extra (duration_ms и т.п.).
+
+Логгеры - по модулям (logging.getLogger(__name__)), уровни задаются на
+приложения в LOGGING; выключенный уровень (DEBUG в продакшене) отсекается
+проверкой isEnabledFor без форматирования сообщения.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from datetime import datetime, timezone
+
+# Атрибуты LogRecord; все остальные пришли из extra и выводятся как поля
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+            # Сколько запись ждала в очереди до вывода
+            "lag_ms": round((time.time() - record.created) * 1000, 1),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """
+    Неблокирующий обработчик: очередь на queue_size записей и поток вывода
+    в stream (по умолчанию stderr). Форматтер из LOGGING применяется в
+    потоке вывода.
+    """
+
+    def __init__(self, stream=None, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self.listener = logging.handlers.QueueListener(self.queue, self.target)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Сообщение собирается сразу: аргументы могут измениться до вывода
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Дописывает оставшиеся записи и останавливает поток вывода"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.target.flush()
+
+    def close(self):
+        self.stop()
+        super().close()
+
+
+def log_startup():
+    """Режим, БД, адрес сайта и почта - одной записью при старте процесса"""
+    from django.conf import settings
+
+    logger = logging.getLogger("crm_logistic.settings")
+    database = settings.DATABASES["default"]
+    logger.info(
+        "Загружены %s настройки: БД %s (%s), SITE_URL %s, email %s",
+        "продакшен" if settings.IS_PRODUCTION else "разработочные",
+        database["ENGINE"].rsplit(".", 1)[-1],
+        database["NAME"],
+        settings.SITE_URL,
+        settings.EMAIL_BACKEND.rsplit(".", 2)[-2],
+    )
+    if settings.IS_PRODUCTION:
+        missing = [var for var in settings.REQUIRED_ENV_VARS if not os.getenv(var)]
+        if missing:
+            logger.warning("Отсутствуют переменные окружения: %s", missing)
@@ -0,0 +1,470 @@
+"""
+Массовый импорт заявок из CSV/XLSX.
+
+Файл читается потоково (csv построчно, openpyxl в режиме read_only), строки
+проверяются пакетами по ORDER_IMPORT_CHUNK_SIZE. Контрагенты, склады и
+города сопоставляются через словари, заполняемые одним запросом на пакет
+(контрагенты) или на весь импорт (склады, города). Корректные строки пакета
+вставляются одним bulk_create с заранее выделенными сквозными номерами,
+QR-коды создаются в фоне после коммита. Ошибки возвращаются по строкам.
+
+Описание колонок задается в представлениях (см. DELIVERY_IMPORT в
+logistic/views.py), заголовки колонок - verbose_name или имя поля модели.
+"""
+
+import csv
+import io
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import HttpResponse
+from django.shortcuts import render
+
+from counterparties.models import Counterparty
+from utils.background import submit_on_commit
+from utils.qr_utils import generate_missing_qr_codes
+from utils.status_history import record_created
+from warehouses.models import City, Warehouse
+
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d.%m.%y", "%d/%m/%Y")
+
+# Поля, которые импорт заполняет сам и не проверяет через clean_fields
+SKIP_VALIDATION = ("id", "tracking_number", "qr_code", "created_at", "updated_at")
+
+
+class ImportFileError(Exception):
+    """Файл нельзя прочитать целиком (формат, заголовок, размер)"""
+
+
+# --- Чтение файла ---
+
+
+def _xlsx_rows(uploaded):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(uploaded, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _csv_encoding(raw):
+    sample = raw.read(64 * 1024)
+    raw.seek(0)
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # Обрезанный многобайтовый символ в конце образца - не повод менять кодировку
+        if e.start < len(sample) - 3:
+            return "cp1251"
+    return "utf-8-sig"
+
+
+def _csv_rows(uploaded):
+    raw = uploaded.file if hasattr(uploaded, "file") else uploaded
+    text = io.TextIOWrapper(raw, encoding=_csv_encoding(raw), newline="")
+    try:
+        sample = text.read(16 * 1024)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=";,\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(text, dialect)
+    finally:
+        text.detach()
+
+
+def iter_rows(uploaded):
+    """Строки файла кортежами значений (первая - заголовок)"""
+    name = (getattr(uploaded, "name", "") or "").lower()
+    if name.endswith(".xlsx"):
+        return _xlsx_rows(uploaded)
+    if name.endswith(".csv"):
+        return _csv_rows(uploaded)
+    raise ImportFileError("Поддерживаются файлы .csv и .xlsx")
+
+
+# --- Разбор значений ---
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def parse_text(value, lookups):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def parse_int(value, lookups):
+    if isinstance(value, (int, float)):
+        if float(value).is_integer():
+            return int(value)
+        raise ValueError("ожидается целое число")
+    try:
+        return int(str(value).strip().replace(" ", ""))
+    except ValueError:
+        raise ValueError("ожидается целое число")
+
+
+def parse_float(value, lookups):
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip().replace(" ", "").replace(",", "."))
+    except ValueError:
+        raise ValueError("ожидается число")
+
+
+def parse_date(value, lookups):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError("ожидается дата в формате ДД.ММ.ГГГГ")
+
+
+def parse_counterparty(value, lookups):
+    return lookups.counterparty(parse_text(value, lookups))
+
+
+def parse_warehouse(value, lookups):
+    return lookups.warehouse(parse_text(value, lookups))
+
+
+def parse_city(value, lookups):
+    return lookups.city(parse_text(value, lookups))
+
+
+class ReferenceLookups:
+    """
+    Сопоставление значений ячеек со справочниками на время одного импорта.
+    Склады и города загружаются целиком, контрагенты - по ключам пакета.
+    """
+
+    def __init__(self):
+        self.cities = {
+            name.lower(): pk for pk, name in City.objects.values_list("pk", "name")
+        }
+        self.warehouses = {}
+        for pk, code, name in Warehouse.objects.values_list("pk", "code", "name"):
+            self.warehouses.setdefault(name.lower(), pk)
+            self.warehouses[code.lower()] = pk
+        self.counterparties = {}
+
+    def prefetch_counterparties(self, keys):
+        """Один запрос на все еще не известные ключи (ИНН или наименование)"""
+        missing = {key for key in keys if key and key not in self.counterparties}
+        if not missing:
+            return
+        found = (
+            Counterparty.objects.filter(Q(inn__in=missing) | Q(name__in=missing))
+            .order_by("-is_active", "pk")
+            .values_list("pk", "inn", "name")
+        )
+        for pk, inn, name in found:
+            for key in (inn, name):
+                if key in missing:
+                    self.counterparties.setdefault(key, pk)
+        for key in missing:
+            self.counterparties.setdefault(key, None)
+
+    def counterparty(self, key):
+        if key not in self.counterparties:
+            self.prefetch_counterparties([key])
+        pk = self.counterparties[key]
+        if pk is None:
+            raise ValueError(f"контрагент «{key}» не найден (ИНН или наименование)")
+        return pk
+
+    def warehouse(self, key):
+        pk = self.warehouses.get(key.lower())
+        if pk is None:
+            raise ValueError(f"склад «{key}» не найден (код или название)")
+        return pk
+
+    def city(self, key):
+        pk = self.cities.get(key.lower())
+        if pk is None:
+            raise ValueError(f"город «{key}» не найден")
+        return pk
+
+
+# --- Описание импорта ---
+
+
+class Column:
+    """
+    Колонка файла: field - поле модели (для связей - attname вида sender_id),
+    parse(value, lookups) - разбор непустой ячейки.
+    """
+
+    def __init__(self, field, parse=parse_text, headers=()):
+        self.field = field
+        self.parse = parse
+        self.headers = tuple(headers)
+
+
+class ImportSpec:
+    """
+    Набор колонок для модели заявки. defaults(user) - значения, которые
+    ставятся всем созданным заявкам (оператор, статус).
+    """
+
+    def __init__(self, model, columns, defaults=None):
+        self.model = model
+        self.columns = columns
+        self.defaults = defaults or (lambda user: {})
+        self.exclude = [
+            f.name
+            for f in model._meta.concrete_fields
+            if f.is_relation or f.name in SKIP_VALIDATION
+        ]
+
+    def model_field(self, column):
+        return self.model._meta.get_field(column.field.removesuffix("_id"))
+
+    def label(self, column):
+        return str(self.model_field(column).verbose_name)
+
+    def column_headers(self, column):
+        field = self.model_field(column)
+        return {
+            header.strip().lower()
+            for header in (field.name, str(field.verbose_name), *column.headers)
+        }
+
+    def header_names(self):
+        """Заголовки для шаблона файла"""
+        return [self.label(column) for column in self.columns]
+
+    def template_response(self, filename):
+        """Пустой CSV с заголовками колонок (разделитель ;)"""
+        response = HttpResponse(content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response.write("\ufeff")
+        csv.writer(response, delimiter=";").writerow(self.header_names())
+        return response
+
+    def view(self, request, title, list_url, template_filename):
+        """
+        GET - форма загрузки (?template=1 - шаблон файла),
+        POST - импорт файла из поля file и отчет по строкам
+        """
+        if request.method == "GET" and request.GET.get("template"):
+            return self.template_response(template_filename)
+
+        context = {
+            "title": title,
+            "list_url": list_url,
+            "headers": self.header_names(),
+            "max_rows": settings.ORDER_IMPORT_MAX_ROWS,
+        }
+        if request.method == "POST":
+            uploaded = request.FILES.get("file")
+            if not uploaded:
+                context["error"] = "Выберите файл для загрузки"
+            else:
+                importer = OrderImporter(self, request.user)
+                try:
+                    context["result"] = importer.run(uploaded)
+                except ImportFileError as e:
+                    context["error"] = str(e)
+                    context["result"] = importer.result
+        return render(request, "order_import.html", context)
+
+    def map_header(self, header_row):
+        """Индекс ячейки для каждой колонки, найденной в заголовке"""
+        positions = {
+            str(cell).strip().lower(): index
+            for index, cell in enumerate(header_row)
+            if not _is_empty(cell)
+        }
+        mapping = []
+        for column in self.columns:
+            for header in self.column_headers(column):
+                if header in positions:
+                    mapping.append((column, positions[header]))
+                    break
+        if not mapping:
+            raise ImportFileError(
+                "В первой строке не найдено ни одного известного заголовка колонки"
+            )
+        return mapping
+
+
+class ImportResult:
+    def __init__(self):
+        self.total = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, row_number, message):
+        self.error_count += 1
+        if len(self.errors) < settings.ORDER_IMPORT_MAX_ERRORS:
+            self.errors.append((row_number, message))
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "created": self.created,
+            "error_count": self.error_count,
+            "errors": [
+                {"row": row, "message": message} for row, message in self.errors
+            ],
+        }
+
+
+class OrderImporter:
+    def __init__(self, spec, user):
+        self.spec = spec
+        self.user = user
+        self.result = ImportResult()
+        self.lookups = ReferenceLookups()
+
+    def run(self, uploaded):
+        rows = iter_rows(uploaded)
+        try:
+            header = next(rows)
+        except StopIteration:
+            raise ImportFileError("Файл пуст")
+        except Exception as e:
+            raise ImportFileError(f"Не удалось прочитать файл: {e}")
+        mapping = self.spec.map_header(header)
+
+        chunk = []
+        row_number = 1
+        while True:
+            try:
+                row = next(rows)
+            except StopIteration:
+                break
+            except Exception as e:
+                # Ошибка чтения посреди файла (кодировка, поврежденный XLSX):
+                # прочитанные строки загружаются, остальные пропускаются
+                if chunk:
+                    self.import_chunk(chunk, mapping)
+                raise ImportFileError(
+                    f"Не удалось прочитать файл после строки {row_number}: {e}. "
+                    f"Загружено заявок - {self.result.created}, остальные пропущены"
+                )
+            row_number += 1
+            if all(_is_empty(value) for value in row):
+                continue
+            self.result.total += 1
+            if self.result.total > settings.ORDER_IMPORT_MAX_ROWS:
+                self.result.total -= 1
+                if chunk:
+                    self.import_chunk(chunk, mapping)
+                raise ImportFileError(
+                    f"В файле больше {settings.ORDER_IMPORT_MAX_ROWS} строк: "
+                    f"загружено заявок - {self.result.created}, остальные пропущены"
+                )
+            chunk.append((row_number, row))
+            if len(chunk) >= settings.ORDER_IMPORT_CHUNK_SIZE:
+                self.import_chunk(chunk, mapping)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk, mapping)
+        return self.result
+
+    def prefetch(self, chunk, mapping):
+        keys = set()
+        for column, index in mapping:
+            if column.parse is parse_counterparty:
+                for _, row in chunk:
+                    if index < len(row) and not _is_empty(row[index]):
+                        keys.add(parse_text(row[index], self.lookups))
+        self.lookups.prefetch_counterparties(keys)
+
+    def build(self, row, mapping, defaults):
+        """Заявка из строки или ValidationError со списком ошибок"""
+        order = self.spec.model(**defaults)
+        errors = []
+        failed = []
+        for column, index in mapping:
+            value = row[index] if index < len(row) else None
+            if _is_empty(value):
+                continue
+            try:
+                setattr(order, column.field, column.parse(value, self.lookups))
+            except ValueError as e:
+                errors.append(f"{self.spec.label(column)}: {e}")
+                failed.append(self.spec.model_field(column).name)
+        try:
+            order.clean_fields(exclude=self.spec.exclude + failed)
+        except ValidationError as e:
+            for field, messages in e.message_dict.items():
+                verbose = self.spec.model._meta.get_field(field).verbose_name
+                errors.extend(f"{verbose}: {message}" for message in messages)
+        if errors:
+            raise ValidationError(errors)
+        return order
+
+    def import_chunk(self, chunk, mapping):
+        self.prefetch(chunk, mapping)
+        defaults = self.spec.defaults(self.user)
+
+        orders = []
+        for row_number, row in chunk:
+            try:
+                orders.append(self.build(row, mapping, defaults))
+            except ValidationError as e:
+                self.result.add_error(row_number, "; ".join(e.messages))
+        if not orders:
+            return
+
+        model = self.spec.model
+        # Номера выделяются по последнему сохраненному: если параллельное
+        # создание заявок заняло их раньше, пакет вставляется еще раз
+        for attempt in range(2):
+            try:
+                self.insert(orders)
+                break
+            except IntegrityError as e:
+                numbers = [order.tracking_number for order in orders]
+                if model.objects.filter(tracking_number__in=numbers).exists():
+                    if attempt == 0:
+                        continue
+                    cause = "сквозные номера заняты параллельно созданными заявками"
+                else:
+                    cause = f"ошибка базы данных: {e}"
+                self.result.add_error(
+                    chunk[0][0],
+                    f"Строки {chunk[0][0]}-{chunk[-1][0]} не загружены: {cause}",
+                )
+                return
+        self.result.created += len(orders)
+
+    def insert(self, orders):
+        """Вставка пакета с новыми сквозными номерами одной транзакцией"""
+        model = self.spec.model
+        with transaction.atomic():
+            numbers = model.allocate_tracking_numbers(len(orders))
+            for order, number in zip(orders, numbers):
+                order.pk = None
+                order.tracking_number = number
+            model.objects.bulk_create(orders)
+            # id по номерам: MySQL не возвращает их из bulk_create
+            ids = dict(
+                model.objects.filter(tracking_number__in=numbers).values_list(
+                    "tracking_number", "pk"
+                )
+            )
+            for order in orders:
+                order.pk = ids[order.tracking_number]
+            record_created(orders, changed_by=self.user)
+            submit_on_commit(generate_missing_qr_codes, model, list(ids.values()))
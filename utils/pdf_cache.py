@@ -0,0 +1,111 @@
+"""
+HTTP-кэширование PDF заявок.
+
+Версия документа - строка заявки (updated_at, файл QR-кода) и данные
+пользователей, имена которых печатаются в PDF: с общим кэшем (CACHE_SHARED)
+это версии справочников из reference_cache, иначе - имена логиста и
+оператора из БД (версии в locmem у каждого воркера свои). Из версии
+строится ETag: повторный запрос с If-None-Match или If-Modified-Since
+получает 304 без генерации, а готовые байты хранятся в кэше renders под
+ключом с ETag, поэтому повторное сканирование одной и той же заявки не
+запускает WeasyPrint. После изменения заявки ETag меняется, старая запись
+истекает сама.
+
+PDF открываются по QR-коду без входа (проверка роли есть только у
+операторов), и содержимое не зависит от пользователя, поэтому ответ
+помечается как public: его могут хранить и общие прокси, а браузер и
+прокси перепроверяют его по ETag.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from users.models import UserProfile
+from utils.reference_cache import versions_stamp
+
+# Поля заявки, достаточные для проверки доступа и построения ETag
+VERSION_FIELDS = (
+    "id",
+    "tracking_number",
+    "operator_id",
+    "logistic_id",
+    "qr_code",
+    "updated_at",
+)
+
+# Увеличить при изменении шаблонов PDF, чтобы сбросить кэш
+PDF_TEMPLATE_VERSION = 1
+
+
+def _users_stamp(order):
+    """Версия данных логиста и оператора заявки, печатаемых в PDF"""
+    if settings.CACHE_SHARED:
+        return versions_stamp((User, UserProfile))
+    user_ids = {order.operator_id, order.logistic_id} - {None}
+    if not user_ids:
+        return ""
+    users = User.objects.filter(pk__in=user_ids).order_by("pk")
+    return list(users.values_list("pk", "username", "first_name", "last_name"))
+
+
+def order_version(order, extra=()):
+    """Хеш версии PDF заявки"""
+    parts = [
+        order._meta.label_lower,
+        order.pk,
+        order.updated_at.isoformat(),
+        order.qr_code.name if order.qr_code else "",
+        _users_stamp(order),
+        PDF_TEMPLATE_VERSION,
+        *extra,
+    ]
+    return hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+
+
+def _add_cache_headers(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=settings.ORDER_PDF_MAX_AGE,
+        must_revalidate=True,
+    )
+    return response
+
+
+def order_pdf_response(request, order, render, filename, extra_version=()):
+    """
+    Ответ с PDF заявки order (загруженной с полями VERSION_FIELDS).
+    render() вызывается только при промахе кэша и возвращает байты PDF
+    или None при ошибке - тогда и функция возвращает None.
+    """
+    version = order_version(order, extra_version)
+    etag = quote_etag(version)
+    last_modified = order.updated_at
+
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp())
+    )
+    if not_modified is not None:
+        return _add_cache_headers(not_modified, etag, last_modified)
+
+    cache_key = f"order_pdf:{version}"
+    renders = caches["renders"]
+    pdf = renders.get(cache_key)
+    if pdf is None:
+        pdf = render()
+        if not pdf:
+            return None
+        if len(pdf) <= settings.ORDER_PDF_CACHE_MAX_BYTES:
+            renders.set(cache_key, pdf, settings.ORDER_PDF_CACHE_TTL)
+
+    response = HttpResponse(pdf, content_type="application/pdf")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return _add_cache_headers(response, etag, last_modified)
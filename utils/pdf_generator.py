@@ -1,14 +1,19 @@
 import base64
+import logging
+import time
 from django.template.loader import render_to_string
-from django.conf import settings
-from weasyprint import HTML, CSS
 from datetime import datetime
-import os
+
+from monitoring.metrics import track_render
+from utils.pdf_render import local_url_fetcher, render_context
+
+logger = logging.getLogger(__name__)
 
 
 def generate_pdf_from_template(template_name, context, css_string=None):
     """
-    Универсальная функция для генерации PDF из HTML-шаблона
+    Универсальная функция для генерации PDF из HTML-шаблона.
+    Стили и шрифты берутся из общего контекста процесса (utils.pdf_render)
     """
     try:
         if "now" not in context:
@@ -16,41 +21,38 @@ def generate_pdf_from_template(template_name, context, css_string=None):
 
         html_string = render_to_string(template_name, context)
 
-        if hasattr(settings, "SITE_URL") and settings.SITE_URL:
-            base_url = settings.SITE_URL
-        else:
-            base_url = "https://crm.gulnar8f.beget.tech"
-
-        print(f"📄 Генерация PDF из шаблона {template_name}, base_url: {base_url}")
-
-        html = HTML(string=html_string, base_url=base_url)
-
-        stylesheets = []
-        if css_string:
-            stylesheets.append(CSS(string=css_string))
-
-        pdf_bytes = html.write_pdf(stylesheets=stylesheets)
-
-        print(f"✅ PDF успешно сгенерирован, размер: {len(pdf_bytes)} байт")
+        start = time.perf_counter()
+        with track_render("pdf"):
+            pdf_bytes = render_context().write_pdf(html_string, [css_string])
+
+        logger.debug(
+            "PDF из шаблона %s сгенерирован, размер: %s байт",
+            template_name,
+            len(pdf_bytes),
+            extra={
+                "template": template_name,
+                "size_bytes": len(pdf_bytes),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            },
+        )
         return pdf_bytes
 
     except Exception as e:
-        print(f"❌ Ошибка при генерации PDF: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Ошибка при генерации PDF: %s", e)
 
         try:
-            print("🔄 Пробуем альтернативный способ генерации...")
+            from weasyprint import HTML
+
+            logger.debug("Пробуем альтернативный способ генерации...")
             html_string = render_to_string(template_name, context)
-            html = HTML(string=html_string)
+            html = HTML(string=html_string, url_fetcher=local_url_fetcher)
             pdf_bytes = html.write_pdf()
-            print(
-                f"✅ PDF создан альтернативным способом, размер: {len(pdf_bytes)} байт"
+            logger.debug(
+                "PDF создан альтернативным способом, размер: %s байт", len(pdf_bytes)
             )
             return pdf_bytes
         except Exception as e2:
-            print(f"❌ Альтернативный способ тоже не сработал: {e2}")
+            logger.error("Альтернативный способ тоже не сработал: %s", e2)
             return None
 
 
@@ -214,15 +216,11 @@ def generate_qr_code_pdf(qr_code_path):
         </html>
         """
 
-        html = HTML(string=html_string, base_url=settings.SITE_URL)
-
-        pdf_bytes = html.write_pdf()
+        with track_render("pdf"):
+            pdf_bytes = render_context().write_pdf(html_string)
 
         return pdf_bytes
 
     except Exception as e:
-        print(f"❌ Ошибка при генерации PDF с QR-кодом: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Ошибка при генерации PDF с QR-кодом: %s", e)
         return None
@@ -0,0 +1,117 @@
+"""
+Общий контекст WeasyPrint для PDF одного потока.
+
+Раньше каждый документ заново разбирал CSS (DEFAULT_CSS, альбомные стили
+отчетов), заново искал шрифты DejaVu/Liberation и загружал ресурсы по
+base_url=SITE_URL через сеть - то есть запросом к самому себе. Теперь у
+потока один RenderContext (создается при первом PDF и заново после fork):
+разобранные таблицы стилей по тексту CSS и одна FontConfiguration.
+
+Ресурсы документа (картинки, стили) отдает local_url_fetcher: адреса
+SITE_URL/STATIC_URL и SITE_URL/MEDIA_URL читаются с диска, data: и file: -
+стандартным загрузчиком, остальное не загружается, поэтому генерация PDF
+никогда не ходит в сеть.
+
+FontConfiguration (fontconfig и карта шрифтов pango) и привязанные к ней
+таблицы стилей не потокобезопасны, а воркеры gthread рендерят PDF в
+нескольких потоках сразу. Поэтому контекст свой у каждого потока
+(threading.local): потоков в воркере фиксированное число, и каждый
+разбирает CSS и загружает шрифты один раз.
+"""
+
+import mimetypes
+import os
+import threading
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+
+
+def local_path(url):
+    """Файл на диске для адреса статики или media сайта, иначе None"""
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc:
+        site = urlsplit(settings.SITE_URL)
+        if (parts.scheme, parts.netloc) != (site.scheme, site.netloc):
+            return None
+    path = unquote(parts.path)
+
+    try:
+        if path.startswith(settings.MEDIA_URL):
+            found = safe_join(settings.MEDIA_ROOT, path[len(settings.MEDIA_URL) :])
+        elif path.startswith(settings.STATIC_URL):
+            relative = path[len(settings.STATIC_URL) :]
+            found = finders.find(relative) or safe_join(settings.STATIC_ROOT, relative)
+        else:
+            return None
+    except SuspiciousFileOperation:
+        return None
+    return found if os.path.isfile(found) else None
+
+
+def local_url_fetcher(url, *args, **kwargs):
+    """url_fetcher WeasyPrint без сетевых запросов"""
+    from weasyprint import default_url_fetcher
+
+    path = local_path(url)
+    if path:
+        with open(path, "rb") as f:
+            return {
+                "string": f.read(),
+                "mime_type": mimetypes.guess_type(path)[0],
+                "redirected_url": url,
+            }
+    if urlsplit(url).scheme in ("data", "file"):
+        return default_url_fetcher(url, *args, **kwargs)
+    raise ValueError(f"Внешние ресурсы в PDF не загружаются: {url}")
+
+
+class RenderContext:
+    """Разобранные таблицы стилей и конфигурация шрифтов потока"""
+
+    def __init__(self):
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.pid = os.getpid()
+        self.font_config = FontConfiguration()
+        self.stylesheets = {}
+
+    def stylesheet(self, css_string):
+        """CSS из строки, разобранный один раз на поток"""
+        from weasyprint import CSS
+
+        sheet = self.stylesheets.get(css_string)
+        if sheet is None:
+            sheet = CSS(
+                string=css_string,
+                font_config=self.font_config,
+                url_fetcher=local_url_fetcher,
+            )
+            self.stylesheets[css_string] = sheet
+        return sheet
+
+    def write_pdf(self, html_string, css_strings=(), url_fetcher=local_url_fetcher):
+        """PDF из HTML со стилями css_strings (пустые пропускаются)"""
+        from weasyprint import HTML
+
+        html = HTML(
+            string=html_string, base_url=settings.SITE_URL, url_fetcher=url_fetcher
+        )
+        return html.write_pdf(
+            stylesheets=[self.stylesheet(css) for css in css_strings if css],
+            font_config=self.font_config,
+        )
+
+
+_local = threading.local()
+
+
+def render_context():
+    """RenderContext текущего потока"""
+    context = getattr(_local, "context", None)
+    if context is None or context.pid != os.getpid():
+        context = _local.context = RenderContext()
+    return context
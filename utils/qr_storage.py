@@ -0,0 +1,204 @@
+"""
+Раскладка QR-кодов заявок в хранилище media.
+
+Раньше все PNG лежали в одном каталоге на вид заявки (qr_codes/delivery/,
+qr_codes/pickup/): при сотнях тысяч файлов поиск в каталоге, листинг и
+резервное копирование замедляются. Теперь файл кладется в подкаталоги по
+началу md5 номера заявки - qr_codes/delivery/3f/a2/delivery_qr_....png:
+два уровня по 256 каталогов, в каждом единицы файлов. Путь зависит только
+от номера, поэтому его можно вычислить без обращения к хранилищу.
+
+- migrate_qr_files переносит уже сохраненные файлы в новую раскладку
+  (команда migrate_qr_storage);
+- find_orphan_qr_files / delete_orphan_qr_files сравнивают множество
+  файлов в хранилище со множеством ссылок в БД и удаляют файлы без заявки
+  (команда reap_qr_orphans). Файл удаленной заявки удаляется и сразу -
+  сигналом post_delete после фиксации транзакции.
+"""
+
+import hashlib
+import logging
+import os
+import posixpath
+from datetime import timedelta
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+logger = logging.getLogger(__name__)
+
+QR_ROOT = "qr_codes"
+
+# Уровни подкаталогов и символов md5 на уровень
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+
+
+def qr_shard(tracking_number):
+    """Подкаталоги файла по номеру заявки: '3f/a2'"""
+    digest = hashlib.md5(str(tracking_number).encode()).hexdigest()
+    return "/".join(
+        digest[level * SHARD_WIDTH : (level + 1) * SHARD_WIDTH]
+        for level in range(SHARD_LEVELS)
+    )
+
+
+@deconstructible
+class ShardedQrPath:
+    """upload_to поля qr_code: qr_codes/<kind>/<шард>/<имя файла>"""
+
+    def __init__(self, kind):
+        self.kind = kind
+
+    def __call__(self, instance, filename):
+        return posixpath.join(
+            QR_ROOT,
+            self.kind,
+            qr_shard(instance.tracking_number),
+            posixpath.basename(filename),
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, ShardedQrPath) and other.kind == self.kind
+
+
+def _qr_directory(model):
+    return posixpath.join(QR_ROOT, model._meta.get_field("qr_code").upload_to.kind)
+
+
+def migrate_qr_files(model, batch_size=1000, dry_run=False):
+    """
+    Переносит QR-файлы заявок model, лежащие не по своему шарду, и
+    обновляет ссылки пачками (bulk_update). Возвращает словарь счетчиков:
+    moved - перенесено, missing - файла нет в хранилище (ссылка не
+    меняется), current - уже на месте.
+    """
+    field = model._meta.get_field("qr_code")
+    storage = field.storage
+    counts = {"moved": 0, "missing": 0, "current": 0}
+    last_pk = 0
+    while True:
+        batch = list(
+            model.objects.filter(pk__gt=last_pk)
+            .exclude(qr_code="")
+            .exclude(qr_code__isnull=True)
+            .only("pk", "tracking_number", "qr_code")
+            .order_by("pk")[:batch_size]
+        )
+        if not batch:
+            return counts
+        last_pk = batch[-1].pk
+
+        moved = []
+        for order in batch:
+            old_name = order.qr_code.name
+            new_name = field.upload_to(order, old_name)
+            if old_name == new_name:
+                counts["current"] += 1
+            elif not storage.exists(old_name):
+                counts["missing"] += 1
+            else:
+                if not dry_run:
+                    _move(storage, old_name, new_name)
+                    order.qr_code.name = new_name
+                    moved.append(order)
+                counts["moved"] += 1
+        if moved:
+            model.objects.bulk_update(moved, ["qr_code"])
+
+
+def _move(storage, old_name, new_name):
+    if isinstance(storage, FileSystemStorage):
+        new_path = storage.path(new_name)
+        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        os.replace(storage.path(old_name), new_path)
+        return
+    if storage.exists(new_name):
+        storage.delete(new_name)
+    with storage.open(old_name, "rb") as content:
+        storage.save(new_name, content)
+    storage.delete(old_name)
+
+
+def stored_qr_files(model):
+    """Множество имен файлов в каталоге QR-кодов model (с подкаталогами)"""
+    storage = model._meta.get_field("qr_code").storage
+    root = _qr_directory(model)
+    if isinstance(storage, FileSystemStorage):
+        base = storage.path("")
+        names = set()
+        for dirpath, _dirnames, filenames in os.walk(storage.path(root)):
+            relative = os.path.relpath(dirpath, base).replace(os.sep, "/")
+            names.update(posixpath.join(relative, name) for name in filenames)
+        return names
+
+    names = set()
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        if not storage.exists(directory):
+            continue
+        dirs, files = storage.listdir(directory)
+        pending.extend(posixpath.join(directory, name) for name in dirs)
+        names.update(posixpath.join(directory, name) for name in files)
+    return names
+
+
+def referenced_qr_files(model):
+    """Множество имен QR-файлов, на которые ссылаются заявки model"""
+    return set(
+        model.objects.exclude(qr_code="")
+        .exclude(qr_code__isnull=True)
+        .values_list("qr_code", flat=True)
+        .iterator(chunk_size=5000)
+    )
+
+
+def find_orphan_qr_files(model, min_age=timedelta(hours=1)):
+    """
+    Файлы без заявки: разность множеств хранилища и БД. Файлы моложе
+    min_age пропускаются - generate_qr_code пишет файл до сохранения
+    ссылки, и незафиксированная транзакция выглядела бы сиротой.
+    Возвращает (сироты, число ссылок на отсутствующие файлы).
+    """
+    storage = model._meta.get_field("qr_code").storage
+    stored = stored_qr_files(model)
+    referenced = referenced_qr_files(model)
+
+    threshold = timezone.now() - min_age
+    orphans = sorted(
+        name
+        for name in stored - referenced
+        if storage.get_modified_time(name) < threshold
+    )
+    return orphans, len(referenced - stored)
+
+
+def delete_orphan_qr_files(model, names):
+    """
+    Удаляет файлы names (пачку из find_orphan_qr_files), повторно проверив,
+    что на них не появились ссылки. Возвращает число удаленных.
+    """
+    storage = model._meta.get_field("qr_code").storage
+    names = set(names) - set(
+        model.objects.filter(qr_code__in=names).values_list("qr_code", flat=True)
+    )
+    for name in names:
+        storage.delete(name)
+    logger.info("Удалено QR-файлов без заявок %s: %s", model._meta.label, len(names))
+    return len(names)
+
+
+def _delete_qr_file(sender, instance, **kwargs):
+    if instance.qr_code:
+        name, storage = instance.qr_code.name, instance.qr_code.storage
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+for _sender in ("logistic.DeliveryOrder", "pickup.PickupOrder"):
+    post_delete.connect(
+        _delete_qr_file, sender=_sender, dispatch_uid=f"qr_file_delete:{_sender}"
+    )
@@ -1,11 +1,118 @@
+import logging
+import multiprocessing
 import os
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from django.conf import settings
-import qrcode
 from io import BytesIO
 from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db.models import Q
 from django.urls import reverse
 
+logger = logging.getLogger(__name__)
+
+
+def make_qr_png(data):
+    """
+    Кодирует строку в PNG с QR-кодом и возвращает буфер BytesIO.
+    qrcode/PIL импортируются при первом вызове, а не при старте воркера.
+    """
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    buffer.seek(0)
+    return buffer
+
+
+def qr_png_bytes(data):
+    """PNG QR-кода байтами - для передачи из процесса пула"""
+    return make_qr_png(data).getvalue()
+
+
+def encode_qr_pngs(datas, executor=None):
+    """
+    PNG для списка строк. Кодирование QR - чистый Python и упирается в GIL,
+    поэтому параллельно оно идет только в пуле процессов (executor);
+    без пула - по очереди в текущем потоке.
+    """
+    if executor is None:
+        return [qr_png_bytes(data) for data in datas]
+    return list(executor.map(qr_png_bytes, datas, chunksize=16))
+
+
+def qr_process_pool():
+    """
+    Пул процессов для кодирования QR (QR_REGENERATION_PROCESSES) или None.
+    Процессы запускаются через spawn: fork многопоточного воркера небезопасен.
+    """
+    if settings.QR_REGENERATION_PROCESSES < 2:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=settings.QR_REGENERATION_PROCESSES,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def regenerate_qr_codes(model, ids, on_chunk=None, use_pool=True):
+    """
+    Пересоздает QR-коды заявок model с первичными ключами ids пачками по
+    QR_REGENERATION_CHUNK_SIZE: PNG пачки кодируются в пуле процессов,
+    файлы пишутся через storage, ссылки сохраняются одним bulk_update.
+    on_chunk(processed, failed) вызывается после каждой пачки.
+    use_pool=False кодирует в текущем потоке - для небольших пачек внутри
+    запроса, где запуск процессов дольше самого кодирования.
+    Возвращает (обработано, ошибок).
+    """
+    chunk_size = settings.QR_REGENERATION_CHUNK_SIZE
+    ids = sorted(ids)
+    processed = failed = 0
+
+    executor = qr_process_pool() if use_pool else None
+    try:
+        for start in range(0, len(ids), chunk_size):
+            orders = list(
+                model.objects.filter(pk__in=ids[start : start + chunk_size])
+                .only("pk", "tracking_number", "qr_code")
+                .order_by("pk")
+            )
+            pngs = encode_qr_pngs([order.qr_code_data() for order in orders], executor)
+
+            saved = []
+            for order, png in zip(orders, pngs):
+                try:
+                    if order.qr_code:
+                        order.qr_code.delete(save=False)
+                    order.qr_code.save(
+                        order.qr_code_filename(), ContentFile(png), save=False
+                    )
+                    saved.append(order)
+                except Exception as e:
+                    logger.error("Ошибка QR-кода для заявки #%s: %s", order.pk, e)
+                    failed += 1
+            model.objects.bulk_update(saved, ["qr_code"])
+
+            # Заявки, удаленные после постановки задачи, тоже считаются пройденными
+            processed += len(ids[start : start + chunk_size])
+            if on_chunk:
+                on_chunk(processed, failed)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return processed, failed
+
 
 def regenerate_qr_codes_for_pickup():
     """Перегенерация всех QR-кодов для заявок на забор (только ссылка на PDF)"""
@@ -26,25 +133,9 @@ def regenerate_qr_codes_for_pickup():
                 order.qr_code = None
 
             pdf_url = f"{settings.SITE_URL}{reverse('pickup_order_pdf', kwargs={'pk': order.pk})}"
-            qr_data = pdf_url  
-
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(qr_data)
-            qr.make(fit=True)
-
-            img = qr.make_image(fill_color="black", back_color="white")
-
-            qr_dir = Path(settings.MEDIA_ROOT) / "qr_codes" / "pickup"
-            qr_dir.mkdir(parents=True, exist_ok=True)
+            qr_data = pdf_url
 
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            buffer.seek(0)
+            buffer = make_qr_png(qr_data)
 
             filename = f'pickup_qr_{order.tracking_number.replace("/", "_")}.png'
             order.qr_code.save(filename, File(buffer), save=False)
@@ -52,10 +143,12 @@ def regenerate_qr_codes_for_pickup():
 
             order.save(update_fields=["qr_code"])
             regenerated += 1
-            print(f"✅ Перегенерирован QR-код для заявки #{order.id} (чистая ссылка)")
+            logger.debug(
+                "Перегенерирован QR-код для заявки #%s (чистая ссылка)", order.id
+            )
 
         except Exception as e:
-            print(f"❌ Ошибка для заявки #{order.id}: {e}")
+            logger.error("Ошибка для заявки #%s: %s", order.id, e)
 
     return regenerated
 
@@ -79,25 +172,9 @@ def regenerate_qr_codes_for_delivery():
                 order.qr_code = None
 
             pdf_url = f"{settings.SITE_URL}{reverse('delivery_order_pdf', kwargs={'pk': order.pk})}"
-            qr_data = pdf_url 
-
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(qr_data)
-            qr.make(fit=True)
-
-            img = qr.make_image(fill_color="black", back_color="white")
+            qr_data = pdf_url
 
-            qr_dir = Path(settings.MEDIA_ROOT) / "qr_codes" / "delivery"
-            qr_dir.mkdir(parents=True, exist_ok=True)
-
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            buffer.seek(0)
+            buffer = make_qr_png(qr_data)
 
             filename = f'delivery_qr_{order.tracking_number.replace("/", "_")}.png'
             order.qr_code.save(filename, File(buffer), save=False)
@@ -105,10 +182,12 @@ def regenerate_qr_codes_for_delivery():
 
             order.save(update_fields=["qr_code"])
             regenerated += 1
-            print(f"✅ Перегенерирован QR-код для доставки #{order.id} (чистая ссылка)")
+            logger.debug(
+                "Перегенерирован QR-код для доставки #%s (чистая ссылка)", order.id
+            )
 
         except Exception as e:
-            print(f"❌ Ошибка для доставки #{order.id}: {e}")
+            logger.error("Ошибка для доставки #%s: %s", order.id, e)
 
     return regenerated
 
@@ -118,11 +197,34 @@ def regenerate_all_qr_codes():
     pickup_count = regenerate_qr_codes_for_pickup()
     delivery_count = regenerate_qr_codes_for_delivery()
 
-    print("\n" + "=" * 50)
-    print(f"✅ Перегенерация завершена!")
-    print(f"   Перегенерировано заявок на забор: {pickup_count}")
-    print(f"   Перегенерировано заявок на доставку: {delivery_count}")
-    print(f"   Всего: {pickup_count + delivery_count}")
-    print("=" * 50)
+    logger.info(
+        "Перегенерация завершена: заявок на забор %s, на доставку %s, всего %s",
+        pickup_count,
+        delivery_count,
+        pickup_count + delivery_count,
+    )
 
     return pickup_count + delivery_count
+
+
+def generate_missing_qr_codes(model, ids=None, use_pool=True):
+    """
+    Создает QR-коды заявкам, у которых их нет: после массового создания
+    через bulk_create (save() и генерация QR не вызываются) или если фоновая
+    задача не успела отработать. ids ограничивает набор заявок. Коды
+    создаются пачками (regenerate_qr_codes). Возвращает число созданных.
+    """
+    orders = model.objects.filter(Q(qr_code="") | Q(qr_code__isnull=True))
+    if ids is not None:
+        orders = orders.filter(pk__in=ids)
+
+    missing = list(orders.values_list("pk", flat=True))
+    if not missing:
+        return 0
+    regenerate_qr_codes(model, missing, use_pool=use_pool)
+    return (
+        model.objects.filter(pk__in=missing)
+        .exclude(qr_code="")
+        .exclude(qr_code__isnull=True)
+        .count()
+    )
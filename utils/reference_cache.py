@@ -0,0 +1,235 @@
+"""
+Кэш справочников для выпадающих списков форм.
+
+Список вариантов (value, label) строится одним запросом и хранится в кэше
+reference_data под ключом с версиями моделей, из которых он собран. Версии
+лежат в кэше default; сигналы post_save и post_delete увеличивают версию
+модели, поэтому после изменения справочника формы получают новый список, а старые записи истекают сами. Записи под ключом с версией не
+меняются, поэтому кэш reference_data может держать их копию в памяти
+процесса (utils.caching.TieredCache).
+
+Без общего кэша (CACHE_SHARED) списки не кэшируются: версии в locmem
+одного воркера не видны другим, и там формы показывали бы старый список
+до REFERENCE_CACHE_TTL.
+
+Большие справочники (контрагенты) в <select> не выводятся: SearchSelect
+отдает только выбранный вариант, остальные подгружаются поиском (Select2).
+"""
+
+from django import forms
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.db.models.signals import post_delete, post_save
+from django.forms.models import ModelChoiceIterator
+
+from counterparties.models import Counterparty
+from pickup.models import Carrier
+from users.models import UserProfile
+from warehouses.models import City, ContainerType, Warehouse, WarehouseSchedule
+
+
+def _version_key(model):
+    return f"reference_version:{model._meta.label_lower}"
+
+
+# Поля, от которых зависят подписи и выборки справочников. Сохранение с
+# update_fields без них (вход в систему пишет только last_login) версию
+# не меняет; у остальных моделей версию меняет любое сохранение
+WATCHED_FIELDS = {
+    User: {"username", "first_name", "last_name", "is_active"},
+    UserProfile: {"role", "user"},
+}
+
+
+def _bump_version(sender, update_fields=None, **kwargs):
+    watched = WATCHED_FIELDS.get(sender)
+    if watched and update_fields is not None and not watched & set(update_fields):
+        return
+    key = _version_key(sender)
+    if not cache.add(key, 2, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Ключ истек между add и incr
+            cache.set(key, 2, None)
+
+
+def versions_stamp(models):
+    """Строка из текущих версий моделей - меняется при любом их изменении"""
+    version_keys = [_version_key(model) for model in models]
+    versions = cache.get_many(version_keys)
+    return ".".join(str(versions.get(key, 1)) for key in version_keys)
+
+
+for _model in (
+    User,
+    UserProfile,
+    Counterparty,
+    Carrier,
+    City,
+    Warehouse,
+    WarehouseSchedule,
+    ContainerType,
+):
+    _uid = f"reference_version_{_model._meta.label_lower}"
+    post_save.connect(_bump_version, sender=_model, dispatch_uid=_uid)
+    post_delete.connect(_bump_version, sender=_model, dispatch_uid=_uid)
+
+
+class ChoiceList:
+    """
+    Кэшируемый список вариантов: queryset - функция, возвращающая
+    упорядоченный QuerySet, label - функция объект -> подпись,
+    models - модели, изменение которых делает список устаревшим.
+    """
+
+    def __init__(self, name, queryset, label=str, models=()):
+        self.name = name
+        self.queryset = queryset
+        self.label = label
+        self.models = tuple(models) or (queryset().model,)
+
+    def cache_key(self):
+        return f"choices:{self.name}:{versions_stamp(self.models)}"
+
+    def build(self):
+        return [(obj.pk, self.label(obj)) for obj in self.queryset()]
+
+    def choices(self):
+        if not settings.CACHE_SHARED:
+            return self.build()
+        key = self.cache_key()
+        reference_cache = caches["reference_data"]
+        choices = reference_cache.get(key)
+        if choices is None:
+            choices = self.build()
+            reference_cache.set(key, choices, settings.REFERENCE_CACHE_TTL)
+        return choices
+
+
+# --- Подписи ---
+
+
+def user_full_name(user):
+    """Имя Фамилия или логин"""
+    return user.get_full_name().strip() or user.username
+
+
+def user_short_name(user):
+    """Фамилия Имя, только имя или логин"""
+    if user.first_name and user.last_name:
+        return f"{user.last_name} {user.first_name}"
+    return user.first_name or user.username
+
+
+def warehouse_with_city(warehouse):
+    return f"{warehouse.name} ({warehouse.city.name})"
+
+
+# --- Справочники ---
+
+CITIES = ChoiceList("cities", lambda: City.objects.order_by("name"))
+
+WAREHOUSES = ChoiceList(
+    "warehouses",
+    lambda: Warehouse.objects.select_related("city").order_by("city__name", "name"),
+    models=(Warehouse, City),
+)
+
+CLIENT_WAREHOUSES = ChoiceList(
+    "client_warehouses",
+    lambda: Warehouse.objects.filter(visible_to_clients=True)
+    .select_related("city")
+    .order_by("city__name", "name"),
+    label=warehouse_with_city,
+    models=(Warehouse, City),
+)
+
+CARRIERS = ChoiceList(
+    "carriers", lambda: Carrier.objects.filter(is_active=True).order_by("name")
+)
+
+_user_lists = {}
+
+
+def user_choices(*roles, active_only=False, label=user_full_name):
+    """Список пользователей с ролями профиля roles"""
+    name = f"users:{'+'.join(roles)}:{int(active_only)}:{label.__name__}"
+    if name not in _user_lists:
+
+        def queryset():
+            users = User.objects.filter(profile__role__in=roles)
+            if active_only:
+                users = users.filter(is_active=True)
+            return users.order_by("first_name", "last_name", "username")
+
+        _user_lists[name] = ChoiceList(name, queryset, label, models=(User, UserProfile))
+    return _user_lists[name]
+
+
+# --- Поля и виджеты форм ---
+
+
+class CachedChoiceIterator(ModelChoiceIterator):
+    """Варианты из кэша справочника вместо запроса к queryset"""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from self.field.choice_list.choices()
+
+    def __len__(self):
+        return len(self.field.choice_list.choices()) + (
+            self.field.empty_label is not None
+        )
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(
+            self.field.choice_list.choices()
+        )
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField, который выводит варианты из ChoiceList.
+    Выбранное значение по-прежнему проверяется через queryset.
+    """
+
+    iterator = CachedChoiceIterator
+
+    def __init__(self, choice_list, **kwargs):
+        self.choice_list = choice_list
+        super().__init__(queryset=choice_list.queryset(), **kwargs)
+
+    def use(self, choice_list):
+        """Переключает поле на другой справочник (например, по роли пользователя)"""
+        self.choice_list = choice_list
+        self.queryset = choice_list.queryset()
+
+
+class SearchSelect(forms.Select):
+    """
+    <select> для больших справочников: выводятся только пустой и выбранный
+    варианты, остальные подгружает Select2 через эндпоинт поиска.
+    """
+
+    def optgroups(self, name, value, attrs=None):
+        iterator = self.choices
+        choices = []
+        if iterator.field.empty_label is not None:
+            choices.append(("", iterator.field.empty_label))
+
+        selected = [pk for pk in value if pk not in (None, "")]
+        if selected:
+            try:
+                objects = list(iterator.queryset.filter(pk__in=selected))
+            except (ValueError, TypeError):
+                objects = []
+            choices.extend(iterator.choice(obj) for obj in objects)
+
+        self.choices = choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterator
@@ -0,0 +1,105 @@
+"""
+Справочники страниц списков одним ответом.
+
+Выпадающие списки и модальные окна списков заявок раньше запрашивали
+города, склады по городу, карточку склада, логистов и операторов
+отдельными эндпоинтами - по запросу на каждое открытие. Теперь страница
+получает все справочники одним JSON (api/reference/) и дальше выбирает из
+него на клиенте. Ответ собирается несколькими запросами и хранится в кэше
+reference_data под ключом с версиями моделей из reference_cache; версия служит и ETag,
+поэтому повторная загрузка страницы получает 304.
+
+Без общего кэша (CACHE_SHARED) версии в locmem одного воркера не видны
+другим, поэтому ответ не кэшируется, а ETag строится по самим данным: 304
+экономит передачу, но не запросы к БД.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+from users.models import UserProfile
+from utils.reference_cache import user_full_name, user_short_name, versions_stamp
+from warehouses.models import City, Warehouse, WarehouseSchedule
+
+MODELS = (City, Warehouse, WarehouseSchedule, User, UserProfile)
+
+
+def reference_version():
+    """Хеш версий справочников - ключ кэша и ETag ответа"""
+    return hashlib.md5(versions_stamp(MODELS).encode()).hexdigest()
+
+
+def data_version(data):
+    """Хеш самих справочников - ETag без общего кэша"""
+    content = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.md5(content.encode()).hexdigest()
+
+
+def _users(roles):
+    users = (
+        User.objects.filter(is_active=True, profile__role__in=roles)
+        .select_related("profile")
+        .order_by("first_name", "last_name", "username")
+    )
+    return [
+        {
+            "id": user.id,
+            "username": user.username,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "full_name": user_full_name(user),
+            "short_name": user_short_name(user),
+            "role": user.profile.role,
+        }
+        for user in users
+    ]
+
+
+def build_reference_data():
+    warehouses = (
+        Warehouse.objects.select_related("city", "manager")
+        .prefetch_related("schedules")
+        .order_by("name")
+    )
+    return {
+        "cities": [
+            {"id": city.id, "name": city.name}
+            for city in City.objects.order_by("name")
+        ],
+        "warehouses": [
+            {
+                "id": wh.id,
+                "name": wh.name,
+                "city_id": wh.city_id,
+                "city": wh.city.name,
+                "address": wh.address,
+                "phone": wh.phone,
+                "email": wh.email or "",
+                "working_hours": wh.get_working_hours(),
+                "available_area": wh.available_area or 0,
+                "total_area": wh.total_area or 0,
+                "manager": (
+                    wh.manager.get_full_name() if wh.manager else "Не назначен"
+                ),
+            }
+            for wh in warehouses
+        ],
+        "logistics": _users(["logistic"]),
+        "operators": _users(["operator", "logistic", "admin"]),
+    }
+
+
+def reference_data(version):
+    """Справочники для версии version (из reference_version)"""
+    key = f"reference_data:{version}"
+    reference_cache = caches["reference_data"]
+    data = reference_cache.get(key)
+    if data is None:
+        data = build_reference_data()
+        reference_cache.set(key, data, settings.REFERENCE_CACHE_TTL)
+    return data
@@ -0,0 +1,101 @@
+"""
+Нормализованный текст для поиска в одной колонке.
+
+Поиск по заявкам и контрагентам в админке шел через icontains по десятку
+колонок, часть из них - через JOIN: на больших таблицах это полный проход с
+соединениями. Теперь текстовые поля записи складываются в колонку
+search_text (нижний регистр, ё -> е, одинарные пробелы), и поиск - это
+одно условие LIKE '%слово%' на слово запроса по одной колонке той же
+таблицы, без соединений. Индекс B-tree такое условие не обслуживает
+(слово ищется с любого места, а не с начала), поэтому колонка не
+индексируется: это по-прежнему проход по таблице, но с одной проверкой
+подстроки на строку вместо десятка и без JOIN.
+
+Колонка обновляется в save() (в том числе с update_fields) и в bulk_create
+/ bulk_update менеджера; для уже существующих строк ее заполняет миграция
+или команда rebuild_search_text.
+"""
+
+from django.db import models
+
+from utils.text_utils import normalize_search_text
+
+SEARCH_TEXT_MAX_LENGTH = 500
+
+
+def build_search_text(values):
+    """Нормализованная строка из значений полей (пустые пропускаются)"""
+    text = normalize_search_text(" ".join(str(value) for value in values if value))
+    return text[:SEARCH_TEXT_MAX_LENGTH]
+
+
+def search_terms(search):
+    """Слова поискового запроса в той же нормализации, что и колонка"""
+    return normalize_search_text(search).split()
+
+
+def fill_search_text(queryset, fields, batch_size=2000):
+    """
+    Заполняет search_text у строк queryset пачками по первичному ключу.
+    Работает и с историческими моделями миграций. Возвращает число строк.
+    """
+    model = queryset.model
+    updated = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).order_by("pk").only(*fields)[:batch_size]
+        )
+        if not batch:
+            return updated
+        for obj in batch:
+            obj.search_text = build_search_text(getattr(obj, f) for f in fields)
+        model.objects.bulk_update(batch, ["search_text"])
+        updated += len(batch)
+        last_pk = batch[-1].pk
+
+
+class SearchTextMixin:
+    """
+    Подмешивается к модели (перед models.Model) с полем search_text:
+    save() собирает его из полей SEARCH_FIELDS.
+    """
+
+    SEARCH_FIELDS = ()
+
+    def update_search_text(self):
+        self.search_text = build_search_text(
+            getattr(self, field) for field in self.SEARCH_FIELDS
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.update_search_text()
+        elif set(update_fields) & set(self.SEARCH_FIELDS):
+            self.update_search_text()
+            kwargs["update_fields"] = {*update_fields, "search_text"}
+        super().save(*args, **kwargs)
+
+
+class SearchTextQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.update_search_text()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if set(fields) & set(self.model.SEARCH_FIELDS):
+            objs = list(objs)
+            for obj in objs:
+                obj.update_search_text()
+            fields = [*fields, "search_text"]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def search(self, search):
+        """Записи, в тексте которых есть все слова запроса"""
+        queryset = self
+        for term in search_terms(search):
+            queryset = queryset.filter(search_text__contains=term)
+        return queryset
@@ -0,0 +1,191 @@
+"""
+История смены статусов заявок и отчет по времени в статусе.
+
+Каждая смена статуса добавляет строку в таблицу истории модели (связь
+status_changes) в той же транзакции, что и запись статуса:
+- save() заявки (формы, inline-редактирование, одиночные операции) -
+  через StatusHistoryMixin;
+- массовая смена статуса - QuerySet.set_status (один UPDATE и bulk_create);
+- массовое создание (импорт, преобразование заборов) - record_created.
+
+История ведется с момента появления таблицы, прошлые смены не
+восстанавливаются.
+"""
+
+from itertools import groupby
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import DurationField, ExpressionWrapper, F, Window
+from django.db.models.functions import Lead
+from django.utils import timezone
+
+from monitoring.metrics import percentile
+
+
+class StatusChange(models.Model):
+    """Переход заявки из статуса from_status в to_status"""
+
+    from_status = models.CharField(
+        max_length=20, blank=True, default="", verbose_name="Прежний статус"
+    )
+    to_status = models.CharField(max_length=20, verbose_name="Новый статус")
+    changed_at = models.DateTimeField(default=timezone.now, verbose_name="Время смены")
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Кто изменил",
+    )
+
+    class Meta:
+        abstract = True
+        ordering = ["changed_at", "id"]
+
+    def __str__(self):
+        return f"{self.from_status or '—'} → {self.to_status} ({self.changed_at:%d.%m.%Y %H:%M})"
+
+
+def _history_model(order_model):
+    return order_model._meta.get_field("status_changes").related_model
+
+
+def record_created(orders, changed_by=None):
+    """Начальный статус для заявок, созданных через bulk_create"""
+    if not orders:
+        return
+    history = _history_model(type(orders[0]))
+    now = timezone.now()
+    history.objects.bulk_create(
+        history(
+            order_id=order.pk,
+            to_status=order.status,
+            changed_at=now,
+            changed_by=changed_by,
+        )
+        for order in orders
+    )
+
+
+class StatusQuerySet(models.QuerySet):
+    def set_status(self, status, changed_by=None):
+        """
+        Переводит заявки выборки в статус status одним UPDATE и пишет историю.
+        Возвращает число заявок, у которых статус изменился.
+        """
+        history = _history_model(self.model)
+        with transaction.atomic():
+            current = list(
+                self.exclude(status=status)
+                .select_for_update()
+                .values_list("pk", "status")
+            )
+            if not current:
+                return 0
+
+            now = timezone.now()
+            fields = {"status": status}
+            if any(f.name == "updated_at" for f in self.model._meta.concrete_fields):
+                fields["updated_at"] = now
+            self.model.objects.filter(pk__in=[pk for pk, _ in current]).update(**fields)
+            history.objects.bulk_create(
+                history(
+                    order_id=pk,
+                    from_status=old_status,
+                    to_status=status,
+                    changed_at=now,
+                    changed_by=changed_by,
+                )
+                for pk, old_status in current
+            )
+        return len(current)
+
+
+class StatusHistoryMixin:
+    """
+    Подмешивается к модели заявки (перед models.Model): save() при смене
+    статуса пишет строку истории в той же транзакции.
+    status_changed_by_id - кто меняет статус, если известно.
+    """
+
+    status_changed_by_id = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def _status_change(self, update_fields):
+        """Прежний статус, если save() его меняет, иначе None"""
+        if self._state.adding:
+            return ""
+        if update_fields is not None and "status" not in update_fields:
+            return None
+        loaded = getattr(self, "_loaded_status", None)
+        if loaded is None or loaded == self.status:
+            return None
+        return loaded
+
+    def save(self, *args, **kwargs):
+        from_status = self._status_change(kwargs.get("update_fields"))
+        if from_status is None:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            _history_model(type(self)).objects.create(
+                order=self,
+                from_status=from_status,
+                to_status=self.status,
+                changed_by_id=self.status_changed_by_id,
+            )
+        self._loaded_status = self.status
+
+
+# --- Отчет ---
+
+
+def status_durations(changes, group_by, status_labels):
+    """
+    Время в статусе по группам (group_by - путь к полю, например
+    "order__logistic__username"): число интервалов, среднее и перцентили
+    в часах. Длительность интервала - разница между сменой статуса и
+    следующей сменой той же заявки (оконная функция LEAD); текущий,
+    еще не завершенный статус не учитывается.
+    """
+    next_changed_at = Window(
+        Lead("changed_at"),
+        partition_by=[F("order_id")],
+        order_by=[F("changed_at").asc(), F("id").asc()],
+    )
+    rows = (
+        changes.annotate(next_changed_at=next_changed_at)
+        .annotate(
+            duration=ExpressionWrapper(
+                F("next_changed_at") - F("changed_at"), output_field=DurationField()
+            )
+        )
+        .filter(next_changed_at__isnull=False)
+        .order_by(group_by, "to_status", "duration")
+        .values_list(group_by, "to_status", "duration")
+    )
+
+    report = []
+    for (group, status), items in groupby(rows, key=lambda row: row[:2]):
+        hours = [row[2].total_seconds() / 3600 for row in items]
+        report.append(
+            {
+                "group": group,
+                "status": status,
+                "status_display": status_labels.get(status, status),
+                "count": len(hours),
+                "avg": sum(hours) / len(hours),
+                "p50": percentile(hours, 0.50),
+                "p90": percentile(hours, 0.90),
+                "max": hours[-1],
+            }
+        )
+    return report
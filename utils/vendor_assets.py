@@ -0,0 +1,111 @@
+"""
+Сторонние библиотеки интерфейса: Bootstrap, иконки, jQuery, Select2.
+
+Шаблоны берут их из своей статики (assets/vendor, закрепленные версии
+скачивает команда fetch_vendor_assets): после collectstatic файлы получают
+хеш в имени, сжатые копии и долгий кэш, как и остальные бандлы. Файл,
+которого нет в статике (команду еще не запускали или не выполнен
+collectstatic), подключается с CDN; VENDOR_ASSETS_LOCAL=0 включает CDN
+для всех файлов.
+"""
+
+import logging
+from functools import cache
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+logger = logging.getLogger(__name__)
+
+# имя в шаблоне -> (адрес на CDN, путь в статике)
+VENDOR_FILES = {
+    "bootstrap_css": (
+        "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css",
+        "vendor/bootstrap/bootstrap.min.css",
+    ),
+    "bootstrap_js": (
+        "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js",
+        "vendor/bootstrap/bootstrap.bundle.min.js",
+    ),
+    "bootstrap_icons_css": (
+        "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/bootstrap-icons.css",
+        "vendor/bootstrap-icons/bootstrap-icons.css",
+    ),
+    "jquery_js": (
+        "https://code.jquery.com/jquery-3.6.0.min.js",
+        "vendor/jquery/jquery.min.js",
+    ),
+    "select2_css": (
+        "https://cdn.jsdelivr.net/npm/select2@4.1.0-rc.0/dist/css/select2.min.css",
+        "vendor/select2/select2.min.css",
+    ),
+    "select2_js": (
+        "https://cdn.jsdelivr.net/npm/select2@4.1.0-rc.0/dist/js/select2.min.js",
+        "vendor/select2/select2.min.js",
+    ),
+}
+
+# Файлы, на которые ссылаются стили библиотек (url(...) в CSS):
+# имя в шаблоне -> [(адрес на CDN, путь в статике)]
+VENDOR_EXTRA_FILES = {
+    "bootstrap_icons_css": [
+        (
+            "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/fonts/bootstrap-icons.woff2",
+            "vendor/bootstrap-icons/fonts/bootstrap-icons.woff2",
+        ),
+        (
+            "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/fonts/bootstrap-icons.woff",
+            "vendor/bootstrap-icons/fonts/bootstrap-icons.woff",
+        ),
+    ],
+}
+
+
+def all_vendor_files():
+    """[(адрес на CDN, путь в статике)] всех файлов для скачивания"""
+    files = list(VENDOR_FILES.values())
+    for extra in VENDOR_EXTRA_FILES.values():
+        files.extend(extra)
+    return files
+
+
+def local_url(name):
+    """
+    Адрес файла name в своей статике или None, если его (или файлов, на
+    которые он ссылается) там нет
+    """
+    paths = [VENDOR_FILES[name][1]] + [
+        path for _, path in VENDOR_EXTRA_FILES.get(name, [])
+    ]
+    if not all(finders.find(path) for path in paths):
+        return None
+    try:
+        return static(paths[0])
+    except ValueError:
+        # Хранилище с манифестом: файл скачан, но collectstatic не выполнен
+        return None
+
+
+@cache
+def vendor_urls():
+    urls = {}
+    fallback = []
+    for name, (cdn_url, _) in VENDOR_FILES.items():
+        url = local_url(name) if settings.VENDOR_ASSETS_LOCAL else None
+        if url is None:
+            url = cdn_url
+            fallback.append(name)
+        urls[name] = url
+    if settings.VENDOR_ASSETS_LOCAL and fallback:
+        logger.warning(
+            "Нет в статике, подключаются с CDN: %s (выполните fetch_vendor_assets "
+            "и collectstatic)",
+            ", ".join(fallback),
+        )
+    return urls
+
+
+def vendor_assets(request):
+    """Контекстный процессор: адреса библиотек в переменной vendor"""
+    return {"vendor": vendor_urls()}
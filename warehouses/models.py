@@ -77,10 +77,12 @@ class Warehouse(models.Model):
 
     def get_working_hours(self):
         """Возвращает график работы склада в читаемом формате"""
-        working_schedules = self.schedules.filter(is_working=True).order_by(
-            "day_of_week"
+        # Фильтр в Python, чтобы работал prefetch_related("schedules")
+        working_schedules = sorted(
+            (schedule for schedule in self.schedules.all() if schedule.is_working),
+            key=lambda schedule: schedule.day_of_week,
         )
-        if not working_schedules.exists():
+        if not working_schedules:
             return "График работы не указан"
 
         # Просто группируем дни с одинаковым временем работы
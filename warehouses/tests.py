@@ -1,3 +1,73 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from utils import demo_data
+
+from .models import City
+
+
+@override_settings(CACHE_SHARED=True)
+class ReferenceDataTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        data = demo_data.seed()
+        cls.user = data["users"]["operator1"]
+        cls.city = data["cities"]["Москва"]
+
+    def setUp(self):
+        cache.clear()
+        caches["reference_data"].clear()
+        self.client.force_login(self.user)
+        self.url = reverse("reference_data_json")
+
+    def test_all_lists_in_one_response(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+        data = response.json()
+        self.assertEqual(
+            sorted(data), ["cities", "logistics", "operators", "warehouses"]
+        )
+        self.assertIn({"id": self.city.pk, "name": "Москва"}, data["cities"])
+        self.assertEqual({user["role"] for user in data["logistics"]}, {"logistic"})
+
+    def test_unchanged_data_gets_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        caches["reference_data"].clear()
+        with mock.patch("utils.reference_data.build_reference_data") as build:
+            response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        build.assert_not_called()
+
+    def test_city_rename_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.city.name = "Москва-Сити"
+        self.city.save()
+
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn(
+            {"id": self.city.pk, "name": "Москва-Сити"}, response.json()["cities"]
+        )
+
+    @override_settings(CACHE_SHARED=False)
+    def test_etag_from_data_without_shared_backend(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        # Изменение в обход сигналов (как в другом воркере) видно сразу
+        City.objects.filter(pk=self.city.pk).update(name="Москва-Сити")
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            {"id": self.city.pk, "name": "Москва-Сити"}, response.json()["cities"]
+        )
+
+    def test_login_required(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
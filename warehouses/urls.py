@@ -19,6 +19,7 @@ urlpatterns = [
         name="available_containers_json",
     ),
     path("api/warehouses/", views.get_warehouses_json, name="warehouses_json"),
+    path("api/reference/", views.get_reference_data_json, name="reference_data_json"),
     path(
         "api/warehouses/<int:warehouse_id>/check_date/",
         views.check_date_availability_json,
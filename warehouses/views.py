@@ -1,8 +1,21 @@
 from datetime import datetime
 import json
+from django.conf import settings
 from django.http import JsonResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import quote_etag
 from django.views.decorators.http import require_GET, require_POST
 from django.contrib.auth.decorators import login_required
+from utils.reference_data import (
+    build_reference_data,
+    data_version,
+    reference_data,
+    reference_version,
+)
 from .models import City, Warehouse, WarehouseContainer, WarehouseSchedule
 
 
@@ -84,6 +97,29 @@ def get_warehouses_json(request):
     return JsonResponse(data, safe=False)
 
 
+@require_GET
+@login_required
+def get_reference_data_json(request):
+    """Справочники страниц списков (города, склады, логисты, операторы) одним JSON"""
+    if settings.CACHE_SHARED:
+        version = reference_version()
+        data = None
+    else:
+        data = build_reference_data()
+        version = data_version(data)
+    etag = quote_etag(version)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(
+            data if data is not None else reference_data(version),
+            json_dumps_params={"separators": (",", ":")},
+        )
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+    patch_vary_headers(response, ("Cookie",))
+    return response
+
+
 @require_POST
 def check_date_availability_json(request, warehouse_id):
     """Проверяет доступность даты для указанного склада"""